@@ -1,15 +1,36 @@
 """Lightning tracking cog for Redbot with multi-API support."""
+import asyncio
+import random
+from collections import defaultdict
 import discord
 from redbot.core import commands, Config
 from datetime import datetime
-from typing import Optional, Literal
+from typing import Dict, List, Literal, NamedTuple, Optional
 
 from .services import (
     BlitzortungService,
     WeatherAPIService,
     OpenWeatherMapService,
 )
+from .services.blitzortung_live import BlitzortungLive
+from .services.cache import LightningCache
 from .services.map_parser import MapParser
+from .monitor import MONITOR_INTERVAL, LightningMonitor
+
+BLITZORTUNG_RADIUS_KM = 25
+MAX_TRACKED_LOCATIONS = 25
+# With the live feed on, Blitzortung checks count strikes from this many recent minutes
+LIVE_WINDOW_MINUTES = 15
+STRIKE_LOG_SIZE = 50  # Only the most recent strikes are kept; `lightning log` shows up to 50
+TOP_STRIKERS = 10
+
+
+class ProviderSettings(NamedTuple):
+    """A guild's provider choice and API keys."""
+    provider: str
+    owm_api_key: str
+    weatherapi_key: str
+
 
 class Lightning(commands.Cog):
     """Track and display lightning strike statistics from multiple free APIs."""
@@ -22,15 +43,22 @@ class Lightning(commands.Cog):
         self.config.register_guild(
             strikes=0,
             last_strike_time=None,
-            strike_log=[],
+            strike_log=[],  # the last STRIKE_LOG_SIZE strikes, oldest first
+            striker_totals={},  # user id -> {"name", "count"}, kept up to date by `strike`
+            top_strikers=None,  # [[user id, name, count], ...] highest first; None until built
             api_provider="weatherapi",
             owm_api_key="",
             weatherapi_key="",
-            tracked_locations=[]
+            tracked_locations=[],  # {"lat", "lon", "label"} dicts checked by the monitor
+            alert_channel=None,
+            alert_min_strikes=1  # Blitzortung strikes needed to raise an alert
         )
         self.config.register_user(
             strikes_triggered=0
         )
+        self.config.register_global(
+            live_strikes=False  # ingest Blitzortung's live feed and answer strike checks locally
+        )
         
         # Initialize services
         self.services = {
@@ -38,6 +66,45 @@ class Lightning(commands.Cog):
             "owm": OpenWeatherMapService(),
             "blitzortung": BlitzortungService(),
         }
+        # Shared by every guild: one upstream call per grid cell per TTL
+        self.cache = LightningCache()
+        # guild_id -> ProviderSettings, dropped whenever the provider or a key changes
+        self._settings: Dict[int, ProviderSettings] = {}
+        # Serialises the read-modify-write of a guild's strike counters
+        self._strike_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        # Optional live strike feed; Blitzortung checks use it once it covers LIVE_WINDOW_MINUTES
+        self.live = BlitzortungLive(self.services["blitzortung"].get_session)
+        self.bot.loop.create_task(self._start_live())
+
+        self.monitor = LightningMonitor(self)
+        self.monitor_task = self.bot.loop.create_task(self.monitor.run())
+
+    async def _start_live(self):
+        if await self.config.live_strikes():
+            self.live.start()
+
+    def cog_unload(self):
+        self.monitor_task.cancel()
+        asyncio.create_task(self._close())
+
+    async def _close(self):
+        await self.live.stop()
+        for service in self.services.values():
+            await service.close()
+
+    async def get_settings(self, guild_id: int) -> ProviderSettings:
+        """Get a guild's provider and keys, reading Config only on first use."""
+        settings = self._settings.get(guild_id)
+        if settings is None:
+            guild_config = self.config.guild_from_id(guild_id)
+            settings = ProviderSettings(
+                provider=await guild_config.api_provider(),
+                owm_api_key=await guild_config.owm_api_key(),
+                weatherapi_key=await guild_config.weatherapi_key(),
+            )
+            self._settings[guild_id] = settings
+        return settings
 
     @commands.group(invoke_without_command=True)
     @commands.guild_only()
@@ -58,6 +125,7 @@ class Lightning(commands.Cog):
         - blitzortung: Free, no key needed, real-time lightning detection
         """
         await self.config.guild(ctx.guild).api_provider.set(provider)
+        self._settings.pop(ctx.guild.id, None)
         
         info = {
             "weatherapi": "WeatherAPI (requires free key from weatherapi.com)",
@@ -93,6 +161,7 @@ class Lightning(commands.Cog):
         else:
             await ctx.send("❌ Blitzortung doesn't require an API key. Use `[p]lightning setprovider` to switch providers.")
             return
+        self._settings.pop(ctx.guild.id, None)
         
         embed = discord.Embed(
             title="✓ API Key Set",
@@ -117,26 +186,60 @@ class Lightning(commands.Cog):
         return await service.fetch(lat, lon, radius_km=radius_km)
 
     async def get_lightning_data(self, guild_id: int, lat: float, lon: float) -> dict:
-        """Get lightning data from configured provider."""
-        provider = await self.config.guild_from_id(guild_id).api_provider()
+        """Get lightning data from configured provider.
+
+        Results are cached per grid cell (see services/cache.py), so nearby checks from any
+        guild within a few minutes reuse one upstream response.
+        """
+        settings = await self.get_settings(guild_id)
+        provider = settings.provider
         
         if provider == "weatherapi":
-            api_key = await self.config.guild_from_id(guild_id).weatherapi_key()
-            if not api_key:
+            if not settings.weatherapi_key:
                 return {"error": "WeatherAPI key not set. Use `[p]lightning setkey <key>`"}
-            return await self.fetch_weatherapi(lat, lon, api_key)
+            return await self.query_provider(provider, lat, lon, settings.weatherapi_key)
         
         elif provider == "owm":
-            api_key = await self.config.guild_from_id(guild_id).owm_api_key()
-            if not api_key:
+            if not settings.owm_api_key:
                 return {"error": "OpenWeatherMap key not set. Use `[p]lightning setkey <key>`"}
-            return await self.fetch_openweathermap(lat, lon, api_key)
+            return await self.query_provider(provider, lat, lon, settings.owm_api_key)
+        
+        return await self.query_provider(provider, lat, lon)
+
+    async def query_provider(self, provider: str, lat: float, lon: float, api_key: str = "") -> dict:
+        """Fetch from a provider through the shared cache (used by commands and the monitor)."""
+        if provider == "weatherapi":
+            return await self.cache.get(
+                provider, lat, lon, lambda la, lo: self.fetch_weatherapi(la, lo, api_key), api_key=api_key
+            )
+        
+        elif provider == "owm":
+            return await self.cache.get(
+                provider, lat, lon, lambda la, lo: self.fetch_openweathermap(la, lo, api_key), api_key=api_key
+            )
         
         elif provider == "blitzortung":
-            return await self.fetch_blitzortung(lat, lon)
+            if self.live.covers(LIVE_WINDOW_MINUTES):
+                return self.live_region(lat, lon, BLITZORTUNG_RADIUS_KM)
+            return await self.cache.get(
+                provider, lat, lon,
+                lambda la, lo: self.fetch_blitzortung(la, lo, BLITZORTUNG_RADIUS_KM),
+                radius=BLITZORTUNG_RADIUS_KM,
+            )
         
         return {"error": "Unknown provider"}
 
+    def live_region(self, lat: float, lon: float, radius_km: int) -> dict:
+        """Answer a Blitzortung region query from the live feed, in the same shape as the API."""
+        strikes = self.live.grid.query(lat, lon, radius_km, LIVE_WINDOW_MINUTES)
+        return {
+            "strikes": [
+                {"lat": s_lat, "lon": s_lon, "time": t, "distance_km": round(distance, 1)}
+                for distance, t, s_lat, s_lon in strikes
+            ],
+            "live_window_minutes": LIVE_WINDOW_MINUTES,
+        }
+
     @lightning.command(name="check")
     @commands.guild_only()
     async def check_lightning(self, ctx: commands.Context, latitude: float, longitude: float, label: str = ""):
@@ -156,7 +259,7 @@ class Lightning(commands.Cog):
             await ctx.send(f"❌ {error_msg}")
             return
         
-        provider = await self.config.guild(ctx.guild).api_provider()
+        provider = (await self.get_settings(ctx.guild.id)).provider
         location_name = label if label else f"{latitude}, {longitude}"
         
         # Use the service's display method
@@ -213,7 +316,7 @@ class Lightning(commands.Cog):
             await ctx.send(f"❌ {error_msg}")
             return
         
-        provider = await self.config.guild(ctx.guild).api_provider()
+        provider = (await self.get_settings(ctx.guild.id)).provider
         
         # Use the service's display method
         service = self.services.get(provider)
@@ -223,6 +326,165 @@ class Lightning(commands.Cog):
         else:
             await ctx.send("❌ Unknown provider configured")
 
+    @lightning.command(name="track")
+    @commands.admin_or_permissions(manage_guild=True)
+    @commands.guild_only()
+    async def track(self, ctx: commands.Context, latitude: float, longitude: float, *, label: str = ""):
+        """
+        Watch a location for lightning in the background.
+        
+        Alerts go to the channel set with `[p]lightning alertchannel`.
+        
+        Parameters:
+            latitude: Location latitude
+            longitude: Location longitude
+            label: Optional name for the location (e.g., "My City")
+        """
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            await ctx.send("❌ Latitude must be between -90 and 90 and longitude between -180 and 180.")
+            return
+        async with self.config.guild(ctx.guild).tracked_locations() as locations:
+            if len(locations) >= MAX_TRACKED_LOCATIONS:
+                await ctx.send(f"❌ This server already tracks {MAX_TRACKED_LOCATIONS} locations. Remove one with `[p]lightning untrack`.")
+                return
+            if any(loc["lat"] == latitude and loc["lon"] == longitude for loc in locations):
+                await ctx.send("❌ That location is already tracked.")
+                return
+            locations.append({"lat": latitude, "lon": longitude, "label": label})
+        
+        embed = discord.Embed(
+            title="✓ Location Tracked",
+            description=f"Watching **{label or f'{latitude}, {longitude}'}** for lightning.",
+            color=discord.Color.green()
+        )
+        if not await self.config.guild(ctx.guild).alert_channel():
+            embed.add_field(name="Note", value="Set an alert channel with `[p]lightning alertchannel #channel` to receive alerts.", inline=False)
+        await ctx.send(embed=embed)
+
+    @lightning.command(name="untrack")
+    @commands.admin_or_permissions(manage_guild=True)
+    @commands.guild_only()
+    async def untrack(self, ctx: commands.Context, *, location: str):
+        """
+        Stop watching a tracked location.
+        
+        Parameters:
+            location: The location's number from `[p]lightning tracked`, or its label
+        """
+        async with self.config.guild(ctx.guild).tracked_locations() as locations:
+            if location.isdigit() and 1 <= int(location) <= len(locations):
+                removed = locations.pop(int(location) - 1)
+            else:
+                matches = [i for i, loc in enumerate(locations) if loc.get("label", "").lower() == location.lower()]
+                if not matches:
+                    await ctx.send("❌ No tracked location with that number or label. See `[p]lightning tracked`.")
+                    return
+                removed = locations.pop(matches[0])
+        
+        name = removed.get("label") or f"{removed['lat']}, {removed['lon']}"
+        await ctx.send(f"✓ Stopped tracking **{name}**.")
+
+    @lightning.command(name="tracked")
+    @commands.guild_only()
+    async def tracked(self, ctx: commands.Context):
+        """List the locations watched for lightning in this server."""
+        guild_config = self.config.guild(ctx.guild)
+        locations = await guild_config.tracked_locations()
+        if not locations:
+            await ctx.send("No locations are tracked. Add one with `[p]lightning track <lat> <lon> [label]`.")
+            return
+        channel_id = await guild_config.alert_channel()
+        channel = ctx.guild.get_channel(channel_id) if channel_id else None
+        
+        lines = [
+            f"{i}. **{loc.get('label') or 'Unnamed'}** ({loc['lat']}, {loc['lon']})"
+            for i, loc in enumerate(locations, 1)
+        ]
+        embed = discord.Embed(
+            title="⚡ Tracked Locations",
+            description="\n".join(lines),
+            color=discord.Color.gold()
+        )
+        embed.add_field(name="Alert Channel", value=channel.mention if channel else "Not set", inline=True)
+        embed.add_field(name="Strike Threshold", value=await guild_config.alert_min_strikes(), inline=True)
+        embed.set_footer(text=f"Checked every {MONITOR_INTERVAL // 60} minutes")
+        await ctx.send(embed=embed)
+
+    @lightning.command(name="alertchannel")
+    @commands.admin_or_permissions(manage_guild=True)
+    @commands.guild_only()
+    async def alert_channel(self, ctx: commands.Context, channel: Optional[discord.TextChannel] = None):
+        """
+        Set the channel for lightning alerts on tracked locations.
+        
+        Run without a channel to turn alerts off.
+        """
+        await self.config.guild(ctx.guild).alert_channel.set(channel.id if channel else None)
+        if channel:
+            await ctx.send(f"✓ Lightning alerts will be sent to {channel.mention}.")
+        else:
+            await ctx.send("✓ Lightning alerts turned off.")
+
+    @lightning.command(name="alertstrikes")
+    @commands.admin_or_permissions(manage_guild=True)
+    @commands.guild_only()
+    async def alert_strikes(self, ctx: commands.Context, strikes: int):
+        """
+        Set how many Blitzortung strikes near a tracked location trigger an alert.
+        
+        WeatherAPI and OpenWeatherMap alert whenever they report a thunderstorm.
+        """
+        strikes = max(1, strikes)
+        await self.config.guild(ctx.guild).alert_min_strikes.set(strikes)
+        await ctx.send(f"✓ Alerts will be sent when at least {strikes} strike(s) are detected near a tracked location.")
+
+    @lightning.command(name="live")
+    @commands.is_owner()
+    async def live_feed(self, ctx: commands.Context, enabled: Optional[bool] = None):
+        """
+        Show or toggle the live Blitzortung strike feed.
+        
+        When on, the bot keeps the last 30 minutes of strikes worldwide in memory. Once it has
+        been connected for 15 minutes, Blitzortung checks and alerts are answered from it
+        instead of the region API.
+        """
+        if enabled is not None:
+            await self.config.live_strikes.set(enabled)
+            if enabled:
+                self.live.start()
+            else:
+                await self.live.stop()
+        enabled = await self.config.live_strikes()
+        
+        if not enabled:
+            status = "Off (checks use the Blitzortung region API)"
+        elif self.live.covers(LIVE_WINDOW_MINUTES):
+            status = "Connected, answering checks locally"
+        elif self.live.connected:
+            status = f"Connected, collecting {LIVE_WINDOW_MINUTES} minutes of strikes before answering checks"
+        else:
+            status = "Disconnected, using the region API until it reconnects"
+        embed = discord.Embed(
+            title="⚡ Live Strike Feed",
+            description=status,
+            color=discord.Color.gold() if self.live.connected else discord.Color.blue()
+        )
+        if enabled:
+            embed.add_field(name="Strikes in Memory", value=len(self.live.grid), inline=True)
+            embed.add_field(name="Received", value=self.live.strikes_received, inline=True)
+            if self.live.connected_since:
+                embed.add_field(name="Connected Since", value=f"<t:{int(self.live.connected_since)}:R>", inline=True)
+            hotspots = self.live.grid.hotspots(LIVE_WINDOW_MINUTES)
+            if hotspots:
+                embed.add_field(
+                    name=f"Busiest Areas (last {LIVE_WINDOW_MINUTES} min)",
+                    value="\n".join(f"{lat:+.0f}°, {lon:+.0f}° (1° cell): {count} strikes" for count, lat, lon in hotspots),
+                    inline=False
+                )
+            if self.live.last_error:
+                embed.add_field(name="Last Error", value=self.live.last_error[:1000], inline=False)
+        await ctx.send(embed=embed)
+
     @lightning.command(name="strike")
     @commands.guild_only()
     async def strike(self, ctx: commands.Context, intensity: Optional[int] = None):
@@ -233,24 +495,48 @@ class Lightning(commands.Cog):
             intensity: Intensity of the strike (1-10). Defaults to random.
         """
         if intensity is None:
-            import random
             intensity = random.randint(1, 10)
         else:
             intensity = max(1, min(10, intensity))
         
         # Update guild stats
-        async with self.config.guild(ctx.guild).all() as guild_data:
-            guild_data["strikes"] += 1
-            guild_data["last_strike_time"] = datetime.now().isoformat()
-            guild_data["strike_log"].append({
+        guild_config = self.config.guild(ctx.guild)
+        async with self._strike_locks[ctx.guild.id]:
+            top = await self._top_strikers(ctx.guild)
+            now = datetime.now().isoformat()
+            guild_strikes = await guild_config.strikes() + 1
+            await guild_config.strikes.set(guild_strikes)
+            await guild_config.last_strike_time.set(now)
+            
+            strike_log = await guild_config.strike_log()
+            strike_log.append({
                 "user": ctx.author.name,
+                "user_id": ctx.author.id,
                 "intensity": intensity,
-                "time": datetime.now().isoformat()
+                "time": now
             })
+            await guild_config.strike_log.set(strike_log[-STRIKE_LOG_SIZE:])
+            
+            key = str(ctx.author.id)
+            count = await guild_config.striker_totals.get_raw(key, "count", default=0)
+            if count == 0:
+                # Fold in strikes logged under this name before totals were kept by user id
+                legacy = await guild_config.striker_totals.get_raw(ctx.author.name, "count", default=0)
+                if legacy:
+                    await guild_config.striker_totals.clear_raw(ctx.author.name)
+                    count = legacy
+            count += 1
+            await guild_config.striker_totals.set_raw(key, value={"name": ctx.author.name, "count": count})
+            if any(row[0] == ctx.author.name for row in top):
+                # The merged name row leaves a gap only a full recount can fill (once per user)
+                top[:] = self._rank_all(await guild_config.striker_totals())
+            else:
+                self._rank_striker(top, key, ctx.author.name, count)
+            await guild_config.top_strikers.set(top)
         
         # Update user stats
-        async with self.config.user(ctx.author).all() as user_data:
-            user_data["strikes_triggered"] += 1
+        user_strikes = await self.config.user(ctx.author).strikes_triggered() + 1
+        await self.config.user(ctx.author).strikes_triggered.set(user_strikes)
         
         # Create visual representation
         power_bar = "⚡" * intensity + "░" * (10 - intensity)
@@ -263,14 +549,59 @@ class Lightning(commands.Cog):
         )
         embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.display_avatar.url)
         
-        guild_data = await self.config.guild(ctx.guild).all()
-        user_data = await self.config.user(ctx.author).all()
-        
-        embed.add_field(name="Total Strikes (Guild)", value=guild_data["strikes"], inline=True)
-        embed.add_field(name="Your Strikes", value=user_data["strikes_triggered"], inline=True)
+        embed.add_field(name="Total Strikes (Guild)", value=guild_strikes, inline=True)
+        embed.add_field(name="Your Strikes", value=user_strikes, inline=True)
         
         await ctx.send(embed=embed)
 
+    async def _top_strikers(self, guild: discord.Guild) -> List[list]:
+        """
+        Get the guild's leaderboard as [user id, name, count] rows, highest first.
+        
+        Guilds whose strike log predates the leaderboard get their totals counted from the
+        full log once (entries without a user id are counted by name), then the log is capped.
+        Call with the guild's strike lock held.
+        """
+        guild_config = self.config.guild(guild)
+        top = await guild_config.top_strikers()
+        if top is not None:
+            return top
+        
+        strike_log = await guild_config.strike_log()
+        totals = {}
+        for entry in strike_log:
+            key = str(entry.get("user_id", entry["user"]))
+            total = totals.setdefault(key, {"name": entry["user"], "count": 0})
+            total["count"] += 1
+        top = self._rank_all(totals)
+        await guild_config.striker_totals.set(totals)
+        await guild_config.strike_log.set(strike_log[-STRIKE_LOG_SIZE:])
+        await guild_config.top_strikers.set(top)
+        return top
+
+    @staticmethod
+    def _rank_all(totals: dict) -> List[list]:
+        """Build the leaderboard from every user's total."""
+        return sorted(
+            ([key, total["name"], total["count"]] for key, total in totals.items()),
+            key=lambda row: row[2],
+            reverse=True
+        )[:TOP_STRIKERS]
+
+    @staticmethod
+    def _rank_striker(top: List[list], key: str, name: str, count: int):
+        """Update the leaderboard in place after a user's total rose to `count`."""
+        for row in top:
+            if row[0] == key:
+                row[1], row[2] = name, count
+                break
+        else:
+            if len(top) >= TOP_STRIKERS and count <= top[-1][2]:
+                return
+            top.append([key, name, count])
+        top.sort(key=lambda row: row[2], reverse=True)
+        del top[TOP_STRIKERS:]
+
     @lightning.command(name="stats")
     @commands.guild_only()
     async def stats(self, ctx: commands.Context, user: Optional[discord.Member] = None):
@@ -284,7 +615,8 @@ class Lightning(commands.Cog):
             user = ctx.author
         
         user_strikes = await self.config.user(user).strikes_triggered()
-        guild_data = await self.config.guild(ctx.guild).all()
+        guild_config = self.config.guild(ctx.guild)
+        last_strike_time = await guild_config.last_strike_time()
         
         embed = discord.Embed(
             title="⚡ Lightning Statistics",
@@ -292,22 +624,21 @@ class Lightning(commands.Cog):
             timestamp=datetime.now()
         )
         
-        embed.add_field(name="Guild Total Strikes", value=guild_data["strikes"], inline=False)
+        embed.add_field(name="Guild Total Strikes", value=await guild_config.strikes(), inline=False)
         embed.add_field(name=f"{user.display_name}'s Strikes", value=user_strikes, inline=False)
         
-        if guild_data["last_strike_time"]:
+        if last_strike_time:
             embed.add_field(
                 name="Last Strike",
-                value=guild_data["last_strike_time"],
+                value=last_strike_time,
                 inline=False
             )
         
-        # Top strikers from log
-        if guild_data["strike_log"]:
-            from collections import Counter
-            strikers = Counter(strike["user"] for strike in guild_data["strike_log"])
-            top_3 = strikers.most_common(3)
-            top_strikers_text = "\n".join([f"{i+1}. {name}: {count}" for i, (name, count) in enumerate(top_3)])
+        # Top strikers from the maintained leaderboard
+        async with self._strike_locks[ctx.guild.id]:
+            top_3 = (await self._top_strikers(ctx.guild))[:3]
+        if top_3:
+            top_strikers_text = "\n".join([f"{i+1}. {name}: {count}" for i, (_, name, count) in enumerate(top_3)])
             embed.add_field(name="Top Strikers", value=top_strikers_text, inline=False)
         
         embed.set_thumbnail(url="https://cdn-icons-png.flaticon.com/512/992/992566.png")
@@ -319,6 +650,7 @@ class Lightning(commands.Cog):
     async def reset(self, ctx: commands.Context):
         """Reset all lightning statistics for this server."""
         await self.config.guild(ctx.guild).clear()
+        self._settings.pop(ctx.guild.id, None)
         
         embed = discord.Embed(
             title="⚡ Statistics Reset",
@@ -338,8 +670,9 @@ class Lightning(commands.Cog):
         """
         limit = max(1, min(50, limit))
         
-        guild_data = await self.config.guild(ctx.guild).all()
-        strikes = guild_data["strike_log"][-limit:]
+        async with self._strike_locks[ctx.guild.id]:
+            await self._top_strikers(ctx.guild)  # Trims a log kept before it was capped
+            strikes = (await self.config.guild(ctx.guild).strike_log())[-limit:]
         
         if not strikes:
             await ctx.send("No lightning strikes recorded yet.")
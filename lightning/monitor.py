@@ -0,0 +1,124 @@
+"""Background lightning monitoring for every guild's tracked locations."""
+import asyncio
+import logging
+from typing import Dict, Tuple
+
+import discord
+
+from .services.cache import snap
+
+log = logging.getLogger("red.lightning.monitor")
+
+MONITOR_INTERVAL = 300  # seconds between checks of all tracked locations
+MONITOR_CONCURRENCY = 4  # upstream requests in flight at once
+KEY_FIELDS = {"weatherapi": "weatherapi_key", "owm": "owm_api_key"}
+
+
+class LightningMonitor:
+    """Polls tracked locations and alerts guilds when lightning starts and stops.
+
+    Locations from all guilds are grouped by provider and grid cell (the same cells the
+    lookup cache uses), so each cell is fetched once per interval however many guilds watch
+    it. Alerts are edge-triggered: a guild hears once when a location becomes active and
+    once when it clears.
+    """
+
+    def __init__(self, cog):
+        self.cog = cog
+        self._active: Dict[Tuple[int, float, float], bool] = {}  # (guild_id, lat, lon) -> alerting
+        self.last_cells = 0
+        self.last_locations = 0
+
+    async def run(self):
+        await self.cog.bot.wait_until_ready()
+        while True:
+            try:
+                await self.check_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Lightning monitoring cycle failed")
+            await asyncio.sleep(MONITOR_INTERVAL)
+
+    @staticmethod
+    def collect(all_guilds: dict) -> Dict[Tuple[str, float, float], dict]:
+        """Group tracked locations of guilds with an alert channel by (provider, cell lat, cell lon).
+
+        Each group holds the distinct API keys that can fetch it and its watchers, as
+        (guild_id, guild_data, location) tuples.
+        """
+        groups = {}
+        for guild_id, data in all_guilds.items():
+            locations = data.get("tracked_locations") or []
+            if not locations or not data.get("alert_channel"):
+                continue
+            provider = data.get("api_provider", "weatherapi")
+            api_key = data.get(KEY_FIELDS[provider], "") if provider in KEY_FIELDS else ""
+            if provider in KEY_FIELDS and not api_key:
+                continue
+            for location in locations:
+                cell = snap(provider, location["lat"], location["lon"])
+                group = groups.setdefault((provider, *cell), {"keys": [], "watchers": []})
+                if api_key not in group["keys"]:
+                    group["keys"].append(api_key)
+                group["watchers"].append((guild_id, data, location))
+        return groups
+
+    async def check_all(self):
+        groups = self.collect(await self.cog.config.all_guilds())
+        semaphore = asyncio.Semaphore(MONITOR_CONCURRENCY)
+
+        async def poll(provider, lat, lon, keys):
+            async with semaphore:
+                data = None
+                for api_key in keys:  # Another guild's key may work where one fails
+                    data = await self.cog.query_provider(provider, lat, lon, api_key)
+                    if not data.get("error"):
+                        break
+                return data
+
+        cells = list(groups)
+        results = await asyncio.gather(*(poll(*cell, groups[cell]["keys"]) for cell in cells))
+        self.last_cells = len(cells)
+        self.last_locations = sum(len(group["watchers"]) for group in groups.values())
+
+        seen = set()
+        for cell, data in zip(cells, results):
+            if data.get("error"):
+                log.debug(f"Lightning monitor poll failed: {data['error']}")
+                # Keep the previous state of these locations until a poll succeeds
+                seen.update((guild_id, location["lat"], location["lon"]) for guild_id, _, location in groups[cell]["watchers"])
+                continue
+            service = self.cog.services[cell[0]]
+            for guild_id, guild_data, location in groups[cell]["watchers"]:
+                key = (guild_id, location["lat"], location["lon"])
+                seen.add(key)
+                if service.reports_strikes:
+                    active = service.strike_count(data) >= guild_data.get("alert_min_strikes", 1)
+                else:
+                    active = service.is_thunderstorm(data)
+                if active != self._active.get(key, False):
+                    self._active[key] = active
+                    await self._alert(guild_id, guild_data, location, service, data, active)
+        for key in set(self._active) - seen:
+            del self._active[key]  # Location untracked or guild no longer alerting
+
+    async def _alert(self, guild_id: int, guild_data: dict, location: dict, service, data: dict, active: bool):
+        channel = self.cog.bot.get_channel(guild_data["alert_channel"])
+        if channel is None:
+            return
+        label = location.get("label") or f"{location['lat']}, {location['lon']}"
+        try:
+            if active:
+                await channel.send(
+                    f"⚠️ Lightning detected near **{label}**", embed=service.display_data(data, label)
+                )
+            else:
+                embed = discord.Embed(
+                    title="✓ All Clear",
+                    description=f"No more lightning detected near **{label}**.",
+                    color=discord.Color.green(),
+                )
+                await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            log.debug(f"Could not send lightning alert to guild {guild_id}: {e}")
@@ -6,6 +6,10 @@ import aiohttp
 class LightningService(ABC):
     """Base class for lightning tracking services."""
 
+    # Whether fetch() returns individual strikes (compared with a strike threshold) rather
+    # than weather conditions (where only a thunderstorm report counts)
+    reports_strikes = False
+
     def __init__(self):
         self.session = None
 
@@ -24,3 +28,17 @@ class LightningService(ABC):
     def format_display_name(self) -> str:
         """Return the display name of this service."""
         pass
+
+    def is_thunderstorm(self, data: dict) -> bool:
+        """Whether fetched data reports a thunderstorm at the location."""
+        return False
+
+    def strike_count(self, data: dict) -> int:
+        """Number of lightning strikes in fetched data."""
+        return 0
+
+    async def close(self):
+        """Close the aiohttp session, if one was opened."""
+        if self.session:
+            await self.session.close()
+            self.session = None
@@ -8,6 +8,8 @@ import asyncio
 class BlitzortungService(LightningService):
     """Blitzortung service for real-time crowdsourced lightning detection."""
 
+    reports_strikes = True
+
     async def fetch(self, lat: float, lon: float, radius_km: int = 25) -> dict:
         """Fetch data from Blitzortung (real-time lightning strikes)"""
         session = await self.get_session()
@@ -32,6 +34,14 @@ class BlitzortungService(LightningService):
         """Return display name."""
         return "Blitzortung"
 
+    def strike_count(self, data: dict) -> int:
+        """Return the number of strikes in the region."""
+        return len(data.get("strikes") or [])
+
+    def is_thunderstorm(self, data: dict) -> bool:
+        """Any strike in the region counts as a thunderstorm."""
+        return self.strike_count(data) > 0
+
     def display_data(self, data: dict, location_name: str):
         """Format data as Discord embed."""
         strikes = data.get("strikes", [])
@@ -53,11 +63,17 @@ class BlitzortungService(LightningService):
             for i, strike in enumerate(strikes[:5], 1):
                 lat = strike.get("lat", "N/A")
                 lon = strike.get("lon", "N/A")
-                strikes_text += f"{i}. Lat: {lat}, Lon: {lon}\n"
+                distance = strike.get("distance_km")
+                strikes_text += f"{i}. Lat: {lat}, Lon: {lon}" + (f" ({distance} km)" if distance is not None else "") + "\n"
 
-            embed.add_field(name="Recent Strikes", value=strikes_text[:1024], inline=False)
+            # Live-feed results are sorted nearest first
+            title = "Nearest Strikes" if "live_window_minutes" in data else "Recent Strikes"
+            embed.add_field(name=title, value=strikes_text[:1024], inline=False)
         else:
             embed.add_field(name="Status", value="✓ No recent lightning detected", inline=False)
 
-        embed.set_footer(text="Data from Blitzortung (crowdsourced, real-time)")
+        if "live_window_minutes" in data:
+            embed.set_footer(text=f"Data from Blitzortung live feed (last {data['live_window_minutes']} minutes)")
+        else:
+            embed.set_footer(text="Data from Blitzortung (crowdsourced, real-time)")
         return embed
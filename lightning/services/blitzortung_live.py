@@ -0,0 +1,149 @@
+"""Live Blitzortung strike feed over WebSocket."""
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+import aiohttp
+
+from .strike_grid import StrikeGrid
+
+log = logging.getLogger("red.lightning.live")
+
+LIVE_URLS = (
+    "wss://ws1.blitzortung.org/",
+    "wss://ws7.blitzortung.org/",
+    "wss://ws8.blitzortung.org/",
+)
+SUBSCRIBE_MESSAGE = '{"a": 111}'
+RECONNECT_MIN = 5
+RECONNECT_MAX = 300
+RECEIVE_TIMEOUT = 120  # The global feed is never quiet this long on a working connection
+
+
+def decode(data: str) -> str:
+    """Undo the LZW-style compression Blitzortung applies to each strike message.
+
+    Characters below 256 are literals; higher code points refer to strings built while
+    decoding, exactly as in the JavaScript client on blitzortung.org.
+    """
+    if not data:
+        return ""
+    dictionary = {}
+    current = data[0]
+    previous = current
+    out = [current]
+    code = 256
+    for char in data[1:]:
+        number = ord(char)
+        if number < 256:
+            entry = char
+        elif number in dictionary:
+            entry = dictionary[number]
+        else:
+            entry = previous + current
+        out.append(entry)
+        current = entry[0]
+        dictionary[code] = previous + current
+        code += 1
+        previous = entry
+    return "".join(out)
+
+
+def parse_strike(message: str):
+    """(epoch seconds, lat, lon) from one feed message (compressed or plain JSON), or None."""
+    try:
+        strike = json.loads(message)
+    except ValueError:
+        try:
+            strike = json.loads(decode(message))
+        except ValueError:
+            return None
+    try:
+        t, lat, lon = strike["time"], float(strike["lat"]), float(strike["lon"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or not isinstance(t, (int, float)):
+        return None
+    return t / 1e9 if t > 1e12 else float(t), lat, lon  # Feed times are nanoseconds
+
+
+class BlitzortungLive:
+    """Consumes the global strike feed into a StrikeGrid, reconnecting with backoff.
+
+    `covers(minutes)` is True only after the feed has been connected without a break for
+    that long, so callers know the grid holds every strike in their window and can answer
+    locally instead of polling the region API.
+    """
+
+    def __init__(self, get_session: Callable[[], Awaitable[aiohttp.ClientSession]], grid: Optional[StrikeGrid] = None):
+        self._get_session = get_session
+        self.grid = grid or StrikeGrid()
+        self.urls = list(LIVE_URLS)  # Overridable, e.g. with the local stand-in (see standin.py)
+        self._task = None
+        self.connected = False
+        self.connected_since = None
+        self.last_error = None
+        self.strikes_received = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.connected = False
+        self.connected_since = None
+
+    def covers(self, minutes: float) -> bool:
+        return self.connected and self.connected_since is not None and time.time() - self.connected_since >= minutes * 60
+
+    async def _run(self):
+        delay = RECONNECT_MIN
+        while True:
+            url = random.choice(self.urls)
+            try:
+                await self._connect_and_read(url)
+                wait, delay = RECONNECT_MIN, RECONNECT_MIN  # Server closed a working connection
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                log.info(f"Blitzortung feed disconnected ({self.last_error}); polling until it reconnects")
+                wait, delay = delay, min(delay * 2, RECONNECT_MAX)
+            finally:
+                self.connected = False
+                self.connected_since = None
+            await asyncio.sleep(wait)
+
+    async def _connect_and_read(self, url: str):
+        session = await self._get_session()
+        async with session.ws_connect(url, heartbeat=30) as ws:
+            await ws.send_str(SUBSCRIBE_MESSAGE)
+            self.connected = True
+            self.connected_since = time.time()
+            self.last_error = None
+            grid = self.grid
+            while True:
+                message = await ws.receive(timeout=RECEIVE_TIMEOUT)
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    strike = parse_strike(message.data)
+                    if strike is not None:
+                        grid.add(*strike)
+                        self.strikes_received += 1
+                elif message.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING):
+                    return
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    raise ConnectionError(str(ws.exception()))
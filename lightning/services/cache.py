@@ -0,0 +1,81 @@
+"""Short-lived, provider-agnostic cache for lightning lookups."""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+# Grid cell size (degrees) and freshness (seconds) per provider. Weather conditions cover
+# a wide area and change slowly; Blitzortung strikes are point data and go stale quickly.
+CELL_DEGREES = {"weatherapi": 0.1, "owm": 0.1, "blitzortung": 0.05}
+TTL_SECONDS = {"weatherapi": 300, "owm": 300, "blitzortung": 60}
+DEFAULT_CELL_DEGREES = 0.1
+DEFAULT_TTL = 120
+MAX_ENTRIES = 2048
+
+
+def snap(provider: str, lat: float, lon: float) -> Tuple[float, float]:
+    """Centre of the grid cell containing lat/lon, which is what gets fetched and cached."""
+    size = CELL_DEGREES.get(provider, DEFAULT_CELL_DEGREES)
+    return (
+        round((lat // size) * size + size / 2, 4),
+        round((lon // size) * size + size / 2, 4),
+    )
+
+
+class LightningCache:
+    """Results keyed by (provider, grid cell, radius), with one upstream request per key in flight.
+
+    Everyone checking a location in the same cell within the provider's TTL shares one
+    response. Error results are returned but never cached. Requests made with different API
+    keys are not coalesced, so one guild's bad key cannot fail another guild's check.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[float, dict]] = {}  # key -> (expires_at, data)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        provider: str,
+        lat: float,
+        lon: float,
+        fetch: Callable[[float, float], Awaitable[dict]],
+        radius: Optional[int] = None,
+        api_key: str = "",
+    ) -> dict:
+        """Return cached data for the cell containing lat/lon, or `fetch(cell_lat, cell_lon)` it."""
+        cell_lat, cell_lon = snap(provider, lat, lon)
+        key = (provider, cell_lat, cell_lon, radius)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        flight = (key, api_key)
+        task = self._inflight.get(flight)
+        if task is None:
+            task = asyncio.create_task(fetch(cell_lat, cell_lon))
+            self._inflight[flight] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(flight, None))
+        data = await asyncio.shield(task)
+
+        if isinstance(data, dict) and not data.get("error"):
+            ttl = TTL_SECONDS.get(provider, DEFAULT_TTL)
+            self._entries[key] = (time.monotonic() + ttl, data)
+            self._prune()
+        return data
+
+    def _prune(self):
+        if len(self._entries) <= MAX_ENTRIES:
+            return
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        while len(self._entries) > MAX_ENTRIES:
+            self._entries.pop(next(iter(self._entries)))
+
+    def __len__(self):
+        return len(self._entries)
@@ -27,10 +27,14 @@ class OpenWeatherMapService(LightningService):
         """Return display name."""
         return "OpenWeatherMap"
 
+    def is_thunderstorm(self, data: dict) -> bool:
+        """Check for thunderstorm weather condition IDs (200-232)."""
+        return any(200 <= w.get("id", 0) <= 232 for w in data.get("weather", []))
+
     def display_data(self, data: dict, location_name: str):
         """Format data as Discord embed."""
         weather_list = data.get("weather", [])
-        is_thunderstorm = any(w["id"] >= 200 and w["id"] <= 232 for w in weather_list)
+        is_thunderstorm = self.is_thunderstorm(data)
 
         embed = discord.Embed(
             title="⚡ Lightning Check (OpenWeatherMap)",
@@ -0,0 +1,131 @@
+"""In-memory store of recent lightning strikes, indexed by time and position."""
+import math
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+RETENTION_MINUTES = 30
+CELL_DEGREES = 1.0
+CELL_COLUMNS = int(360 / CELL_DEGREES)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell(lat: float, lon: float) -> Tuple[int, int]:
+    return int((lat + 90) // CELL_DEGREES), int((lon + 180) // CELL_DEGREES) % CELL_COLUMNS
+
+
+def _cells_around(lat: float, lon: float, radius_km: float) -> List[Tuple[int, int]]:
+    """Grid cells covering the bounding box of a circle."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    ratio = math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi / 2)) / max(math.cos(math.radians(lat)), 1e-12)
+    if south <= -90 or north >= 90 or ratio >= 1:
+        cols = range(CELL_COLUMNS)  # Reaches a pole: every longitude
+    else:
+        dlon = math.degrees(math.asin(ratio))
+        first = int((lon - dlon + 180) // CELL_DEGREES)
+        last = int((lon + dlon + 180) // CELL_DEGREES)
+        cols = range(first, min(last, first + CELL_COLUMNS - 1) + 1)
+    rows = range(int((south + 90) // CELL_DEGREES), int((north + 90) // CELL_DEGREES) + 1)
+    return [(row, col % CELL_COLUMNS) for row in rows for col in cols]
+
+
+class _Bucket:
+    """One minute of strikes: parallel arrays plus, per grid cell, the offsets of its strikes."""
+
+    __slots__ = ("times", "lats", "lons", "cells")
+
+    def __init__(self):
+        self.times = array("d")
+        self.lats = array("d")
+        self.lons = array("d")
+        self.cells: Dict[Tuple[int, int], array] = {}
+
+
+class StrikeGrid:
+    """The last `retention_minutes` of strikes in per-minute buckets over a 1° grid.
+
+    Adding a strike is a few array appends. Queries look only at the buckets inside the time
+    window and, within each, only at the cells covering the search circle. Whole buckets are
+    dropped as they age out, so memory follows the recent strike rate.
+    """
+
+    def __init__(self, retention_minutes: int = RETENTION_MINUTES):
+        self.retention = retention_minutes * 60
+        self._buckets: Dict[int, _Bucket] = {}  # minute number -> bucket
+        self._expired_before = 0
+        self.total_added = 0
+
+    def __len__(self):
+        return sum(len(bucket.times) for bucket in self._buckets.values())
+
+    def add(self, t: float, lat: float, lon: float, now: Optional[float] = None):
+        """Record a strike at epoch time `t`; strikes older than the retention window are ignored."""
+        now = time.time() if now is None else now
+        minute = int(t // 60)
+        if minute * 60 + 60 <= now - self.retention:
+            return
+        if minute > self._expired_before:
+            self.expire(now)
+        bucket = self._buckets.get(minute)
+        if bucket is None:
+            bucket = self._buckets[minute] = _Bucket()
+        bucket.cells.setdefault(_cell(lat, lon), array("I")).append(len(bucket.times))
+        bucket.times.append(t)
+        bucket.lats.append(lat)
+        bucket.lons.append(lon)
+        self.total_added += 1
+
+    def expire(self, now: Optional[float] = None):
+        """Drop buckets that lie entirely outside the retention window."""
+        now = time.time() if now is None else now
+        cutoff = int((now - self.retention) // 60)
+        for minute in [m for m in self._buckets if m < cutoff]:
+            del self._buckets[minute]
+        self._expired_before = int(now // 60)
+
+    def query(self, lat: float, lon: float, radius_km: float, minutes: float, now: Optional[float] = None) -> list:
+        """Strikes within `radius_km` in the last `minutes`, nearest first.
+
+        Returns (distance_km, time, lat, lon) tuples.
+        """
+        now = time.time() if now is None else now
+        since = now - minutes * 60
+        cells = _cells_around(lat, lon, radius_km)
+        result = []
+        for minute, bucket in self._buckets.items():
+            if minute * 60 + 60 <= since:
+                continue
+            times, lats, lons = bucket.times, bucket.lats, bucket.lons
+            for cell in cells:
+                for i in bucket.cells.get(cell, ()):
+                    if times[i] < since:
+                        continue
+                    distance = haversine_km(lat, lon, lats[i], lons[i])
+                    if distance <= radius_km:
+                        result.append((distance, times[i], lats[i], lons[i]))
+        result.sort()
+        return result
+
+    def hotspots(self, minutes: float, top: int = 5, now: Optional[float] = None) -> list:
+        """The `top` busiest 1° cells in the last `minutes`, as (count, south-west lat, lon)."""
+        now = time.time() if now is None else now
+        since_minute = int((now - minutes * 60) // 60)
+        counts: Dict[Tuple[int, int], int] = {}
+        for minute, bucket in self._buckets.items():
+            if minute < since_minute:
+                continue
+            for cell, offsets in bucket.cells.items():
+                counts[cell] = counts.get(cell, 0) + len(offsets)
+        busiest = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [
+            (count, row * CELL_DEGREES - 90, col * CELL_DEGREES - 180)
+            for (row, col), count in busiest
+        ]
@@ -3,6 +3,10 @@ from .base import LightningService
 import discord
 
 
+# WeatherAPI condition codes that mean thunder or thundery showers
+THUNDER_CODES = {1087, 1273, 1276, 1279, 1282}
+
+
 class WeatherAPIService(LightningService):
     """WeatherAPI.com service for weather-based lightning detection."""
 
@@ -27,11 +31,16 @@ class WeatherAPIService(LightningService):
         """Return display name."""
         return "WeatherAPI"
 
+    def is_thunderstorm(self, data: dict) -> bool:
+        """Check the current condition code and text for thunder."""
+        condition = data.get("current", {}).get("condition", {})
+        return condition.get("code") in THUNDER_CODES or "thunder" in condition.get("text", "").lower()
+
     def display_data(self, data: dict, location_name: str):
         """Format data as Discord embed."""
         current = data.get("current", {})
         condition = current.get("condition", {})
-        is_thunderstorm = "thunder" in condition.get("text", "").lower()
+        is_thunderstorm = self.is_thunderstorm(data)
 
         embed = discord.Embed(
             title="⚡ Lightning Check (WeatherAPI)",
@@ -0,0 +1,119 @@
+"""
+Local stand-in for Blitzortung's live strike feed, for testing live ingestion.
+
+Serves a WebSocket at `/` that, after the client's subscribe message, sends strikes in
+Blitzortung's message format (LZW-compressed JSON unless `--plain`). A share of the strikes
+(`--storm-share`) falls within ~30 km of `--storm`; the rest are spread over the globe.
+`--drop-after` closes each connection after that many seconds, to exercise reconnects and
+the fallback to polling. Nothing here is loaded by the cog.
+
+Example:
+    python -m lightning.standin --port 8766 --rate 50 --storm 40.71,-74.0
+    # then, from the bot (e.g. with the dev cog's [p]eval):
+    bot.get_cog("Lightning").live.urls = ["ws://127.0.0.1:8766/"]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from aiohttp import WSMsgType, web
+
+
+def encode(text: str) -> str:
+    """LZW-compress `text` the way Blitzortung does (inverse of blitzortung_live.decode)."""
+    dictionary = {}
+    code = 256
+    out = []
+    word = ""
+    for char in text:
+        candidate = word + char
+        if len(candidate) == 1 or candidate in dictionary:
+            word = candidate
+            continue
+        out.append(word if len(word) == 1 else chr(dictionary[word]))
+        dictionary[candidate] = code
+        code += 1
+        word = char
+    if word:
+        out.append(word if len(word) == 1 else chr(dictionary[word]))
+    return "".join(out)
+
+
+class BlitzortungStandin:
+    def __init__(self, rate: float, storm, storm_share: float, drop_after: float, plain: bool):
+        self.rate = rate
+        self.storm = storm
+        self.storm_share = storm_share
+        self.drop_after = drop_after
+        self.plain = plain
+        self.rng = random.Random()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/", self.feed)
+        return app
+
+    def _strike(self) -> dict:
+        if self.storm and self.rng.random() < self.storm_share:
+            lat = self.storm[0] + self.rng.uniform(-0.25, 0.25)
+            lon = self.storm[1] + self.rng.uniform(-0.25, 0.25)
+        else:
+            lat, lon = self.rng.uniform(-60, 70), self.rng.uniform(-180, 180)
+        return {
+            "time": time.time_ns(),
+            "lat": round(lat, 5),
+            "lon": round(lon, 5),
+            "alt": 0,
+            "pol": 0,
+            "mds": self.rng.randint(5000, 15000),
+            "mcg": self.rng.randint(100, 250),
+            "status": 0,
+            "region": 1,
+            "sig": [{"sta": self.rng.randint(1, 3000), "time": self.rng.randint(1000, 9000000), "lat": 0, "lon": 0, "alt": 0, "status": 0}],
+        }
+
+    async def feed(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        message = await ws.receive()
+        if message.type != WSMsgType.TEXT:
+            return ws
+        sender = asyncio.create_task(self._send(ws))
+        try:
+            async for _ in ws:  # Drain until the client closes
+                pass
+        finally:
+            sender.cancel()
+        return ws
+
+    async def _send(self, ws):
+        opened = time.monotonic()
+        while not ws.closed:
+            text = json.dumps(self._strike(), separators=(",", ":"))
+            await ws.send_str(text if self.plain else encode(text))
+            if self.drop_after and time.monotonic() - opened > self.drop_after:
+                await ws.close()
+                return
+            await asyncio.sleep(1 / self.rate)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--rate", type=float, default=20.0, help="Strikes per second")
+    parser.add_argument("--storm", default="", help="lat,lon where a share of strikes is concentrated")
+    parser.add_argument("--storm-share", type=float, default=0.2, help="Fraction of strikes near --storm")
+    parser.add_argument("--drop-after", type=float, default=0, help="Close connections after this many seconds")
+    parser.add_argument("--plain", action="store_true", help="Send uncompressed JSON")
+    args = parser.parse_args(argv)
+    storm = tuple(float(v) for v in args.storm.split(",")) if args.storm else None
+    standin = BlitzortungStandin(args.rate, storm, args.storm_share, args.drop_after, args.plain)
+    web.run_app(standin.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
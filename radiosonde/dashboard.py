@@ -4,6 +4,8 @@ import wtforms
 from redbot.core import commands
 import datetime
 
+from .snapshot import DEFAULT_MAX_AGE
+
 
 def dashboard_page(*args, **kwargs):
     """Decorator for dashboard pages."""
@@ -31,15 +33,16 @@ class DashboardIntegration:
             return {"status": 0, "web_content": {"source": "<p>Radiosonde cog not loaded.</p>"}}
 
         try:
-            # Fetch latest sondes to show active tracking
-            sondes_data, error = await cog.fetch_sondes()
+            # Latest shared snapshot shows active tracking
+            sondes_data, error = await cog.sondes.get()
             total_sondes = len(sondes_data) if sondes_data else 0
 
             # Count tracked sondes across all guilds
             tracked_total = 0
             guild_count = 0
+            all_guilds = await cog.config.all_guilds()
             for guild in self.bot.guilds:
-                tracked = await cog.config.guild(guild).tracked_sondes()
+                tracked = all_guilds.get(guild.id, {}).get("tracked_sondes")
                 if tracked:
                     tracked_total += len(tracked)
                     guild_count += 1
@@ -108,8 +111,8 @@ class DashboardIntegration:
                     }
                 }
 
-            sondes_data, error = await cog.fetch_sondes()
-            if error or not sondes_data:
+            error = await cog._current_sondes(tracked, DEFAULT_MAX_AGE)
+            if error:
                 return {
                     "status": 1,
                     "web_content": {
@@ -123,7 +126,7 @@ class DashboardIntegration:
             sondes_html += '<div style="margin-top: 20px;">'
 
             for sonde_id in tracked:
-                sonde = sondes_data.get(sonde_id)
+                sonde = cog._latest_sonde(sonde_id)
                 if not sonde:
                     sondes_html += f'''
                     <div style="background-color: #2b2e34; padding: 15px; border-radius: 8px; border: 1px solid #3a3d41; margin-bottom: 15px;">
@@ -239,6 +242,7 @@ class DashboardIntegration:
                 else:
                     await config.update_channel.set(channel_val)
                     await config.update_interval.set(interval_val)
+                    await cog._reschedule(guild)
 
                     if channel_val:
                         channel = guild.get_channel(channel_val)
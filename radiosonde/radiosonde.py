@@ -3,10 +3,26 @@ import discord
 from redbot.core import commands, Config, checks
 import aiohttp
 import asyncio
+import heapq
+from datetime import datetime, timezone
 from .dashboard import DashboardIntegration
+from .snapshot import DEFAULT_MAX_AGE, SondeSnapshot
+from .realtime import STALE_FRAME, SondeStream
+from .sites import SiteDirectory
+from .telemetry import TelemetryStore
 
 __version__ = "1.0.3"
 
+SONDEHUB_API = "https://api.v2.sondehub.org"
+
+# Delay before retrying guilds whose update failed because /sondes could not be fetched
+RETRY_DELAY = 60
+
+# Live board: sondes per board message, and how far a sonde must move before its message is edited
+BOARD_PAGE_SIZE = 10
+BOARD_MIN_MOVE = 0.005  # degrees of latitude or longitude, roughly 500 m
+BOARD_MIN_CLIMB = 100  # metres
+
 class Radiosonde(DashboardIntegration, commands.Cog):
     """Track radiosondes using the SondeHub API."""
 
@@ -20,22 +36,50 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         self.config.register_guild(
             tracked_sondes=[],
             update_channel=None,
-            update_interval=300  # default 5 minutes
+            update_interval=300,  # default 5 minutes
+            live_board=False,  # edit one combined status message in place instead of posting updates
+            board_channel=None,
+            board_messages=[]  # ids of the board's messages in board_channel, one per page
         )
+        self.config.register_global(
+            realtime_stream=False  # stream tracked sondes over MQTT instead of polling /sondes
+        )
+        # Overridable so a local stand-in (see standin.py) can replace SondeHub
+        self.api_base = SONDEHUB_API
 
         self.session = aiohttp.ClientSession()
-        self.bg_task = self.bot.loop.create_task(self.update_sondes())
+        # One shared /sondes download serves every guild, command and dashboard page
+        self.sondes = SondeSnapshot(self.fetch_sondes)
+        # Optional live frames for tracked serials; polling covers anything it has not delivered
+        self.sonde_stream = SondeStream(self.session, self.fetch_realtime_endpoint)
+        # Downloaded flight histories, extended with only the newer frames on later views
+        self.telemetry = TelemetryStore(self.fetch_telemetry, self.fetch_telemetry_window)
+        # Launch sites, downloaded daily and indexed for name search and nearest-site queries
+        self.sites = SiteDirectory(self.fetch_sites)
         # track last update times per guild to respect configured intervals
         self._last_updates = {}
+        # Update scheduler: heap of (due_time, guild_id); _due holds each guild's current
+        # entry, so entries replaced by a reschedule are skipped when they reach the top.
+        self._schedule = []
+        self._due = {}
+        self._guild_settings = {}  # guild_id -> (tracked, channel_id, interval, live_board)
+        self._boards = {}  # guild_id -> (channel_id, message ids) of the live board
+        self._board_shown = {}  # guild_id -> [(serials, [(lat, lon, alt), ...]) last shown per page]
+        self._schedule_changed = asyncio.Event()
+        self.bg_task = self.bot.loop.create_task(self.update_sondes())
 
     def cog_unload(self):
         self.bg_task.cancel()
-        asyncio.create_task(self.session.close())
+        asyncio.create_task(self._close())
+
+    async def _close(self):
+        await self.sonde_stream.stop()
+        await self.session.close()
 
     async def fetch_sondes(self):
         """Fetch latest sonde data. Returns (data_dict, error_message). 
         data_dict is a dictionary keyed by serial number. error_message is None on success."""
-        url = "https://api.v2.sondehub.org/sondes"
+        url = f"{self.api_base}/sondes"
         try:
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
                 if resp.status != 200:
@@ -55,7 +99,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
     async def fetch_sites(self):
         """Fetch launch sites data. Returns (data_dict, error_message).
         data_dict is keyed by station ID. error_message is None on success."""
-        url = "https://api.v2.sondehub.org/sites"
+        url = f"{self.api_base}/sites"
         try:
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
                 if resp.status != 200:
@@ -74,7 +118,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
     async def fetch_telemetry(self, serial: str):
         """Fetch telemetry history for a given sonde serial. Returns (data, error)."""
         # Individual sonde telemetry is served at /sonde/{serial} (singular)
-        url = f"https://api.v2.sondehub.org/sonde/{serial}"
+        url = f"{self.api_base}/sonde/{serial}"
         try:
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
                 if resp.status != 200:
@@ -92,10 +136,30 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         except OSError as e:
             return None, f"Network/OS error: {type(e).__name__}: {e}"
 
+    async def fetch_telemetry_window(self, serial: str, duration: str):
+        """Fetch a serial's telemetry for the last `duration` (e.g. `1h`) from /sondes/telemetry.
+        Returns (data, error); data is keyed by serial, then by frame datetime."""
+        url = f"{self.api_base}/sondes/telemetry"
+        params = {"serial": serial, "duration": duration}
+        try:
+            async with self.session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=15)) as resp:
+                if resp.status != 200:
+                    return None, f"API returned HTTP {resp.status}"
+                data = await resp.json()
+                return data, None
+        except asyncio.TimeoutError:
+            return None, "Request timed out after 15 seconds"
+        except aiohttp.ClientConnectorError as e:
+            return None, f"Connection failed: {e.os_error.strerror if e.os_error else str(e)}"
+        except aiohttp.ClientError as e:
+            return None, f"Request error: {type(e).__name__}: {e}"
+        except OSError as e:
+            return None, f"Network/OS error: {type(e).__name__}: {e}"
+
     async def fetch_sondes_near(self, lat: float, lon: float, distance: float = 100.0):
         """Query sondes by location. `distance` is passed directly to API (units used by API).
         Returns (data_dict, error)."""
-        url = f"https://api.v2.sondehub.org/sondes?lat={lat}&lon={lon}&distance={distance}"
+        url = f"{self.api_base}/sondes?lat={lat}&lon={lon}&distance={distance}"
         try:
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
                 if resp.status != 200:
@@ -113,7 +177,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
 
     async def fetch_realtime_endpoint(self):
         """Return the MQTT-over-WebSocket endpoint from /sondes/websocket."""
-        url = "https://api.v2.sondehub.org/sondes/websocket"
+        url = f"{self.api_base}/sondes/websocket"
         try:
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                 if resp.status != 200:
@@ -125,7 +189,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
 
     async def fetch_listeners_stats(self):
         """Fetch aggregated listener/uploader statistics from /listeners/stats."""
-        url = "https://api.v2.sondehub.org/listeners/stats"
+        url = f"{self.api_base}/listeners/stats"
         try:
             async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
                 if resp.status != 200:
@@ -141,24 +205,132 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         except OSError as e:
             return {}, f"Network/OS error: {type(e).__name__}: {e}"
 
+    def _schedule_guild(self, guild_id: int, guild_config: dict):
+        """(Re)compute a guild's next update time from its settings and last update."""
+        tracked = guild_config.get("tracked_sondes", [])
+        channel_id = guild_config.get("update_channel")
+        interval = guild_config.get("update_interval", 300)
+        live_board = guild_config.get("live_board", False)
+        # Board message ids are only written by _update_board and _clear_board after startup
+        self._boards.setdefault(guild_id, (guild_config.get("board_channel"), list(guild_config.get("board_messages", []))))
+        if not tracked or not channel_id:
+            self._guild_settings.pop(guild_id, None)
+            self._due.pop(guild_id, None)
+        else:
+            self._guild_settings[guild_id] = (tracked, channel_id, interval, live_board)
+            self._push_due(guild_id, self._last_updates.get(guild_id, 0) + interval)
+        self.sonde_stream.set_serials({serial for tracked, *_ in self._guild_settings.values() for serial in tracked})
+        self._schedule_changed.set()
+
+    def _push_due(self, guild_id: int, due: float):
+        self._due[guild_id] = due
+        heapq.heappush(self._schedule, (due, guild_id))
+
+    async def _reschedule(self, guild: discord.Guild):
+        """Call after changing a guild's tracked sondes, channel, interval or board mode."""
+        guild_config = await self.config.guild(guild).all()
+        self._schedule_guild(guild.id, guild_config)
+        await self._retire_board(guild.id, guild_config)
+
+    async def _retire_board(self, guild_id: int, guild_config: dict):
+        """Delete the guild's board pages if the board is off, has nothing to show or moved channel.
+
+        A guild with no tracked sondes drops out of the schedule, so _update_board never
+        gets to remove its pages itself.
+        """
+        board_channel, message_ids = self._boards.get(guild_id, (None, []))
+        if not message_ids:
+            return
+        if (
+            guild_config.get("tracked_sondes") and guild_config.get("live_board", False)
+            and board_channel == guild_config.get("update_channel")
+        ):
+            return
+        await self._clear_board(guild_id)
+
+    async def _clear_board(self, guild_id: int):
+        """Delete every stored board page for the guild and forget their ids."""
+        board_channel, message_ids = self._boards.pop(guild_id, (None, []))
+        self._board_shown.pop(guild_id, None)
+        channel = self.bot.get_channel(board_channel) if board_channel else None
+        if channel is not None:
+            for message_id in message_ids:
+                try:
+                    await channel.get_partial_message(message_id).delete()
+                except discord.HTTPException:
+                    pass
+        guild_conf = self.config.guild_from_id(guild_id)
+        await guild_conf.board_channel.set(None)
+        await guild_conf.board_messages.set([])
+
+    def _pop_due(self, now: float) -> list:
+        """Remove and return the ids of guilds due at `now`, dropping superseded heap entries."""
+        due = []
+        while self._schedule:
+            when, guild_id = self._schedule[0]
+            if self._due.get(guild_id) != when:
+                heapq.heappop(self._schedule)
+                continue
+            if when > now:
+                break
+            heapq.heappop(self._schedule)
+            del self._due[guild_id]
+            due.append(guild_id)
+        return due
+
+    def _latest_sonde(self, serial: str):
+        """The newer of the stream's last frame and the polled snapshot entry for `serial`."""
+        frame = self.sonde_stream.frame(serial)
+        snapshot_age = self.sondes.age
+        if frame is not None and (snapshot_age is None or frame[0] < snapshot_age):
+            return frame[1]
+        return self.sondes.sonde(serial)
+
+    async def _current_sondes(self, serials, max_age: float):
+        """Make sure `serials` can be answered: (None, error) only if polling was needed and failed.
+
+        Serials the connected stream delivered recently need no /sondes download at all; one
+        that went quiet (stopped transmitting or landed) falls back to the polled snapshot.
+        """
+        fresh_for = min(max_age, STALE_FRAME)
+        if all(self.sonde_stream.covers(serial, fresh_for) for serial in serials):
+            return None
+        _, error = await self.sondes.get(max_age)
+        return error
+
     async def update_sondes(self):
         await self.bot.wait_until_ready()
+        for guild_id, guild_config in (await self.config.all_guilds()).items():
+            self._schedule_guild(guild_id, guild_config)
+            await self._retire_board(guild_id, guild_config)
+        if await self.config.realtime_stream():
+            self.sonde_stream.start()
         while not self.bot.is_closed():
             now = self.bot.loop.time()
-            for guild in self.bot.guilds:
-                guild_config = await self.config.guild(guild).all()
-                tracked = guild_config.get("tracked_sondes", [])
-                channel_id = guild_config.get("update_channel")
-                interval = guild_config.get("update_interval", 300)
-
-                if not tracked or not channel_id:
-                    continue
+            due_ids = self._pop_due(now)
+            if not due_ids:
+                # Sleep until the next guild is due, or until a command changes the schedule
+                self._schedule_changed.clear()
+                timeout = self._schedule[0][0] - now if self._schedule else None
+                try:
+                    await asyncio.wait_for(self._schedule_changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
 
-                last = self._last_updates.get(guild.id, 0)
-                if now - last < interval:
+            due = []
+            for guild_id in due_ids:
+                settings = self._guild_settings.get(guild_id)
+                if settings is None or self.bot.get_guild(guild_id) is None:
                     continue
-
-                sondes_data, error = await self.fetch_sondes()
+                due.append((guild_id, *settings))
+            if not due:
+                continue
+            # Due guilds share one snapshot, refreshed at most once per shortest interval
+            # (skipped entirely when the stream has frames for every due serial)
+            serials = {serial for _, tracked, *_ in due for serial in tracked}
+            error = await self._current_sondes(serials, min(interval for _, _, _, interval, _ in due))
+            for guild_id, tracked, channel_id, interval, live_board in due:
                 channel = self.bot.get_channel(channel_id)
                 if error:
                     # Inform channel of failures optionally (only once)
@@ -167,12 +339,22 @@ class Radiosonde(DashboardIntegration, commands.Cog):
                             await channel.send(f"Could not fetch sondes for updates: {error}")
                     except Exception:
                         pass
+                    self._push_due(guild_id, now + min(RETRY_DELAY, interval))
                     continue
+                self._last_updates[guild_id] = now
+                self._push_due(guild_id, now + interval)
                 if not channel:
                     continue
 
+                if live_board:
+                    try:
+                        await self._update_board(guild_id, channel, tracked)
+                    except discord.HTTPException:
+                        pass  # Retried at the next interval
+                    continue
+
                 for sonde_id in tracked:
-                    sonde = sondes_data.get(sonde_id)
+                    sonde = self._latest_sonde(sonde_id)
                     if not sonde:
                         e = discord.Embed(title=f"{sonde_id}", description="No current data (not in latest API)", colour=0xDD5555)
                         await channel.send(embed=e)
@@ -180,9 +362,98 @@ class Radiosonde(DashboardIntegration, commands.Cog):
                     embed = self._sonde_to_embed(sonde_id, sonde)
                     await channel.send(embed=embed)
 
-                self._last_updates[guild.id] = now
                 await asyncio.sleep(1)  # small delay between guilds
-            await asyncio.sleep(5)  # short polling delay
+
+    @staticmethod
+    def _board_values(sonde):
+        """(lat, lon, alt) as compared between board edits, or None for a sonde without data."""
+        if not sonde:
+            return None
+        return tuple(v if isinstance(v, (int, float)) else None for v in (sonde.get("lat"), sonde.get("lon"), sonde.get("alt")))
+
+    @staticmethod
+    def _board_moved(old, new) -> bool:
+        """Whether a sonde changed enough since it was last shown to be worth an edit."""
+        if old is None or new is None:
+            return old != new
+        for before, after, threshold in zip(old, new, (BOARD_MIN_MOVE, BOARD_MIN_MOVE, BOARD_MIN_CLIMB)):
+            if (before is None) != (after is None):
+                return True
+            if before is not None and abs(after - before) >= threshold:
+                return True
+        return False
+
+    def _board_embed(self, serials, page: int, pages: int) -> discord.Embed:
+        """One page of the live board: a field per sonde."""
+        title = "Tracked sondes" if pages == 1 else f"Tracked sondes ({page + 1}/{pages})"
+        e = discord.Embed(title=title, colour=0x55AAFF, timestamp=discord.utils.utcnow())
+        for serial in serials:
+            sonde = self._latest_sonde(serial)
+            if not sonde:
+                e.add_field(name=serial, value="No current data (not in latest API)", inline=False)
+                continue
+            value = self._sonde_summary(sonde)
+            last = sonde.get("last_seen") or sonde.get("datetime") or sonde.get("time")
+            if last:
+                value += f"\nLast seen: {last}"
+            e.add_field(name=serial, value=value, inline=False)
+        e.set_footer(text="Edited in place when a sonde moves; last edited")
+        return e
+
+    async def _update_board(self, guild_id: int, channel, tracked):
+        """Bring the guild's live board up to date, editing only pages whose sondes changed.
+
+        Board messages are reused across restarts through their stored ids; a page whose
+        message was deleted is posted again, and pages no longer needed are deleted.
+        """
+        board_channel, message_ids = self._boards.get(guild_id, (None, []))
+        shown = self._board_shown.get(guild_id, [])
+        if board_channel != channel.id:
+            # Update channel changed: remove the old pages and start a new board there
+            if message_ids:
+                await self._clear_board(guild_id)
+            board_channel, message_ids, shown = None, [], []
+
+        pages = [tracked[i:i + BOARD_PAGE_SIZE] for i in range(0, len(tracked), BOARD_PAGE_SIZE)]
+        new_ids, new_shown = [], []
+        try:
+            for index, serials in enumerate(pages):
+                values = [self._board_values(self._latest_sonde(serial)) for serial in serials]
+                message_id = message_ids[index] if index < len(message_ids) else None
+                previous = shown[index] if index < len(shown) else None
+                if (
+                    message_id is not None and previous is not None and previous[0] == serials
+                    and not any(map(self._board_moved, previous[1], values))
+                ):
+                    new_ids.append(message_id)
+                    new_shown.append(previous)
+                    continue
+                embed = self._board_embed(serials, index, len(pages))
+                message = None
+                if message_id is not None:
+                    try:
+                        message = await channel.get_partial_message(message_id).edit(embed=embed)
+                    except discord.NotFound:
+                        message = None
+                if message is None:
+                    message = await channel.send(embed=embed)
+                new_ids.append(message.id)
+                new_shown.append((serials, values))
+
+            for message_id in message_ids[len(pages):]:
+                try:
+                    await channel.get_partial_message(message_id).delete()
+                except discord.HTTPException:
+                    pass
+        finally:
+            # Keep ids of pages not reached so a failed edit is retried rather than reposted
+            new_ids += message_ids[len(new_ids):len(pages)]
+            self._board_shown[guild_id] = new_shown
+            if (board_channel, message_ids) != (channel.id, new_ids):
+                self._boards[guild_id] = (channel.id, new_ids)
+                guild_conf = self.config.guild_from_id(guild_id)
+                await guild_conf.board_channel.set(channel.id)
+                await guild_conf.board_messages.set(new_ids)
 
     def _format_sonde_message(self, sonde_id: str, sonde: dict) -> str:
         """Create a safe, readable message for a single sonde dict."""
@@ -232,6 +503,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
             return
         tracked.append(sonde_id)
         await self.config.guild(ctx.guild).tracked_sondes.set(tracked)
+        await self._reschedule(ctx.guild)
         await ctx.send(f"Now tracking sonde {sonde_id}.")
 
     @sonde.command()
@@ -243,6 +515,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
             return
         tracked.remove(sonde_id)
         await self.config.guild(ctx.guild).tracked_sondes.set(tracked)
+        await self._reschedule(ctx.guild)
         await ctx.send(f"Stopped tracking sonde {sonde_id}.")
 
     @sonde.command()
@@ -259,6 +532,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         """Show current guild settings."""
         update_channel_id = await self.config.guild(ctx.guild).update_channel()
         update_interval = await self.config.guild(ctx.guild).update_interval()
+        live_board = await self.config.guild(ctx.guild).live_board()
 
         channel_name = "Not set"
         if update_channel_id:
@@ -280,6 +554,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         e.add_field(name="Update Channel", value=channel_name, inline=False)
         e.add_field(name="Update Interval", value=format_interval(update_interval), inline=True)
         e.add_field(name="Interval (seconds)", value=str(update_interval), inline=True)
+        e.add_field(name="Live board", value="On" if live_board else "Off", inline=True)
         await ctx.send(embed=e)
 
     @sonde.command()
@@ -290,16 +565,15 @@ class Radiosonde(DashboardIntegration, commands.Cog):
             await ctx.send("No sondes are being tracked in this server.")
             return
         async with ctx.typing():
-            sondes_data, error = await self.fetch_sondes()
-        if error or not sondes_data:
-            detail = f" {error}" if error else ""
+            error = await self._current_sondes(tracked, DEFAULT_MAX_AGE)
+        if error:
             await ctx.send(
-                f"Could not fetch sonde data from the API.{detail} Try again later."
+                f"Could not fetch sonde data from the API. {error} Try again later."
             )
             return
         embeds = []
         for sonde_id in tracked:
-            s = sondes_data.get(sonde_id)
+            s = self._latest_sonde(sonde_id)
             if s is None:
                 e = discord.Embed(title=f"{sonde_id}", description="No current data (not in latest API)", colour=0xDD5555)
                 embeds.append(e)
@@ -317,8 +591,8 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         if batch:
             await ctx.send(embeds=batch)
 
-    def _sonde_to_embed(self, sonde_id: str, sonde: dict) -> discord.Embed:
-        """Build a Discord embed summarizing a sonde's current data."""
+    def _sonde_summary(self, sonde: dict) -> str:
+        """Position, altitude and speed lines shared by sonde embeds and the live board."""
         def fmt_num(v, prec=5):
             return f"{v:.{prec}f}" if isinstance(v, (int, float)) else (str(v) if v is not None else "—")
 
@@ -336,7 +610,10 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         else:
             speed = None
         speed_str = f"{speed:.1f} m/s" if speed is not None else "—"
+        return f"Lat: {lat} | Lon: {lon}\nAlt: {alt_str} | Speed: {speed_str}"
 
+    def _sonde_to_embed(self, sonde_id: str, sonde: dict) -> discord.Embed:
+        """Build a Discord embed summarizing a sonde's current data."""
         heading = sonde.get("heading")
         sats = sonde.get("sats")
         temp = sonde.get("temp")
@@ -344,8 +621,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         uploader = sonde.get("uploader_callsign") or sonde.get("uploader")
 
         title = f"Sonde {sonde_id}"
-        desc = f"Lat: {lat} | Lon: {lon}\nAlt: {alt_str} | Speed: {speed_str}"
-        e = discord.Embed(title=title, description=desc, colour=0x55AAFF)
+        e = discord.Embed(title=title, description=self._sonde_summary(sonde), colour=0x55AAFF)
         e.add_field(name="Heading", value=str(heading) if heading is not None else "—", inline=True)
         e.add_field(name="Sats", value=str(sats) if sats is not None else "—", inline=True)
         e.add_field(name="Temp (°C)", value=str(temp) if temp is not None else "—", inline=True)
@@ -361,6 +637,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
     async def setchannel(self, ctx, channel: discord.TextChannel):
         """Set the channel for sonde updates."""
         await self.config.guild(ctx.guild).update_channel.set(channel.id)
+        await self._reschedule(ctx.guild)
         await ctx.send(f"Sonde updates will be sent to {channel.mention}.")
 
     @sonde.command()
@@ -370,8 +647,24 @@ class Radiosonde(DashboardIntegration, commands.Cog):
             await ctx.send("Interval must be at least 30 seconds.")
             return
         await self.config.guild(ctx.guild).update_interval.set(seconds)
+        await self._reschedule(ctx.guild)
         await ctx.send(f"Update interval set to {seconds} seconds.")
 
+    @sonde.command()
+    async def board(self, ctx, enabled: bool = None):
+        """Show or toggle the live board: one status message edited in place instead of new update posts."""
+        if enabled is not None:
+            await self.config.guild(ctx.guild).live_board.set(enabled)
+            await self._reschedule(ctx.guild)
+        enabled = await self.config.guild(ctx.guild).live_board()
+        if enabled:
+            await ctx.send(
+                "Live board is on: tracked sondes are shown in one message in the update channel, "
+                "edited when a sonde moves instead of posting new updates."
+            )
+        else:
+            await ctx.send("Live board is off: each update posts a new message per tracked sonde.")
+
     def _format_site_message(self, site_id: str, site: dict) -> str:
         """Build the display message for a single site."""
         name = site.get("station_name", "—")
@@ -407,25 +700,20 @@ class Radiosonde(DashboardIntegration, commands.Cog):
     async def site(self, ctx, query: str):
         """Look up a radiosonde launch site by station ID or by name (e.g. 10238, Bergen-Hohne)."""
         async with ctx.typing():
-            sites_data, error = await self.fetch_sites()
-        if error or not sites_data:
+            index, error = await self.sites.get()
+        if error or not index:
             detail = f" {error}" if error else ""
             await ctx.send(
                 f"Could not fetch sites from the API.{detail} Try again later."
             )
             return
         # Try exact match by station ID first
-        site = sites_data.get(query)
+        site = index.sites.get(query)
         if site is not None:
             await ctx.send(embed=self._site_to_embed(query, site))
             return
-        # Search by station name (case-insensitive, substring)
-        query_lower = query.lower()
-        matches = [
-            (sid, s)
-            for sid, s in sites_data.items()
-            if query_lower in (s.get("station_name") or "").lower()
-        ]
+        # Search station names and IDs by word prefix, then by substring
+        matches = [(sid, index.sites[sid]) for sid in index.search(query)]
         if not matches:
             await ctx.send(f"No site found for `{query}` (try station ID or part of the site name).")
             return
@@ -435,7 +723,7 @@ class Radiosonde(DashboardIntegration, commands.Cog):
             return
         # Multiple matches: list them (up to 15)
         desc_lines = [f"Multiple sites matching \"{query}\" — use station ID for one:"]
-        for sid, s in sorted(matches, key=lambda x: (x[1].get("station_name") or ""))[:15]:
+        for sid, s in matches[:15]:
             name = s.get("station_name", "—")
             desc_lines.append(f"`{sid}` — {name}")
         if len(matches) > 15:
@@ -447,40 +735,66 @@ class Radiosonde(DashboardIntegration, commands.Cog):
     async def history(self, ctx, serial: str, limit: int = 25):
         """Show recent telemetry history for a radiosonde serial."""
         async with ctx.typing():
-            data, error = await self.fetch_telemetry(serial)
+            series, error = await self.telemetry.get(serial)
         if error:
             await ctx.send(
                 f"Could not fetch telemetry for `{serial}`: {error}. Check the serial number or try again later."
             )
             return
-        if not data:
-            await ctx.send(f"No telemetry found for `{serial}`. It may be expired or never uploaded.")
-            return
-        # Try to find telemetry list in response
-        telemetry = None
-        if isinstance(data, dict):
-            telemetry = data.get("telemetry") or data.get("history") or data.get("data")
-        if telemetry is None and isinstance(data, list):
-            telemetry = data
-        if not telemetry:
-            await ctx.send(f"No telemetry history found for `{serial}`.")
+        if not series:
+            await ctx.send(f"No telemetry history found for `{serial}`. It may be expired or never uploaded.")
             return
         # Take last `limit` points
-        points = telemetry[-limit:]
+        first = max(len(series) - max(limit, 1), 0)
         desc_lines = []
-        for p in reversed(points):
-            t = p.get("time") or p.get("timestamp") or p.get("ts") or "—"
-            lat = p.get("lat") if p.get("lat") is not None else "—"
-            lon = p.get("lon") if p.get("lon") is not None else "—"
-            alt = p.get("alt")
-            alt_str = f"{alt:.1f} m" if isinstance(alt, (int, float)) else (str(alt) if alt is not None else "—")
-            desc_lines.append(f"{t} — Lat: {lat} | Lon: {lon} | Alt: {alt_str}")
+        for index in reversed(range(first, len(series))):
+            desc_lines.append(self._format_telemetry_row(*series.row(index)))
         desc = "\n".join(desc_lines)
         if len(desc) > 3500:
             desc = desc[:3490] + "\n…output truncated…"
-        e = discord.Embed(title=f"Telemetry for {serial} (last {len(points)})", description=desc, colour=0x55AAFF)
+        e = discord.Embed(title=f"Telemetry for {serial} (last {len(series) - first})", description=desc, colour=0x55AAFF)
+        await ctx.send(embed=e)
+
+    @sonde.command()
+    async def flight(self, ctx, serial: str, points: int = 20):
+        """Summarise a whole flight with a downsampled altitude profile."""
+        points = min(max(points, 3), 40)
+        async with ctx.typing():
+            series, error = await self.telemetry.get(serial)
+        if error:
+            await ctx.send(
+                f"Could not fetch telemetry for `{serial}`: {error}. Check the serial number or try again later."
+            )
+            return
+        if not series:
+            await ctx.send(f"No telemetry history found for `{serial}`. It may be expired or never uploaded.")
+            return
+        indices = series.downsample(points)
+        if not indices:
+            await ctx.send(f"No altitude data found for `{serial}`.")
+            return
+        peak = max(indices, key=lambda i: series.alts[i])
+        duration = series.times[-1] - series.times[0]
+        e = discord.Embed(
+            title=f"Flight profile for {serial}",
+            description="\n".join(self._format_telemetry_row(*series.row(i)) for i in indices),
+            colour=0x55AAFF,
+        )
+        e.add_field(name="Frames", value=str(len(series)), inline=True)
+        e.add_field(name="Duration", value=f"{int(duration // 3600)}h {int(duration % 3600 // 60)}m", inline=True)
+        e.add_field(name="Max altitude", value=f"{series.alts[peak]:.0f} m", inline=True)
+        e.set_footer(text=f"{len(indices)} points chosen to keep the shape of the altitude profile")
         await ctx.send(embed=e)
 
+    @staticmethod
+    def _format_telemetry_row(t: float, lat: float, lon: float, alt: float) -> str:
+        """One history line; NaN marks a value the frame did not include."""
+        when = datetime.fromtimestamp(t, timezone.utc).strftime("%Y-%m-%d %H:%M:%SZ")
+        lat_str = f"{lat:.5f}" if lat == lat else "—"
+        lon_str = f"{lon:.5f}" if lon == lon else "—"
+        alt_str = f"{alt:.1f} m" if alt == alt else "—"
+        return f"{when} — Lat: {lat_str} | Lon: {lon_str} | Alt: {alt_str}"
+
     @sonde.command()
     async def nearby(self, ctx, lat: float, lon: float, distance: float = 100.0):
         """List sondes near a given lat/lon within `distance` (API units)."""
@@ -503,8 +817,43 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         if len(data) > 25:
             desc_lines.append(f"… and {len(data) - 25} more.")
         e = discord.Embed(title="Nearby sondes", description="\n".join(desc_lines), colour=0x55AAFF)
+        index, _ = await self.sites.get()
+        if index:
+            nearest = index.near(lat, lon, 3)
+            if nearest:
+                e.add_field(name="Nearest launch sites", value=self._format_site_distances(index, nearest), inline=False)
         await ctx.send(embed=e)
 
+    @sonde.command()
+    async def nearsites(self, ctx, lat: float, lon: float, count: int = 5):
+        """List the launch sites nearest to a given lat/lon."""
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            await ctx.send("Latitude must be between -90 and 90 and longitude between -180 and 180.")
+            return
+        count = min(max(count, 1), 15)
+        async with ctx.typing():
+            index, error = await self.sites.get()
+        if error or not index:
+            detail = f" {error}" if error else ""
+            await ctx.send(f"Could not fetch sites from the API.{detail} Try again later.")
+            return
+        nearest = index.near(lat, lon, count)
+        if not nearest:
+            await ctx.send("No launch sites with a known position were found.")
+            return
+        e = discord.Embed(
+            title=f"Launch sites nearest to {lat},{lon}",
+            description=self._format_site_distances(index, nearest),
+            colour=0x55AAFF,
+        )
+        await ctx.send(embed=e)
+
+    @staticmethod
+    def _format_site_distances(index, nearest) -> str:
+        return "\n".join(
+            f"`{sid}` — {index.sites[sid].get('station_name', '—')} ({distance:.0f} km)" for distance, sid in nearest
+        )
+
     @sonde.command()
     async def realtime(self, ctx):
         """Show the MQTT-over-WebSocket endpoint used for realtime sonde streaming."""
@@ -526,6 +875,33 @@ class Radiosonde(DashboardIntegration, commands.Cog):
         e = discord.Embed(title="Realtime MQTT-over-WebSocket endpoint", description=url, colour=0x55AAFF)
         await ctx.send(embed=e)
 
+    @sonde.command()
+    @checks.is_owner()
+    async def stream(self, ctx, enabled: bool = None):
+        """Show or toggle realtime streaming of tracked sondes (falls back to polling when disconnected)."""
+        if enabled is not None:
+            await self.config.realtime_stream.set(enabled)
+            if enabled:
+                self.sonde_stream.start()
+            else:
+                await self.sonde_stream.stop()
+        enabled = await self.config.realtime_stream()
+        if not enabled:
+            status = "Off (polling `/sondes`)"
+        elif self.sonde_stream.connected:
+            status = "Connected"
+        else:
+            status = "Disconnected, polling until it reconnects"
+        e = discord.Embed(title="Realtime sonde stream", description=status, colour=0x55AAFF if self.sonde_stream.connected else 0xDD5555)
+        if enabled:
+            e.add_field(name="Subscribed serials", value=str(self.sonde_stream.subscription_count), inline=True)
+            e.add_field(name="Frames received", value=str(self.sonde_stream.frames_received), inline=True)
+            if self.sonde_stream.connected_since:
+                e.add_field(name="Connected since", value=f"<t:{int(self.sonde_stream.connected_since)}:R>", inline=True)
+            if self.sonde_stream.last_error:
+                e.add_field(name="Last error", value=self.sonde_stream.last_error[:1000], inline=False)
+        await ctx.send(embed=e)
+
     @sonde.command()
     async def listeners(self, ctx):
         """Show aggregated listener/uploader statistics from SondeHub."""
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import logging
+import struct
+import time
+import uuid
+
+import aiohttp
+
+
+log = logging.getLogger("red.radiosonde.realtime")
+
+KEEPALIVE = 60  # seconds; a PINGREQ is sent every KEEPALIVE / 2
+MAX_SUBSCRIPTIONS = 50  # SondeHub's broker (AWS IoT) allows 50 topics per connection
+RECONNECT_MIN = 5
+RECONNECT_MAX = 300
+TOPIC_PREFIX = "sondes/"
+STALE_FRAME = 60  # seconds; sondes transmit every second, so a silent serial has stopped or landed
+
+# MQTT 3.1.1 control packet types (high nibble of the first byte)
+CONNECT, CONNACK, PUBLISH, SUBSCRIBE, SUBACK = 1, 2, 3, 8, 9
+UNSUBSCRIBE, UNSUBACK, PINGREQ, PINGRESP, DISCONNECT = 10, 11, 12, 13, 14
+
+
+def _string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return struct.pack("!H", len(data)) + data
+
+
+def _packet(packet_type: int, flags: int, body: bytes) -> bytes:
+    """Fixed header (type, flags, variable-length remaining length) followed by `body`."""
+    header = bytearray([(packet_type << 4) | flags])
+    length = len(body)
+    while True:
+        byte = length % 128
+        length //= 128
+        header.append(byte | 0x80 if length else byte)
+        if not length:
+            return bytes(header) + body
+
+
+def _read_packet(buffer: bytearray):
+    """Split one complete packet off the front of `buffer`: (type, flags, body) or None if incomplete."""
+    multiplier, length, index = 1, 0, 1
+    while True:
+        if index >= len(buffer):
+            return None
+        byte = buffer[index]
+        length += (byte & 0x7F) * multiplier
+        multiplier *= 128
+        index += 1
+        if not byte & 0x80:
+            break
+        if index > 4:
+            raise ValueError("Malformed MQTT remaining length")
+    if len(buffer) < index + length:
+        return None
+    first = buffer[0]
+    body = bytes(buffer[index:index + length])
+    del buffer[:index + length]
+    return first >> 4, first & 0x0F, body
+
+
+def _parse_publish(flags: int, body: bytes):
+    """(topic, payload) from a PUBLISH body."""
+    (topic_length,) = struct.unpack_from("!H", body)
+    topic = body[2:2 + topic_length].decode("utf-8", "replace")
+    offset = 2 + topic_length
+    if (flags >> 1) & 0x03:  # QoS 1/2 carry a packet id
+        offset += 2
+    return topic, body[offset:]
+
+
+class SondeStream:
+    """Latest telemetry frame per tracked serial from SondeHub's MQTT-over-WebSocket feed.
+
+    Implements the small part of MQTT 3.1.1 needed to subscribe at QoS 0 (CONNECT, SUBSCRIBE,
+    UNSUBSCRIBE, PUBLISH, PINGREQ) on top of aiohttp's WebSocket client, so streaming needs no
+    extra dependency. `connected` is False while disconnected; callers fall back to polling.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, fetch_endpoint):
+        self.session = session
+        self._fetch_endpoint = fetch_endpoint  # coroutine function returning (data, error)
+        self._wanted = set()
+        self._subscribed = set()
+        self._frames = {}  # upper-case serial -> (monotonic receive time, frame dict)
+        self._ws = None
+        self._packet_id = 0
+        self._task = None
+        self._sync_task = None  # Subscription update scheduled by set_serials
+        self.connected = False
+        self.connected_since = None
+        self.last_error = None
+        self.frames_received = 0
+
+    # ------------------------------------------------------------------ control
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in (self._sync_task, self._task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._sync_task = None
+        self.connected = False
+
+    def set_serials(self, serials):
+        """Subscribe to exactly these serials (up to MAX_SUBSCRIPTIONS)."""
+        self._wanted = set(sorted(serials)[:MAX_SUBSCRIPTIONS])
+        wanted_upper = {serial.upper() for serial in self._wanted}
+        for serial in list(self._frames):
+            if serial not in wanted_upper:
+                del self._frames[serial]
+        if self.connected and (self._sync_task is None or self._sync_task.done()):
+            self._sync_task = asyncio.create_task(self._resync())
+
+    @property
+    def subscription_count(self) -> int:
+        return len(self._subscribed)
+
+    def covers(self, serial: str, max_age: float = STALE_FRAME) -> bool:
+        """Whether the stream is connected and delivered a frame for `serial` in the last `max_age` seconds."""
+        entry = self._frames.get(serial.upper())
+        return self.connected and entry is not None and time.monotonic() - entry[0] <= max_age
+
+    def frame(self, serial: str):
+        """(age in seconds, frame dict) for `serial`, or None."""
+        entry = self._frames.get(serial.upper())
+        if entry is None:
+            return None
+        return time.monotonic() - entry[0], entry[1]
+
+    # ------------------------------------------------------------------ connection
+
+    async def _run(self):
+        delay = RECONNECT_MIN
+        while True:
+            try:
+                await self._connect_and_read()
+                wait, delay = RECONNECT_MIN, RECONNECT_MIN  # Broker closed a working session
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                log.info(f"SondeHub stream disconnected ({self.last_error}); polling until it reconnects")
+                wait, delay = delay, min(delay * 2, RECONNECT_MAX)
+            finally:
+                self.connected = False
+                self.connected_since = None
+                self._subscribed.clear()
+                if self._ws is not None and not self._ws.closed:
+                    await self._ws.close()
+                self._ws = None
+            await asyncio.sleep(wait)
+
+    async def _endpoint_url(self) -> str:
+        data, error = await self._fetch_endpoint()
+        if error:
+            raise ConnectionError(f"endpoint lookup failed: {error}")
+        if isinstance(data, dict):
+            data = data.get("url") or data.get("endpoint") or data.get("ws")
+        if not isinstance(data, str) or not data.startswith(("ws://", "wss://")):
+            raise ConnectionError("endpoint lookup returned no WebSocket URL")
+        return data
+
+    async def _connect_and_read(self):
+        url = await self._endpoint_url()  # Presigned and short-lived, so fetched per connection
+        self._ws = ws = await self.session.ws_connect(url, protocols=("mqtt",), heartbeat=None)
+        client_id = f"redbot-radiosonde-{uuid.uuid4().hex[:12]}"
+        body = _string("MQTT") + bytes([4, 0x02]) + struct.pack("!H", KEEPALIVE) + _string(client_id)
+        await ws.send_bytes(_packet(CONNECT, 0, body))
+
+        buffer = bytearray()
+        pinger = None
+        try:
+            while True:
+                message = await ws.receive(timeout=KEEPALIVE * 1.5)
+                if message.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.CLOSING):
+                    return
+                if message.type == aiohttp.WSMsgType.ERROR:
+                    raise ConnectionError(str(ws.exception()))
+                if message.type != aiohttp.WSMsgType.BINARY:
+                    continue
+                buffer.extend(message.data)
+                while True:
+                    packet = _read_packet(buffer)
+                    if packet is None:
+                        break
+                    packet_type, flags, body = packet
+                    if packet_type == CONNACK:
+                        if len(body) < 2 or body[1] != 0:
+                            raise ConnectionError(f"broker refused connection (code {body[1] if len(body) > 1 else '?'})")
+                        self.connected = True
+                        self.connected_since = time.time()
+                        self.last_error = None
+                        pinger = asyncio.create_task(self._ping_loop(ws))
+                        await self._sync_subscriptions()
+                    elif packet_type == PUBLISH:
+                        self._handle_publish(flags, body)
+        finally:
+            if pinger is not None:
+                pinger.cancel()
+
+    async def _ping_loop(self, ws):
+        while not ws.closed:
+            await asyncio.sleep(KEEPALIVE / 2)
+            await ws.send_bytes(_packet(PINGREQ, 0, b""))
+
+    def _next_packet_id(self) -> bytes:
+        self._packet_id = self._packet_id % 0xFFFF + 1
+        return struct.pack("!H", self._packet_id)
+
+    async def _sync_subscriptions(self):
+        # Repeats until caught up, since set_serials may change the wanted set mid-send
+        while True:
+            ws = self._ws
+            if ws is None or ws.closed or not self.connected:
+                return
+            add = self._wanted - self._subscribed
+            remove = self._subscribed - self._wanted
+            if not add and not remove:
+                return
+            if remove:
+                body = self._next_packet_id() + b"".join(_string(TOPIC_PREFIX + s) for s in sorted(remove))
+                await ws.send_bytes(_packet(UNSUBSCRIBE, 0x02, body))
+                self._subscribed -= remove
+            if add:
+                body = self._next_packet_id() + b"".join(_string(TOPIC_PREFIX + s) + b"\x00" for s in sorted(add))
+                await ws.send_bytes(_packet(SUBSCRIBE, 0x02, body))
+                self._subscribed |= add
+
+    async def _resync(self):
+        """set_serials' background update; a broken connection is handled by the read loop."""
+        try:
+            await self._sync_subscriptions()
+        except (ConnectionError, aiohttp.ClientError) as e:
+            log.debug(f"Could not update stream subscriptions: {e}")
+
+    def _handle_publish(self, flags: int, body: bytes):
+        try:
+            topic, payload = _parse_publish(flags, body)
+            frame = json.loads(payload)
+        except (struct.error, ValueError):
+            return
+        if not isinstance(frame, dict):
+            return
+        serial = frame.get("serial") or topic[len(TOPIC_PREFIX):]
+        if serial:
+            self._frames[str(serial).upper()] = (time.monotonic(), frame)
+            self.frames_received += 1
@@ -0,0 +1,169 @@
+import math
+import re
+
+from .snapshot import SondeSnapshot
+
+
+# Launch sites change rarely; /sites is downloaded at most once a day.
+SITES_MAX_AGE = 86400
+GRID_DEGREES = 1.0
+EARTH_RADIUS_KM = 6371.0
+HALF_CIRCUMFERENCE_KM = math.pi * EARTH_RADIUS_KM
+
+_TOKEN = re.compile(r"\w+")
+_IDS = ""  # Trie node key holding the site ids of words ending at that node
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def site_position(site: dict):
+    """(lat, lon) of a site (SondeHub stores `position` as [lon, lat]), or None."""
+    pos = site.get("position")
+    if isinstance(pos, (list, tuple)) and len(pos) >= 2:
+        try:
+            return float(pos[1]), float(pos[0])
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+class SiteIndex:
+    """Launch sites indexed for name/ID search and nearest-site queries.
+
+    Words of station names and IDs go into a prefix trie, so `bergen ho` finds Bergen-Hohne
+    without scanning every site; the substring matches the `site` command always found are
+    still listed, after the word-prefix hits. Positions go into a 1° grid, and `near` only
+    measures distances to sites in the cells covering the search circle.
+    """
+
+    def __init__(self, sites: dict):
+        self.sites = sites
+        self._trie = {}
+        self._grid = {}  # (row, col) -> [(lat, lon, site_id)]
+        for site_id, site in sites.items():
+            if not isinstance(site, dict):
+                continue
+            for word in set(_TOKEN.findall(f"{site_id} {site.get('station_name') or ''}".lower())):
+                node = self._trie
+                for char in word:
+                    node = node.setdefault(char, {})
+                node.setdefault(_IDS, []).append(site_id)
+            position = site_position(site)
+            if position is not None:
+                self._grid.setdefault(self._cell(*position), []).append((*position, site_id))
+
+    def __len__(self):
+        return len(self.sites)
+
+    @staticmethod
+    def _cell(lat: float, lon: float) -> tuple:
+        return int((lat + 90) // GRID_DEGREES), int((lon + 180) // GRID_DEGREES) % int(360 / GRID_DEGREES)
+
+    # ------------------------------------------------------------------ search
+
+    def _prefixed(self, prefix: str) -> set:
+        node = self._trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return set()
+        found, stack = set(), [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == _IDS:
+                    found.update(child)
+                else:
+                    stack.append(child)
+        return found
+
+    def search(self, query: str) -> list:
+        """Site ids whose name or ID has a word starting with each word of `query`.
+
+        Sites whose station name only contains `query` as a case-insensitive substring
+        follow the word-prefix hits, so `berg` still finds Heidelberg after Bergen.
+        """
+        words = _TOKEN.findall(query.lower())
+        matches = None
+        for word in words:
+            found = self._prefixed(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                break
+        matches = matches or set()
+        query_lower = query.lower()
+        contained = {
+            site_id for site_id, site in self.sites.items()
+            if site_id not in matches and isinstance(site, dict)
+            and query_lower in (site.get("station_name") or "").lower()
+        }
+
+        def by_name(site_id):
+            return self.sites[site_id].get("station_name") or ""
+
+        return sorted(matches, key=by_name) + sorted(contained, key=by_name)
+
+    # ------------------------------------------------------------------ spatial
+
+    def within(self, lat: float, lon: float, radius_km: float) -> list:
+        """(distance_km, site_id) for sites within `radius_km`, nearest first."""
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        cols = int(360 / GRID_DEGREES)
+        ratio = math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi / 2)) / max(math.cos(math.radians(lat)), 1e-12)
+        if south <= -90 or north >= 90 or ratio >= 1:
+            col_range = range(cols)  # Reaches a pole: every longitude
+        else:
+            dlon = math.degrees(math.asin(ratio))
+            first, last = int((lon - dlon + 180) // GRID_DEGREES), int((lon + dlon + 180) // GRID_DEGREES)
+            col_range = range(first, min(last, first + cols - 1) + 1)
+        row_min = int((south + 90) // GRID_DEGREES)
+        row_max = int((north + 90) // GRID_DEGREES)
+        result = []
+        for row in range(row_min, row_max + 1):
+            for col in col_range:
+                for site_lat, site_lon, site_id in self._grid.get((row, col % cols), ()):
+                    distance = haversine_km(lat, lon, site_lat, site_lon)
+                    if distance <= radius_km:
+                        result.append((distance, site_id))
+        result.sort()
+        return result
+
+    def near(self, lat: float, lon: float, count: int = 5) -> list:
+        """(distance_km, site_id) for the `count` sites nearest to lat/lon, nearest first.
+
+        Searches a circle that doubles until it holds `count` sites; every site closer than the
+        farthest one returned lies inside that circle, so the answer is exact.
+        """
+        radius = 100.0
+        while True:
+            found = self.within(lat, lon, radius)
+            if len(found) >= count or radius >= HALF_CIRCUMFERENCE_KM:
+                return found[:count]
+            radius = min(radius * 2, HALF_CIRCUMFERENCE_KM)
+
+
+class SiteDirectory:
+    """The `/sites` list as a SiteIndex, rebuilt when a daily refresh brings new data.
+
+    If a refresh fails, the previous index keeps answering.
+    """
+
+    def __init__(self, fetch):
+        self._snapshot = SondeSnapshot(fetch)  # Same single-flight download as /sondes
+        self._data = None
+        self._index = None
+
+    async def get(self, max_age: float = SITES_MAX_AGE):
+        """Return (SiteIndex or None, error_message)."""
+        data, error = await self._snapshot.get(max_age)
+        if error:
+            return (self._index, None) if self._index is not None else (None, error)
+        if data is not self._data:
+            self._data = data
+            self._index = SiteIndex(data)
+        return self._index, None
@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+
+# Commands and dashboard pages accept data this old; the update loop passes its own limit.
+DEFAULT_MAX_AGE = 30
+
+
+class SondeSnapshot:
+    """The latest SondeHub `/sondes` feed, shared by the update loop, commands and dashboard.
+
+    `/sondes` is a multi-megabyte JSON document keyed by serial. It is downloaded and parsed
+    at most once per `max_age` no matter how many guilds or pages ask for it, and concurrent
+    callers wait for the same request instead of starting their own.
+    """
+
+    def __init__(self, fetch):
+        self._fetch = fetch  # coroutine function returning (data_dict, error_message)
+        self._data = {}
+        self._fetched_at = None
+        self._upper = None  # upper-case serial -> serial, built on first lookup
+        self._inflight = None
+        self.fetches = 0
+
+    @property
+    def age(self):
+        """Seconds since the last successful fetch, or None before the first one."""
+        return None if self._fetched_at is None else time.monotonic() - self._fetched_at
+
+    async def get(self, max_age: float = DEFAULT_MAX_AGE):
+        """Return (data_dict, error_message), fetching only if the snapshot is older than `max_age`."""
+        age = self.age
+        if age is not None and age < max_age:
+            return self._data, None
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._refresh())
+        task = self._inflight
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done() and self._inflight is task:
+                self._inflight = None
+
+    async def _refresh(self):
+        data, error = await self._fetch()
+        self.fetches += 1
+        if error:
+            return {}, error
+        self._data = data
+        self._fetched_at = time.monotonic()
+        self._upper = None
+        return data, None
+
+    def sonde(self, serial: str):
+        """Look up a sonde in the current snapshot by serial (case-insensitive), or None."""
+        sonde = self._data.get(serial)
+        if sonde is not None:
+            return sonde
+        if self._upper is None:
+            self._upper = {key.upper(): key for key in self._data}
+        key = self._upper.get(serial.upper())
+        return self._data.get(key) if key is not None else None
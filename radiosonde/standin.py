@@ -0,0 +1,166 @@
+"""
+Local stand-in for the parts of SondeHub the Radiosonde cog uses, for testing streaming.
+
+Serves `/sondes` (a synthetic feed), `/sonde/<serial>` and `/sondes/telemetry` (flight
+histories starting when the stand-in started, one frame every `--history-step` seconds),
+`/sondes/websocket` (returns this server's MQTT URL) and an MQTT-over-WebSocket broker at `/mqtt` that answers CONNECT, SUBSCRIBE, UNSUBSCRIBE and
+PINGREQ and publishes a moving telemetry frame for every subscribed `sondes/<serial>` topic.
+`--drop-after` closes each broker connection after that many seconds, to exercise the cog's
+fallback to polling and its reconnects. Nothing here is loaded by the cog.
+
+Example:
+    python -m radiosonde.standin --port 8765 --sondes 500 --rate 1 --drop-after 60
+    # then, from the bot (e.g. with the dev cog's [p]eval):
+    bot.get_cog("Radiosonde").api_base = "http://127.0.0.1:8765"
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import struct
+import time
+
+from aiohttp import WSMsgType, web
+
+from .realtime import (
+    CONNACK, CONNECT, PINGREQ, PINGRESP, PUBLISH, SUBACK, SUBSCRIBE, TOPIC_PREFIX, UNSUBACK, UNSUBSCRIBE,
+    _packet, _read_packet, _string,
+)
+
+
+DURATIONS = {"1h": 3600, "3h": 3 * 3600, "6h": 6 * 3600, "12h": 12 * 3600, "1d": 86400}
+
+
+def _frame(serial: str, seed: int, at: float = None) -> dict:
+    """A deterministic, slowly moving telemetry frame for `serial` (at `at`, default now)."""
+    rng = random.Random(serial)
+    lat0, lon0 = rng.uniform(-60, 70), rng.uniform(-180, 180)
+    at = time.time() if at is None else at
+    t = at - seed
+    return {
+        "serial": serial,
+        "lat": round(lat0 + 0.01 * math.sin(t / 300), 5),
+        "lon": round(lon0 + 0.02 * (t % 3600) / 3600, 5),
+        "alt": round(5000 + 5 * (t % 6000), 1),
+        "vel_h": round(rng.uniform(2, 25), 1),
+        "vel_v": 5.0,
+        "heading": rng.randint(0, 359),
+        "sats": rng.randint(6, 12),
+        "temp": round(-50 + rng.uniform(-5, 5), 1),
+        "batt": 2.9,
+        "uploader_callsign": "STANDIN",
+        "datetime": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(at)),
+    }
+
+
+class SondeHubStandin:
+    def __init__(self, sondes: int, rate: float, drop_after: float, history_step: float = 2.0):
+        self.serials = [f"S{1000000 + i}" for i in range(sondes)]
+        self.rate = rate
+        self.drop_after = drop_after
+        self.history_step = history_step
+        self.seed = int(time.time())
+        self.base_url = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/sondes", self.sondes)
+        app.router.add_get("/sondes/websocket", self.websocket_endpoint)
+        app.router.add_get("/sondes/telemetry", self.telemetry_window)
+        app.router.add_get("/sonde/{serial}", self.telemetry)
+        app.router.add_get("/mqtt", self.mqtt)
+        return app
+
+    async def sondes(self, request):
+        return web.json_response({serial: _frame(serial, self.seed) for serial in self.serials})
+
+    def _history(self, serial: str, start: float) -> list:
+        now = time.time()
+        start = self.seed + math.ceil(max(start - self.seed, 0) / self.history_step) * self.history_step
+        count = int((now - start) // self.history_step) + 1
+        return [_frame(serial, self.seed, start + i * self.history_step) for i in range(max(count, 0))]
+
+    async def telemetry(self, request):
+        serial = request.match_info["serial"]
+        if serial not in self.serials:
+            return web.json_response([], status=404)
+        return web.json_response(self._history(serial, self.seed))
+
+    async def telemetry_window(self, request):
+        serial = request.query.get("serial")
+        duration = DURATIONS.get(request.query.get("duration"))
+        if duration is None:
+            return web.json_response({"message": "invalid duration"}, status=400)
+        frames = self._history(serial, time.time() - duration) if serial in self.serials else []
+        return web.json_response({serial: {f["datetime"]: f for f in frames}} if frames else {})
+
+    async def websocket_endpoint(self, request):
+        return web.json_response(f"ws://{request.host}/mqtt")
+
+    async def mqtt(self, request):
+        ws = web.WebSocketResponse(protocols=("mqtt",))
+        await ws.prepare(request)
+        topics = set()
+        publisher = None
+        opened = time.monotonic()
+
+        async def publish():
+            while not ws.closed:
+                for topic in list(topics):
+                    payload = json.dumps(_frame(topic[len(TOPIC_PREFIX):], self.seed)).encode()
+                    await ws.send_bytes(_packet(PUBLISH, 0, _string(topic) + payload))
+                if self.drop_after and time.monotonic() - opened > self.drop_after:
+                    await ws.close()
+                    return
+                await asyncio.sleep(self.rate)
+
+        buffer = bytearray()
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.BINARY:
+                    continue
+                buffer.extend(message.data)
+                while (packet := _read_packet(buffer)) is not None:
+                    packet_type, _, body = packet
+                    if packet_type == CONNECT:
+                        await ws.send_bytes(_packet(CONNACK, 0, b"\x00\x00"))
+                        publisher = asyncio.create_task(publish())
+                    elif packet_type in (SUBSCRIBE, UNSUBSCRIBE):
+                        packet_id, offset, granted = body[:2], 2, b""
+                        while offset < len(body):
+                            (length,) = struct.unpack_from("!H", body, offset)
+                            topic = body[offset + 2:offset + 2 + length].decode()
+                            offset += 2 + length
+                            if packet_type == SUBSCRIBE:
+                                offset += 1  # Requested QoS
+                                topics.add(topic)
+                                granted += b"\x00"
+                            else:
+                                topics.discard(topic)
+                        reply = SUBACK if packet_type == SUBSCRIBE else UNSUBACK
+                        await ws.send_bytes(_packet(reply, 0, packet_id + granted))
+                    elif packet_type == PINGREQ:
+                        await ws.send_bytes(_packet(PINGRESP, 0, b""))
+        finally:
+            if publisher is not None:
+                publisher.cancel()
+        return ws
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sondes", type=int, default=500, help="Sondes in the /sondes feed")
+    parser.add_argument("--rate", type=float, default=1.0, help="Seconds between frames per subscribed serial")
+    parser.add_argument("--drop-after", type=float, default=0, help="Close broker connections after this many seconds")
+    parser.add_argument("--history-step", type=float, default=2.0, help="Seconds between frames in flight histories")
+    args = parser.parse_args(argv)
+    standin = SondeHubStandin(args.sondes, args.rate, args.drop_after, args.history_step)
+    web.run_app(standin.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
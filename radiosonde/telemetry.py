@@ -0,0 +1,208 @@
+import asyncio
+import time
+from array import array
+from datetime import datetime, timezone
+
+
+# A history view refetches at most this often; views in between reuse the stored frames.
+REFRESH_AGE = 30
+# A flight whose newest frame is this much older than the last fetch is over and never refetched.
+FLIGHT_ENDED_AFTER = 3600
+MAX_FRAMES = 50_000  # per serial; the oldest frames are dropped beyond this
+MAX_SERIALS = 32  # least recently viewed flights are evicted beyond this
+
+# `/sondes/telemetry` windows, smallest first; gaps longer than the largest refetch the whole flight
+DURATIONS = (("1h", 3600), ("3h", 3 * 3600), ("6h", 6 * 3600), ("12h", 12 * 3600), ("1d", 86400))
+
+
+def frame_time(frame: dict):
+    """Epoch seconds of a telemetry frame, or None if it carries no usable timestamp."""
+    value = frame.get("datetime") or frame.get("time") or frame.get("timestamp") or frame.get("ts")
+    if isinstance(value, (int, float)):
+        return float(value / 1000 if value > 1e11 else value)  # Milliseconds or seconds
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def telemetry_frames(data) -> list:
+    """Frame dicts from any of SondeHub's telemetry shapes.
+
+    `/sonde/{serial}` returns a list (or a dict holding one under `telemetry`, `history` or
+    `data`); `/sondes/telemetry` returns {serial: {datetime: frame}}.
+    """
+    if isinstance(data, list):
+        return [f for f in data if isinstance(f, dict)]
+    if not isinstance(data, dict):
+        return []
+    for key in ("telemetry", "history", "data"):
+        if isinstance(data.get(key), list):
+            return [f for f in data[key] if isinstance(f, dict)]
+    frames = []
+    for value in data.values():
+        if isinstance(value, dict):
+            frames.extend(f for f in value.values() if isinstance(f, dict))
+    return frames
+
+
+def _number(value):
+    return float(value) if isinstance(value, (int, float)) else float("nan")
+
+
+class TelemetrySeries:
+    """One flight's frames as parallel arrays of time, lat, lon and alt (NaN when missing)."""
+
+    __slots__ = ("times", "lats", "lons", "alts", "fetched_at")
+
+    def __init__(self):
+        self.times = array("d")
+        self.lats = array("d")
+        self.lons = array("d")
+        self.alts = array("d")
+        self.fetched_at = None  # time.time() of the last successful fetch
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def last_time(self):
+        return self.times[-1] if self.times else None
+
+    def extend(self, frames) -> int:
+        """Append frames newer than the last stored one (one per timestamp); returns how many."""
+        last = self.last_time
+        rows = {}
+        for frame in frames:
+            t = frame_time(frame)
+            if t is not None and (last is None or t > last):
+                rows.setdefault(t, frame)  # Several uploaders report the same frame
+        for t in sorted(rows):
+            frame = rows[t]
+            self.times.append(t)
+            self.lats.append(_number(frame.get("lat")))
+            self.lons.append(_number(frame.get("lon")))
+            self.alts.append(_number(frame.get("alt")))
+        overflow = len(self.times) - MAX_FRAMES
+        if overflow > 0:
+            for column in (self.times, self.lats, self.lons, self.alts):
+                del column[:overflow]
+        return len(rows)
+
+    def row(self, index: int) -> tuple:
+        return self.times[index], self.lats[index], self.lons[index], self.alts[index]
+
+    def ended(self) -> bool:
+        """Whether the flight stopped reporting well before the last fetch."""
+        return (
+            self.fetched_at is not None and self.last_time is not None
+            and self.fetched_at - self.last_time > FLIGHT_ENDED_AFTER
+        )
+
+    def downsample(self, threshold: int) -> list:
+        """Indices of at most `threshold` frames keeping the shape of the altitude profile (LTTB)."""
+        indices = [i for i, alt in enumerate(self.alts) if alt == alt]  # Frames with an altitude
+        return [indices[i] for i in lttb([self.times[i] for i in indices], [self.alts[i] for i in indices], threshold)]
+
+
+def lttb(xs, ys, threshold: int) -> list:
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that best preserve the curve.
+
+    The first and last points are always kept; each bucket in between contributes the point
+    forming the largest triangle with the previous pick and the next bucket's average.
+    """
+    n = len(xs)
+    if threshold >= n:
+        return list(range(n))
+    threshold = max(threshold, 3)
+    picks = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = xs[n - 1], ys[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(xs[next_start:next_end]) / count
+            avg_y = sum(ys[next_start:next_end]) / count
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        picks.append(best)
+        a = best
+    picks.append(n - 1)
+    return picks
+
+
+class TelemetryStore:
+    """Per-serial telemetry cache for history views.
+
+    The first view of a flight downloads it whole from `/sonde/{serial}`; later views fetch
+    only the `/sondes/telemetry` window since the newest stored frame and append what is new.
+    Flights that have ended are served from memory without fetching. Concurrent views of the
+    same serial share one request.
+    """
+
+    def __init__(self, fetch_full, fetch_window):
+        self._fetch_full = fetch_full  # coroutine(serial) -> (data, error)
+        self._fetch_window = fetch_window  # coroutine(serial, duration) -> (data, error)
+        self._series = {}  # upper-case serial -> TelemetrySeries, least recently viewed first
+        self._inflight = {}
+        self.full_fetches = 0
+        self.window_fetches = 0
+
+    async def get(self, serial: str, max_age: float = REFRESH_AGE):
+        """Return (TelemetrySeries or None, error_message)."""
+        key = serial.upper()
+        series = self._series.pop(key, None)
+        if series is not None:
+            self._series[key] = series  # Mark as most recently viewed
+            if series.ended() or (series.fetched_at is not None and time.time() - series.fetched_at < max_age):
+                return series, None
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(serial, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, serial: str, key: str):
+        series = self._series.get(key)
+        if series is not None and series.fetched_at is not None and series.last_time is not None:
+            gap = time.time() - series.last_time
+            duration = next((name for name, seconds in DURATIONS if seconds > gap + REFRESH_AGE), None)
+            if duration is not None:
+                data, error = await self._fetch_window(serial, duration)
+                self.window_fetches += 1
+                if not error:
+                    series.extend(telemetry_frames(data))
+                    series.fetched_at = time.time()
+                    return series, None
+                # Fall through to a full download
+
+        data, error = await self._fetch_full(serial)
+        self.full_fetches += 1
+        if error:
+            return (series, None) if series else (None, error)
+        frames = telemetry_frames(data)
+        if not frames and series is None:
+            return None, None
+        if series is None:
+            series = TelemetrySeries()
+        series.extend(frames)
+        series.fetched_at = time.time()
+        self._series[key] = series
+        while len(self._series) > MAX_SERIALS:
+            self._series.pop(next(iter(self._series)))
+        return series, None
@@ -0,0 +1,73 @@
+"""
+Callback execution shared by SquawkAPI and CommandAPI.
+
+Callbacks are run in priority tiers: callbacks sharing a priority run concurrently, and
+tiers run highest priority first. Each callback runs under its own timeout and never
+raises, so one failure cannot cancel the rest of its tier.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+def priority_tiers(callback_list: list) -> List[list]:
+    """Split a priority-sorted callback list into runs of equal priority."""
+    tiers = []
+    for callback_info in callback_list:
+        if tiers and tiers[-1][0].priority == callback_info.priority:
+            tiers[-1].append(callback_info)
+        else:
+            tiers.append([callback_info])
+    return tiers
+
+
+async def run_tier(coros: list) -> list:
+    """Run one tier's callbacks concurrently and return their results in order."""
+    if len(coros) == 1:
+        return [await coros[0]]
+    if hasattr(asyncio, "TaskGroup"):
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+        return [task.result() for task in tasks]
+    return await asyncio.gather(*coros)  # Python < 3.11
+
+
+async def run_callback(
+    callback_info,
+    args: tuple,
+    on_failure: Callable[[Any, str], Awaitable[None]],
+) -> Dict[str, Any]:
+    """Run one callback under its timeout, reporting failures to `on_failure(callback_info, error)`."""
+    callback_start = time.time()
+    callback_result = {
+        'cog_name': callback_info.cog_name,
+        'success': False,
+        'execution_time': 0.0,
+        'error': None,
+        'return_value': None
+    }
+
+    try:
+        # Execute with timeout
+        callback_result['return_value'] = await asyncio.wait_for(
+            callback_info.callback(*args),
+            timeout=callback_info.timeout
+        )
+        callback_result['success'] = True
+
+        # Reset failure count on success
+        callback_info.failure_count = 0
+
+    except asyncio.TimeoutError:
+        error_msg = f"Callback timeout ({callback_info.timeout}s)"
+        callback_result['error'] = error_msg
+        await on_failure(callback_info, error_msg)
+
+    except Exception as e:
+        error_msg = f"Callback error: {e}"
+        callback_result['error'] = error_msg
+        await on_failure(callback_info, error_msg)
+
+    callback_result['execution_time'] = time.time() - callback_start
+    return callback_result
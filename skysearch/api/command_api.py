@@ -1,10 +1,12 @@
-import asyncio
 import logging
 import time
 from typing import Callable, Awaitable, List, Optional, Dict, Any
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+from .callbacks import priority_tiers, run_callback, run_tier
+from .command_profiler import CommandProfiler
+
 log = logging.getLogger("red.skysearch.command_api")
 
 @dataclass
@@ -31,8 +33,9 @@ class CommandAPI:
     - Command filtering (only run callbacks for specific commands)
     - Performance metrics and timing
     - Circuit breaker for failing callbacks
-    - Priority-based execution
+    - Priority-based execution (same-priority callbacks run concurrently)
     - Detailed execution results
+    - Latency percentiles and phase breakdowns for every command (see command_profiler.py)
     """
     def __init__(self):
         self._callbacks: List[CommandCallbackInfo] = []
@@ -52,7 +55,12 @@ class CommandAPI:
         
         # Command execution tracking
         self._active_commands: Dict[str, Dict] = {}  # Track currently executing commands
-        self._lock = asyncio.Lock()
+
+        # Run same-priority callbacks concurrently (see set_concurrent_execution)
+        self.concurrent_callbacks = True
+
+        # Per-command latency histograms, fed by the cog's before/after invoke hooks
+        self.profiler = CommandProfiler()
 
     def register_callback(self, callback: Callable, cog_name: str = "Unknown", priority: int = 0, 
                          timeout: float = 15.0, command_filter: Optional[List[str]] = None) -> bool:
@@ -189,13 +197,12 @@ class CommandAPI:
         """Call all basic callbacks when a command is executed."""
         command_key = f"{ctx.guild.id if ctx.guild else 'DM'}_{command_name}_{ctx.message.id}"
         
-        async with self._lock:
-            self._active_commands[command_key] = {
-                'command_name': command_name,
-                'start_time': time.time(),
-                'guild_id': ctx.guild.id if ctx.guild else None,
-                'user_id': ctx.author.id
-            }
+        self._active_commands[command_key] = {
+            'command_name': command_name,
+            'start_time': time.time(),
+            'guild_id': ctx.guild.id if ctx.guild else None,
+            'user_id': ctx.author.id
+        }
         
         try:
             results = await self._execute_callbacks(
@@ -209,16 +216,20 @@ class CommandAPI:
             return results
             
         finally:
-            async with self._lock:
-                self._active_commands.pop(command_key, None)
+            self._active_commands.pop(command_key, None)
 
     async def run_pre_execute(self, ctx, command_name: str, args: list) -> bool:
         """Run pre-execute callbacks. Returns False if any callback cancels execution."""
+        def cancelled(tier_results):
+            # A cancellation skips the lower priority tiers
+            return any(r['success'] and r['return_value'] is False for r in tier_results)
+
         results = await self._execute_callbacks(
             self._pre_execute_callbacks,
             "pre_execute_callback",
             command_name,
-            ctx, command_name, args
+            ctx, command_name, args,
+            after_tier=cancelled
         )
         
         # Check if any callback cancelled execution
@@ -251,8 +262,15 @@ class CommandAPI:
         )
 
     async def _execute_callbacks(self, callback_list: List[CommandCallbackInfo], callback_type: str, 
-                               command_name: str, *args) -> Dict[str, Any]:
-        """Execute a list of callbacks with filtering, error handling, and metrics."""
+                               command_name: str, *args,
+                               after_tier: Optional[Callable[[List[Dict[str, Any]]], Any]] = None) -> Dict[str, Any]:
+        """
+        Execute a list of callbacks with filtering, error handling, and metrics.
+
+        Callbacks sharing a priority run concurrently, so a tier takes as long as its slowest
+        callback; tiers still run highest priority first. If `after_tier` returns True
+        for a tier's results, lower priority tiers are skipped.
+        """
         start_time = time.time()
         results = {
             'callback_type': callback_type,
@@ -279,54 +297,26 @@ class CommandAPI:
                 
             filtered_callbacks.append(callback_info)
         
-        # Execute filtered callbacks
-        for callback_info in filtered_callbacks:
-            callback_start = time.time()
-            callback_result = {
-                'cog_name': callback_info.cog_name,
-                'success': False,
-                'execution_time': 0.0,
-                'error': None,
-                'return_value': None
-            }
-            
-            try:
-                # Execute with timeout
-                result = await asyncio.wait_for(
-                    callback_info.callback(*args),
-                    timeout=callback_info.timeout
-                )
-                
-                callback_result['success'] = True
-                callback_result['return_value'] = result
-                results['success_count'] += 1
-                
-                # Reset failure count on success
-                callback_info.failure_count = 0
-                
-            except asyncio.TimeoutError:
-                error_msg = f"Callback timeout ({callback_info.timeout}s)"
-                callback_result['error'] = error_msg
-                results['error_count'] += 1
-                await self._handle_callback_failure(callback_info, error_msg)
-                
-            except Exception as e:
-                error_msg = f"Callback error: {e}"
-                callback_result['error'] = error_msg
-                results['error_count'] += 1
-                await self._handle_callback_failure(callback_info, error_msg)
-                
-            finally:
-                callback_result['execution_time'] = time.time() - callback_start
+        tiers = priority_tiers(filtered_callbacks) if self.concurrent_callbacks else [[cb] for cb in filtered_callbacks]
+        for tier in tiers:
+            tier_results = await run_tier([run_callback(callback_info, args, self._handle_callback_failure) for callback_info in tier])
+
+            # Aggregate once per tier; nothing awaits in between, so no lock is needed.
+            for callback_info, callback_result in zip(tier, tier_results):
                 results['callback_results'].append(callback_result)
-                
-                # Update metrics
+                if callback_result['success']:
+                    results['success_count'] += 1
+                else:
+                    results['error_count'] += 1
                 stats = self._metrics['callback_stats'][callback_info.cog_name]
                 stats['calls'] += 1
                 stats['total_time'] += callback_result['execution_time']
                 if not callback_result['success']:
                     stats['failures'] += 1
-        
+
+            if after_tier is not None and after_tier(tier_results):
+                break
+
         results['execution_time'] = time.time() - start_time
         return results
 
@@ -390,6 +380,11 @@ class CommandAPI:
             
         return enabled_any
 
+    def set_concurrent_execution(self, enabled: bool):
+        """Run same-priority callbacks concurrently (default) or strictly one after another."""
+        self.concurrent_callbacks = bool(enabled)
+        log.info(f"Concurrent command callback execution {'enabled' if enabled else 'disabled'}")
+
     def get_command_performance(self, command_name: str = None) -> Dict[str, Any]:
         """Get performance statistics for commands."""
         if command_name:
@@ -397,6 +392,13 @@ class CommandAPI:
         else:
             return dict(self._metrics['command_stats'])
 
+    def get_latency_percentiles(self, command_name: str = None) -> Dict[str, Any]:
+        """Get p50/p95/p99 latency and phase breakdowns, for one command or all of them."""
+        summaries = self.profiler.summaries()
+        if command_name:
+            return summaries.get(command_name, {})
+        return summaries
+
     def get_active_commands(self) -> Dict[str, Dict]:
         """Get information about currently executing commands."""
         current_time = time.time()
@@ -0,0 +1,250 @@
+"""
+Per-command latency profiling for SkySearch commands.
+
+Every SkySearch command is timed from the cog's before/after invoke hooks into a rolling
+histogram per command, so `skysearch profile` can show p50/p95/p99 for all of them, not
+only the few commands wrapped by CommandAPI hooks. Inside a command, time is attributed to
+phases: `api` (airplanes.live requests), `photo` (planespotters lookups) and `send` (Discord
+messages), with whatever is left counted as `other`. Phase times are wall-clock time during
+which at least one call of that phase was running, so concurrent photo fetches count once.
+
+With sampling on, a command still running after `threshold` seconds gets a stack snapshot of
+its task, and one invocation per command at a time is run under cProfile and kept if it turns
+out slow. Both are written to the `profiles` directory in the cog data folder. cProfile sees
+the whole event loop, so a sample also contains whatever else ran while the command awaited.
+"""
+
+import asyncio
+import cProfile
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import discord
+
+from ..utils.perf import RollingHistogram, _ms
+
+
+log = logging.getLogger("red.skysearch.command_profiler")
+
+PHASES = ("api", "photo", "send")
+DEFAULT_THRESHOLD = 3.0
+MAX_SAMPLE_FILES = 50
+
+
+class _Invocation:
+    """Timing state for one running command."""
+
+    __slots__ = ("command", "start", "phases", "depth", "opened", "task", "watchdog", "profile")
+
+    def __init__(self, command: str):
+        self.command = command
+        self.start = time.perf_counter()
+        self.phases = {}  # phase -> seconds
+        self.depth = {}  # phase -> number of open calls
+        self.opened = {}  # phase -> perf_counter when depth went 0 -> 1
+        self.task = asyncio.current_task()
+        self.watchdog = None
+        self.profile = None
+
+
+_current: ContextVar[Optional[_Invocation]] = ContextVar("skysearch_command_invocation", default=None)
+
+
+@contextmanager
+def command_phase(name: str):
+    """Attribute a block to `name` in the running command's breakdown (no-op outside a command)."""
+    invocation = _current.get()
+    if invocation is None:
+        yield
+        return
+    depth = invocation.depth.get(name, 0)
+    if depth == 0:
+        invocation.opened[name] = time.perf_counter()
+    invocation.depth[name] = depth + 1
+    try:
+        yield
+    finally:
+        invocation.depth[name] -= 1
+        if invocation.depth[name] == 0:
+            elapsed = time.perf_counter() - invocation.opened.pop(name)
+            invocation.phases[name] = invocation.phases.get(name, 0.0) + elapsed
+
+
+def record_command_phase(name: str, seconds: float):
+    """Add an already-measured duration to the running command's breakdown (no-op outside a command)."""
+    invocation = _current.get()
+    if invocation is not None and seconds > 0:
+        invocation.phases[name] = invocation.phases.get(name, 0.0) + seconds
+
+
+class CommandProfiler:
+    """Latency histograms and phase breakdowns per command, with optional slow-invocation samples."""
+
+    def __init__(self):
+        self._totals: Dict[str, RollingHistogram] = {}
+        self._phases: Dict[str, Dict[str, RollingHistogram]] = {}
+        self._failures: Dict[str, int] = {}
+        self._running: Dict[int, _Invocation] = {}  # id(ctx) -> invocation
+        self.sample_dir: Optional[Path] = None
+        self.threshold = DEFAULT_THRESHOLD
+        self._profiling = False  # Only one cProfile can be active per thread
+        self.samples_written = 0
+
+    # ------------------------------------------------------------------ lifecycle
+
+    @property
+    def sampling(self) -> bool:
+        return self.sample_dir is not None
+
+    def enable_sampling(self, directory: Path, threshold: float = DEFAULT_THRESHOLD):
+        self.sample_dir = Path(directory)
+        self.threshold = threshold
+
+    def disable_sampling(self):
+        self.sample_dir = None
+
+    def begin(self, ctx):
+        """Start timing `ctx.command`; call from `cog_before_invoke`."""
+        invocation = _Invocation(ctx.command.qualified_name if ctx.command else "unknown")
+        self._running[id(ctx)] = invocation
+        # before_invoke runs in the command's own task, so the command body sees this
+        _current.set(invocation)
+        if self.sampling and invocation.task is not None:
+            invocation.watchdog = asyncio.get_running_loop().call_later(
+                self.threshold, self._snapshot_stack, invocation
+            )
+            if not self._profiling:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError:  # Another profiler (e.g. a debugger) is active
+                    pass
+                else:
+                    self._profiling = True
+                    invocation.profile = profile
+
+    def finish(self, ctx):
+        """Record the invocation started by `begin`; call from `cog_after_invoke`."""
+        invocation = self._running.pop(id(ctx), None)
+        _current.set(None)
+        if invocation is None:
+            return
+        total = time.perf_counter() - invocation.start
+        if invocation.watchdog is not None:
+            invocation.watchdog.cancel()
+        if invocation.profile is not None:
+            invocation.profile.disable()
+            self._profiling = False
+            if total >= self.threshold:
+                self._write_sample(invocation, "pstats", lambda path: invocation.profile.dump_stats(str(path)))
+
+        command = invocation.command
+        failed = bool(getattr(ctx, "command_failed", False))
+        if failed:
+            self._failures[command] = self._failures.get(command, 0) + 1
+        histogram = self._totals.get(command)
+        if histogram is None:
+            histogram = self._totals[command] = RollingHistogram()
+        histogram.add(total, {"failed": failed})
+
+        phases = self._phases.setdefault(command, {})
+        accounted = 0.0
+        for name, seconds in invocation.phases.items():
+            phases.setdefault(name, RollingHistogram()).add(seconds)
+            accounted += seconds
+        phases.setdefault("other", RollingHistogram()).add(max(0.0, total - accounted))
+
+    # ------------------------------------------------------------------ samples
+
+    def _snapshot_stack(self, invocation: _Invocation):
+        """Write where a slow command's task is currently awaiting."""
+        task = invocation.task
+        if task is None or task.done():
+            return
+
+        def write(path):
+            elapsed = time.perf_counter() - invocation.start
+            with open(path, "w", encoding="utf-8") as fp:
+                fp.write(f"{invocation.command} still running after {elapsed:.1f}s\n")
+                fp.write(f"phases so far: {invocation.phases}\n\n")
+                task.print_stack(file=fp)
+
+        self._write_sample(invocation, "stack.txt", write)
+
+    def _write_sample(self, invocation: _Invocation, suffix: str, writer):
+        directory = self.sample_dir
+        if directory is None:
+            return
+        name = invocation.command.replace(" ", "_")
+        path = directory / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{id(invocation) % 10000:04d}.{suffix}"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            writer(path)
+            self.samples_written += 1
+            # Keep only the newest samples
+            samples = sorted(directory.iterdir(), key=lambda p: p.stat().st_mtime)
+            for old in samples[:-MAX_SAMPLE_FILES]:
+                old.unlink()
+        except OSError as e:
+            log.warning(f"Could not write command profile sample {path}: {e}")
+
+    # ------------------------------------------------------------------ reporting
+
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        """{command: summary with failures and per-phase summaries}, slowest p95 first."""
+        result = {}
+        for command, histogram in self._totals.items():
+            summary = histogram.summary()
+            summary["failures"] = self._failures.get(command, 0)
+            summary["phases"] = {
+                name: phase.summary() for name, phase in sorted(self._phases.get(command, {}).items())
+            }
+            result[command] = summary
+        return dict(sorted(result.items(), key=lambda item: item[1]["p95"], reverse=True))
+
+    def reset(self):
+        self._totals.clear()
+        self._phases.clear()
+        self._failures.clear()
+
+
+def build_profile_embed(profiler: CommandProfiler, command: Optional[str] = None) -> discord.Embed:
+    """Embed with p50/p95/p99 per command, or the phase breakdown of one command."""
+    summaries = profiler.summaries()
+    embed = discord.Embed(title="⏱️ SkySearch command latency", color=0xfffffe)
+    footer = "Rolling window per command"
+    if profiler.sampling:
+        footer += f" • sampling invocations slower than {profiler.threshold:g}s ({profiler.samples_written} written)"
+    embed.set_footer(text=footer)
+
+    if command:
+        s = summaries.get(command)
+        if s is None:
+            embed.description = f"No invocations of `{command}` recorded yet."
+            return embed
+        embed.title = f"⏱️ {command}"
+        embed.description = (
+            f"n={s['count']} failures={s['failures']} p50={_ms(s['p50'])} p95={_ms(s['p95'])} "
+            f"p99={_ms(s['p99'])} max={_ms(s['max'])} ms"
+        )
+        lines = []
+        for name, p in s["phases"].items():
+            share = p["mean"] / s["mean"] * 100 if s["mean"] else 0.0
+            lines.append(f"`{name:<6}` mean={_ms(p['mean'])} p95={_ms(p['p95'])} ms ({share:.0f}% of mean)")
+        embed.add_field(name="Phases", value="\n".join(lines) or "No phases recorded.", inline=False)
+        return embed
+
+    if not summaries:
+        embed.description = "No commands recorded yet."
+        return embed
+    lines = [
+        f"`{name[:24]:<24}` n={s['count']} p50={_ms(s['p50'])} p95={_ms(s['p95'])} p99={_ms(s['p99'])} ms"
+        for name, s in list(summaries.items())[:20]
+    ]
+    embed.description = "\n".join(lines)[:4000]
+    embed.add_field(name="Details", value="`skysearch profile <command name>` shows where a command's time went.", inline=False)
+    return embed
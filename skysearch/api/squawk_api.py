@@ -1,10 +1,11 @@
-import asyncio
 import logging
 import time
 from typing import Callable, Awaitable, List, Optional, Dict, Set, Any
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+from .callbacks import priority_tiers, run_callback, run_tier
+
 log = logging.getLogger("red.skysearch.api")
 
 @dataclass
@@ -29,7 +30,7 @@ class SquawkAlertAPI:
     Features:
     - Callback deduplication
     - Error handling with circuit breaker
-    - Priority-based execution
+    - Priority-based execution (same-priority callbacks run concurrently)
     - Performance metrics
     - Debug capabilities
     """
@@ -51,8 +52,8 @@ class SquawkAlertAPI:
             'callback_stats': defaultdict(lambda: {'calls': 0, 'failures': 0, 'total_time': 0.0})
         }
         
-        # Lock for thread safety
-        self._lock = asyncio.Lock()
+        # Run same-priority callbacks concurrently (see set_concurrent_execution)
+        self.concurrent_callbacks = True
 
     def register_callback(self, callback: Callable, cog_name: str = "Unknown", priority: int = 0, timeout: float = 10.0) -> bool:
         """
@@ -180,17 +181,16 @@ class SquawkAlertAPI:
         """
         alert_key = f"{guild.id}_{aircraft_info.get('hex')}_{squawk_code}"
         
-        # Check for duplicate alerts
-        async with self._lock:
-            now = time.time()
-            if alert_key in self._recent_alerts:
-                time_since_last = now - self._recent_alerts[alert_key]
-                if time_since_last < self._dedup_window:
-                    log.debug(f"Skipping duplicate alert for {alert_key} ({time_since_last:.1f}s ago)")
-                    return {"skipped": True, "reason": "duplicate", "time_since_last": time_since_last}
-            
-            self._recent_alerts[alert_key] = now
-            self._cleanup_old_alerts(now)
+        # Check for duplicate alerts (no await between check and set, so this is atomic)
+        now = time.time()
+        if alert_key in self._recent_alerts:
+            time_since_last = now - self._recent_alerts[alert_key]
+            if time_since_last < self._dedup_window:
+                log.debug(f"Skipping duplicate alert for {alert_key} ({time_since_last:.1f}s ago)")
+                return {"skipped": True, "reason": "duplicate", "time_since_last": time_since_last}
+
+        self._recent_alerts[alert_key] = now
+        self._cleanup_old_alerts(now)
         
         # Execute callbacks
         results = await self._execute_callbacks(
@@ -209,17 +209,18 @@ class SquawkAlertAPI:
 
     async def run_pre_send(self, guild, aircraft_info, squawk_code, message_data: Dict) -> Dict:
         """Run pre-send callbacks to modify message data."""
-        results = await self._execute_callbacks(
+        def apply_modifications(tier_results):
+            # Apply each tier's changes before the next (lower priority) tier sees message_data
+            for result in tier_results:
+                if result['success'] and result['return_value']:
+                    message_data.update(result['return_value'])
+
+        await self._execute_callbacks(
             self._pre_send_callbacks,
-            "pre_send_callback", 
-            guild, aircraft_info, squawk_code, message_data
+            "pre_send_callback",
+            guild, aircraft_info, squawk_code, message_data,
+            after_tier=apply_modifications
         )
-        
-        # Apply modifications from successful callbacks
-        for result in results['callback_results']:
-            if result['success'] and result['return_value']:
-                message_data.update(result['return_value'])
-                
         return message_data
 
     async def run_post_send(self, guild, aircraft_info, squawk_code, sent_message):
@@ -230,8 +231,15 @@ class SquawkAlertAPI:
             guild, aircraft_info, squawk_code, sent_message
         )
 
-    async def _execute_callbacks(self, callback_list: List[CallbackInfo], callback_type: str, *args) -> Dict[str, Any]:
-        """Execute a list of callbacks with error handling and metrics."""
+    async def _execute_callbacks(self, callback_list: List[CallbackInfo], callback_type: str, *args,
+                                 after_tier: Optional[Callable[[List[Dict[str, Any]]], Any]] = None) -> Dict[str, Any]:
+        """
+        Execute a list of callbacks with error handling and metrics.
+
+        Callbacks sharing a priority run concurrently, so a tier takes as long as its slowest
+        callback; tiers still run highest priority first. `after_tier` is called with each
+        tier's results before the next tier starts and may return True to stop early.
+        """
         start_time = time.time()
         results = {
             'callback_type': callback_type,
@@ -242,58 +250,34 @@ class SquawkAlertAPI:
             'execution_time': 0.0,
             'callback_results': []
         }
-        
+
+        enabled = []
         for callback_info in callback_list:
-            if not callback_info.enabled:
+            if callback_info.enabled:
+                enabled.append(callback_info)
+            else:
                 results['disabled_count'] += 1
-                continue
-                
-            callback_start = time.time()
-            callback_result = {
-                'cog_name': callback_info.cog_name,
-                'success': False,
-                'execution_time': 0.0,
-                'error': None,
-                'return_value': None
-            }
-            
-            try:
-                # Execute with timeout
-                result = await asyncio.wait_for(
-                    callback_info.callback(*args),
-                    timeout=callback_info.timeout
-                )
-                
-                callback_result['success'] = True
-                callback_result['return_value'] = result
-                results['success_count'] += 1
-                
-                # Reset failure count on success
-                callback_info.failure_count = 0
-                
-            except asyncio.TimeoutError:
-                error_msg = f"Callback timeout ({callback_info.timeout}s)"
-                callback_result['error'] = error_msg
-                results['error_count'] += 1
-                await self._handle_callback_failure(callback_info, error_msg)
-                
-            except Exception as e:
-                error_msg = f"Callback error: {e}"
-                callback_result['error'] = error_msg
-                results['error_count'] += 1
-                await self._handle_callback_failure(callback_info, error_msg)
-                
-            finally:
-                callback_result['execution_time'] = time.time() - callback_start
+
+        tiers = priority_tiers(enabled) if self.concurrent_callbacks else [[cb] for cb in enabled]
+        for tier in tiers:
+            tier_results = await run_tier([run_callback(callback_info, args, self._handle_callback_failure) for callback_info in tier])
+
+            # Aggregate once per tier; nothing awaits in between, so no lock is needed.
+            for callback_info, callback_result in zip(tier, tier_results):
                 results['callback_results'].append(callback_result)
-                
-                # Update metrics
+                if callback_result['success']:
+                    results['success_count'] += 1
+                else:
+                    results['error_count'] += 1
                 stats = self._metrics['callback_stats'][callback_info.cog_name]
                 stats['calls'] += 1
                 stats['total_time'] += callback_result['execution_time']
                 if not callback_result['success']:
                     stats['failures'] += 1
-        
+
+            if after_tier is not None and after_tier(tier_results):
+                break
+
         results['execution_time'] = time.time() - start_time
         return results
 
@@ -363,6 +347,11 @@ class SquawkAlertAPI:
             
         return enabled_any
 
+    def set_concurrent_execution(self, enabled: bool):
+        """Run same-priority callbacks concurrently (default) or strictly one after another."""
+        self.concurrent_callbacks = bool(enabled)
+        log.info(f"Concurrent callback execution {'enabled' if enabled else 'disabled'}")
+
     def set_dedup_window(self, seconds: float):
         """Set the deduplication window in seconds."""
         if seconds < 1.0 or seconds > 300.0:
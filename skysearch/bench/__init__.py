@@ -0,0 +1,12 @@
+"""
+Benchmark tooling for SkySearch cog.
+
+Nothing in this package is imported by the cog at runtime; it exists so the
+background loops and hot helpers can be measured without touching live APIs.
+
+Modules:
+- standin.py: Local aiohttp stand-in for airplanes.live, planespotters.net and nasstatus.faa.gov.
+- replay.py: Replay driver that runs the background loops against synthetic guilds, users and fences.
+- micro.py: Microbenchmarks for per-aircraft helpers with baseline save/compare.
+
+"""
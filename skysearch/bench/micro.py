@@ -0,0 +1,296 @@
+"""
+Microbenchmarks for the SkySearch helpers that run per aircraft, per cycle.
+
+Covers:
+- HelperUtils.create_aircraft_embed
+- HelperUtils.aircraft_matches_watchlist
+- HelperUtils.get_aircraft_types
+- HelperUtils.format_altitude / format_speed / format_position
+- Skysearch._faa_snapshot_signature
+- FenceIndex.match (circle and polygon geo-fences against the whole feed)
+- stats.build_stats_charts
+- StatsChartCache._render (local Pillow chart rendering, when Pillow is installed)
+
+Fixtures come from the same feed as the replay stand-in: a recorded `all_with_pos.json`
+when --fixtures is given, otherwise the seeded synthetic snapshot. Timings use timeit
+(best-of-N repeats of an auto-ranged loop) and are reported per call in microseconds.
+
+Baselines live in bench/baselines/micro.json. Record them on the reference machine with
+--save, and check a change with --compare, which exits non-zero when a benchmark is
+slower than its baseline by more than --threshold.
+
+Example:
+    python -m skysearch.bench.micro --save skysearch/bench/baselines/micro.json
+    python -m skysearch.bench.micro --compare skysearch/bench/baselines/micro.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from .standin import AirplanesLiveStandin, StandinOptions
+from ..data import icao_codes
+from ..skysearch import Skysearch
+from ..utils.helpers import HelperUtils
+from ..utils.charts import HAS_PILLOW
+from ..utils.stats import StatsChartCache, build_chart_specs, build_stats_charts
+from ..utils.geofence import FenceIndex
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+ICAO_SET_ATTRIBUTES = (
+    "law_enforcement_icao_set", "military_icao_set", "medical_icao_set", "suspicious_icao_set",
+    "newsagency_icao_set", "balloons_icao_set", "global_prior_known_accident_set",
+    "ukr_conflict_set", "agri_utility_set", "trainer_educational_set",
+)
+
+
+class _BenchCog:
+    """The slice of the cog HelperUtils needs for pure helpers (ICAO sets only)."""
+
+    def __init__(self):
+        for attr in ICAO_SET_ATTRIBUTES:
+            setattr(self, attr, getattr(icao_codes, attr))
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[], object]
+    batch: int  # calls made by one func() invocation
+
+
+def _load_feed(fixtures_dir: Optional[Path], count: int, seed: int) -> list:
+    options = StandinOptions(aircraft_count=count, fixtures_dir=fixtures_dir, seed=seed)
+    return AirplanesLiveStandin(options).aircraft
+
+
+def _watchlist(feed: list, rng: random.Random, size: int = 8) -> dict:
+    picks = rng.sample(feed, min(size, len(feed)))
+    return {
+        "icao": [a.get("hex", "").upper() for a in picks[: size // 2]],
+        "type": ["military", "law_enforcement"],
+        "callsign": [(a.get("flight") or "").strip().lower() for a in picks[size // 2:]],
+        "reg": [],
+        "squawk": ["7700"],
+    }
+
+
+def _faa_lists(rng: random.Random):
+    airports = [f"K{chr(65 + i % 26)}{chr(65 + i // 26)}A" for i in range(40)]
+    ground = [
+        {"arpt": a, "reason": "weather", "avg": f"{rng.randrange(15, 90)} minutes", "max": "2 hours"}
+        for a in airports[:10]
+    ]
+    arrival = [
+        {"arpt": a, "reason": "volume", "type": rng.choice(("Arrival", "Departure")),
+         "min": "16 minutes", "max": "45 minutes", "trend": "Increasing"}
+        for a in airports[10:30]
+    ]
+    closures = [
+        {"arpt": a, "reason": "runway maintenance", "start": "Jan 01 at 00:00 UTC.", "reopen": "Jan 02 at 06:00 UTC."}
+        for a in airports[30:35]
+    ]
+    return ground, arrival, closures, "Mon Jan 1 12:00:00 2024 GMT"
+
+
+def _api_stats(rng: random.Random) -> dict:
+    """An api_stats dict shaped like APIManager.get_request_stats() after a month of use."""
+    now_hour = int(time.time() // 3600)
+    now_day = now_hour // 24
+    endpoint_usage = {f"/?endpoint_{i}": rng.randrange(10, 50_000) for i in range(40)}
+    hourly = {now_hour - h: rng.randrange(0, 900) for h in range(24 * 30)}
+    daily = {now_day - d: rng.randrange(1_000, 20_000) for d in range(30)}
+    total = sum(daily.values())
+    failed = total // 50
+    return {
+        "total_requests": total,
+        "successful_requests": total - failed,
+        "failed_requests": failed,
+        "rate_limited_requests": failed // 3,
+        "auth_failed_requests": 0,
+        "permission_denied_requests": 0,
+        "api_mode_usage": {"primary": total - 100, "fallback": 100},
+        "endpoint_usage": endpoint_usage,
+        "hourly_requests": hourly,
+        "daily_requests": daily,
+        "last_request_time": time.time(),
+        "last_request_time_formatted": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "total_response_time": total * 0.2,
+        "avg_response_time": 0.2,
+        "success_rate": (total - failed) / total * 100,
+        "requests_last_24h": sum(hourly.get(now_hour - h, 0) for h in range(24)),
+    }
+
+
+def _fences(feed: list, rng: random.Random, count: int = 200) -> dict:
+    """Circle and polygon fences centred on random aircraft, a third with altitude bands."""
+    positioned = [a for a in feed if a.get("lat") is not None and a.get("lon") is not None] or [{"lat": 0.0, "lon": 0.0}]
+    fences = {}
+    for i in range(count):
+        centre = rng.choice(positioned)
+        lat, lon = centre["lat"], centre["lon"]
+        if i % 2:
+            fence = {"lat": lat, "lon": lon, "radius_nm": rng.uniform(5, 50)}
+        else:
+            size = rng.uniform(0.2, 1.5)
+            fence = {"shape": "polygon", "coords": [
+                lat - size, lon - size, lat - size, lon + size, lat + size / 2, lon + size, lat + size, lon, lat + size / 2, lon - size,
+            ]}
+        if i % 3 == 0:
+            fence.update(min_alt=0, max_alt=10000)
+        fences[i] = fence
+    return fences
+
+
+def build_benchmarks(feed: list, seed: int) -> list:
+    """Create the benchmark callables over a shared feed."""
+    rng = random.Random(seed)
+    helpers = HelperUtils(_BenchCog())
+    watchlist = _watchlist(feed, rng)
+    hexes = [(a.get("hex") or "").upper() for a in feed]
+    embed_sample = feed[:200]
+    ground, arrival, closures, update_time = _faa_lists(rng)
+    api_stats = _api_stats(rng)
+    fence_index = FenceIndex()
+    fence_index.rebuild(_fences(feed, rng))
+
+    def embeds():
+        for aircraft in embed_sample:
+            helpers.create_aircraft_embed(aircraft, None, None, None)
+
+    def matches():
+        for aircraft in feed:
+            helpers.aircraft_matches_watchlist(aircraft, watchlist)
+
+    def types():
+        for hex_id in hexes:
+            helpers.get_aircraft_types(hex_id)
+
+    def altitudes():
+        for aircraft in feed:
+            helpers.format_altitude(aircraft.get("alt_baro"))
+
+    def speeds():
+        for aircraft in feed:
+            helpers.format_speed(aircraft.get("gs"))
+
+    def positions():
+        for aircraft in feed:
+            helpers.format_position(aircraft.get("lat"), aircraft.get("lon"))
+
+    def faa_signature():
+        Skysearch._faa_snapshot_signature(None, ground, arrival, closures, update_time)
+
+    def fence_match():
+        fence_index.match(feed)
+
+    def charts():
+        build_stats_charts(api_stats)
+
+    chart_specs = build_chart_specs(api_stats)
+
+    def chart_pngs():
+        StatsChartCache._render(chart_specs)
+
+    benchmarks = [
+        Benchmark("create_aircraft_embed", embeds, len(embed_sample)),
+        Benchmark("aircraft_matches_watchlist", matches, len(feed)),
+        Benchmark("get_aircraft_types", types, len(hexes)),
+        Benchmark("format_altitude", altitudes, len(feed)),
+        Benchmark("format_speed", speeds, len(feed)),
+        Benchmark("format_position", positions, len(feed)),
+        Benchmark("_faa_snapshot_signature", faa_signature, 1),
+        Benchmark("geofence_match", fence_match, len(feed)),
+        Benchmark("build_stats_charts", charts, 1),
+    ]
+    if HAS_PILLOW:
+        benchmarks.append(Benchmark("render_stats_charts", chart_pngs, 1))
+    return benchmarks
+
+
+def run_benchmarks(benchmarks: list, repeat: int = 5, only: Optional[list] = None) -> dict:
+    """Time every benchmark and return {name: {"best_us", "median_us", "loops"}} per call."""
+    results = {}
+    for bench in benchmarks:
+        if only and bench.name not in only:
+            continue
+        timer = timeit.Timer(bench.func)
+        loops, _ = timer.autorange()
+        samples = [t / loops / bench.batch * 1e6 for t in timer.repeat(repeat=repeat, number=loops)]
+        results[bench.name] = {
+            "best_us": round(min(samples), 3),
+            "median_us": round(statistics.median(samples), 3),
+            "loops": loops * bench.batch,
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return benchmarks whose best time grew by more than `threshold` (0.15 = 15%)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("best_us"):
+            continue
+        change = (current["best_us"] - previous["best_us"]) / previous["best_us"]
+        if change > threshold:
+            regressions.append(f"{name}: {previous['best_us']}us -> {current['best_us']}us (+{change:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for SkySearch hot helpers.")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of recorded fixtures")
+    parser.add_argument("--aircraft", type=int, default=5000, help="Feed size used by per-aircraft benchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", default=None, help="Run only these benchmarks")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--save", type=Path, default=None, help="Write results as a new baseline")
+    parser.add_argument("--compare", type=Path, nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Compare with a baseline file (defaults to bench/baselines/micro.json)")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    feed = _load_feed(args.fixtures, args.aircraft, args.seed)
+    results = run_benchmarks(build_benchmarks(feed, args.seed), repeat=args.repeat, only=args.only)
+
+    width = max(len(name) for name in results) if results else 10
+    print(f"{'benchmark':<{width}} {'best us':>12} {'median us':>12} {'calls':>10}")
+    for name, row in results.items():
+        print(f"{name:<{width}} {row['best_us']:>12.3f} {row['median_us']:>12.3f} {row['loops']:>10}")
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "aircraft": len(feed),
+            "results": results,
+        }, indent=2), encoding="utf-8")
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        if not args.compare.exists():
+            print(f"\nNo baseline at {args.compare}; record one with --save first.")
+            sys.exit(2)
+        baseline = json.loads(args.compare.read_text(encoding="utf-8")).get("results", {})
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions beyond threshold:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions beyond threshold.")
+
+
+if __name__ == "__main__":
+    main()
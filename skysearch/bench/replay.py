@@ -0,0 +1,744 @@
+"""
+Offline replay driver for the SkySearch background loops.
+
+Builds a Skysearch cog against an in-memory Config and a synthetic bot (guilds, members,
+channels, geofences, custom alerts and watchlists), points every HTTP base URL at the
+local stand-in from standin.py and runs one iteration of each background loop per cycle:
+
+- check_emergency_squawks
+- check_watched_aircraft
+- check_geofence_alerts
+- check_faa_status_changes
+
+Each iteration reports wall time, Config reads/writes, HTTP calls by endpoint, 429s,
+messages sent and peak traced memory. Results can be written to JSON and compared with
+a previous run to flag regressions before deploying.
+
+The loops' pacing sleeps (0.5s per squawk code) are skipped by default
+and reported separately, so wall time reflects work rather than deliberate throttling.
+Peak memory uses tracemalloc, which slows everything down; pass --no-memory when only
+timings matter.
+
+Example:
+    python -m skysearch.bench.replay --guilds 50 --users 40 --cycles 3 --latency-ms 40 --rate-limit 0.02
+    python -m skysearch.bench.replay --json run.json --baseline previous.json --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+from .standin import AirplanesLiveStandin, StandinOptions
+from .. import skysearch as skysearch_module
+from ..data.icao_codes import law_enforcement_icao_set, medical_icao_set, military_icao_set
+from ..skysearch import Skysearch
+from ..utils.api import APIManager
+from ..utils.helpers import HelperUtils
+
+
+log = logging.getLogger("red.skysearch.bench")
+
+LOOP_NAMES = (
+    "check_emergency_squawks",
+    "check_watched_aircraft",
+    "check_geofence_alerts",
+    "check_faa_status_changes",
+)
+WATCHLIST_TYPES = ("military", "law_enforcement", "medical")
+
+
+# --------------------------------------------------------------------------- Config
+
+
+class _ValueCall:
+    """Awaitable / async context manager returned by calling a ReplayValue, like Red's Value."""
+
+    def __init__(self, value):
+        self._value = value
+        self._obj = None
+
+    def __await__(self):
+        return self._value._read().__await__()
+
+    async def __aenter__(self):
+        self._obj = await self._value._read()
+        return self._obj
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self._value.set(self._obj)
+
+
+class ReplayValue:
+    """A single Config value that counts reads and writes."""
+
+    def __init__(self, config, scope, identifier, key):
+        self._config = config
+        self._scope = scope
+        self._identifier = identifier
+        self._key = key
+
+    def __call__(self, default=None):
+        return _ValueCall(self)
+
+    async def _read(self):
+        self._config.ops["read"] += 1
+        data = self._config._data[self._scope].get(self._identifier, {})
+        if self._key in data:
+            return copy.deepcopy(data[self._key])
+        return copy.deepcopy(self._config._defaults[self._scope].get(self._key))
+
+    async def set(self, value):
+        self._config.ops["write"] += 1
+        self._config._data[self._scope].setdefault(self._identifier, {})[self._key] = copy.deepcopy(value)
+
+    async def clear(self):
+        self._config.ops["write"] += 1
+        self._config._data[self._scope].get(self._identifier, {}).pop(self._key, None)
+
+
+class ReplayGroup:
+    """Scope accessor returned by ReplayConfig.guild()/user()."""
+
+    def __init__(self, config, scope, identifier):
+        self._config = config
+        self._scope = scope
+        self._identifier = identifier
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self._config._defaults[self._scope]:
+            raise AttributeError(name)
+        return ReplayValue(self._config, self._scope, self._identifier, name)
+
+    async def all(self):
+        self._config.ops["read"] += 1
+        merged = dict(self._config._defaults[self._scope])
+        merged.update(self._config._data[self._scope].get(self._identifier, {}))
+        return copy.deepcopy(merged)
+
+    async def clear(self):
+        self._config.ops["write"] += 1
+        self._config._data[self._scope].pop(self._identifier, None)
+
+
+class ReplayConfig:
+    """In-memory stand-in for redbot's Config that counts every read and write."""
+
+    GLOBAL = "GLOBAL"
+    GUILD = "GUILD"
+    USER = "USER"
+
+    def __init__(self):
+        self._defaults = {self.GLOBAL: {}, self.GUILD: {}, self.USER: {}}
+        self._data = {self.GLOBAL: {}, self.GUILD: {}, self.USER: {}}
+        self.ops = Counter()
+
+    def register_global(self, **defaults):
+        self._defaults[self.GLOBAL].update(defaults)
+
+    def register_guild(self, **defaults):
+        self._defaults[self.GUILD].update(defaults)
+
+    def register_user(self, **defaults):
+        self._defaults[self.USER].update(defaults)
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self._defaults[self.GLOBAL]:
+            raise AttributeError(name)
+        return ReplayValue(self, self.GLOBAL, 0, name)
+
+    def guild(self, guild):
+        return ReplayGroup(self, self.GUILD, guild.id)
+
+    def guild_from_id(self, guild_id):
+        return ReplayGroup(self, self.GUILD, guild_id)
+
+    def user(self, user):
+        return ReplayGroup(self, self.USER, user.id)
+
+    def user_from_id(self, user_id):
+        return ReplayGroup(self, self.USER, user_id)
+
+    async def _all_scope(self, scope):
+        self.ops["read"] += 1
+        defaults = self._defaults[scope]
+        return {
+            identifier: {**copy.deepcopy(defaults), **copy.deepcopy(values)}
+            for identifier, values in self._data[scope].items()
+        }
+
+    async def all_guilds(self):
+        return await self._all_scope(self.GUILD)
+
+    async def all_users(self):
+        return await self._all_scope(self.USER)
+
+    def seed(self, scope, identifier, **values):
+        """Write population data without counting it as an operation."""
+        self._data[scope].setdefault(identifier, {}).update(copy.deepcopy(values))
+
+    def reset_ops(self):
+        self.ops.clear()
+
+
+class _ReplayConfigFactory:
+    """Replaces `Config` in the skysearch module while the cog is constructed."""
+
+    def __init__(self, config):
+        self._config = config
+
+    def get_conf(self, *args, **kwargs):
+        return self._config
+
+
+# --------------------------------------------------------------------------- Discord
+
+
+class MessageSink:
+    """Counts messages 'sent' by the replay bot."""
+
+    def __init__(self):
+        self.channel_messages = 0
+        self.direct_messages = 0
+
+    @property
+    def total(self):
+        return self.channel_messages + self.direct_messages
+
+    def reset(self):
+        self.channel_messages = 0
+        self.direct_messages = 0
+
+
+class ReplayMessage:
+    _next_id = 1
+
+    def __init__(self, channel, content=None, embed=None):
+        self.id = ReplayMessage._next_id
+        ReplayMessage._next_id += 1
+        self.channel = channel
+        self.content = content
+        self.embeds = [embed] if embed is not None else []
+
+    async def edit(self, **kwargs):
+        return self
+
+    async def delete(self, **kwargs):
+        return None
+
+
+class ReplayChannel:
+    def __init__(self, channel_id, guild, sink):
+        self.id = channel_id
+        self.guild = guild
+        self.name = f"replay-{channel_id}"
+        self.mention = f"<#{channel_id}>"
+        self._sink = sink
+
+    async def send(self, content=None, **kwargs):
+        self._sink.channel_messages += 1
+        return ReplayMessage(self, content, kwargs.get("embed"))
+
+    def permissions_for(self, member):
+        return SimpleNamespace(send_messages=True, embed_links=True, attach_files=True)
+
+
+class ReplayMember:
+    def __init__(self, user_id, sink, bot=False):
+        self.id = user_id
+        self.bot = bot
+        self.name = f"replay-user-{user_id}"
+        self.display_name = self.name
+        self.mention = f"<@{user_id}>"
+        self._sink = sink
+
+    async def send(self, content=None, **kwargs):
+        self._sink.direct_messages += 1
+        return ReplayMessage(None, content, kwargs.get("embed"))
+
+
+class ReplayGuild:
+    def __init__(self, guild_id, me):
+        self.id = guild_id
+        self.name = f"Replay Guild {guild_id}"
+        self.me = me
+        self.members = []
+        self.text_channels = []
+        self._channels = {}
+
+    def add_channel(self, channel):
+        self.text_channels.append(channel)
+        self._channels[channel.id] = channel
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def get_member(self, user_id):
+        return next((m for m in self.members if m.id == user_id), None)
+
+    def get_role(self, role_id):
+        return None
+
+
+class _ReplayI18nCache:
+    async def get_locale(self, guild):
+        return "en-US"
+
+    async def get_regional_format(self, guild):
+        return None
+
+
+class ReplayBot:
+    """Just enough of Red for the background loops."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.user = ReplayMember(1, sink, bot=True)
+        self.guilds = []
+        self._channels = {}
+        self._users = {}
+        self._i18n_cache = _ReplayI18nCache()
+        self._never_ready = asyncio.Event()
+
+    def add_guild(self, guild):
+        self.guilds.append(guild)
+        for channel in guild.text_channels:
+            self._channels[channel.id] = channel
+        for member in guild.members:
+            self._users[member.id] = member
+
+    def get_channel(self, channel_id):
+        return self._channels.get(channel_id)
+
+    def get_guild(self, guild_id):
+        return next((g for g in self.guilds if g.id == guild_id), None)
+
+    def get_user(self, user_id):
+        return self._users.get(user_id)
+
+    async def wait_until_ready(self):
+        # The replay drives loop bodies directly; the tasks.loop schedulers must never start.
+        await self._never_ready.wait()
+
+    wait_until_red_ready = wait_until_ready
+
+
+# --------------------------------------------------------------------------- Population
+
+
+@dataclass
+class ReplayPopulation:
+    """Size and shape of the synthetic guild/user/fence population."""
+
+    guilds: int = 25
+    users_per_guild: int = 40
+    shared_user_ratio: float = 0.3  # fraction of members drawn from a pool shared across guilds
+    watchlist_user_ratio: float = 0.25
+    watchlist_size: int = 8
+    fences_per_guild: int = 2
+    fence_radius_nm: float = 150.0
+    custom_alerts_per_guild: int = 2
+    emergency_alert_ratio: float = 0.8
+    faa_alert_ratio: float = 0.5
+    seed: int = 2024
+
+
+def _seed_typed_hexes(standin: AirplanesLiveStandin, rng: random.Random, count: int):
+    """Give some stand-in aircraft hex codes from the cog's type sets so type watchlists match."""
+    pool = [
+        code.lower()
+        for icao_set in (military_icao_set, law_enforcement_icao_set, medical_icao_set)
+        for code in sorted(icao_set)[:count]
+    ]
+    rng.shuffle(pool)
+    offset = standin.options.emergency_count
+    for entry, hex_code in zip(standin.aircraft[offset:], pool[:count]):
+        entry["hex"] = hex_code
+    standin._reindex()
+
+
+def build_population(standin: AirplanesLiveStandin, population: ReplayPopulation):
+    """Create the replay bot and Config contents from the stand-in's current snapshot."""
+    rng = random.Random(population.seed)
+    sink = MessageSink()
+    bot = ReplayBot(sink)
+    config = ReplayConfig()
+    _seed_typed_hexes(standin, rng, max(10, len(standin.aircraft) // 100))
+    positioned = [a for a in standin.aircraft if a.get("lat") is not None and a.get("lon") is not None]
+
+    next_id = iter(range(10_000, 10**12))
+    shared_pool = [
+        ReplayMember(next(next_id), sink)
+        for _ in range(max(1, int(population.guilds * population.users_per_guild * population.shared_user_ratio)))
+    ]
+    watchlist_users = set()
+
+    for _ in range(population.guilds):
+        guild = ReplayGuild(next(next_id), bot.user)
+        alert_channel = ReplayChannel(next(next_id), guild, sink)
+        fence_channel = ReplayChannel(next(next_id), guild, sink)
+        guild.add_channel(alert_channel)
+        guild.add_channel(fence_channel)
+
+        shared_count = int(population.users_per_guild * population.shared_user_ratio)
+        guild.members.extend(rng.sample(shared_pool, min(shared_count, len(shared_pool))))
+        guild.members.extend(
+            ReplayMember(next(next_id), sink) for _ in range(population.users_per_guild - shared_count)
+        )
+        guild.members.append(bot.user)
+
+        guild_values = {}
+        if rng.random() < population.emergency_alert_ratio:
+            guild_values["alert_channel"] = alert_channel.id
+        if rng.random() < population.faa_alert_ratio:
+            guild_values["faa_alert_channel"] = alert_channel.id
+
+        custom_alerts = {}
+        for i in range(population.custom_alerts_per_guild):
+            target = rng.choice(standin.aircraft)
+            alert_type = rng.choice(("icao", "callsign", "squawk", "type"))
+            value = {
+                "icao": target.get("hex", ""),
+                "callsign": (target.get("flight") or "").strip(),
+                "squawk": target.get("squawk", ""),
+                "type": target.get("t", ""),
+            }[alert_type]
+            custom_alerts[f"replay_{i}"] = {
+                "type": alert_type,
+                "value": value,
+                "cooldown": 5,
+                "custom_channel": None,
+                "custom_role": None,
+                "created_by": shared_pool[0].id,
+                "created_at": "2024-01-01T00:00:00",
+                "last_triggered": None,
+            }
+        if custom_alerts:
+            guild_values["custom_alerts"] = custom_alerts
+
+        fences = {}
+        for i in range(population.fences_per_guild):
+            center = rng.choice(positioned) if positioned else {"lat": 0.0, "lon": 0.0}
+            fences[f"geofence_replay_{guild.id}_{i}"] = {
+                "name": f"Replay fence {i}",
+                "lat": center["lat"],
+                "lon": center["lon"],
+                "radius_nm": population.fence_radius_nm,
+                "alert_on": rng.choice(("entry", "exit", "both")),
+                "cooldown": 0,
+                "channel_id": fence_channel.id,
+                "role_id": None,
+                "aircraft_inside": {},
+                "last_alert_time": None,
+            }
+        if fences:
+            guild_values["geofence_alerts"] = fences
+
+        config.seed(ReplayConfig.GUILD, guild.id, **guild_values)
+
+        for member in guild.members:
+            if member.bot or member.id in watchlist_users:
+                continue
+            if rng.random() >= population.watchlist_user_ratio:
+                continue
+            watchlist_users.add(member.id)
+            watchlist = {"icao": [], "type": [], "callsign": [], "reg": [], "squawk": []}
+            for target in rng.sample(standin.aircraft, min(population.watchlist_size, len(standin.aircraft))):
+                kind = rng.choice(("icao", "icao", "callsign", "reg", "type"))
+                if kind == "icao":
+                    watchlist["icao"].append(target.get("hex", "").upper())
+                elif kind == "callsign" and target.get("flight"):
+                    watchlist["callsign"].append(target["flight"].strip().lower())
+                elif kind == "reg" and target.get("r"):
+                    watchlist["reg"].append(target["r"].lower())
+                elif kind == "type":
+                    watchlist["type"].append(rng.choice(WATCHLIST_TYPES))
+            watchlist["type"] = sorted(set(watchlist["type"]))
+            config.seed(ReplayConfig.USER, member.id, watchlist=watchlist)
+
+        bot.add_guild(guild)
+
+    return bot, config
+
+
+# --------------------------------------------------------------------------- Driver
+
+
+class _PacingSleepRecorder:
+    """asyncio proxy for the skysearch module that records pacing sleeps instead of waiting."""
+
+    def __init__(self):
+        self.skipped_seconds = 0.0
+        self._real_sleep = asyncio.sleep
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+    async def sleep(self, delay, result=None):
+        self.skipped_seconds += delay
+        return await self._real_sleep(0, result)
+
+
+@dataclass
+class ReplayOptions:
+    cycles: int = 3
+    loops: tuple = LOOP_NAMES
+    skip_pacing_sleeps: bool = True
+    track_memory: bool = True
+    standin: StandinOptions = field(default_factory=StandinOptions)
+    population: ReplayPopulation = field(default_factory=ReplayPopulation)
+
+
+@dataclass
+class CycleReport:
+    cycle: int
+    loop: str
+    wall_ms: float
+    config_reads: int
+    config_writes: int
+    http_calls: int
+    http_by_endpoint: dict
+    http_429: int
+    http_bytes: int
+    messages_sent: int
+    peak_kib: Optional[float]
+    pacing_sleep_s: float
+
+
+def _managers(cog):
+    """Every APIManager/HelperUtils/AirportCommands-like object hanging off the cog."""
+    owners = [cog] + [value for value in vars(cog).values() if hasattr(value, "cog")]
+    for owner in owners:
+        yield owner
+        for attr in ("api", "helpers"):
+            value = getattr(owner, attr, None)
+            if value is not None:
+                yield value
+
+
+def point_cog_at_standin(cog, base_url: str):
+    """Redirect airplanes.live, planespotters and FAA status URLs to the stand-in."""
+    for obj in _managers(cog):
+        if isinstance(obj, APIManager):
+            obj.primary_api_url = base_url
+            obj.fallback_api_url = base_url
+        elif isinstance(obj, HelperUtils):
+            obj.planespotters_photos_url = f"{base_url}/pub/photos"
+        if hasattr(obj, "faa_status_url"):
+            obj.faa_status_url = f"{base_url}/api/airport-status-information"
+
+
+def build_cog(bot, config):
+    """Construct Skysearch against the replay Config without letting its loops schedule."""
+    original_config = skysearch_module.Config
+    skysearch_module.Config = _ReplayConfigFactory(config)
+    try:
+        cog = Skysearch(bot)
+    finally:
+        skysearch_module.Config = original_config
+    for loop_name in LOOP_NAMES:
+        getattr(cog, loop_name).cancel()
+    return cog
+
+
+async def _close_cog(cog):
+    closed = set()
+    for obj in _managers(cog):
+        if isinstance(obj, APIManager) and id(obj) not in closed:
+            closed.add(id(obj))
+            await obj.close()
+    session = getattr(cog, "_http_client", None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def run_replay(options: ReplayOptions) -> list:
+    """Run the replay and return one CycleReport per loop per cycle."""
+    standin = AirplanesLiveStandin(options.standin)
+    base_url = await standin.start()
+    bot, config = build_population(standin, options.population)
+    cog = build_cog(bot, config)
+    point_cog_at_standin(cog, base_url)
+    await asyncio.sleep(0)  # let APIManager stats initialisation finish
+
+    pacing = _PacingSleepRecorder()
+    if options.skip_pacing_sleeps:
+        skysearch_module.asyncio = pacing
+    if options.track_memory:
+        tracemalloc.start()
+
+    reports = []
+    try:
+        for cycle in range(options.cycles):
+            for loop_name in options.loops:
+                standin.reset_counters()
+                config.reset_ops()
+                bot.sink.reset()
+                pacing.skipped_seconds = 0.0
+                if options.track_memory and hasattr(tracemalloc, "reset_peak"):
+                    tracemalloc.reset_peak()
+
+                start = time.perf_counter()
+                await getattr(cog, loop_name).coro(cog)
+                wall_ms = (time.perf_counter() - start) * 1000
+
+                peak_kib = tracemalloc.get_traced_memory()[1] / 1024 if options.track_memory else None
+                reports.append(CycleReport(
+                    cycle=cycle,
+                    loop=loop_name,
+                    wall_ms=round(wall_ms, 2),
+                    config_reads=config.ops["read"],
+                    config_writes=config.ops["write"],
+                    http_calls=sum(standin.calls.values()),
+                    http_by_endpoint=dict(standin.calls),
+                    http_429=standin.status_counts.get(429, 0),
+                    http_bytes=standin.bytes_sent,
+                    messages_sent=bot.sink.total,
+                    peak_kib=round(peak_kib, 1) if peak_kib is not None else None,
+                    pacing_sleep_s=round(pacing.skipped_seconds, 2),
+                ))
+            standin.advance_cycle()
+    finally:
+        if options.track_memory:
+            tracemalloc.stop()
+        skysearch_module.asyncio = asyncio
+        await cog.cog_unload()
+        await _close_cog(cog)
+        await standin.stop()
+    return reports
+
+
+# --------------------------------------------------------------------------- Reporting
+
+
+def summarize(reports: list) -> dict:
+    """Aggregate cycle reports per loop (median wall time, mean counters, max peak memory)."""
+    by_loop = defaultdict(list)
+    for report in reports:
+        by_loop[report.loop].append(report)
+    summary = {}
+    for loop_name, rows in by_loop.items():
+        peaks = [r.peak_kib for r in rows if r.peak_kib is not None]
+        summary[loop_name] = {
+            "cycles": len(rows),
+            "wall_ms": round(statistics.median(r.wall_ms for r in rows), 2),
+            "config_ops": round(statistics.mean(r.config_reads + r.config_writes for r in rows), 1),
+            "http_calls": round(statistics.mean(r.http_calls for r in rows), 1),
+            "messages_sent": round(statistics.mean(r.messages_sent for r in rows), 1),
+            "peak_kib": max(peaks) if peaks else None,
+        }
+    return summary
+
+
+def compare(summary: dict, baseline: dict, threshold: float) -> list:
+    """Return human readable regressions where a metric grew more than `threshold` (0.2 = 20%)."""
+    regressions = []
+    for loop_name, metrics in summary.items():
+        previous = baseline.get(loop_name)
+        if not previous:
+            continue
+        for metric in ("wall_ms", "config_ops", "http_calls", "peak_kib"):
+            old = previous.get(metric)
+            new = metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > threshold:
+                regressions.append(f"{loop_name}.{metric}: {old} -> {new} (+{change:.0%})")
+    return regressions
+
+
+def format_table(reports: list) -> str:
+    header = f"{'cycle':>5} {'loop':<26} {'wall ms':>10} {'cfg r/w':>11} {'http':>6} {'429':>4} {'msgs':>5} {'peak KiB':>10} {'paced s':>8}"
+    lines = [header, "-" * len(header)]
+    for r in reports:
+        peak = f"{r.peak_kib:.1f}" if r.peak_kib is not None else "-"
+        lines.append(
+            f"{r.cycle:>5} {r.loop:<26} {r.wall_ms:>10.1f} {f'{r.config_reads}/{r.config_writes}':>11} "
+            f"{r.http_calls:>6} {r.http_429:>4} {r.messages_sent:>5} {peak:>10} {r.pacing_sleep_s:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the SkySearch background loops against a local stand-in.")
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--loops", nargs="+", choices=LOOP_NAMES, default=list(LOOP_NAMES))
+    parser.add_argument("--guilds", type=int, default=25)
+    parser.add_argument("--users", type=int, default=40, help="Members per guild")
+    parser.add_argument("--fences", type=int, default=2, help="Geofences per guild")
+    parser.add_argument("--watchlist-size", type=int, default=8)
+    parser.add_argument("--aircraft", type=int, default=None, help="Snapshot size (pads or trims recordings)")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of recorded fixtures")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Probability of answering 429")
+    parser.add_argument("--photo-hit-rate", type=float, default=0.8)
+    parser.add_argument("--keep-sleeps", action="store_true", help="Honour the loops' pacing sleeps")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak measurement")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--json", type=Path, default=None, help="Write reports and summary to this file")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare against a previous --json file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed growth before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    options = ReplayOptions(
+        cycles=args.cycles,
+        loops=tuple(args.loops),
+        skip_pacing_sleeps=not args.keep_sleeps,
+        track_memory=not args.no_memory,
+        standin=StandinOptions(
+            aircraft_count=args.aircraft,
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.jitter_ms,
+            rate_limit_probability=args.rate_limit,
+            photo_hit_rate=args.photo_hit_rate,
+            seed=args.seed,
+            fixtures_dir=args.fixtures,
+        ),
+        population=ReplayPopulation(
+            guilds=args.guilds,
+            users_per_guild=args.users,
+            fences_per_guild=args.fences,
+            watchlist_size=args.watchlist_size,
+            seed=args.seed,
+        ),
+    )
+    logging.basicConfig(level=logging.WARNING)
+    reports = asyncio.run(run_replay(options))
+    summary = summarize(reports)
+    print(format_table(reports))
+    print()
+    print(json.dumps(summary, indent=2))
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"reports": [asdict(r) for r in reports], "summary": summary}, indent=2),
+            encoding="utf-8",
+        )
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("summary", {})
+        regressions = compare(summary, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions beyond threshold:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions beyond threshold.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,454 @@
+"""
+Local stand-in for the HTTP services used by the SkySearch background loops.
+
+Serves airplanes.live (`all_with_pos`, `filter_squawk`, `circle`, `find_hex` and the
+fallback `/v2/` routes), planespotters.net photo lookups and the nasstatus.faa.gov
+airport status feed from one aiohttp application. Responses come from recorded
+fixtures when a fixtures directory is given, otherwise from a seeded synthetic feed.
+
+Latency, 429 rate limiting and payload size are configurable through StandinOptions
+so the replay driver can reproduce slow or throttled upstreams.
+
+Fixture directory layout (every file is optional):
+- all_with_pos.json: a recorded `?all_with_pos` response ('aircraft' or 'ac' key).
+- nasstatus.xml: a recorded airport-status-information document.
+- planespotters.json: a recorded planespotters photo response used for photo hits.
+
+Run standalone with `python -m skysearch.bench.standin --port 8765`.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from xml.sax.saxutils import escape
+
+import aiohttp
+from aiohttp import web
+
+
+EMERGENCY_SQUAWKS = ("7500", "7600", "7700")
+DEFAULT_SYNTHETIC_AIRCRAFT = 5000
+EARTH_RADIUS_NM = 3440.065
+# Seconds of simulated flight between two replay cycles (matches the 3 minute loops).
+CYCLE_SECONDS = 180
+
+_TYPE_CODES = (
+    ("A320", "AIRBUS A-320"), ("B738", "BOEING 737-800"), ("A21N", "AIRBUS A-321neo"),
+    ("B77W", "BOEING 777-300ER"), ("E190", "EMBRAER ERJ-190"), ("C172", "CESSNA 172"),
+    ("H60", "SIKORSKY UH-60 Black Hawk"), ("C17", "BOEING C-17 Globemaster III"),
+    ("PC12", "PILATUS PC-12"), ("EC35", "EUROCOPTER EC-135"),
+)
+_CALLSIGN_PREFIXES = ("RYR", "EIN", "BAW", "DLH", "AAL", "UAL", "DAL", "RCH", "N", "G")
+_FAA_AIRPORTS = ("ATL", "ORD", "DFW", "DEN", "JFK", "LAX", "SFO", "SEA", "EWR", "BOS")
+
+
+@dataclass
+class StandinOptions:
+    """Knobs for the stand-in server."""
+
+    aircraft_count: Optional[int] = None  # None keeps the recorded snapshot size
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    rate_limit_probability: float = 0.0
+    photo_hit_rate: float = 0.8
+    emergency_count: int = 3
+    faa_change_every: int = 2  # cycles between FAA status changes, 0 disables
+    seed: int = 1337
+    fixtures_dir: Optional[Path] = None
+
+
+def haversine_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in nautical miles."""
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def synthetic_aircraft(count: int, rng: random.Random, emergency_count: int = 3) -> list:
+    """Generate an airplanes.live-shaped aircraft list."""
+    aircraft = []
+    for i in range(count):
+        type_code, desc = rng.choice(_TYPE_CODES)
+        prefix = rng.choice(_CALLSIGN_PREFIXES)
+        on_ground = rng.random() < 0.08
+        squawk = f"{rng.randrange(0, 7777):04d}"
+        if squawk in EMERGENCY_SQUAWKS:
+            squawk = "1200"
+        aircraft.append({
+            "hex": f"{0x400000 + i * 7919 % 0x3FFFFF:06x}",
+            "type": "adsb_icao",
+            "flight": f"{prefix}{rng.randrange(1, 9999)}".ljust(8),
+            "r": f"{prefix[:1]}-{rng.randrange(1000, 9999)}",
+            "t": type_code,
+            "desc": desc,
+            "alt_baro": "ground" if on_ground else rng.randrange(500, 41000, 25),
+            "alt_geom": rng.randrange(500, 41000, 25),
+            "gs": round(rng.uniform(0, 20) if on_ground else rng.uniform(120, 520), 1),
+            "track": round(rng.uniform(0, 360), 2),
+            "baro_rate": rng.randrange(-2000, 2000, 64),
+            "squawk": squawk,
+            "category": "A3",
+            "lat": round(rng.uniform(-60, 70), 6),
+            "lon": round(rng.uniform(-180, 180), 6),
+            "seen": round(rng.uniform(0, 10), 1),
+            "rssi": round(rng.uniform(-30, -3), 1),
+        })
+    for i, entry in enumerate(aircraft[:emergency_count]):
+        entry["squawk"] = EMERGENCY_SQUAWKS[i % len(EMERGENCY_SQUAWKS)]
+    return aircraft
+
+
+def _pad_snapshot(aircraft: list, count: int) -> list:
+    """Grow or shrink a recorded snapshot to `count` entries, minting new hex codes for clones."""
+    if not aircraft or count <= len(aircraft):
+        return aircraft[:count]
+    padded = list(aircraft)
+    i = 0
+    while len(padded) < count:
+        clone = dict(aircraft[i % len(aircraft)])
+        clone["hex"] = f"{(0x800000 + len(padded)) & 0xFFFFFF:06x}"
+        padded.append(clone)
+        i += 1
+    return padded
+
+
+def _build_faa_xml(generation: int) -> str:
+    """Build a small airport-status-information document that changes with `generation`."""
+    airports = _FAA_AIRPORTS[generation % 3:generation % 3 + 4]
+    ground = "".join(
+        f"<Ground_Delay><ARPT>{a}</ARPT><Reason>weather / thunderstorms</Reason>"
+        f"<Avg>{30 + generation % 5 * 7} minutes</Avg><Max>{60 + generation % 4 * 15} minutes</Max></Ground_Delay>"
+        for a in airports[:2]
+    )
+    arrival = "".join(
+        f"<Delay><ARPT>{a}</ARPT><Reason>volume</Reason><Arrival_Departure Type=\"Arrival\">"
+        f"<Min>16 minutes</Min><Max>{30 + generation % 3 * 15} minutes</Max><Trend>Increasing</Trend>"
+        f"</Arrival_Departure></Delay>"
+        for a in airports[2:]
+    )
+    closure = (
+        f"<Airport><ARPT>{_FAA_AIRPORTS[-1]}</ARPT><Reason>{escape('!BOS 01/001 BOS AD AP CLSD')}</Reason>"
+        f"<Start>Jan 01 at 00:00 UTC.</Start><Reopen>Jan 02 at 06:00 UTC.</Reopen></Airport>"
+    )
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?><AIRPORT_STATUS_INFORMATION>"
+        f"<Update_Time>Replay generation {generation}</Update_Time>"
+        f"<Delay_type><Name>Ground Delay Programs</Name><Ground_Delay_List>{ground}</Ground_Delay_List></Delay_type>"
+        f"<Delay_type><Name>Arrival/Departure Delay Info</Name><Arrival_Departure_Delay_List>{arrival}</Arrival_Departure_Delay_List></Delay_type>"
+        f"<Delay_type><Name>Airport Closures</Name><Airport_Closure_List>{closure}</Airport_Closure_List></Delay_type>"
+        "</AIRPORT_STATUS_INFORMATION>"
+    )
+
+
+class AirplanesLiveStandin:
+    """aiohttp stand-in for airplanes.live, planespotters.net and nasstatus.faa.gov."""
+
+    def __init__(self, options: Optional[StandinOptions] = None):
+        self.options = options or StandinOptions()
+        self._rng = random.Random(self.options.seed)
+        self._runner = None
+        self.base_url = None
+
+        # Per-endpoint request counters, reset by the replay driver between cycles.
+        self.calls = Counter()
+        self.status_counts = Counter()
+        self.bytes_sent = 0
+
+        self.generation = 0
+        self._faa_xml_fixture = None
+        self._photo_fixture = None
+        self.aircraft = self._load_snapshot()
+        self._by_hex = {}
+        self._body_cache = {}
+        self._reindex()
+
+    def _load_snapshot(self) -> list:
+        """Load the recorded snapshot (and other fixtures) or build a synthetic one."""
+        aircraft = None
+        fixtures_dir = self.options.fixtures_dir
+        if fixtures_dir:
+            fixtures_dir = Path(fixtures_dir)
+            snapshot_path = fixtures_dir / "all_with_pos.json"
+            if snapshot_path.exists():
+                recorded = json.loads(snapshot_path.read_text(encoding="utf-8"))
+                aircraft = recorded.get("aircraft") or recorded.get("ac") or []
+            faa_path = fixtures_dir / "nasstatus.xml"
+            if faa_path.exists():
+                self._faa_xml_fixture = faa_path.read_text(encoding="utf-8")
+            photo_path = fixtures_dir / "planespotters.json"
+            if photo_path.exists():
+                self._photo_fixture = json.loads(photo_path.read_text(encoding="utf-8"))
+
+        if aircraft is None:
+            count = self.options.aircraft_count or DEFAULT_SYNTHETIC_AIRCRAFT
+            return synthetic_aircraft(count, self._rng, self.options.emergency_count)
+        if self.options.aircraft_count:
+            aircraft = _pad_snapshot(aircraft, self.options.aircraft_count)
+        return aircraft
+
+    def _reindex(self):
+        """Rebuild lookup tables and drop cached bodies after the snapshot changes."""
+        self._by_hex = {(a.get("hex") or "").lower(): a for a in self.aircraft}
+        self._body_cache = {}
+
+    def advance_cycle(self):
+        """Move every aircraft one loop interval forward and flip a few takeoff/landing states."""
+        self.generation += 1
+        rng = self._rng
+        for entry in self.aircraft:
+            lat = entry.get("lat")
+            lon = entry.get("lon")
+            if lat is None or lon is None:
+                continue
+            if entry.get("alt_baro") == "ground":
+                if rng.random() < 0.05:
+                    entry["alt_baro"] = rng.randrange(500, 3000, 25)
+                    entry["gs"] = round(rng.uniform(140, 200), 1)
+                continue
+            if rng.random() < 0.02:
+                entry["alt_baro"] = "ground"
+                entry["gs"] = round(rng.uniform(0, 20), 1)
+                continue
+            distance_deg = float(entry.get("gs") or 0) * CYCLE_SECONDS / 3600 / 60
+            track = math.radians(float(entry.get("track") or 0))
+            entry["lat"] = round(max(-85.0, min(85.0, lat + distance_deg * math.cos(track))), 6)
+            entry["lon"] = round((lon + distance_deg * math.sin(track) + 180) % 360 - 180, 6)
+        self._reindex()
+
+    def reset_counters(self):
+        """Clear request counters (called between replay cycles)."""
+        self.calls.clear()
+        self.status_counts.clear()
+        self.bytes_sent = 0
+
+    # ------------------------------------------------------------------ server
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        app = web.Application()
+        app.router.add_get("/", self._handle_rest)
+        app.router.add_get("/v2/{kind}", self._handle_v2)
+        app.router.add_get("/v2/{kind}/{value}", self._handle_v2)
+        app.router.add_get("/pub/photos/{kind}/{value}", self._handle_photo)
+        app.router.add_get("/api/airport-status-information", self._handle_faa)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _throttle(self, endpoint: str):
+        """Apply latency and random 429s; returns a response when the request is rate limited."""
+        self.calls[endpoint] += 1
+        delay = self.options.latency_ms
+        if self.options.latency_jitter_ms:
+            delay += self._rng.uniform(0, self.options.latency_jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.options.rate_limit_probability and self._rng.random() < self.options.rate_limit_probability:
+            self.status_counts[429] += 1
+            return web.json_response({"msg": "You have exceeded the rate limit"}, status=429)
+        return None
+
+    def _json(self, payload, cache_key=None, status=200):
+        """Serialize a payload (optionally cached for the current generation) and count its size."""
+        body = self._body_cache.get(cache_key) if cache_key else None
+        if body is None:
+            body = json.dumps(payload, separators=(",", ":")).encode()
+            if cache_key:
+                self._body_cache[cache_key] = body
+        self.status_counts[status] += 1
+        self.bytes_sent += len(body)
+        return web.Response(body=body, status=status, content_type="application/json")
+
+    def _envelope(self, aircraft: list, key: str = "aircraft") -> dict:
+        now_ms = int(time.time() * 1000)
+        return {key: aircraft, "msg": "No error", "now": now_ms, "total": len(aircraft), "ctime": now_ms, "ptime": 0}
+
+    def _circle(self, spec: str) -> list:
+        lat, lon, radius = (float(part) for part in spec.split(",")[:3])
+        return [
+            a for a in self.aircraft
+            if a.get("lat") is not None and a.get("lon") is not None
+            and haversine_nm(lat, lon, a["lat"], a["lon"]) <= radius
+        ]
+
+    async def _handle_rest(self, request: web.Request) -> web.Response:
+        """Primary REST API: `/?all_with_pos`, `filter_squawk`, `circle`, `find_hex`."""
+        query = request.query
+        if "find_hex" in query:
+            endpoint = "find_hex"
+        elif "circle" in query:
+            endpoint = "circle"
+        elif "filter_squawk" in query:
+            endpoint = "filter_squawk"
+        elif "all_with_pos" in query:
+            endpoint = "all_with_pos"
+        else:
+            endpoint = "other"
+        limited = await self._throttle(endpoint)
+        if limited is not None:
+            return limited
+
+        try:
+            if endpoint == "find_hex":
+                match = self._by_hex.get(query["find_hex"].lower())
+                return self._json(self._envelope([match] if match else []))
+            if endpoint == "circle":
+                return self._json(self._envelope(self._circle(query["circle"])))
+            if endpoint == "filter_squawk":
+                squawk = query["filter_squawk"]
+                return self._json(
+                    self._envelope([a for a in self.aircraft if a.get("squawk") == squawk]),
+                    cache_key=f"squawk:{squawk}",
+                )
+            if endpoint == "all_with_pos":
+                return self._json(self._envelope(self.aircraft), cache_key="all_with_pos")
+        except (KeyError, ValueError):
+            return self._json({"msg": "bad request"}, status=400)
+        return self._json({"msg": "unsupported query"}, status=400)
+
+    async def _handle_v2(self, request: web.Request) -> web.Response:
+        """Fallback API: `/v2/hex/<hex>`, `/v2/squawk/<code>`, `/v2/mil` and friends."""
+        kind = request.match_info["kind"]
+        value = request.match_info.get("value", "")
+        limited = await self._throttle(f"v2_{kind}")
+        if limited is not None:
+            return limited
+        if kind == "hex":
+            match = self._by_hex.get(value.lower())
+            return self._json(self._envelope([match] if match else [], key="ac"))
+        if kind == "squawk":
+            return self._json(self._envelope([a for a in self.aircraft if a.get("squawk") == value], key="ac"))
+        return self._json(self._envelope([], key="ac"))
+
+    async def _handle_photo(self, request: web.Request) -> web.Response:
+        """planespotters.net `/pub/photos/hex/<hex>` and `/pub/photos/reg/<reg>`."""
+        kind = request.match_info["kind"]
+        value = request.match_info["value"]
+        limited = await self._throttle(f"planespotters_{kind}")
+        if limited is not None:
+            return limited
+        # Hash rather than RNG so repeated lookups for one aircraft agree.
+        if zlib.crc32(value.upper().encode()) % 1000 >= self.options.photo_hit_rate * 1000:
+            return self._json({"photos": []})
+        if self._photo_fixture is not None:
+            return self._json(self._photo_fixture)
+        return self._json({
+            "photos": [{
+                "id": f"{zlib.crc32(value.encode()):08x}",
+                "thumbnail": {"src": f"https://t.plnspttrs.net/replay/{value}_s.jpg", "size": {"width": 200, "height": 133}},
+                "thumbnail_large": {"src": f"https://t.plnspttrs.net/replay/{value}_l.jpg", "size": {"width": 420, "height": 280}},
+                "link": f"https://www.planespotters.net/photo/replay/{value}",
+                "photographer": "Replay Photographer",
+            }]
+        })
+
+    async def _handle_faa(self, request: web.Request) -> web.Response:
+        """nasstatus.faa.gov airport status XML, changing every `faa_change_every` cycles."""
+        limited = await self._throttle("nasstatus")
+        if limited is not None:
+            return limited
+        if self._faa_xml_fixture is not None:
+            body = self._faa_xml_fixture
+        else:
+            every = self.options.faa_change_every
+            body = _build_faa_xml(self.generation // every if every else 0)
+        encoded = body.encode()
+        self.status_counts[200] += 1
+        self.bytes_sent += len(encoded)
+        return web.Response(body=encoded, content_type="application/xml")
+
+
+async def record_fixtures(directory: Path, api_url: str = "https://api.airplanes.live", user_agent: Optional[str] = None):
+    """Record live responses into `directory` for later offline replay."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    headers = {"User-Agent": user_agent or "SkySearchBot/1.0 (+https://github.com/ben-cogs/skysearch)"}
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+        async with session.get(f"{api_url}/?all_with_pos") as response:
+            response.raise_for_status()
+            snapshot = await response.json(content_type=None)
+        (directory / "all_with_pos.json").write_text(json.dumps(snapshot), encoding="utf-8")
+
+        async with session.get("https://nasstatus.faa.gov/api/airport-status-information") as response:
+            if response.status == 200:
+                (directory / "nasstatus.xml").write_text(await response.text(), encoding="utf-8")
+
+        aircraft = snapshot.get("aircraft") or snapshot.get("ac") or []
+        for entry in aircraft[:25]:
+            hex_id = entry.get("hex")
+            if not hex_id:
+                continue
+            async with session.get(f"https://api.planespotters.net/pub/photos/hex/{hex_id}") as response:
+                if response.status != 200:
+                    continue
+                photos = await response.json(content_type=None)
+            if photos.get("photos"):
+                (directory / "planespotters.json").write_text(json.dumps(photos), encoding="utf-8")
+                break
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the SkySearch stand-in APIs locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of recorded fixtures")
+    parser.add_argument("--record", action="store_true", help="Record live fixtures into --fixtures and exit")
+    parser.add_argument("--aircraft", type=int, default=None, help="Snapshot size (pads or trims recordings)")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Probability of answering 429")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        if not args.fixtures:
+            parser.error("--record needs --fixtures")
+        asyncio.run(record_fixtures(args.fixtures))
+        return
+
+    options = StandinOptions(
+        aircraft_count=args.aircraft,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        rate_limit_probability=args.rate_limit,
+        fixtures_dir=args.fixtures,
+    )
+
+    async def serve():
+        standin = AirplanesLiveStandin(options)
+        base_url = await standin.start(args.host, args.port)
+        print(f"Stand-in serving {len(standin.aircraft)} aircraft at {base_url}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await standin.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,10 @@ import aiohttp
 import re
 from discord.ext import commands
 from redbot.core.i18n import Translator, cog_i18n
-from ..utils.stats import build_stats_embed, build_stats_charts, build_stats_config_embed
+from ..utils.stats import build_stats_embed, build_stats_charts, build_stats_chart_files, build_stats_config_embed, StatsChartCache
+from ..utils.charts import HAS_PILLOW
+from ..utils.perf import build_perf_embed
+from ..api.command_profiler import build_profile_embed
 
 _ = Translator("Skysearch", __file__)
 
@@ -20,6 +23,7 @@ class AdminCommands:
     
     def __init__(self, cog):
         self.cog = cog
+        self._chart_cache = StatsChartCache()
     
     async def set_alert_channel(self, ctx, channel: discord.TextChannel = None):
         """Set or clear a channel to send emergency squawk alerts to. Clear with no channel."""
@@ -805,6 +809,13 @@ class AdminCommands:
         api_stats = self.cog.api.get_request_stats()
         embed = build_stats_embed(api_stats, _)
         await ctx.send(embed=embed)
+        if HAS_PILLOW:
+            # Rendered locally; cached while the charted aggregates are unchanged
+            charts = await self._chart_cache.get(api_stats)
+            chart_embeds, chart_files = build_stats_chart_files(charts)
+            if chart_embeds:
+                await ctx.send(embeds=chart_embeds, files=chart_files)
+            return
         chart_embeds = build_stats_charts(api_stats, _)
         if chart_embeds:
             try:
@@ -819,6 +830,7 @@ class AdminCommands:
     async def apistats_reset(self, ctx):
         """Reset API request statistics."""
         self.cog.api.reset_request_stats()
+        self._chart_cache.invalidate()
         embed = discord.Embed(
             title="🔄 API Statistics Reset",
             description="All API request statistics have been reset to zero.",
@@ -955,6 +967,123 @@ class AdminCommands:
                 color=0xff0000
             )
             await ctx.send(embed=embed)
+
+    async def perf_report(self, ctx, action: str = None, value: str = None):
+        """Show timing percentiles for background loops and API requests, reset them, or toggle span export."""
+        perf = self.cog.perf
+        action = (action or "").lower()
+        if action == "reset":
+            perf.reset()
+            embed = discord.Embed(
+                title="🔄 Performance Timings Reset",
+                description="All rolling timing histograms have been cleared.",
+                color=0xffaa00
+            )
+            await ctx.send(embed=embed)
+            return
+        if action == "export":
+            state = (value or "").lower()
+            if state not in ("on", "off"):
+                current = "on" if perf.export_path else "off"
+                await ctx.send(f"Span export is **{current}**. Use `skysearch perf export on|off`.")
+                return
+            if state == "on":
+                path = self.cog.get_perf_export_path()
+                perf.enable_export(path)
+                await self.cog.config.perf_export.set(True)
+                await ctx.send(f"✅ Exporting timing spans (OTLP JSON lines) to `{path}`.")
+            else:
+                perf.disable_export()
+                await self.cog.config.perf_export.set(False)
+                await ctx.send("✅ Span export disabled.")
+            return
+        if action:
+            await ctx.send("Usage: `skysearch perf [reset | export on|off]`")
+            return
+        await ctx.send(embed=build_perf_embed(perf.summaries(), perf.export_path))
+
+    async def profile_report(self, ctx, arguments: str = None):
+        """Show per-command latency percentiles and phase breakdowns, reset them, or toggle slow-command sampling."""
+        profiler = self.cog.command_api.profiler
+        parts = (arguments or "").split()
+        action = parts[0].lower() if parts else ""
+        if action == "reset":
+            profiler.reset()
+            embed = discord.Embed(
+                title="🔄 Command Latency Reset",
+                description="All per-command latency histograms have been cleared.",
+                color=0xffaa00
+            )
+            await ctx.send(embed=embed)
+            return
+        if action == "sampling":
+            state = parts[1].lower() if len(parts) > 1 else ""
+            if state == "on":
+                threshold = await self.cog.config.profile_threshold()
+                if len(parts) > 2:
+                    try:
+                        threshold = float(parts[2])
+                    except ValueError:
+                        await ctx.send("❌ Threshold must be a number of seconds.")
+                        return
+                    if threshold <= 0:
+                        await ctx.send("❌ Threshold must be greater than 0 seconds.")
+                        return
+                    await self.cog.config.profile_threshold.set(threshold)
+                path = self.cog.get_profile_path()
+                profiler.enable_sampling(path, threshold)
+                await self.cog.config.profile_sampling.set(True)
+                await ctx.send(
+                    f"✅ Commands slower than {threshold:g}s will be sampled (cProfile stats and stack snapshots) to `{path}`."
+                )
+            elif state == "off":
+                profiler.disable_sampling()
+                await self.cog.config.profile_sampling.set(False)
+                await ctx.send("✅ Slow command sampling disabled.")
+            else:
+                current = f"on (threshold {profiler.threshold:g}s)" if profiler.sampling else "off"
+                await ctx.send(f"Slow command sampling is **{current}**. Use `skysearch profile sampling on|off [seconds]`.")
+            return
+        # Anything else is a command name, e.g. `skysearch profile aircraft icao`
+        await ctx.send(embed=build_profile_embed(profiler, " ".join(parts) or None))
+
+    async def cluster_mode(self, ctx, state: str = None):
+        """Toggle or show leader/peer sharing of upstream snapshots across bot processes."""
+        cluster = self.cog.cluster
+        state = (state or "").lower()
+        if state == "on":
+            if not cluster.enable(self.cog.get_cluster_path()):
+                await ctx.send("❌ Cluster mode needs `fcntl` lock files and is not available on this platform.")
+                return
+            await self.cog.config.cluster_mode.set(True)
+            await ctx.send(
+                "✅ Cluster mode enabled. Every process that loads SkySearch with this setting shares one "
+                "airplanes.live/FAA fetcher. Reload the cog on the other processes to pick it up."
+            )
+            return
+        if state == "off":
+            cluster.disable()
+            await self.cog.config.cluster_mode.set(False)
+            await ctx.send("✅ Cluster mode disabled. This process now polls the APIs on its own.")
+            return
+        if state:
+            await ctx.send("Usage: `skysearch cluster [on|off]`")
+            return
+
+        status = cluster.status()
+        embed = discord.Embed(title="🛰️ Cluster Snapshot Sharing", color=0xfffffe)
+        embed.add_field(name="Enabled", value="Yes" if status["enabled"] else "No", inline=True)
+        embed.add_field(name="Role", value="Leader" if status["leader"] else "Peer", inline=True)
+        embed.add_field(name="Process", value=f"`{status['pid']}` (leader `{status['leader_pid'] or 'none'}`)", inline=True)
+        embed.add_field(name="Fetched here", value=f"{status['fetched_locally']:,}", inline=True)
+        embed.add_field(name="From leader", value=f"{status['served_from_peer']:,}", inline=True)
+        embed.add_field(name="Fallback fetches", value=f"{status['fallback_fetches']:,}", inline=True)
+        embed.add_field(name="Guilds evaluated here", value=f"{len(self.cog.bot.guilds):,}", inline=True)
+        if status["directory"]:
+            embed.set_footer(text=f"Shared directory: {status['directory']}")
+        if not status["supported"]:
+            embed.description = "Not available on this platform (no fcntl)."
+        await ctx.send(embed=embed)
     
     async def add_custom_alert(self, ctx, alert_type: str, value: str, cooldown: int = 5, channel: discord.TextChannel = None, role: discord.Role = None):
         """Add a custom alert for specific aircraft or squawks.
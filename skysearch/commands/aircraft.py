@@ -3,8 +3,9 @@ Aircraft commands for SkySearch cog
 """
 
 
-import asyncio
 import datetime
+import io
+import time
 import json
 import os
 import logging
@@ -14,14 +15,19 @@ from redbot.core import commands as red_commands
 from redbot.core.i18n import Translator, cog_i18n
 
 from ..utils.api import APIManager
-from ..utils.helpers import HelperUtils
+from ..utils.helpers import HelperUtils, WATCHLIST_IMPORT_MAX_BYTES, WATCHLIST_MAX_ITEMS
 from ..utils.export import ExportManager
+from ..utils.paginator import AircraftPaginator
+from ..utils.geo import API_MAX_RADIUS_NM, PositionIndex, bbox_centre, haversine_nm
+from ..utils.geofence import PreparedFence, parse_polygon
 
 log = logging.getLogger("red.skysearch")
 
 # Internationalization
 _ = Translator("Skysearch", __file__)
 
+NEAREST_MAX_RESULTS = 50
+
 
 @cog_i18n(_)
 class AircraftCommands:
@@ -96,11 +102,9 @@ class AircraftCommands:
         # Print endpoint and masked API key
         await self._debug_api_info(ctx, url)
         try:
-            import time
             start = time.monotonic()
             response = await self.api.make_request(url, ctx)
             elapsed = time.monotonic() - start
-            import json
             if response:
                 pretty = json.dumps(response, indent=2)[:1900]  # Truncate to stay under Discord's 2000 char limit and avoid errors
                 await ctx.send(f"[DEBUG] Raw API response (truncated):\n```json\n{pretty}\n```\n⏱️ API Latency: {elapsed:.2f} seconds")
@@ -246,367 +250,182 @@ class AircraftCommands:
             embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
             await ctx.send(embed=embed)
 
-    async def show_military_aircraft(self, ctx):
-        """Get information about military aircraft."""
-        url = f"/?all_with_pos&filter_mil"
+    async def _paginate_feed(self, ctx, url, title, per_page=1):
+        """Fetch a filtered feed once and page through it with the shared paginator."""
         response = await self.api.make_request(url, ctx)
-        if response:
-            aircraft_list = response.get('aircraft', [])
-            if aircraft_list:
-                page_index = 0
-
-                async def create_embed(aircraft):
-                    embed = discord.Embed(title=f"Live military aircraft ({page_index + 1} of {len(aircraft_list)})", color=0xfffffe)
-                    embed.set_thumbnail(url="attachment://defaultairplane.png")
-                    aircraft_description = aircraft.get('desc', 'N/A')  # Aircraft Description
-                    aircraft_squawk = aircraft.get('squawk', 'N/A')  # Squawk
-                    aircraft_lat = aircraft.get('lat', 'N/A')  # Latitude
-                    aircraft_lon = aircraft.get('lon', 'N/A')  # Longitude
-                    aircraft_heading = aircraft.get('heading', 'N/A')  # Heading
-                    aircraft_speed = aircraft.get('spd', 'N/A')  # Speed
-                    aircraft_hex = aircraft.get('hex', 'N/A').upper()  # Hex 
-
-                    embed.description = f"# {aircraft_description}"
-                    embed.add_field(name="Squawk", value=f"**`{aircraft_squawk}`**", inline=True)
-                    embed.add_field(name="Latitude", value=f"**`{aircraft_lat}`**", inline=True)
-                    embed.add_field(name="Longitude", value=f"**`{aircraft_lon}`**", inline=True)
-                    embed.add_field(name="Heading", value=f"**`{aircraft_heading}`**", inline=True)
-                    embed.add_field(name="Speed", value=f"**`{aircraft_speed}`**", inline=True)
-                    embed.add_field(name="ICAO", value=f"**`{aircraft_hex}`**", inline=True)
-
-                    # Create temporary aircraft data for photo lookup
-                    temp_aircraft_data = {'hex': aircraft_hex}
-                    photo_url, photographer, photo_err = await self.helpers.get_photo_by_aircraft_data(temp_aircraft_data)
-                    if photo_url:
-                        embed.set_image(url=photo_url)
-                        if photographer:
-                            embed.set_footer(text=f"Photo by {photographer}")
-                    return embed
-
-                async def update_message(message, page_index):
-                    embed = await create_embed(aircraft_list[page_index])
-                    await message.edit(embed=embed)
-
-                embed = await create_embed(aircraft_list[page_index])
-                message = await self.helpers.send_embed_with_default_thumbnail(ctx, embed)
-
-                await message.add_reaction("⬅️")
-                await message.add_reaction("❌")
-                await message.add_reaction("➡️")
-                
-                def check(reaction, user):
-                    return user == ctx.author and str(reaction.emoji) in ["⬅️", "❌", "➡️"]
-
-                while True:
-                    try:
-                        reaction, user = await self.cog.bot.wait_for("reaction_add", timeout=60.0, check=check)
-
-                        if str(reaction.emoji) == "⬅️" and page_index > 0:
-                            page_index -= 1
-                            await update_message(message, page_index)
-                        elif str(reaction.emoji) == "➡️" and page_index < len(aircraft_list) - 1:
-                            page_index += 1
-                            await update_message(message, page_index)
-                        elif str(reaction.emoji) == "❌":
-                            await message.delete()
-                            break
-
-                        await message.remove_reaction(reaction, user)
-                    except asyncio.TimeoutError:
-                        await message.clear_reactions()
-                        break
-            else:
-                await self.send_aircraft_info(ctx, response)
-        else:
+        if not response:
             embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
             await ctx.send(embed=embed)
+            return
+        aircraft_list = response.get('aircraft') or response.get('ac') or []
+        await self._paginate_list(ctx, aircraft_list, title, per_page)
 
-    async def ladd_aircraft(self, ctx):
-        """Get information on LADD-restricted aircraft."""
-        url = f"/?all_with_pos&filter_ladd"
-        response = await self.api.make_request(url, ctx)
-        if response:
-            if 'aircraft' in response and len(response['aircraft']) > 1:
-                pages = [response['aircraft'][i:i + 10] for i in range(0, len(response['aircraft']), 10)]  # Split aircraft list into pages of 10
-                page_index = 0
-                
-                while True:
-                    embed = discord.Embed(title=f"Limited Aircraft Data Displayed (Page {page_index + 1}/{len(pages)})", color=0xfffffe)
-                    embed.set_thumbnail(url="attachment://defaultairplane.png")
-                    
-                    for aircraft in pages[page_index]:
-                        aircraft_description = aircraft.get('desc', 'N/A')  # Aircraft Description
-                        aircraft_squawk = aircraft.get('squawk', 'N/A')  # Squawk
-                        aircraft_lat = aircraft.get('lat', 'N/A')  # Latitude
-                        aircraft_lon = aircraft.get('lon', 'N/A')  # Longitude
-                        aircraft_heading = aircraft.get('heading', 'N/A')  # Heading
-                        aircraft_speed = aircraft.get('spd', 'N/A')  # Speed
-                        aircraft_hex = aircraft.get('hex', 'N/A')  # Hex
-
-                        aircraft_info = f"**Squawk:** {aircraft_squawk}\n"
-                        aircraft_info += f"**Coordinates:** Lat: {aircraft_lat}, Lon: {aircraft_lon}\n"
-                        aircraft_info += f"**Heading:** {aircraft_heading}\n"
-                        aircraft_info += f"**Speed:** {aircraft_speed}\n"
-                        aircraft_info += f"**ICAO:** {aircraft_hex}"
-
-                        embed.add_field(name=aircraft_description, value=aircraft_info, inline=False)
-
-                    message = await self.helpers.send_embed_with_default_thumbnail(ctx, embed)
-                    await message.add_reaction("⬅️")  # Adding a reaction to scroll to the previous page
-                    await message.add_reaction("❌")  # Adding a reaction to close
-                    await message.add_reaction("➡️")  # Adding a reaction to scroll to the next page
+    async def _paginate_list(self, ctx, aircraft_list, title, per_page=1):
+        """Page through an aircraft list, or send the single result (or "no results") directly."""
+        if len(aircraft_list) <= 1:
+            await self.send_aircraft_info(ctx, {'aircraft': aircraft_list})
+            return
+        paginator = AircraftPaginator(self.helpers, ctx.author, aircraft_list, title=title, per_page=per_page)
+        await paginator.start(ctx)
 
-                    def check(reaction, user):
-                        return user == ctx.author and str(reaction.emoji) in ['⬅️', '❌', '➡️']
+    async def show_military_aircraft(self, ctx):
+        """Get information about military aircraft."""
+        await self._paginate_feed(ctx, "/?all_with_pos&filter_mil", "Live military aircraft")
 
-                    try:
-                        reaction, user = await self.cog.bot.wait_for('reaction_add', timeout=60.0, check=check)
-                        await message.remove_reaction(reaction, user)
-                        
-                        if str(reaction.emoji) == '⬅️' and page_index > 0:
-                            await message.delete()
-                            page_index -= 1
-                        elif str(reaction.emoji) == '➡️' and page_index < len(pages) - 1:
-                            await message.delete()
-                            page_index += 1
-                        elif str(reaction.emoji) == '❌':
-                            await message.delete()
-                            break
-                        else:
-                            await message.delete()
-                            break
-                    except asyncio.TimeoutError:
-                        await message.delete()
-                        break
-            else:
-                await self.send_aircraft_info(ctx, response)
-        else:
-            embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
-            await ctx.send(embed=embed)
+    async def ladd_aircraft(self, ctx):
+        """Get information on LADD-restricted aircraft."""
+        await self._paginate_feed(ctx, "/?all_with_pos&filter_ladd", "Limited Aircraft Data Displayed", per_page=10)
 
     async def pia_aircraft(self, ctx):
         """View live aircraft using private ICAO addresses."""
-        url = f"/?all_with_pos&filter_pia"
-        response = await self.api.make_request(url, ctx)
-        if response:
-            if 'aircraft' in response and len(response['aircraft']) > 1:
-                pages = [response['aircraft'][i:i + 10] for i in range(0, len(response['aircraft']), 10)]  # Split aircraft list into pages of 10
-                page_index = 0
-                
-                while True:
-                    embed = discord.Embed(title=f"Private ICAO Aircraft Data Displayed (Page {page_index + 1}/{len(pages)})", color=0xfffffe)
-                    embed.set_thumbnail(url="attachment://defaultairplane.png")
-                    
-                    for aircraft in pages[page_index]:
-                        aircraft_description = aircraft.get('desc', 'N/A')  # Aircraft Description
-                        aircraft_squawk = aircraft.get('squawk', 'N/A')  # Squawk
-                        aircraft_lat = aircraft.get('lat', 'N/A')  # Latitude
-                        aircraft_lon = aircraft.get('lon', 'N/A')  # Longitude
-                        aircraft_heading = aircraft.get('heading', 'N/A')  # Heading
-                        aircraft_speed = aircraft.get('spd', 'N/A')  # Speed
-                        aircraft_hex = aircraft.get('hex', 'N/A')  # Hex
+        await self._paginate_feed(ctx, "/?all_with_pos&filter_pia", "Private ICAO Aircraft Data Displayed", per_page=10)
 
-                        aircraft_info = f"**Squawk:** {aircraft_squawk}\n"
-                        aircraft_info += f"**Coordinates:** Lat: {aircraft_lat}, Lon: {aircraft_lon}\n"
-                        aircraft_info += f"**Heading:** {aircraft_heading}\n"
-                        aircraft_info += f"**Speed:** {aircraft_speed}\n"
-                        aircraft_info += f"**ICAO:** {aircraft_hex}"
+    async def _parse_location(self, ctx, lat: str, lon: str, radius: str, max_radius: float = 500):
+        """Validate query coordinates and radius, sending an error embed and returning None if invalid."""
+        try:
+            lat_float = float(lat)
+            lon_float = float(lon)
+            radius_float = float(radius)
+        except ValueError:
+            embed = discord.Embed(title="Error", description="Invalid coordinates or radius. Please provide valid numbers.", color=0xff4545)
+            await ctx.send(embed=embed)
+            return None
 
-                        embed.add_field(name=aircraft_description, value=aircraft_info, inline=False)
+        if not (-90 <= lat_float <= 90):
+            error = "Latitude must be between -90 and 90 degrees."
+        elif not (-180 <= lon_float <= 180):
+            error = "Longitude must be between -180 and 180 degrees."
+        elif radius_float <= 0 or radius_float > max_radius:
+            error = f"Radius must be between 0 and {max_radius:g} nautical miles."
+        else:
+            return lat_float, lon_float, radius_float
+        embed = discord.Embed(title="Error", description=error, color=0xff4545)
+        await ctx.send(embed=embed)
+        return None
 
-                    message = await self.helpers.send_embed_with_default_thumbnail(ctx, embed)
-                    await message.add_reaction("⬅️")  # Adding a reaction to scroll to the previous page
-                    await message.add_reaction("❌")  # Adding a reaction to close
-                    await message.add_reaction("➡️")  # Adding a reaction to scroll to the next page
+    async def _position_index(self, ctx, lat: float, lon: float, radius: float, endpoint: str = "circle"):
+        """
+        Aircraft positions to answer a location query from.
 
-                    def check(reaction, user):
-                        return user == ctx.author and str(reaction.emoji) in ['⬅️', '❌', '➡️']
+        Uses the global snapshot kept fresh by the background loops, and only queries the API
+        (`circle=` or `closest=` around the point) when that snapshot is stale.
+        """
+        positions = self.cog.positions
+        index = positions.index()
+        if index is not None:
+            positions.stats["snapshot_queries"] += 1
+            return index
+        positions.stats["api_queries"] += 1
+        if endpoint == "circle":
+            radius = min(radius, API_MAX_RADIUS_NM)
+        url = f"{await self.api.get_api_url()}/?{endpoint}={lat},{lon},{radius:g}"
+        response = await self.api.make_request(url, ctx)
+        if not response:
+            return None
+        return PositionIndex(response.get('aircraft') or response.get('ac') or [], time.time(), radius_nm=radius)
 
-                    try:
-                        reaction, user = await self.cog.bot.wait_for('reaction_add', timeout=60.0, check=check)
-                        await message.remove_reaction(reaction, user)
-                        
-                        if str(reaction.emoji) == '⬅️' and page_index > 0:
-                            await message.delete()
-                            page_index -= 1
-                        elif str(reaction.emoji) == '➡️' and page_index < len(pages) - 1:
-                            await message.delete()
-                            page_index += 1
-                        elif str(reaction.emoji) == '❌':
-                            await message.delete()
-                            break
-                        else:
-                            await message.delete()
-                            break
-                    except asyncio.TimeoutError:
-                        await message.delete()
-                        break
-            else:
-                await self.send_aircraft_info(ctx, response)
-        else:
-            embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
-            await ctx.send(embed=embed)
+    async def _note_capped_search(self, ctx, index, radius_nm: float):
+        """Tell the user when an API fallback could search only part of the requested area."""
+        if index.radius_nm is not None and index.radius_nm < radius_nm:
+            await ctx.send(_("⚠️ The live snapshot is not available right now and airplanes.live searches at most {radius:g} nm around a point, so aircraft further than that from the centre may be missing.").format(radius=index.radius_nm))
 
     async def aircraft_within_radius(self, ctx, lat: str, lon: str, radius: str):
-        """Get information about aircraft within a specified radius."""
-        url = f"{await self.api.get_api_url()}/?circle={lat},{lon},{radius}"
-        response = await self.api.make_request(url, ctx)
-        if response:
-            await self.send_aircraft_info(ctx, response)
-        else:
+        """Get information about aircraft within a specified radius, nearest first."""
+        location = await self._parse_location(ctx, lat, lon, radius, max_radius=API_MAX_RADIUS_NM)
+        if location is None:
+            return
+        lat_float, lon_float, radius_float = location
+        index = await self._position_index(ctx, lat_float, lon_float, radius_float)
+        if index is None:
             embed = discord.Embed(title="Error", description="Error retrieving aircraft information for aircraft within the specified radius.", color=0xff4545)
             await ctx.send(embed=embed)
+            return
+        results = index.within(lat_float, lon_float, radius_float)
+        await self._paginate_list(ctx, results, _("Aircraft within {radius:g} nm").format(radius=radius_float))
 
     async def closest_aircraft(self, ctx, lat: str, lon: str, radius: str = "100"):
         """Find the closest aircraft to specified coordinates."""
-        # Validate input parameters
+        location = await self._parse_location(ctx, lat, lon, radius)
+        if location is None:
+            return
+        lat_float, lon_float, radius_float = location
+
+        index = await self._position_index(ctx, lat_float, lon_float, radius_float, endpoint="closest")
+        if index is None:
+            embed = discord.Embed(title=_("Error"), description=_("Error retrieving closest aircraft information."), color=0xff4545)
+            await ctx.send(embed=embed)
+            return
+        results = index.nearest(lat_float, lon_float, k=1, radius_nm=radius_float)
+        if not results:
+            embed = discord.Embed(title=_("No Aircraft Found"), description=_("No aircraft found within {radius} nautical miles of the specified location.").format(radius=radius), color=0xff4545)
+            await ctx.send(embed=embed)
+            return
+
+        aircraft_data = results[0]
+        image_url, photographer, photo_err = await self.helpers.get_photo_by_aircraft_data(aircraft_data)
+        embed = self.helpers.create_aircraft_embed(aircraft_data, image_url, photographer, photo_err)
+        embed.set_author(name=_("Closest Aircraft Found"))
+        embed.description = _("**Distance:** {distance} nautical miles\n**Direction:** {direction}° from your location").format(
+            distance=aircraft_data['dst'], direction=aircraft_data['dir']
+        )
+        view = self.helpers.create_aircraft_view_with_watchlist(aircraft_data)
+        await self.helpers.send_embed_with_default_thumbnail(ctx, embed, view=view)
+
+    async def nearest_aircraft(self, ctx, lat: str, lon: str, count: str = "5", radius: str = "250"):
+        """List the `count` aircraft nearest to specified coordinates (k-nearest)."""
+        location = await self._parse_location(ctx, lat, lon, radius)
+        if location is None:
+            return
+        lat_float, lon_float, radius_float = location
         try:
-            lat_float = float(lat)
-            lon_float = float(lon)
-            radius_float = float(radius)
-            
-            if not (-90 <= lat_float <= 90):
-                embed = discord.Embed(title="Error", description="Latitude must be between -90 and 90 degrees.", color=0xff4545)
-                await ctx.send(embed=embed)
-                return
-                
-            if not (-180 <= lon_float <= 180):
-                embed = discord.Embed(title="Error", description="Longitude must be between -180 and 180 degrees.", color=0xff4545)
-                await ctx.send(embed=embed)
-                return
-                
-            if radius_float <= 0 or radius_float > 500:
-                embed = discord.Embed(title="Error", description="Radius must be between 0 and 500 nautical miles.", color=0xff4545)
-                await ctx.send(embed=embed)
-                return
-                
+            k = int(count)
         except ValueError:
-            embed = discord.Embed(title="Error", description="Invalid coordinates or radius. Please provide valid numbers.", color=0xff4545)
+            k = 0
+        if not 1 <= k <= NEAREST_MAX_RESULTS:
+            embed = discord.Embed(title="Error", description=f"Count must be between 1 and {NEAREST_MAX_RESULTS}.", color=0xff4545)
             await ctx.send(embed=embed)
             return
 
-        # Use new REST API endpoint for closest aircraft search
-        url = f"{await self.api.get_api_url()}/?closest={lat},{lon},{radius}"
-        response = await self.api.make_request(url, ctx)
-        
-        if response and 'aircraft' in response and response['aircraft']:
-            aircraft_data = response['aircraft'][0]
-            
-            # Create a custom embed for closest aircraft with distance info
-            embed = discord.Embed(title="Closest Aircraft Found", color=0xfffffe)
-            embed.set_thumbnail(url="attachment://defaultairplane.png")
-            
-            # Add distance information if available
-            distance_nmi = aircraft_data.get('dst', 'Unknown')
-            direction_deg = aircraft_data.get('dir', 'Unknown')
-            
-            if distance_nmi != 'Unknown' and direction_deg != 'Unknown':
-                embed.description = _("**Distance:** {distance} nautical miles\n**Direction:** {direction}° from your location").format(distance=distance_nmi, direction=direction_deg)
-            
-            # Aircraft description
-            description = f"{aircraft_data.get('desc', 'N/A')}"
-            if aircraft_data.get('year', None) is not None:
-                description += f" ({aircraft_data.get('year')})"
-            embed.add_field(name="Aircraft", value=description, inline=False)
-            
-            # Basic aircraft info
-            callsign = aircraft_data.get('flight', 'N/A').strip()
-            if not callsign or callsign == 'N/A':
-                callsign = 'N/A'
-            embed.add_field(name="Callsign", value=f"{callsign}", inline=True)
-            
-            registration = aircraft_data.get('reg', None)
-            if registration is not None:
-                registration = registration.upper()
-                embed.add_field(name="Registration", value=f"{registration}", inline=True)
-            
-            icao = aircraft_data.get('hex', 'N/A').upper()
-            embed.add_field(name="ICAO", value=f"{icao}", inline=True)
-            
-            # Position
-            lat_pos = aircraft_data.get('lat', 'N/A')
-            lon_pos = aircraft_data.get('lon', 'N/A')
-            if lat_pos != 'N/A' and lon_pos != 'N/A':
-                lat_formatted = round(float(lat_pos), 4)
-                lon_formatted = round(float(lon_pos), 4)
-                embed.add_field(name="Position", value=f"{lat_formatted}, {lon_formatted}", inline=True)
-            
-            # Altitude
-            altitude = aircraft_data.get('alt_baro', 'N/A')
-            if altitude == 'ground':
-                embed.add_field(name="Status", value="On ground", inline=True)
-            elif altitude != 'N/A':
-                if isinstance(altitude, int):
-                    altitude = "{:,}".format(altitude)
-                altitude_feet = f"{altitude} ft"
-                embed.add_field(name="Altitude", value=f"{altitude_feet}", inline=True)
-            
-            # Speed
-            ground_speed_knots = aircraft_data.get('gs', 'N/A')
-            if ground_speed_knots != 'N/A':
-                ground_speed_mph = round(float(ground_speed_knots) * 1.15078)
-                embed.add_field(name="Speed", value=f"{ground_speed_mph} mph", inline=True)
-            
-            # Squawk
-            squawk_code = aircraft_data.get('squawk', 'N/A')
-            embed.add_field(name="Squawk", value=f"{squawk_code}", inline=True)
-            
-            # Emergency status
-            emergency_squawk_codes = ['7500', '7600', '7700']
-            if squawk_code in emergency_squawk_codes:
-                if squawk_code == '7500':
-                    emergency_status = "🚨 Aircraft reports it's been hijacked"
-                elif squawk_code == '7600':
-                    emergency_status = "🚨 Aircraft has lost radio contact"
-                elif squawk_code == '7700':
-                    emergency_status = "🚨 Aircraft has declared a general emergency"
-                embed.add_field(name="Emergency Status", value=emergency_status, inline=False)
-            
-            # Asset intelligence
-            if icao and icao.upper() in self.cog.law_enforcement_icao_set:
-                embed.add_field(name="Asset intelligence", value=":police_officer: Known for use by **state law enforcement**", inline=False)
-            if icao and icao.upper() in self.cog.military_icao_set:
-                embed.add_field(name="Asset intelligence", value=":military_helmet: Known for use in **military** and **government**", inline=False)
-            if icao and icao.upper() in self.cog.medical_icao_set:
-                embed.add_field(name="Asset intelligence", value=":hospital: Known for use in **medical response** and **transport**", inline=False)
-            if icao and icao.upper() in self.cog.suspicious_icao_set:
-                embed.add_field(name="Asset intelligence", value=":warning: Exhibits suspicious flight or **surveillance** activity", inline=False)
-            if icao and icao.upper() in self.cog.global_prior_known_accident_set:
-                embed.add_field(name="Asset intelligence", value=":boom: Prior involved in one or more **documented accidents**", inline=False)
-            if icao and icao.upper() in self.cog.ukr_conflict_set:
-                embed.add_field(name="Asset intelligence", value=":flag_ua: Utilized within the **[Russo-Ukrainian conflict](https://en.wikipedia.org/wiki/Russian-occupied_territories_of_Ukraine)**", inline=False)
-            if icao and icao.upper() in self.cog.newsagency_icao_set:
-                embed.add_field(name="Asset intelligence", value=":newspaper: Used by **news** or **media** organization", inline=False)
-            if icao and icao.upper() in self.cog.balloons_icao_set:
-                embed.add_field(name="Asset intelligence", value=":balloon: Aircraft is a **balloon**", inline=False)
-            if icao and icao.upper() in self.cog.agri_utility_set:
-                embed.add_field(name="Asset intelligence", value=":corn: Used for **agriculture surveys, easement validation, or land inspection**", inline=False)
-            
-            # Add photo if available
-            temp_aircraft_data = {'hex': icao}
-            image_url, photographer, photo_err = await self.helpers.get_photo_by_aircraft_data(temp_aircraft_data)
-            if image_url:
-                embed.set_thumbnail(url=image_url)
-                if photographer:
-                    embed.set_footer(text=f"Photo by {photographer}")
-                else:
-                    embed.set_footer(text="Photo available")
-            else:
-                # Set default aircraft image when no photo is available
-                embed.set_thumbnail(url="attachment://defaultairplane.png")
-                embed.set_footer(text="No photo available")
-            
-            # Create view with buttons including Add to Watchlist
-            view = self.helpers.create_aircraft_view_with_watchlist(aircraft_data)
-            
-            await self.helpers.send_embed_with_default_thumbnail(ctx, embed, view=view)
-            
-        elif response and 'aircraft' in response and not response['aircraft']:
-            embed = discord.Embed(title=_("No Aircraft Found"), description=_("No aircraft found within {radius} nautical miles of the specified location.").format(radius=radius), color=0xff4545)
+        index = await self._position_index(ctx, lat_float, lon_float, radius_float)
+        if index is None:
+            embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
             await ctx.send(embed=embed)
-        else:
-            embed = discord.Embed(title=_("Error"), description=_("Error retrieving closest aircraft information."), color=0xff4545)
+            return
+        await self._note_capped_search(ctx, index, radius_float)
+        results = index.nearest(lat_float, lon_float, k=k, radius_nm=radius_float)
+        await self._paginate_list(ctx, results, _("{count} nearest aircraft").format(count=len(results)), per_page=10)
+
+    async def aircraft_in_bbox(self, ctx, south: str, west: str, north: str, east: str):
+        """List aircraft inside a latitude/longitude box (west > east crosses the antimeridian)."""
+        try:
+            south_f, west_f, north_f, east_f = (float(v) for v in (south, west, north, east))
+        except ValueError:
+            embed = discord.Embed(title="Error", description="Invalid coordinates. Please provide valid numbers.", color=0xff4545)
+            await ctx.send(embed=embed)
+            return
+        if not (-90 <= south_f < north_f <= 90) or not (-180 <= west_f <= 180 and -180 <= east_f <= 180) or west_f == east_f:
+            embed = discord.Embed(
+                title="Error",
+                description="Use `south west north east` with south < north, latitudes within ±90 and longitudes within ±180.",
+                color=0xff4545
+            )
             await ctx.send(embed=embed)
+            return
+
+        centre_lat, centre_lon = bbox_centre(south_f, west_f, north_f, east_f)
+        # Radius of the circle around the box, for the API fallback
+        corner_nm = max(
+            haversine_nm(centre_lat, centre_lon, lat, lon)
+            for lat in (south_f, north_f) for lon in (west_f, east_f)
+        )
+        index = await self._position_index(ctx, centre_lat, centre_lon, corner_nm)
+        if index is None:
+            embed = discord.Embed(title="Error", description="Error retrieving aircraft information.", color=0xff4545)
+            await ctx.send(embed=embed)
+            return
+        await self._note_capped_search(ctx, index, corner_nm)
+        results = index.in_bbox(south_f, west_f, north_f, east_f)
+        await self._paginate_list(ctx, results, _("Aircraft in box ({count})").format(count=len(results)), per_page=10)
 
     async def scroll_planes(self, ctx, category: str = 'mil'):
         """Scroll through available planes with button-based pagination. Category: mil, ladd, pia, all."""
@@ -637,67 +456,8 @@ class AircraftCommands:
                 embed.add_field(name="Details", value="No aircraft information found or the response format is incorrect.", inline=False)
                 await ctx.send(embed=embed)
                 return
-            # Button-based pagination
-            from discord.ui import View, Button
-
-            class AircraftPaginator(View):
-                def __init__(self, aircraft_list, parent, ctx):
-                    super().__init__(timeout=120)
-                    self.aircraft_list = aircraft_list
-                    self.index = 0
-                    self.parent = parent
-                    self.ctx = ctx
-                    self.message = None
-                    self.update_buttons()
-                def update_buttons(self):
-                    self.clear_items()
-                    self.add_item(Button(label="Previous", style=discord.ButtonStyle.secondary, custom_id="prev", disabled=self.index == 0))
-                    self.add_item(Button(label="Next", style=discord.ButtonStyle.secondary, custom_id="next", disabled=self.index == len(self.aircraft_list) - 1))
-                    self.add_item(Button(label="Stop", style=discord.ButtonStyle.danger, custom_id="stop"))
-                async def send_or_edit(self):
-                    embed, view = await get_aircraft_embed_and_view(self.ctx, self.aircraft_list[self.index])
-                    self.update_buttons()
-                    if self.message:
-                        await self.message.edit(embed=embed, view=self)
-                    else:
-                        self.message = await self.parent.helpers.send_embed_with_default_thumbnail(self.ctx, embed, view=self)
-                async def interaction_check(self, interaction: discord.Interaction) -> bool:
-                    return interaction.user == self.ctx.author
-                @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary, custom_id="prev", row=0)
-                async def prev(self, interaction: discord.Interaction, button: Button):
-                    if self.index > 0:
-                        self.index -= 1
-                        await self.send_or_edit()
-                    await interaction.response.defer()
-                @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, custom_id="next", row=0)
-                async def next(self, interaction: discord.Interaction, button: Button):
-                    if self.index < len(self.aircraft_list) - 1:
-                        self.index += 1
-                        await self.send_or_edit()
-                    await interaction.response.defer()
-                @discord.ui.button(label="Stop", style=discord.ButtonStyle.danger, custom_id="stop", row=0)
-                async def stop(self, interaction: discord.Interaction, button: Button):
-                    await interaction.response.defer()
-                    await self.message.edit(content="Pagination stopped.", embed=None, view=None)
-                    self.stop()
-            async def get_aircraft_embed_and_view(ctx, aircraft_info):
-                icao_key = 'aircraft' if 'aircraft' in response else 'ac'
-                return await self._get_aircraft_embed_and_view(ctx, {icao_key: [aircraft_info]})
-            async def _get_aircraft_embed_and_view(self, ctx, response):
-                aircraft_list = response.get('aircraft') or response.get('ac')
-                if aircraft_list:
-                    aircraft_data = aircraft_list[0]
-                    image_url, photographer, photo_err = await self.helpers.get_photo_by_aircraft_data(aircraft_data)
-                    embed = self.helpers.create_aircraft_embed(aircraft_data, image_url, photographer, photo_err)
-                    view = self.helpers.create_aircraft_view_with_watchlist(aircraft_data)
-                    return embed, view
-                else:
-                    embed = discord.Embed(title='No results found for your query', color=discord.Colour(0xff4545))
-                    embed.add_field(name="Details", value="No aircraft information found or the response format is incorrect.", inline=False)
-                    return embed, None
-            self._get_aircraft_embed_and_view = _get_aircraft_embed_and_view.__get__(self)
-            paginator = AircraftPaginator(aircraft_list, self, ctx)
-            await paginator.send_or_edit()
+            paginator = AircraftPaginator(self.helpers, ctx.author, aircraft_list, title=f"Scrolling {category} aircraft")
+            await paginator.start(ctx)
         except Exception as e:
             embed = discord.Embed(title="Error", description=f"Error scrolling through planes: {e}", color=0xff4545)
             await ctx.send(embed=embed)
@@ -773,19 +533,7 @@ class AircraftCommands:
         if item_type is not None and value is None:
             value = item_type.upper()
             # Auto-detect type based on format
-            if value.isdigit() and len(value) == 4:
-                item_type = 'squawk'  # 4 digits = squawk code
-            elif all(c in '0123456789ABCDEFabcdef' for c in value) and len(value) == 6:
-                item_type = 'icao'  # 6 hex chars = ICAO
-            elif any(c.isalpha() for c in value) and value.replace('-', '').replace(' ', '').isalnum():
-                # Has letters + optional dashes/spaces = registration or callsign
-                # Check if it looks like a registration (usually short, with letter prefix)
-                if len(value) <= 6 and value[0].isalpha():
-                    item_type = 'reg'  # Likely a registration
-                else:
-                    item_type = 'callsign'  # Likely a callsign
-            else:
-                item_type = 'icao'  # Default fallback
+            item_type = self.helpers.detect_watchlist_item_type(value)
         
         # Validate arguments
         if item_type is None or value is None:
@@ -1054,6 +802,114 @@ class AircraftCommands:
         
         await ctx.send(embed=embed)
     
+    async def watchlist_import(self, ctx):
+        """
+        Import watchlist items from an attached CSV or JSON file in one update.
+        
+        REUSES: helpers.parse_watchlist_import, helpers.watchlist_bulk_update
+        """
+        attachments = [a for a in ctx.message.attachments if a.filename.lower().endswith(('.csv', '.json', '.txt'))]
+        if not attachments:
+            embed = discord.Embed(
+                title=_("Import Watchlist"),
+                description=_("Attach a `.csv` or `.json` file to the command message.\n\n"
+                              "**CSV:** one `type,value` row per item (e.g. `reg,N814AK`), or just a value per row to auto-detect the type.\n"
+                              "**JSON:** the `watchlist export` format, `{\"icao\": [\"A2F41D\"], \"reg\": [\"N814AK\"]}`, or a list of values."),
+                color=0xfffffe
+            )
+            await ctx.send(embed=embed)
+            return
+        attachment = attachments[0]
+        if attachment.size > WATCHLIST_IMPORT_MAX_BYTES:
+            embed = discord.Embed(
+                title=_("❌ File Too Large"),
+                description=_("Watchlist imports are limited to {size} KB.").format(size=WATCHLIST_IMPORT_MAX_BYTES // 1000),
+                color=0xff4545
+            )
+            await ctx.send(embed=embed)
+            return
+
+        try:
+            items, rejected = self.helpers.parse_watchlist_import(await attachment.read(), attachment.filename)
+        except (ValueError, UnicodeDecodeError) as e:
+            embed = discord.Embed(title=_("❌ Could Not Read File"), description=str(e)[:1000], color=0xff4545)
+            await ctx.send(embed=embed)
+            return
+
+        user_config = self.cog.config.user(ctx.author)
+        result = await self.helpers.watchlist_bulk_update(user_config, add=items)
+        await self._send_bulk_result(ctx, _("✅ Watchlist Imported"), result, rejected)
+
+    async def watchlist_export(self, ctx, file_format: str = "json"):
+        """Export the user's watchlist as a JSON or CSV file that `watchlist import` accepts."""
+        file_format = (file_format or "json").lower().lstrip(".")
+        if file_format not in ("json", "csv"):
+            embed = discord.Embed(title=_("❌ Invalid Format"), description=_("Format must be `json` or `csv`."), color=0xff4545)
+            await ctx.send(embed=embed)
+            return
+        user_config = self.cog.config.user(ctx.author)
+        watchlist = await self.helpers.get_all_watchlist_items(user_config)
+        total = sum(len(items) for items in watchlist.values() if isinstance(items, list))
+        data = self.helpers.export_watchlist(watchlist, file_format)
+        file = discord.File(io.BytesIO(data), filename=f"watchlist.{file_format}")
+        await ctx.send(_("Your watchlist ({count} items):").format(count=total), file=file)
+
+    async def watchlist_category(self, ctx, operation: str, category: str = None):
+        """
+        Combine the ICAO part of the watchlist with an aircraft category set from data/icao_codes.py.
+        
+        REUSES: helpers.get_aircraft_type_sets, helpers.watchlist_bulk_update
+        
+        - union: add every ICAO in the category
+        - intersect: keep only watched ICAOs that are in the category
+        - subtract: remove watched ICAOs that are in the category
+        """
+        type_sets = self.helpers.get_aircraft_type_sets()
+        category = (category or "").lower().strip()
+        if category not in type_sets:
+            embed = discord.Embed(
+                title=_("Invalid Aircraft Type"),
+                description=_("Usage: `watchlist {operation} <type>`\n\nAvailable types: {types}").format(
+                    operation=operation,
+                    types=", ".join(sorted(type_sets))
+                ),
+                color=0xff4545
+            )
+            await ctx.send(embed=embed)
+            return
+
+        icao_set = {icao.upper() for icao in type_sets[category]}
+        user_config = self.cog.config.user(ctx.author)
+        if operation == "union":
+            result = await self.helpers.watchlist_bulk_update(user_config, add={'icao': sorted(icao_set)})
+        elif operation == "intersect":
+            result = await self.helpers.watchlist_bulk_update(user_config, keep={'icao': icao_set})
+        else:
+            result = await self.helpers.watchlist_bulk_update(user_config, remove={'icao': icao_set})
+        await self._send_bulk_result(ctx, _("✅ Watchlist Updated"), result)
+
+    async def _send_bulk_result(self, ctx, title: str, result: dict, rejected: list = None):
+        """Summarize a watchlist_bulk_update result."""
+        embed = discord.Embed(
+            title=title,
+            description=_("**{added}** added, **{removed}** removed, **{total}** items in your watchlist.").format(**result),
+            color=0x00ff00
+        )
+        if result["existing"]:
+            embed.add_field(name=_("Already watched"), value=str(result["existing"]), inline=True)
+        if result["over_cap"]:
+            embed.add_field(
+                name=_("Skipped (watchlist full)"),
+                value=_("{count} items over the {limit} item limit").format(count=result["over_cap"], limit=WATCHLIST_MAX_ITEMS),
+                inline=True
+            )
+        if rejected:
+            preview = ", ".join(f"`{entry[:40]}`" for entry in rejected[:10])
+            if len(rejected) > 10:
+                preview += _(" and {count} more").format(count=len(rejected) - 10)
+            embed.add_field(name=_("Invalid entries ({count})").format(count=len(rejected)), value=preview[:1024], inline=False)
+        await ctx.send(embed=embed)
+
     async def watchlist_clear(self, ctx):
         """Clear the user's entire watchlist."""
         user_config = self.cog.config.user(ctx.author)
@@ -1191,14 +1047,32 @@ class AircraftCommands:
     # Geo-fence commands
     async def geofence_add(self, ctx, name: str, lat: float, lon: float, radius_nm: float, alert_on: str = "both", cooldown: int = 5, channel: discord.TextChannel = None, role: discord.Role = None):
         """Add a geo-fence alert. Notify when aircraft enter and/or leave the area."""
-        if alert_on.lower() not in ("entry", "exit", "both"):
-            embed = discord.Embed(title="❌ Invalid alert_on", description="Use: entry, exit, or both", color=0xff0000)
-            await ctx.send(embed=embed)
-            return
         if radius_nm <= 0 or radius_nm > 500:
             embed = discord.Embed(title="❌ Invalid radius", description="Radius must be 0-500 nautical miles.", color=0xff0000)
             await ctx.send(embed=embed)
             return
+        geometry = {"lat": lat, "lon": lon, "radius_nm": radius_nm}
+        await self._store_geofence(ctx, name, geometry, f"at ({lat}, {lon}), radius {radius_nm} nm", alert_on, cooldown, channel, role)
+
+    async def geofence_add_polygon(self, ctx, name: str, points: str, alert_on: str = "both", cooldown: int = 5, channel: discord.TextChannel = None, role: discord.Role = None):
+        """Add a polygon geo-fence from `lat,lon` points separated by `;` or spaces."""
+        try:
+            coords = parse_polygon(points)
+        except ValueError as e:
+            embed = discord.Embed(title="❌ Invalid polygon", description=str(e), color=0xff0000)
+            await ctx.send(embed=embed)
+            return
+        fence = PreparedFence({"shape": "polygon", "coords": coords})
+        centre_lat, centre_lon = bbox_centre(fence.south, fence.west, fence.north, fence.east)
+        # lat/lon hold the box centre, used for display and as a fallback position in exit alerts
+        geometry = {"shape": "polygon", "coords": coords, "lat": round(centre_lat, 4), "lon": round(centre_lon, 4)}
+        await self._store_geofence(ctx, name, geometry, f"polygon with {len(coords) // 2} points", alert_on, cooldown, channel, role)
+
+    async def _store_geofence(self, ctx, name: str, geometry: dict, summary: str, alert_on: str, cooldown: int, channel, role):
+        if alert_on.lower() not in ("entry", "exit", "both"):
+            embed = discord.Embed(title="❌ Invalid alert_on", description="Use: entry, exit, or both", color=0xff0000)
+            await ctx.send(embed=embed)
+            return
         if cooldown < 1 or cooldown > 1440:
             embed = discord.Embed(title="❌ Invalid cooldown", description="Cooldown must be 1-1440 minutes.", color=0xff0000)
             await ctx.send(embed=embed)
@@ -1212,9 +1086,7 @@ class AircraftCommands:
         geofence_alerts = await self.cog.config.guild(ctx.guild).geofence_alerts()
         geofence_alerts[fence_id] = {
             "name": name,
-            "lat": lat,
-            "lon": lon,
-            "radius_nm": radius_nm,
+            **geometry,
             "alert_on": alert_on.lower(),
             "cooldown": cooldown,
             "channel_id": channel.id,
@@ -1225,12 +1097,54 @@ class AircraftCommands:
         await self.cog.config.guild(ctx.guild).geofence_alerts.set(geofence_alerts)
         embed = discord.Embed(
             title="✅ Geo-fence added",
-            description=f"**{name}** at ({lat}, {lon}), radius {radius_nm} nm\nAlerts: {alert_on} | Cooldown: {cooldown}m | Channel: {channel.mention}",
+            description=f"**{name}** {summary}\nAlerts: {alert_on} | Cooldown: {cooldown}m | Channel: {channel.mention}",
             color=0x00ff00,
         )
         embed.add_field(name="ID", value=f"`{fence_id}`", inline=False)
         await ctx.send(embed=embed)
 
+    async def geofence_altitude(self, ctx, fence_id: str, min_alt: str = None, max_alt: str = None):
+        """Limit a geo-fence to an altitude band in feet (`none` for no limit; no values clears the band)."""
+        geofence_alerts = await self.cog.config.guild(ctx.guild).geofence_alerts()
+        if fence_id not in geofence_alerts:
+            await ctx.send(f"❌ Geo-fence `{fence_id}` not found.")
+            return
+        band = []
+        for value in (min_alt, max_alt):
+            if value is None or value.lower() in ("none", "-"):
+                band.append(None)
+                continue
+            try:
+                band.append(int(value))
+            except ValueError:
+                embed = discord.Embed(title="❌ Invalid altitude", description="Altitudes are whole feet, or `none`.", color=0xff0000)
+                await ctx.send(embed=embed)
+                return
+        if band[0] is not None and band[1] is not None and band[0] > band[1]:
+            embed = discord.Embed(title="❌ Invalid altitude", description="Minimum altitude must not exceed the maximum.", color=0xff0000)
+            await ctx.send(embed=embed)
+            return
+        fence = geofence_alerts[fence_id]
+        for field, value in zip(("min_alt", "max_alt"), band):
+            if value is None:
+                fence.pop(field, None)
+            else:
+                fence[field] = value
+        fence["aircraft_inside"] = {}  # Membership changes with the band; start fresh
+        await self.cog.config.guild(ctx.guild).geofence_alerts.set(geofence_alerts)
+        await ctx.send(f"✅ **{fence.get('name', fence_id)}** altitude band: {self._format_altitude_band(fence)}.")
+
+    @staticmethod
+    def _format_altitude_band(fence: dict) -> str:
+        min_alt, max_alt = fence.get("min_alt"), fence.get("max_alt")
+        if min_alt is None and max_alt is None:
+            return "any altitude"
+        if max_alt is None:
+            return f"at or above {min_alt:,} ft"
+        if min_alt is None:
+            return f"at or below {max_alt:,} ft"
+        return f"{min_alt:,}-{max_alt:,} ft"
+
     async def geofence_remove(self, ctx, fence_id: str):
         """Remove a geo-fence alert by ID."""
         geofence_alerts = await self.cog.config.guild(ctx.guild).geofence_alerts()
@@ -1255,9 +1169,13 @@ class AircraftCommands:
             ch_mention = ch.mention if ch else str(fence.get("channel_id"))
             role_id = fence.get("role_id")
             role_mention = f"<@&{role_id}>" if role_id else "—"
+            if fence.get("shape") == "polygon":
+                area = f"Polygon, {len(fence.get('coords', [])) // 2} points around ({fence.get('lat')}, {fence.get('lon')})"
+            else:
+                area = f"({fence.get('lat')}, {fence.get('lon')}) {fence.get('radius_nm')} nm"
             embed.add_field(
                 name=fence.get("name", fence_id),
-                value=f"**ID:** `{fence_id}`\n**Coords:** ({fence.get('lat')}, {fence.get('lon')}) {fence.get('radius_nm')} nm\n**Alert on:** {fence.get('alert_on', 'both')} | **Cooldown:** {fence.get('cooldown', 5)}m\n**Channel:** {ch_mention} | **Role:** {role_mention}",
+                value=f"**ID:** `{fence_id}`\n**Area:** {area}\n**Altitude:** {self._format_altitude_band(fence)}\n**Alert on:** {fence.get('alert_on', 'both')} | **Cooldown:** {fence.get('cooldown', 5)}m\n**Channel:** {ch_mention} | **Role:** {role_mention}",
                 inline=False,
             )
         await ctx.send(embed=embed)
@@ -19,6 +19,8 @@ from redbot.core.i18n import Translator, cog_i18n
 # Internationalization
 _ = Translator("Skysearch", __file__)
 
+FAA_STATUS_URL = "https://nasstatus.faa.gov/api/airport-status-information"
+
 
 class FAAStatusRefreshButton(discord.ui.Button):
     """Button to refresh FAA status data."""
@@ -532,6 +534,7 @@ class AirportCommands:
         self.api = APIManager(cog)
         self.helpers = HelperUtils(cog)
         self.xml_parser = XMLParser()
+        self.faa_status_url = FAA_STATUS_URL
 
     def _get_default_airplane_file(self):
         """Return the local default airplane image as a Discord file when available."""
@@ -615,7 +618,7 @@ class AirportCommands:
             async with aiohttp.ClientSession() as session:
                 root = await self.xml_parser.fetch_and_parse_xml(
                     session,
-                    "https://nasstatus.faa.gov/api/airport-status-information",
+                    self.faa_status_url,
                     headers if headers else None
                 )
             if root is None:
@@ -5,8 +5,11 @@ from redbot.core import commands
 import datetime
 import html
 import logging
+import string
 from urllib.parse import quote_plus, urlparse
 
+from .view_cache import DashboardViewCache
+
 
 log = logging.getLogger("red.skysearch.dashboard")
 
@@ -38,6 +41,528 @@ def dashboard_page(*args, **kwargs):
         return func
     return decorator
 
+
+STATS_TTL = 60  # Seconds the live airplanes.live stats are reused across page views
+API_STATS_TTL = 60  # Seconds an API statistics snapshot is reused across page views
+LOOKUP_TTL = 30  # Seconds a lookup result (aircraft data and photos) is reused
+LOOKUP_MAX_RESULTS = 5
+LOOKUP_QUERY_PARAMS = {
+    "icao": "find_hex",
+    "callsign": "find_callsign",
+    "reg": "find_reg",
+    "type": "find_type",
+}
+
+STATS_PAGE_SOURCE = (
+    '<h2>SkySearch Stats</h2>'
+    '<p>This page shows live statistics and data for SkySearch.</p>'
+    '<ul>'
+    '<li>Aircraft tracked: <b>{{ aircraft_count }}</b></li>'
+    '<li>Military ICAO tags: <b>{{ military_count }}</b></li>'
+    '<li>Law enforcement ICAO tags: <b>{{ law_count }}</b></li>'
+    '</ul>'
+)
+
+API_STATS_TEMPLATE = string.Template("""
+<div style="background-color: #1e1f22; padding: 20px; border-radius: 8px; color: #e6e6e6;">
+    <h2 style="color: #ffffff;">📊 Airplanes.live API Statistics</h2>
+    <p style="color: #cfcfcf;">Detailed request tracking and performance metrics for the airplanes.live API.</p>
+
+    <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin: 20px 0;">
+        <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; color: #e6e6e6;">
+            <h3 style="color: #ffffff;">📈 Overall Statistics</h3>
+            <ul style="margin: 0; padding-left: 18px;">
+                <li><strong>Total Requests:</strong> $total_requests</li>
+                <li><strong>Success Rate:</strong> $success_rate%</li>
+                <li><strong>Last Request:</strong> $last_request</li>
+            </ul>
+        </div>
+
+        <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; color: #e6e6e6;">
+            <h3 style="color: #ffffff;">✅ Success/Failure</h3>
+            <ul style="margin: 0; padding-left: 18px;">
+                <li><strong>Successful:</strong> $successful_requests</li>
+                <li><strong>Failed:</strong> $failed_requests</li>
+                <li><strong>Rate Limited:</strong> $rate_limited_requests</li>
+            </ul>
+        </div>
+
+        <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; color: #e6e6e6;">
+            <h3 style="color: #ffffff;">🌐 API Mode Usage</h3>
+            <ul style="margin: 0; padding-left: 18px;">
+                <li><strong>Primary API:</strong> $primary_requests</li>
+                <li><strong>Fallback API:</strong> $fallback_requests</li>
+            </ul>
+        </div>
+
+        <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; color: #e6e6e6;">
+            <h3 style="color: #ffffff;">⚡ Performance</h3>
+            <ul style="margin: 0; padding-left: 18px;">
+                <li><strong>Avg Response Time:</strong> $avg_response_time</li>
+                <li><strong>Last 24h Requests:</strong> $requests_last_24h</li>
+            </ul>
+        </div>
+    </div>
+</div>
+$extra_html
+""")
+
+LOOKUP_PAGE_SOURCE = """
+<div style=\"background-color: #1e1f22; padding: 20px; border-radius: 8px; color: #e6e6e6;\">
+    <h2 style=\"color: #ffffff;\">SkySearch Aircraft Lookup</h2>
+    <p style=\"color: #cfcfcf;\">Search for aircraft by ICAO code, callsign, registration, or aircraft type.</p>
+
+    <div style=\"margin-bottom: 20px;\">
+        <h3 style=\"color: #ffffff;\">Search Aircraft:</h3>
+        <div style=\"background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41;\">
+            <style>
+                .form-container {
+                    display: flex;
+                    flex-direction: column;
+                    gap: 15px;
+                }
+                .form-row {
+                    display: flex;
+                    align-items: center;
+                    gap: 10px;
+                    flex-wrap: wrap;
+                }
+                .form-label {
+                    color: #ffffff;
+                    font-weight: bold;
+                    min-width: 100px;
+                }
+                .form-field {
+                    background-color: #1e1f22;
+                    border: 1px solid #3a3d41;
+                    border-radius: 4px;
+                    color: #e6e6e6;
+                    padding: 8px 12px;
+                    font-size: 14px;
+                }
+                .form-field:focus {
+                    outline: none;
+                    border-color: #5865f2;
+                    box-shadow: 0 0 0 2px rgba(88, 101, 242, 0.2);
+                }
+                .form-select {
+                    background-color: #1e1f22;
+                    border: 1px solid #3a3d41;
+                    border-radius: 4px;
+                    color: #e6e6e6;
+                    padding: 8px 12px;
+                    font-size: 14px;
+                    min-width: 150px;
+                }
+                .form-submit {
+                    background-color: #5865f2;
+                    border: none;
+                    border-radius: 4px;
+                    color: #ffffff;
+                    padding: 10px 20px;
+                    font-size: 14px;
+                    font-weight: bold;
+                    cursor: pointer;
+                    transition: background-color 0.2s;
+                }
+                .form-submit:hover {
+                    background-color: #4752c4;
+                }
+                .form-submit:active {
+                    background-color: #3c45a5;
+                }
+            </style>
+            <div class=\"form-container\">
+                {{ form|safe }}
+            </div>
+        </div>
+    </div>
+
+    {{ result_html|safe }}
+</div>
+"""
+
+AIRCRAFT_CARD_TEMPLATE = string.Template("""
+<div style="border: 1px solid #ddd; border-radius: 8px; padding: 20px; margin-bottom: 20px; background-color: #808080; color: #000000;">
+    <h3 style="margin-top: 0; color: #000000; border-bottom: 2px solid #666; padding-bottom: 10px;">$safe_description</h3>
+
+    <div style="display: flex; gap: 30px;">
+        <div style="flex: 1;">
+            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px;">
+                <div>
+                    <h4 style="color: #000000; margin-bottom: 10px;">Flight Information</h4>
+                    <p><strong>Callsign:</strong> $safe_callsign</p>
+                    <p><strong>Registration:</strong> $safe_registration</p>
+                    <p><strong>ICAO:</strong> $safe_icao</p>
+                    <p><strong>Model:</strong> $safe_aircraft_model</p>
+                    <p><strong>Category:</strong> $safe_category_text</p>
+                    <p><strong>Operated by:</strong> $safe_operator</p>
+                </div>
+
+                <div>
+                    <h4 style="color: #000000; margin-bottom: 10px;">Position & Navigation</h4>
+                    <p><strong>Altitude:</strong> $safe_altitude_text</p>
+                    <p><strong>Speed:</strong> $safe_speed_text</p>
+                    <p><strong>Heading:</strong> $safe_heading_text</p>
+                    <p><strong>Position:</strong> $safe_position_text</p>
+                    <p><strong>Squawk:</strong> <span style="$safe_squawk_style">$safe_squawk_code</span></p>
+                    <p><strong>Altitude Trend:</strong> $safe_altitude_trend_text</p>
+                </div>
+            </div>
+
+            <div style="margin-top: 20px;">
+                <h4 style="color: #000000; margin-bottom: 10px;">Timing Information</h4>
+                <p><strong>Last signal:</strong> $safe_last_seen_text</p>
+                <p><strong>Last position:</strong> $safe_last_seen_pos_text</p>
+                <p><strong>Flight status:</strong> $safe_emergency_status</p>
+            </div>
+
+            $asset_intelligence_html
+        </div>
+
+        <div style="flex: 0 0 250px;">
+            <h4 style="color: #000000; margin-bottom: 10px;">Aircraft Photo</h4>
+            $photo_html
+            $photographer_html
+            $photo_err_html
+        </div>
+    </div>
+
+    <div style="margin-top: 20px; text-align: center;">
+        <a href="$safe_globe_link" target="_blank" rel="noopener noreferrer" style="background-color: #007bff; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">View on Globe</a>
+    </div>
+</div>
+""")
+
+
+def _view_cache(cog) -> DashboardViewCache:
+    cache = getattr(cog, "_dashboard_cache", None)
+    if cache is None:
+        cache = cog._dashboard_cache = DashboardViewCache()
+    return cache
+
+
+async def _api_stats_model(cog) -> dict:
+    """The values the apistats page shows, at its display precision; the ETag follows them."""
+    api_stats = cog.api.get_request_stats()
+    top_endpoints = sorted(api_stats['endpoint_usage'].items(), key=lambda x: x[1], reverse=True)[:10]
+    return {
+        'total_requests': api_stats['total_requests'],
+        'success_rate': round(api_stats['success_rate'], 1),
+        'last_request_time_formatted': api_stats.get('last_request_time_formatted', 'Never'),
+        'successful_requests': api_stats['successful_requests'],
+        'failed_requests': api_stats['failed_requests'],
+        'rate_limited_requests': api_stats['rate_limited_requests'],
+        'auth_failed_requests': api_stats['auth_failed_requests'],
+        'permission_denied_requests': api_stats['permission_denied_requests'],
+        'api_mode_usage': dict(api_stats['api_mode_usage']),
+        'avg_response_time': round(api_stats['avg_response_time'], 3),
+        'requests_last_24h': api_stats['requests_last_24h'],
+        'endpoint_usage': dict(top_endpoints),
+    }
+
+
+def _render_api_stats(api_stats: dict) -> str:
+    extra_html = ""
+    # Add top endpoints if available
+    if api_stats['endpoint_usage']:
+        top_endpoints = sorted(
+            api_stats['endpoint_usage'].items(),
+            key=lambda x: x[1],
+            reverse=True
+        )[:10]
+
+        endpoints_html = "<h3>🔗 Top Endpoints</h3><ul>"
+        for endpoint, count in top_endpoints:
+            endpoints_html += f"<li><strong>{_esc(endpoint)}:</strong> {count:,} requests</li>"
+        endpoints_html += "</ul>"
+
+        extra_html += f"""
+        <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; margin-top: 20px; color: #e6e6e6;">
+            {endpoints_html}
+        </div>
+        """
+
+    # Add error details if any
+    if api_stats['auth_failed_requests'] > 0 or api_stats['permission_denied_requests'] > 0:
+        error_html = "<h3>⚠️ Error Details</h3><ul>"
+        if api_stats['auth_failed_requests'] > 0:
+            error_html += f"<li><strong>Authentication Failed:</strong> {api_stats['auth_failed_requests']:,}</li>"
+        if api_stats['permission_denied_requests'] > 0:
+            error_html += f"<li><strong>Permission Denied:</strong> {api_stats['permission_denied_requests']:,}</li>"
+        error_html += "</ul>"
+
+        extra_html += f"""
+        <div style="background-color: #3a2f00; padding: 20px; border-radius: 8px; border: 1px solid #806b00; margin-top: 20px; color: #ffe58f;">
+            {error_html}
+        </div>
+        """
+
+    return API_STATS_TEMPLATE.substitute(
+        total_requests=f"{api_stats['total_requests']:,}",
+        success_rate=f"{api_stats['success_rate']:.1f}",
+        last_request=_esc(api_stats.get('last_request_time_formatted', 'Never')),
+        successful_requests=f"{api_stats['successful_requests']:,}",
+        failed_requests=f"{api_stats['failed_requests']:,}",
+        rate_limited_requests=f"{api_stats['rate_limited_requests']:,}",
+        primary_requests=f"{api_stats['api_mode_usage']['primary']:,}",
+        fallback_requests=f"{api_stats['api_mode_usage']['fallback']:,}",
+        avg_response_time=f"{api_stats['avg_response_time']:.3f}s",
+        requests_last_24h=f"{api_stats['requests_last_24h']:,}",
+        extra_html=extra_html,
+    )
+
+
+async def _lookup_model(cog, search_type: str, search_value: str) -> dict:
+    """Fetch lookup results and their photos; this is the part worth caching."""
+    api_url = await cog.api.get_api_url()
+    response = await cog.api.make_request(f"{api_url}/?{LOOKUP_QUERY_PARAMS[search_type]}={search_value}")
+    if not response:
+        return {"ok": False, "aircraft": [], "total": 0}
+    # Support both 'aircraft' and 'ac' keys
+    aircraft_list = response.get('aircraft') or response.get('ac') or []
+    aircraft = []
+    for aircraft_data in aircraft_list[:LOOKUP_MAX_RESULTS]:
+        # Get photo for the aircraft using full aircraft data
+        image_url, photographer, photo_err = await cog.helpers.get_photo_by_aircraft_data(aircraft_data)
+        aircraft.append({"data": aircraft_data, "image_url": image_url, "photographer": photographer, "photo_err": photo_err})
+    return {"ok": True, "aircraft": aircraft, "total": len(aircraft_list)}
+
+
+def _render_lookup_results(cog, model: dict) -> str:
+    if not model["ok"]:
+        return '''
+        <div style="margin-top: 20px;">
+            <h3 style="color: #ffffff;">Error</h3>
+            <p style="color: #cfcfcf;">Unable to retrieve aircraft information. Please check your search terms and try again.</p>
+        </div>
+        '''
+    if not model["aircraft"]:
+        return '''
+        <div style="margin-top: 20px;">
+            <h3 style="color: #ffffff;">No Results Found</h3>
+            <p style="color: #cfcfcf;">No aircraft found matching your search criteria. Please try a different search term.</p>
+        </div>
+        '''
+    result_html = '<div style="margin-top: 20px;"><h3>Search Results:</h3>'
+    for entry in model["aircraft"]:
+        result_html += _render_aircraft_card(cog, entry["data"], entry["image_url"], entry["photographer"], entry["photo_err"])
+    if model["total"] > LOOKUP_MAX_RESULTS:
+        result_html += f'<p style="color: #666; font-style: italic;">Showing first {LOOKUP_MAX_RESULTS} of {model["total"]} results</p>'
+    result_html += '</div>'
+    return result_html
+
+
+def _render_aircraft_card(cog, aircraft_data: dict, image_url, photographer, photo_err) -> str:
+    # Extract ICAO for later use
+    icao = aircraft_data.get('hex', '')
+    if icao:
+        icao = icao.upper()
+
+    # Create comprehensive aircraft info HTML
+    description = f"{aircraft_data.get('desc', 'N/A')}"
+    if aircraft_data.get('year', None) is not None:
+        description += f" ({aircraft_data.get('year')})"
+
+    callsign = aircraft_data.get('flight', 'N/A').strip()
+    if not callsign or callsign == 'N/A':
+        callsign = 'BLOCKED'
+
+    registration = aircraft_data.get('reg', 'N/A')
+    if registration and registration != 'N/A':
+        registration = registration.upper()
+
+    # Altitude information
+    altitude = aircraft_data.get('alt_baro', 'N/A')
+    if altitude == 'ground':
+        altitude_text = "On ground"
+    elif altitude != 'N/A':
+        if isinstance(altitude, int):
+            altitude = "{:,}".format(altitude)
+        altitude_text = f"{altitude} ft"
+    else:
+        altitude_text = "N/A"
+
+    # Position information
+    lat = aircraft_data.get('lat', 'N/A')
+    lon = aircraft_data.get('lon', 'N/A')
+    if lat != 'N/A' and lat is not None and lon != 'N/A' and lon is not None:
+        try:
+            lat_rounded = round(float(lat), 2)
+            lon_rounded = round(float(lon), 2)
+            lat_dir = "N" if lat_rounded >= 0 else "S"
+            lon_dir = "E" if lon_rounded >= 0 else "W"
+            position_text = f"{abs(lat_rounded)}{lat_dir}, {abs(lon_rounded)}{lon_dir}"
+        except:
+            position_text = "N/A"
+    else:
+        position_text = "N/A"
+
+    # Squawk code with emergency detection
+    squawk_code = aircraft_data.get('squawk', 'N/A')
+    emergency_squawk_codes = ['7500', '7600', '7700']
+    if squawk_code in emergency_squawk_codes:
+        squawk_style = 'color: red; font-weight: bold;'
+        if squawk_code == '7500':
+            emergency_status = "🚨 Aircraft reports it's been hijacked"
+        elif squawk_code == '7600':
+            emergency_status = "🚨 Aircraft has lost radio contact"
+        elif squawk_code == '7700':
+            emergency_status = "🚨 Aircraft has declared a general emergency"
+    else:
+        squawk_style = ''
+        emergency_status = "Aircraft reports normal conditions"
+
+    # Aircraft model
+    aircraft_model = aircraft_data.get('t', 'N/A')
+
+    # Speed information
+    ground_speed_knots = aircraft_data.get('gs', 'N/A')
+    if ground_speed_knots != 'N/A':
+        ground_speed_mph = round(float(ground_speed_knots) * 1.15078)
+        speed_text = f"{ground_speed_mph} mph"
+    else:
+        speed_text = "N/A"
+
+    # Heading information
+    heading = aircraft_data.get('true_heading', None)
+    if heading is not None:
+        heading_text = f"{heading}°"
+    else:
+        heading_text = "N/A"
+
+    # Category information
+    category_code_to_label = {
+        "A0": "No info available", "A1": "Light aircraft", "A2": "Small aircraft",
+        "A3": "Large aircraft", "A4": "High vortex large aircraft", "A5": "Heavy aircraft",
+        "A6": "High performance aircraft", "A7": "Rotorcraft", "B0": "No info available",
+        "B1": "Glider / sailplane", "B2": "Lighter-than-air", "B3": "Parachutist / skydiver",
+        "B4": "Ultralight / hang-glider / paraglider", "B5": "Reserved", "B6": "UAV",
+        "B7": "Space / trans-atmospheric vehicle", "C0": "No info available",
+        "C1": "Emergency vehicle", "C2": "Service vehicle", "C3": "Point obstacle",
+        "C4": "Cluster obstacle", "C5": "Line obstacle", "C6": "Reserved", "C7": "Reserved"
+    }
+    category = aircraft_data.get('category', None)
+    if category is not None:
+        category_text = category_code_to_label.get(category, "Unknown category")
+    else:
+        category_text = "N/A"
+
+    # Operator information
+    operator = aircraft_data.get('ownOp', 'N/A')
+
+    # Timing information
+    last_seen = aircraft_data.get('seen', 'N/A')
+    if last_seen != 'N/A':
+        last_seen_text = "Just now" if float(last_seen) < 1 else f"{int(float(last_seen))} seconds ago"
+    else:
+        last_seen_text = "N/A"
+
+    last_seen_pos = aircraft_data.get('seen_pos', 'N/A')
+    if last_seen_pos != 'N/A':
+        last_seen_pos_text = "Just now" if float(last_seen_pos) < 1 else f"{int(float(last_seen_pos))} seconds ago"
+    else:
+        last_seen_pos_text = "N/A"
+
+    # Altitude trend information
+    baro_rate = aircraft_data.get('baro_rate', 'N/A')
+    if baro_rate == 'N/A':
+        altitude_trend_text = "Altitude trends unavailable, not enough data"
+    else:
+        baro_rate_fps = round(int(baro_rate) / 60, 2)  # Convert feet per minute to feet per second
+        if abs(baro_rate_fps) < 50/60:
+            altitude_trend_text = "Maintaining consistent altitude"
+        elif baro_rate_fps > 0:
+            altitude_trend_text = f"Climbing {baro_rate_fps} feet/sec"
+        else:
+            altitude_trend_text = f"Descending {abs(baro_rate_fps)} feet/sec"
+
+    # Asset intelligence information
+    asset_intelligence = []
+    if icao and icao.upper() in cog.law_enforcement_icao_set:
+        asset_intelligence.append("👮 Known for use by state law enforcement")
+    if icao and icao.upper() in cog.military_icao_set:
+        asset_intelligence.append("🪖 Known for use in military and government")
+    if icao and icao.upper() in cog.medical_icao_set:
+        asset_intelligence.append("🏥 Known for use in medical response and transport")
+    if icao and icao.upper() in cog.suspicious_icao_set:
+        asset_intelligence.append("⚠️ Exhibits suspicious flight or surveillance activity")
+    if icao and icao.upper() in cog.global_prior_known_accident_set:
+        asset_intelligence.append("💥 Prior involved in one or more documented accidents")
+    if icao and icao.upper() in cog.ukr_conflict_set:
+        asset_intelligence.append("🇺🇦 Utilized within the Russo-Ukrainian conflict")
+    if icao and icao.upper() in cog.newsagency_icao_set:
+        asset_intelligence.append("📰 Used by news or media organization")
+    if icao and icao.upper() in cog.balloons_icao_set:
+        asset_intelligence.append("🎈 Aircraft is a balloon")
+    if icao and icao.upper() in cog.agri_utility_set:
+        asset_intelligence.append("🌽 Used for agriculture surveys, easement validation, or land inspection")
+
+    # Build asset intelligence HTML
+    asset_intelligence_html = ""
+    if asset_intelligence:
+        asset_intelligence_html = f'''
+        <div style="margin-top: 20px;">
+            <h4 style="color: #000000; margin-bottom: 10px;">Asset Intelligence</h4>
+            {chr(10).join([f'<p style="margin: 5px 0;">{_esc(intel)}</p>' for intel in asset_intelligence])}
+        </div>
+        '''
+
+    safe_description = _esc(description)
+    safe_callsign = _esc(callsign)
+    safe_registration = _esc(registration)
+    safe_icao = _esc(icao)
+    safe_aircraft_model = _esc(aircraft_model)
+    safe_category_text = _esc(category_text)
+    safe_operator = _esc(operator)
+    safe_altitude_text = _esc(altitude_text)
+    safe_speed_text = _esc(speed_text)
+    safe_heading_text = _esc(heading_text)
+    safe_position_text = _esc(position_text)
+    safe_squawk_style = _esc(squawk_style)
+    safe_squawk_code = _esc(squawk_code)
+    safe_altitude_trend_text = _esc(altitude_trend_text)
+    safe_last_seen_text = _esc(last_seen_text)
+    safe_last_seen_pos_text = _esc(last_seen_pos_text)
+    safe_emergency_status = _esc(emergency_status)
+    safe_image_url = _safe_https_url(image_url)
+    safe_photographer = _esc(photographer) if photographer else ""
+    safe_photo_err = _esc(photo_err) if photo_err else ""
+    safe_globe_link = _safe_https_url(f"https://globe.airplanes.live/?icao={quote_plus(str(icao or ''))}")
+
+    if safe_image_url:
+        photo_html = f'<img src="{safe_image_url}" alt="Aircraft photo" style="max-width: 100%; height: auto; border-radius: 8px; border: 2px solid #666;">'
+    else:
+        photo_html = '<div style="background-color: #666; padding: 40px; text-align: center; border-radius: 8px;"><p style="color: #999; font-style: italic;">No photo available</p></div>'
+    photographer_html = f'<p style="font-size: 12px; color: #666; margin-top: 8px; text-align: center;">Photo by: {safe_photographer}</p>' if safe_photographer else ''
+    photo_err_html = f'<p style="font-size: 12px; color: #a00; margin-top: 6px; text-align: center;">{safe_photo_err}</p>' if (not safe_image_url and safe_photo_err) else ''
+
+    return AIRCRAFT_CARD_TEMPLATE.substitute(
+        asset_intelligence_html=asset_intelligence_html,
+        photo_err_html=photo_err_html,
+        photo_html=photo_html,
+        photographer_html=photographer_html,
+        safe_aircraft_model=safe_aircraft_model,
+        safe_altitude_text=safe_altitude_text,
+        safe_altitude_trend_text=safe_altitude_trend_text,
+        safe_callsign=safe_callsign,
+        safe_category_text=safe_category_text,
+        safe_description=safe_description,
+        safe_emergency_status=safe_emergency_status,
+        safe_globe_link=safe_globe_link,
+        safe_heading_text=safe_heading_text,
+        safe_icao=safe_icao,
+        safe_last_seen_pos_text=safe_last_seen_pos_text,
+        safe_last_seen_text=safe_last_seen_text,
+        safe_operator=safe_operator,
+        safe_position_text=safe_position_text,
+        safe_registration=safe_registration,
+        safe_speed_text=safe_speed_text,
+        safe_squawk_code=safe_squawk_code,
+        safe_squawk_style=safe_squawk_style,
+    )
+
+
 class DashboardIntegration:
     bot: commands.Bot
 
@@ -48,22 +573,17 @@ class DashboardIntegration:
     @dashboard_page(name=None, description="SkySearch Stats Page", methods=("GET",))
     async def dashboard_stats(self, **kwargs) -> typing.Dict[str, typing.Any]:
         #Show a stats page
-        embed_html = (
-            '<h2>SkySearch Stats</h2>'
-            '<p>This page shows live statistics and data for SkySearch.</p>'
-            '<ul>'
-            '<li>Aircraft tracked: <b>{{ aircraft_count }}</b></li>'
-            '<li>Military ICAO tags: <b>{{ military_count }}</b></li>'
-            '<li>Law enforcement ICAO tags: <b>{{ law_count }}</b></li>'
-            '</ul>'
-        )
         # Try to get stats from the cog if possible
         cog = getattr(self, "_skysearch_cog", None)
         aircraft_count = "?"
         if cog and hasattr(cog, "api"):
-            stats = await cog.api.get_stats()
+            # Served from the view cache so page views don't each hit airplanes.live
+            cache = _view_cache(cog)
+            _etag, stats = await cache.model("stats", cog.api.get_stats, STATS_TTL)
             if stats and "aircraft" in stats:
                 aircraft_count = stats["aircraft"]
+            elif not stats:
+                cache.invalidate("stats")
         if hasattr(cog, "military_icao_set"):
             military_count = len(cog.military_icao_set)
         else:
@@ -75,7 +595,7 @@ class DashboardIntegration:
         return {
             "status": 0,
             "web_content": {
-                "source": embed_html,
+                "source": STATS_PAGE_SOURCE,
                 "aircraft_count": aircraft_count,
                 "military_count": military_count,
                 "law_count": law_count,
@@ -95,85 +615,11 @@ class DashboardIntegration:
         try:
             # Wait for stats to be initialized from config
             await cog.api.wait_for_stats_initialization()
-            api_stats = cog.api.get_request_stats()
-            
-            # Format the statistics for display
-            stats_html = f"""
-            <div style="background-color: #1e1f22; padding: 20px; border-radius: 8px; color: #e6e6e6;">
-                <h2 style="color: #ffffff;">📊 Airplanes.live API Statistics</h2>
-                <p style="color: #cfcfcf;">Detailed request tracking and performance metrics for the airplanes.live API.</p>
-                
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin: 20px 0;">
-                    <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; color: #e6e6e6;">
-                        <h3 style="color: #ffffff;">📈 Overall Statistics</h3>
-                        <ul style="margin: 0; padding-left: 18px;">
-                            <li><strong>Total Requests:</strong> {api_stats['total_requests']:,}</li>
-                            <li><strong>Success Rate:</strong> {api_stats['success_rate']:.1f}%</li>
-                            <li><strong>Last Request:</strong> {api_stats.get('last_request_time_formatted', 'Never')}</li>
-                        </ul>
-                    </div>
-                
-                    <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; color: #e6e6e6;">
-                        <h3 style="color: #ffffff;">✅ Success/Failure</h3>
-                        <ul style="margin: 0; padding-left: 18px;">
-                            <li><strong>Successful:</strong> {api_stats['successful_requests']:,}</li>
-                            <li><strong>Failed:</strong> {api_stats['failed_requests']:,}</li>
-                            <li><strong>Rate Limited:</strong> {api_stats['rate_limited_requests']:,}</li>
-                        </ul>
-                    </div>
-                
-                    <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; color: #e6e6e6;">
-                        <h3 style="color: #ffffff;">🌐 API Mode Usage</h3>
-                        <ul style="margin: 0; padding-left: 18px;">
-                            <li><strong>Primary API:</strong> {api_stats['api_mode_usage']['primary']:,}</li>
-                            <li><strong>Fallback API:</strong> {api_stats['api_mode_usage']['fallback']:,}</li>
-                        </ul>
-                    </div>
-                
-                    <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; color: #e6e6e6;">
-                        <h3 style="color: #ffffff;">⚡ Performance</h3>
-                        <ul style="margin: 0; padding-left: 18px;">
-                            <li><strong>Avg Response Time:</strong> {api_stats['avg_response_time']:.3f}s</li>
-                            <li><strong>Last 24h Requests:</strong> {api_stats['requests_last_24h']:,}</li>
-                        </ul>
-                    </div>
-                </div>
-            </div>
-            """
-            
-            # Add top endpoints if available
-            if api_stats['endpoint_usage']:
-                top_endpoints = sorted(
-                    api_stats['endpoint_usage'].items(), 
-                    key=lambda x: x[1], 
-                    reverse=True
-                )[:10]
-                
-                endpoints_html = "<h3>🔗 Top Endpoints</h3><ul>"
-                for endpoint, count in top_endpoints:
-                    endpoints_html += f"<li><strong>{endpoint}:</strong> {count:,} requests</li>"
-                endpoints_html += "</ul>"
-                
-                stats_html += f"""
-                <div style="background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41; margin-top: 20px; color: #e6e6e6;">
-                    {endpoints_html}
-                </div>
-                """
-            
-            # Add error details if any
-            if api_stats['auth_failed_requests'] > 0 or api_stats['permission_denied_requests'] > 0:
-                error_html = "<h3>⚠️ Error Details</h3><ul>"
-                if api_stats['auth_failed_requests'] > 0:
-                    error_html += f"<li><strong>Authentication Failed:</strong> {api_stats['auth_failed_requests']:,}</li>"
-                if api_stats['permission_denied_requests'] > 0:
-                    error_html += f"<li><strong>Permission Denied:</strong> {api_stats['permission_denied_requests']:,}</li>"
-                error_html += "</ul>"
-                
-                stats_html += f"""
-                <div style="background-color: #3a2f00; padding: 20px; border-radius: 8px; border: 1px solid #806b00; margin-top: 20px; color: #ffe58f;">
-                    {error_html}
-                </div>
-                """
+            # A snapshot of the shown values is reused for API_STATS_TTL; the HTML is re-rendered
+            # only when that snapshot's ETag (a hash of the shown values) changes.
+            cache = _view_cache(cog)
+            etag, model = await cache.model("apistats", lambda: _api_stats_model(cog), API_STATS_TTL)
+            stats_html = cache.rendered("apistats", etag, lambda: _render_api_stats(model))
             
             return {
                 "status": 0,
@@ -181,7 +627,6 @@ class DashboardIntegration:
                     "source": stats_html
                 }
             }
-            
         except Exception:
             log.exception("Error loading API statistics in dashboard")
             return {
@@ -192,6 +637,43 @@ class DashboardIntegration:
                 "notifications": [{"message": "Error loading API statistics.", "category": "error"}]
             }
 
+    @dashboard_page(name="perf", description="SkySearch Loop Timings", methods=("GET",), is_owner=True)
+    async def dashboard_perf(self, **kwargs) -> typing.Dict[str, typing.Any]:
+        """Show rolling timing percentiles for background loops and API requests."""
+        cog = getattr(self, "_skysearch_cog", None)
+        if not cog or not hasattr(cog, "perf"):
+            return {"status": 0, "web_content": {"source": "<p>SkySearch cog not loaded.</p>"}}
+
+        summaries = cog.perf.summaries()
+        rows = ""
+        for name, s in summaries.items():
+            counters = ", ".join(f"{k}={v}" for k, v in s["attributes"].items())
+            rows += (
+                f"<tr><td>{_esc(name)}</td><td>{s['count']:,}</td>"
+                f"<td>{s['p50'] * 1000:.1f}</td><td>{s['p95'] * 1000:.1f}</td>"
+                f"<td>{s['p99'] * 1000:.1f}</td><td>{s['max'] * 1000:.1f}</td>"
+                f"<td>{_esc(counters)}</td></tr>"
+            )
+        if not rows:
+            rows = '<tr><td colspan="7">No spans recorded yet.</td></tr>'
+        export_path = cog.perf.export_path
+        export_html = f"<p>Exporting spans to <code>{_esc(export_path)}</code>.</p>" if export_path else ""
+
+        source = f"""
+        <div style="background-color: #1e1f22; padding: 20px; border-radius: 8px; color: #e6e6e6;">
+            <h2 style="color: #ffffff;">⏱️ SkySearch Loop Timings</h2>
+            <p style="color: #cfcfcf;">Rolling p50/p95/p99 per background loop phase and API endpoint (milliseconds).</p>
+            {export_html}
+            <table style="width: 100%; border-collapse: collapse; color: #e6e6e6;">
+                <thead><tr style="text-align: left; border-bottom: 1px solid #3a3d41;">
+                    <th>Span</th><th>Count</th><th>p50</th><th>p95</th><th>p99</th><th>Max</th><th>Last attributes</th>
+                </tr></thead>
+                <tbody>{rows}</tbody>
+            </table>
+        </div>
+        """
+        return {"status": 0, "web_content": {"source": source}}
+
     @dashboard_page(name="lookup", description="SkySearch Aircraft Lookup", methods=("GET", "POST"), context_ids=["guild_id"])
     async def dashboard_aircraft_lookup(self, guild: discord.Guild, **kwargs) -> typing.Dict[str, typing.Any]:
         cog = getattr(self, "_skysearch_cog", None)
@@ -225,434 +707,25 @@ class DashboardIntegration:
                     return {
                         "status": 1,
                         "notifications": [{"message": "Please enter a search value.", "category": "error"}],
-                        "web_content": {
-                            "source": """
-                            <div style=\"background-color: #1e1f22; padding: 20px; border-radius: 8px; color: #e6e6e6;\">
-                                <h2 style=\"color: #ffffff;\">SkySearch Aircraft Lookup</h2>
-                                <p style=\"color: #cfcfcf;\">Search for aircraft by ICAO code, callsign, registration, or aircraft type.</p>
-                                
-                                <div style=\"margin-bottom: 20px;\">
-                                    <h3 style=\"color: #ffffff;\">Search Aircraft:</h3>
-                                    <div style=\"background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41;\">
-                                        <style>
-                                            .form-container {
-                                                display: flex;
-                                                flex-direction: column;
-                                                gap: 15px;
-                                            }
-                                            .form-row {
-                                                display: flex;
-                                                align-items: center;
-                                                gap: 10px;
-                                                flex-wrap: wrap;
-                                            }
-                                            .form-label {
-                                                color: #ffffff;
-                                                font-weight: bold;
-                                                min-width: 100px;
-                                            }
-                                            .form-field {
-                                                background-color: #1e1f22;
-                                                border: 1px solid #3a3d41;
-                                                border-radius: 4px;
-                                                color: #e6e6e6;
-                                                padding: 8px 12px;
-                                                font-size: 14px;
-                                            }
-                                            .form-field:focus {
-                                                outline: none;
-                                                border-color: #5865f2;
-                                                box-shadow: 0 0 0 2px rgba(88, 101, 242, 0.2);
-                                            }
-                                            .form-select {
-                                                background-color: #1e1f22;
-                                                border: 1px solid #3a3d41;
-                                                border-radius: 4px;
-                                                color: #e6e6e6;
-                                                padding: 8px 12px;
-                                                font-size: 14px;
-                                                min-width: 150px;
-                                            }
-                                            .form-submit {
-                                                background-color: #5865f2;
-                                                border: none;
-                                                border-radius: 4px;
-                                                color: #ffffff;
-                                                padding: 10px 20px;
-                                                font-size: 14px;
-                                                font-weight: bold;
-                                                cursor: pointer;
-                                                transition: background-color 0.2s;
-                                            }
-                                            .form-submit:hover {
-                                                background-color: #4752c4;
-                                            }
-                                            .form-submit:active {
-                                                background-color: #3c45a5;
-                                            }
-                                        </style>
-                                        <div class=\"form-container\">
-                                            {{ form|safe }}
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                            """,
-                            "form": form,
-                        }
+                        "web_content": {"source": LOOKUP_PAGE_SOURCE, "form": form, "result_html": ""},
                     }
-                
-                # Build the API URL based on search type
-                api_url = await cog.api.get_api_url()
-                if search_type == "icao":
-                    url = f"{api_url}/?find_hex={search_value}"
-                elif search_type == "callsign":
-                    url = f"{api_url}/?find_callsign={search_value}"
-                elif search_type == "reg":
-                    url = f"{api_url}/?find_reg={search_value}"
-                elif search_type == "type":
-                    url = f"{api_url}/?find_type={search_value}"
-                else:
+                if search_type not in LOOKUP_QUERY_PARAMS:
                     return {
                         "status": 1,
                         "notifications": [{"message": "Invalid search type.", "category": "error"}],
-                        "web_content": {
-                            "source": """
-                            <div style=\"background-color: #1e1f22; padding: 20px; border-radius: 8px; color: #e6e6e6;\">
-                                <h2 style=\"color: #ffffff;\">SkySearch Aircraft Lookup</h2>
-                                <p style=\"color: #cfcfcf;\">Search for aircraft by ICAO code, callsign, registration, or aircraft type.</p>
-                                
-                                <div style=\"margin-bottom: 20px;\">
-                                    <h3 style=\"color: #ffffff;\">Search Aircraft:</h3>
-                                    <div style=\"background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41;\">
-                                        <style>
-                                            .form-container {
-                                                display: flex;
-                                                flex-direction: column;
-                                                gap: 15px;
-                                            }
-                                            .form-row {
-                                                display: flex;
-                                                align-items: center;
-                                                gap: 10px;
-                                                flex-wrap: wrap;
-                                            }
-                                            .form-label {
-                                                color: #ffffff;
-                                                font-weight: bold;
-                                                min-width: 100px;
-                                            }
-                                            .form-field {
-                                                background-color: #1e1f22;
-                                                border: 1px solid #3a3d41;
-                                                border-radius: 4px;
-                                                color: #e6e6e6;
-                                                padding: 8px 12px;
-                                                font-size: 14px;
-                                            }
-                                            .form-field:focus {
-                                                outline: none;
-                                                border-color: #5865f2;
-                                                box-shadow: 0 0 0 2px rgba(88, 101, 242, 0.2);
-                                            }
-                                            .form-select {
-                                                background-color: #1e1f22;
-                                                border: 1px solid #3a3d41;
-                                                border-radius: 4px;
-                                                color: #e6e6e6;
-                                                padding: 8px 12px;
-                                                font-size: 14px;
-                                                min-width: 150px;
-                                            }
-                                            .form-submit {
-                                                background-color: #5865f2;
-                                                border: none;
-                                                border-radius: 4px;
-                                                color: #ffffff;
-                                                padding: 10px 20px;
-                                                font-size: 14px;
-                                                font-weight: bold;
-                                                cursor: pointer;
-                                                transition: background-color 0.2s;
-                                            }
-                                            .form-submit:hover {
-                                                background-color: #4752c4;
-                                            }
-                                            .form-submit:active {
-                                                background-color: #3c45a5;
-                                            }
-                                        </style>
-                                        <div class=\"form-container\">
-                                            {{ form|safe }}
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                            """,
-                            "form": form,
-                        }
+                        "web_content": {"source": LOOKUP_PAGE_SOURCE, "form": form, "result_html": ""},
                     }
                 
-                # Make the API request
-                response = await cog.api.make_request(url)
-                
-                if response:
-                    # Support both 'aircraft' and 'ac' keys
-                    aircraft_list = response.get('aircraft') or response.get('ac')
-                    
-                    if aircraft_list and len(aircraft_list) > 0:
-                        result_html = '<div style="margin-top: 20px;"><h3>Search Results:</h3>'
-                        
-                        for i, aircraft_data in enumerate(aircraft_list[:5]):  # Limit to 5 results
-                            # Get photo for the aircraft using full aircraft data
-                            image_url, photographer, photo_err = await cog.helpers.get_photo_by_aircraft_data(aircraft_data)
-                            
-                            # Extract ICAO for later use
-                            icao = aircraft_data.get('hex', '')
-                            if icao:
-                                icao = icao.upper()
-                            
-                            # Create comprehensive aircraft info HTML
-                            description = f"{aircraft_data.get('desc', 'N/A')}"
-                            if aircraft_data.get('year', None) is not None:
-                                description += f" ({aircraft_data.get('year')})"
-                            
-                            callsign = aircraft_data.get('flight', 'N/A').strip()
-                            if not callsign or callsign == 'N/A':
-                                callsign = 'BLOCKED'
-                            
-                            registration = aircraft_data.get('reg', 'N/A')
-                            if registration and registration != 'N/A':
-                                registration = registration.upper()
-                            
-                            # Altitude information
-                            altitude = aircraft_data.get('alt_baro', 'N/A')
-                            if altitude == 'ground':
-                                altitude_text = "On ground"
-                            elif altitude != 'N/A':
-                                if isinstance(altitude, int):
-                                    altitude = "{:,}".format(altitude)
-                                altitude_text = f"{altitude} ft"
-                            else:
-                                altitude_text = "N/A"
-                            
-                            # Position information
-                            lat = aircraft_data.get('lat', 'N/A')
-                            lon = aircraft_data.get('lon', 'N/A')
-                            if lat != 'N/A' and lat is not None and lon != 'N/A' and lon is not None:
-                                try:
-                                    lat_rounded = round(float(lat), 2)
-                                    lon_rounded = round(float(lon), 2)
-                                    lat_dir = "N" if lat_rounded >= 0 else "S"
-                                    lon_dir = "E" if lon_rounded >= 0 else "W"
-                                    position_text = f"{abs(lat_rounded)}{lat_dir}, {abs(lon_rounded)}{lon_dir}"
-                                except:
-                                    position_text = "N/A"
-                            else:
-                                position_text = "N/A"
-                            
-                            # Squawk code with emergency detection
-                            squawk_code = aircraft_data.get('squawk', 'N/A')
-                            emergency_squawk_codes = ['7500', '7600', '7700']
-                            if squawk_code in emergency_squawk_codes:
-                                squawk_style = 'color: red; font-weight: bold;'
-                                if squawk_code == '7500':
-                                    emergency_status = "🚨 Aircraft reports it's been hijacked"
-                                elif squawk_code == '7600':
-                                    emergency_status = "🚨 Aircraft has lost radio contact"
-                                elif squawk_code == '7700':
-                                    emergency_status = "🚨 Aircraft has declared a general emergency"
-                            else:
-                                squawk_style = ''
-                                emergency_status = "Aircraft reports normal conditions"
-                            
-                            # Aircraft model
-                            aircraft_model = aircraft_data.get('t', 'N/A')
-                            
-                            # Speed information
-                            ground_speed_knots = aircraft_data.get('gs', 'N/A')
-                            if ground_speed_knots != 'N/A':
-                                ground_speed_mph = round(float(ground_speed_knots) * 1.15078)
-                                speed_text = f"{ground_speed_mph} mph"
-                            else:
-                                speed_text = "N/A"
-                            
-                            # Heading information
-                            heading = aircraft_data.get('true_heading', None)
-                            if heading is not None:
-                                heading_text = f"{heading}°"
-                            else:
-                                heading_text = "N/A"
-                            
-                            # Category information
-                            category_code_to_label = {
-                                "A0": "No info available", "A1": "Light aircraft", "A2": "Small aircraft",
-                                "A3": "Large aircraft", "A4": "High vortex large aircraft", "A5": "Heavy aircraft",
-                                "A6": "High performance aircraft", "A7": "Rotorcraft", "B0": "No info available",
-                                "B1": "Glider / sailplane", "B2": "Lighter-than-air", "B3": "Parachutist / skydiver",
-                                "B4": "Ultralight / hang-glider / paraglider", "B5": "Reserved", "B6": "UAV",
-                                "B7": "Space / trans-atmospheric vehicle", "C0": "No info available",
-                                "C1": "Emergency vehicle", "C2": "Service vehicle", "C3": "Point obstacle",
-                                "C4": "Cluster obstacle", "C5": "Line obstacle", "C6": "Reserved", "C7": "Reserved"
-                            }
-                            category = aircraft_data.get('category', None)
-                            if category is not None:
-                                category_text = category_code_to_label.get(category, "Unknown category")
-                            else:
-                                category_text = "N/A"
-                            
-                            # Operator information
-                            operator = aircraft_data.get('ownOp', 'N/A')
-                            
-                            # Timing information
-                            last_seen = aircraft_data.get('seen', 'N/A')
-                            if last_seen != 'N/A':
-                                last_seen_text = "Just now" if float(last_seen) < 1 else f"{int(float(last_seen))} seconds ago"
-                            else:
-                                last_seen_text = "N/A"
-                            
-                            last_seen_pos = aircraft_data.get('seen_pos', 'N/A')
-                            if last_seen_pos != 'N/A':
-                                last_seen_pos_text = "Just now" if float(last_seen_pos) < 1 else f"{int(float(last_seen_pos))} seconds ago"
-                            else:
-                                last_seen_pos_text = "N/A"
-                            
-                            # Altitude trend information
-                            baro_rate = aircraft_data.get('baro_rate', 'N/A')
-                            if baro_rate == 'N/A':
-                                altitude_trend_text = "Altitude trends unavailable, not enough data"
-                            else:
-                                baro_rate_fps = round(int(baro_rate) / 60, 2)  # Convert feet per minute to feet per second
-                                if abs(baro_rate_fps) < 50/60:
-                                    altitude_trend_text = "Maintaining consistent altitude"
-                                elif baro_rate_fps > 0:
-                                    altitude_trend_text = f"Climbing {baro_rate_fps} feet/sec"
-                                else:
-                                    altitude_trend_text = f"Descending {abs(baro_rate_fps)} feet/sec"
-                            
-                            # Asset intelligence information
-                            asset_intelligence = []
-                            if icao and icao.upper() in cog.law_enforcement_icao_set:
-                                asset_intelligence.append("👮 Known for use by state law enforcement")
-                            if icao and icao.upper() in cog.military_icao_set:
-                                asset_intelligence.append("🪖 Known for use in military and government")
-                            if icao and icao.upper() in cog.medical_icao_set:
-                                asset_intelligence.append("🏥 Known for use in medical response and transport")
-                            if icao and icao.upper() in cog.suspicious_icao_set:
-                                asset_intelligence.append("⚠️ Exhibits suspicious flight or surveillance activity")
-                            if icao and icao.upper() in cog.global_prior_known_accident_set:
-                                asset_intelligence.append("💥 Prior involved in one or more documented accidents")
-                            if icao and icao.upper() in cog.ukr_conflict_set:
-                                asset_intelligence.append("🇺🇦 Utilized within the Russo-Ukrainian conflict")
-                            if icao and icao.upper() in cog.newsagency_icao_set:
-                                asset_intelligence.append("📰 Used by news or media organization")
-                            if icao and icao.upper() in cog.balloons_icao_set:
-                                asset_intelligence.append("🎈 Aircraft is a balloon")
-                            if icao and icao.upper() in cog.agri_utility_set:
-                                asset_intelligence.append("🌽 Used for agriculture surveys, easement validation, or land inspection")
-                            
-                            # Build asset intelligence HTML
-                            asset_intelligence_html = ""
-                            if asset_intelligence:
-                                asset_intelligence_html = f'''
-                                <div style="margin-top: 20px;">
-                                    <h4 style="color: #000000; margin-bottom: 10px;">Asset Intelligence</h4>
-                                    {chr(10).join([f'<p style="margin: 5px 0;">{_esc(intel)}</p>' for intel in asset_intelligence])}
-                                </div>
-                                '''
-
-                            safe_description = _esc(description)
-                            safe_callsign = _esc(callsign)
-                            safe_registration = _esc(registration)
-                            safe_icao = _esc(icao)
-                            safe_aircraft_model = _esc(aircraft_model)
-                            safe_category_text = _esc(category_text)
-                            safe_operator = _esc(operator)
-                            safe_altitude_text = _esc(altitude_text)
-                            safe_speed_text = _esc(speed_text)
-                            safe_heading_text = _esc(heading_text)
-                            safe_position_text = _esc(position_text)
-                            safe_squawk_style = _esc(squawk_style)
-                            safe_squawk_code = _esc(squawk_code)
-                            safe_altitude_trend_text = _esc(altitude_trend_text)
-                            safe_last_seen_text = _esc(last_seen_text)
-                            safe_last_seen_pos_text = _esc(last_seen_pos_text)
-                            safe_emergency_status = _esc(emergency_status)
-                            safe_image_url = _safe_https_url(image_url)
-                            safe_photographer = _esc(photographer) if photographer else ""
-                            safe_photo_err = _esc(photo_err) if photo_err else ""
-                            safe_globe_link = _safe_https_url(f"https://globe.airplanes.live/?icao={quote_plus(str(icao or ''))}")
-                            
-                            result_html += f'''
-                            <div style="border: 1px solid #ddd; border-radius: 8px; padding: 20px; margin-bottom: 20px; background-color: #808080; color: #000000;">
-                                <h3 style="margin-top: 0; color: #000000; border-bottom: 2px solid #666; padding-bottom: 10px;">{safe_description}</h3>
-                                
-                                <div style="display: flex; gap: 30px;">
-                                    <div style="flex: 1;">
-                                        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px;">
-                                            <div>
-                                                <h4 style="color: #000000; margin-bottom: 10px;">Flight Information</h4>
-                                                <p><strong>Callsign:</strong> {safe_callsign}</p>
-                                                <p><strong>Registration:</strong> {safe_registration}</p>
-                                                <p><strong>ICAO:</strong> {safe_icao}</p>
-                                                <p><strong>Model:</strong> {safe_aircraft_model}</p>
-                                                <p><strong>Category:</strong> {safe_category_text}</p>
-                                                <p><strong>Operated by:</strong> {safe_operator}</p>
-                                            </div>
-                                            
-                                            <div>
-                                                <h4 style="color: #000000; margin-bottom: 10px;">Position & Navigation</h4>
-                                                <p><strong>Altitude:</strong> {safe_altitude_text}</p>
-                                                <p><strong>Speed:</strong> {safe_speed_text}</p>
-                                                <p><strong>Heading:</strong> {safe_heading_text}</p>
-                                                <p><strong>Position:</strong> {safe_position_text}</p>
-                                                <p><strong>Squawk:</strong> <span style="{safe_squawk_style}">{safe_squawk_code}</span></p>
-                                                <p><strong>Altitude Trend:</strong> {safe_altitude_trend_text}</p>
-                                            </div>
-                                        </div>
-                                        
-                                        <div style="margin-top: 20px;">
-                                            <h4 style="color: #000000; margin-bottom: 10px;">Timing Information</h4>
-                                            <p><strong>Last signal:</strong> {safe_last_seen_text}</p>
-                                            <p><strong>Last position:</strong> {safe_last_seen_pos_text}</p>
-                                            <p><strong>Flight status:</strong> {safe_emergency_status}</p>
-                                        </div>
-                                        
-                                        {asset_intelligence_html}
-                                    </div>
-                                    
-                                    <div style="flex: 0 0 250px;">
-                                        <h4 style="color: #000000; margin-bottom: 10px;">Aircraft Photo</h4>
-                                        {f'<img src="{safe_image_url}" alt="Aircraft photo" style="max-width: 100%; height: auto; border-radius: 8px; border: 2px solid #666;">' if safe_image_url else '<div style="background-color: #666; padding: 40px; text-align: center; border-radius: 8px;"><p style="color: #999; font-style: italic;">No photo available</p></div>'}
-                                        {f'<p style="font-size: 12px; color: #666; margin-top: 8px; text-align: center;">Photo by: {safe_photographer}</p>' if safe_photographer else ''}
-                                        {f'<p style="font-size: 12px; color: #a00; margin-top: 6px; text-align: center;">{safe_photo_err}</p>' if (not safe_image_url and safe_photo_err) else ''}
-                                    </div>
-                                </div>
-                                
-                                <div style="margin-top: 20px; text-align: center;">
-                                    <a href="{safe_globe_link}" target="_blank" rel="noopener noreferrer" style="background-color: #007bff; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block; font-weight: bold;">View on Globe</a>
-                                </div>
-                            </div>
-                            '''
-                        
-                        if len(aircraft_list) > 5:
-                            result_html += f'<p style="color: #666; font-style: italic;">Showing first 5 of {len(aircraft_list)} results</p>'
-                        
-                        result_html += '</div>'
-                    else:
-                        result_html = '''
-                        <div style="margin-top: 20px;">
-                            <h3 style="color: #ffffff;">No Results Found</h3>
-                            <p style="color: #cfcfcf;">No aircraft found matching your search criteria. Please try a different search term.</p>
-                        </div>
-                        '''
-                else:
-                    result_html = '''
-                    <div style="margin-top: 20px;">
-                        <h3 style="color: #ffffff;">Error</h3>
-                        <p style="color: #cfcfcf;">Unable to retrieve aircraft information. Please check your search terms and try again.</p>
-                    </div>
-                    '''
+                # Repeat searches within LOOKUP_TTL reuse the fetched aircraft, and the
+                # rendered cards too while the data's ETag is unchanged.
+                cache = _view_cache(cog)
+                key = f"lookup:{search_type}:{search_value}"
+                etag, model = await cache.model(
+                    key, lambda: _lookup_model(cog, search_type, search_value), LOOKUP_TTL
+                )
+                result_html = cache.rendered(key, etag, lambda: _render_lookup_results(cog, model))
+                if not model["ok"]:
+                    cache.invalidate(key)
                     
             except Exception:
                 log.exception("Error during dashboard aircraft lookup")
@@ -662,8 +735,6 @@ class DashboardIntegration:
                 </div>
                 '''
         
-
-        
         # Populate form with current values if this was a POST request
         if kwargs.get("request") and kwargs["request"].method == "POST":
             form.search_type.data = kwargs["request"].form.get("search_type", "icao")
@@ -672,80 +743,7 @@ class DashboardIntegration:
         return {
             "status": 0,
             "web_content": {
-                "source": """
-                <div style=\"background-color: #1e1f22; padding: 20px; border-radius: 8px; color: #e6e6e6;\">
-                    <h2 style=\"color: #ffffff;\">SkySearch Aircraft Lookup</h2>
-                    <p style=\"color: #cfcfcf;\">Search for aircraft by ICAO code, callsign, registration, or aircraft type.</p>
-                    
-                    <div style=\"margin-bottom: 20px;\">
-                        <h3 style=\"color: #ffffff;\">Search Aircraft:</h3>
-                        <div style=\"background-color: #2b2e34; padding: 20px; border-radius: 8px; border: 1px solid #3a3d41;\">
-                            <style>
-                                .form-container {
-                                    display: flex;
-                                    flex-direction: column;
-                                    gap: 15px;
-                                }
-                                .form-row {
-                                    display: flex;
-                                    align-items: center;
-                                    gap: 10px;
-                                    flex-wrap: wrap;
-                                }
-                                .form-label {
-                                    color: #ffffff;
-                                    font-weight: bold;
-                                    min-width: 100px;
-                                }
-                                .form-field {
-                                    background-color: #1e1f22;
-                                    border: 1px solid #3a3d41;
-                                    border-radius: 4px;
-                                    color: #e6e6e6;
-                                    padding: 8px 12px;
-                                    font-size: 14px;
-                                }
-                                .form-field:focus {
-                                    outline: none;
-                                    border-color: #5865f2;
-                                    box-shadow: 0 0 0 2px rgba(88, 101, 242, 0.2);
-                                }
-                                .form-select {
-                                    background-color: #1e1f22;
-                                    border: 1px solid #3a3d41;
-                                    border-radius: 4px;
-                                    color: #e6e6e6;
-                                    padding: 8px 12px;
-                                    font-size: 14px;
-                                    min-width: 150px;
-                                }
-                                .form-submit {
-                                    background-color: #5865f2;
-                                    border: none;
-                                    border-radius: 4px;
-                                    color: #ffffff;
-                                    padding: 10px 20px;
-                                    font-size: 14px;
-                                    font-weight: bold;
-                                    cursor: pointer;
-                                    transition: background-color 0.2s;
-                                }
-                                .form-submit:hover {
-                                    background-color: #4752c4;
-                                }
-                                .form-submit:active {
-                                    background-color: #3c45a5;
-                                }
-                            </style>
-                            <div class=\"form-container\">
-                                {{ form|safe }}
-                            </div>
-                        </div>
-                    </div>
-                    
-                    {{ result_html|safe }}
-                </div>
-                """,
+                "source": LOOKUP_PAGE_SOURCE,
                 "form": form,
                 "result_html": result_html,
             },
@@ -0,0 +1,77 @@
+"""
+View-model and rendered-HTML cache for the SkySearch dashboard pages.
+
+Dashboard pages used to call upstream APIs and rebuild their HTML on every view. Pages now
+ask DashboardViewCache for a view model, which is refreshed at most once per TTL (with
+concurrent refreshes sharing one build), and each model gets an ETag, a short hash of its
+content. The rendered HTML is kept per page and reused for as long as the ETag is unchanged,
+so a view of unchanged data costs neither an upstream call nor a re-render.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import typing
+
+
+MAX_ENTRIES = 128
+
+
+def make_etag(model: typing.Any) -> str:
+    """Stable short hash of a JSON-like view model."""
+    payload = json.dumps(model, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class DashboardViewCache:
+    def __init__(self):
+        self._models = {}  # key -> (expires_at, etag, model)
+        self._rendered = {}  # key -> (etag, html)
+        self._inflight = {}  # key -> asyncio.Task
+        self.stats = {"model_hits": 0, "model_builds": 0, "render_hits": 0, "renders": 0}
+
+    async def model(self, key: str, builder: typing.Callable[[], typing.Awaitable], ttl: float) -> typing.Tuple[str, typing.Any]:
+        """Return (etag, model) for `key`, calling `builder` only when the cached model has expired."""
+        entry = self._models.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.stats["model_hits"] += 1
+            return entry[1], entry[2]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(builder())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+            self.stats["model_builds"] += 1
+        model = await asyncio.shield(task)
+
+        etag = make_etag(model)
+        self._models[key] = (time.monotonic() + ttl, etag, model)
+        self._trim(self._models)
+        return etag, model
+
+    def rendered(self, key: str, etag: str, render: typing.Callable[[], str]) -> str:
+        """Return cached HTML for `key` if it was rendered for `etag`, otherwise render and store it."""
+        entry = self._rendered.get(key)
+        if entry is not None and entry[0] == etag:
+            self.stats["render_hits"] += 1
+            return entry[1]
+        self.stats["renders"] += 1
+        html = render()
+        self._rendered[key] = (etag, html)
+        self._trim(self._rendered)
+        return html
+
+    def invalidate(self, key: typing.Optional[str] = None):
+        if key is None:
+            self._models.clear()
+            self._rendered.clear()
+        else:
+            self._models.pop(key, None)
+            self._rendered.pop(key, None)
+
+    @staticmethod
+    def _trim(store: dict):
+        while len(store) > MAX_ENTRIES:
+            store.pop(next(iter(store)))
@@ -12,7 +12,8 @@ import json
 import urllib.parse
 import logging
 from redbot.core import commands, Config
-from redbot.core.i18n import Translator, cog_i18n, set_contextual_locales_from_guild
+from redbot.core.i18n import Translator, cog_i18n
+from redbot.core.data_manager import cog_data_path
 from discord.ext import tasks
 
 from .data.icao_codes import (
@@ -24,6 +25,13 @@ from .data.icao_codes import (
 from .utils.api import APIManager
 from .utils.helpers import HelperUtils
 from .utils.export import ExportManager
+from .utils.perf import PerfRecorder, timed_cycle
+from .utils.locales import GuildLocaleResolver, LOCALE_COMMANDS
+from .utils.cluster import SnapshotCoordinator
+from .utils.auto_icao import AutoIcaoLookup
+from .utils.geo import PositionSnapshot
+from .utils.geofence import FenceIndex, has_geometry
+from .utils.feeder import FeederCache
 from .commands.aircraft import AircraftCommands
 from .commands.airport import AirportCommands, FAAStatusView
 from .commands.admin import AdminCommands
@@ -53,11 +61,30 @@ class Skysearch(commands.Cog, DashboardIntegration):
         self.config.register_global(user_agent=None)  # Optional custom User-Agent header for all outbound HTTP requests
         self.config.register_global(planespotters_user_agent=None)  # Optional custom User-Agent header specifically for planespotters.net
         self.config.register_global(api_stats=None)  # API request statistics for persistence
+        self.config.register_global(perf_export=False)  # Append timing spans to perf_spans.jsonl in the cog data folder
+        self.config.register_global(cluster_mode=False)  # Share upstream snapshots between bot processes (see utils/cluster.py)
+        self.config.register_global(profile_sampling=False, profile_threshold=3.0)  # Sample slow commands into the profiles folder (see api/command_profiler.py)
         self.config.register_guild(alert_channel=None, alert_role=None, auto_icao=False, auto_delete_not_found=True, emergency_cooldown=5, last_alerts={}, custom_alerts={}, faa_alert_channel=None, faa_alert_role=None, faa_alert_cooldown=5, last_faa_status=None, faa_last_alert_time=None, geofence_alerts={})
         # Watchlist stores: ICAO codes, aircraft types, callsigns, registrations, squawk codes
         # Format handled by normalize_watchlist() for backward compatibility with list format
         self.config.register_user(watchlist=[], watchlist_notifications={}, watchlist_cooldown=10, watchlist_aircraft_state={})
         
+        # Timing spans for background loops and API requests (see `skysearch perf`)
+        self.perf = PerfRecorder()
+
+        # Leader/peer sharing of upstream snapshots when running as several processes
+        self.cluster = SnapshotCoordinator()
+        # Latest global position feed, reused by location commands (see utils/geo.py)
+        self.positions = PositionSnapshot()
+        # Prepared geo-fence geometry, rebuilt incrementally each geofence cycle
+        self.geofences = FenceIndex()
+        # Parsed feeder JSON per URL, shared by every HelperUtils instance (see utils/feeder.py)
+        self.feeder_cache = FeederCache()
+
+        # Cached guild locales for background alerts (see utils/locales.py)
+        self.locales = GuildLocaleResolver(bot)
+        self._locale_preload_task = None
+
         # Initialize utility managers
         self.api = APIManager(self)
         self.helpers = HelperUtils(self)
@@ -97,6 +124,8 @@ class Skysearch(commands.Cog, DashboardIntegration):
         # Track guilds we've checked and confirmed have auto_icao disabled (to avoid repeated checks)
         self._auto_icao_checked_guilds = set()
         
+        self.auto_icao = AutoIcaoLookup(self)
+
         # Pre-compile regex pattern for ICAO matching
         self._icao_pattern = re.compile(r'^[a-fA-F0-9]{6}$')
         # Limit concurrent background network-heavy operations across tasks.
@@ -115,15 +144,17 @@ class Skysearch(commands.Cog, DashboardIntegration):
             self._auto_icao_checked_guilds.add(guild.id)
 
     async def _set_guild_locales_safe(self, guild) -> bool:
-        """Set i18n context for a guild without letting failures break background tasks."""
-        try:
-            await asyncio.wait_for(set_contextual_locales_from_guild(self.bot, guild), timeout=2.0)
-            return True
-        except asyncio.TimeoutError:
-            log.warning(f"Timed out setting contextual locales for guild {guild.id}")
-        except Exception as e:
-            log.warning(f"Failed to set contextual locales for guild {guild.id}: {e}")
-        return False
+        """Set i18n context for a guild without letting failures break background tasks.
+
+        Call this only for guilds that are about to receive a message; locales come from
+        the resolver cache, so Red's config is read once per guild rather than per cycle.
+        """
+        return await self.locales.apply(guild)
+
+    async def _preload_locales(self):
+        """Warm the locale cache once the bot knows its guilds."""
+        await self.bot.wait_until_ready()
+        await self.locales.preload()
 
     async def _run_background_io(self, awaitable):
         """Bound concurrent background I/O to keep event loop responsive under load."""
@@ -133,6 +164,37 @@ class Skysearch(commands.Cog, DashboardIntegration):
     async def cog_load(self):
         """Called when the cog is loaded - refresh cache."""
         await self._refresh_auto_icao_cache()
+        self._locale_preload_task = asyncio.create_task(self._preload_locales())
+        if await self.config.perf_export():
+            self.perf.enable_export(self.get_perf_export_path())
+        if await self.config.cluster_mode():
+            self.cluster.enable(self.get_cluster_path())
+        if await self.config.profile_sampling():
+            self.command_api.profiler.enable_sampling(self.get_profile_path(), await self.config.profile_threshold())
+
+    @property
+    def cog_data_folder(self):
+        """This cog's data directory (created by Red on first use)."""
+        return cog_data_path(self)
+
+    def get_perf_export_path(self):
+        """Get the path timing spans are exported to."""
+        return self.cog_data_folder / "perf_spans.jsonl"
+
+    def get_cluster_path(self):
+        """Get the directory shared by all processes for cluster snapshots."""
+        return self.cog_data_folder / "cluster"
+
+    def get_profile_path(self):
+        """Get the directory slow command samples (cProfile stats, stack snapshots) are written to."""
+        return self.cog_data_folder / "profiles"
+
+    async def _fetch_background(self, url, max_age):
+        """Background (no ctx) API request, served from the cluster leader's snapshot when possible."""
+        data, fetched_at = await self.cluster.fetch_with_time(url, lambda: self.api.make_request(url), max_age=max_age)
+        if url.endswith("/?all_with_pos"):
+            self.positions.update(data, fetched_at)  # A peer's copy keeps the leader's fetch time
+        return data
 
     def get_airplane_icon_path(self):
         """Get the path to the local airplane icon."""
@@ -152,6 +214,14 @@ class Skysearch(commands.Cog, DashboardIntegration):
         """
         self.command_api.register_callback(callback)
 
+    async def cog_before_invoke(self, ctx):
+        """Start latency profiling for every SkySearch command."""
+        self.command_api.profiler.begin(ctx)
+
+    async def cog_after_invoke(self, ctx):
+        """Record the command's latency and phase breakdown (runs for failed commands too)."""
+        self.command_api.profiler.finish(ctx)
+
     async def _execute_with_hooks(self, ctx, command_name: str, args: list, command_func):
         """Execute a command with pre/post hooks."""
         import time
@@ -186,6 +256,10 @@ class Skysearch(commands.Cog, DashboardIntegration):
         self.check_watched_aircraft.cancel()
         self.check_faa_status_changes.cancel()
         self.check_geofence_alerts.cancel()
+        if self._locale_preload_task:
+            self._locale_preload_task.cancel()
+        self.cluster.disable()
+        self.perf.flush()
         await self.api.close()
 
     @commands.guild_only()
@@ -284,13 +358,31 @@ class Skysearch(commands.Cog, DashboardIntegration):
         """Debug API statistics data structure (delegates to AdminCommands)."""
         await self.admin_commands.apistats_debug(ctx)
 
+    @commands.is_owner()
+    @skysearch.command(name='perf', help=_('Show p50/p95/p99 timings for background loops and API requests (owner only)'))
+    async def perf_report(self, ctx, action: str = None, value: str = None):
+        """Show loop/API timing percentiles; `reset` clears them, `export on|off` toggles span export (delegates to AdminCommands)."""
+        await self.admin_commands.perf_report(ctx, action, value)
+
+    @commands.is_owner()
+    @skysearch.command(name='profile', help=_('Show p50/p95/p99 latency per SkySearch command and where the time went (owner only)'))
+    async def profile_report(self, ctx, *, arguments: str = None):
+        """Show command latency, one command's phase breakdown, `reset`, or `sampling on|off [threshold]` (delegates to AdminCommands)."""
+        await self.admin_commands.profile_report(ctx, arguments)
+
+    @commands.is_owner()
+    @skysearch.command(name='cluster', help=_('Share airplanes.live and FAA snapshots between bot processes (owner only)'))
+    async def cluster_mode(self, ctx, state: str = None):
+        """Show cluster snapshot sharing status, or turn it `on`/`off` (delegates to AdminCommands)."""
+        await self.admin_commands.cluster_mode(ctx, state)
+
     # Aircraft commands
     @commands.guild_only()
     @commands.group(name='aircraft', help=_('Command center for aircraft related commands and API monitoring'), invoke_without_command=True)
     async def aircraft_group(self, ctx):
         """Command center for aircraft related commands and API monitoring"""
         embed = discord.Embed(title=_("Aircraft Commands"), description=_("Available aircraft-related commands and API monitoring:"), color=0xfffffe)
-        embed.add_field(name=_("Search Commands"), value="`icao` `callsign` `reg` `type` `squawk` `radius` `closest`", inline=False)
+        embed.add_field(name=_("Search Commands"), value="`icao` `callsign` `reg` `type` `squawk` `radius` `closest` `nearest` `bbox`", inline=False)
         embed.add_field(name=_("Special Aircraft"), value="`military` `ladd` `pia`", inline=False)
         embed.add_field(name=_("Export"), value=_("`export` - Export aircraft data to CSV, PDF, TXT, or HTML"), inline=False)
         embed.add_field(name=_("Configuration"), value="`alertchannel` `alertrole` `autoicao` `autodelete` `showalertchannel` `setapimode` `apimode`", inline=False)
@@ -298,8 +390,8 @@ class Skysearch(commands.Cog, DashboardIntegration):
         # Add brief mention of force and cooldown clear for owners
         if await ctx.bot.is_owner(ctx.author):
             embed.add_field(name=_("Custom Alert Admin"), value="`forcealert` (owner) `clearalertcooldown`", inline=False)
-        embed.add_field(name=_("Watchlist"), value="`watchlist` - Manage your personal aircraft watchlist\n`watchlist add <icao>` - Add aircraft to watchlist\n`watchlist remove <icao>` - Remove from watchlist\n`watchlist list` - List watched aircraft\n`watchlist status` - Get detailed status\n`watchlist cooldown [minutes]` - Set notification cooldown", inline=False)
-        embed.add_field(name=_("Geo-fence"), value="`geofence add` - Alert when aircraft enter/leave an area\n`geofence remove` - Remove a geo-fence\n`geofence list` - List all geo-fences", inline=False)
+        embed.add_field(name=_("Watchlist"), value="`watchlist` - Manage your personal aircraft watchlist\n`watchlist add <icao>` - Add aircraft to watchlist\n`watchlist remove <icao>` - Remove from watchlist\n`watchlist list` - List watched aircraft\n`watchlist status` - Get detailed status\n`watchlist cooldown [minutes]` - Set notification cooldown\n`watchlist import` / `watchlist export [json|csv]` - Bulk import or export\n`watchlist union|intersect|subtract <type>` - Combine with an aircraft type", inline=False)
+        embed.add_field(name=_("Geo-fence"), value="`geofence add` - Alert when aircraft enter/leave an area\n`geofence polygon` - Polygon geo-fence\n`geofence altitude` - Set an altitude band\n`geofence remove` - Remove a geo-fence\n`geofence list` - List all geo-fences", inline=False)
         embed.add_field(name=_("Other"), value=_("`scroll` - Scroll through available planes\n`feeder` - Parse feeder JSON data (secure modal)"), inline=False)
         # Only show debug command to bot owners
         if await ctx.bot.is_owner(ctx.author):
@@ -373,6 +465,16 @@ class Skysearch(commands.Cog, DashboardIntegration):
         """Find the closest aircraft to specified coordinates."""
         await self.aircraft_commands.closest_aircraft(ctx, lat, lon, radius)
 
+    @aircraft_group.command(name='nearest')
+    async def aircraft_nearest(self, ctx, lat: str, lon: str, count: str = "5", radius: str = "250"):
+        """List the aircraft nearest to specified coordinates."""
+        await self.aircraft_commands.nearest_aircraft(ctx, lat, lon, count, radius)
+
+    @aircraft_group.command(name='bbox')
+    async def aircraft_bbox(self, ctx, south: str, west: str, north: str, east: str):
+        """List aircraft inside a latitude/longitude bounding box."""
+        await self.aircraft_commands.aircraft_in_bbox(ctx, south, west, north, east)
+
     @aircraft_group.command(name='scroll')
     async def aircraft_scroll(self, ctx, category: str = 'mil'):
         """Scroll through available planes. Optionally specify a category: mil, ladd, pia, or all."""
@@ -426,6 +528,36 @@ class Skysearch(commands.Cog, DashboardIntegration):
         """Set or view the watchlist notification cooldown. Accepts formats like '20m', '30s', '1h', or '15.5m'. Use without a value to check current setting."""
         await self.aircraft_commands.watchlist_cooldown(ctx, duration)
 
+    @commands.guild_only()
+    @aircraft_watchlist.command(name='import')
+    async def aircraft_watchlist_import(self, ctx):
+        """Import many watchlist items at once from an attached CSV or JSON file."""
+        await self.aircraft_commands.watchlist_import(ctx)
+
+    @commands.guild_only()
+    @aircraft_watchlist.command(name='export')
+    async def aircraft_watchlist_export(self, ctx, file_format: str = "json"):
+        """Export your watchlist as a JSON or CSV file."""
+        await self.aircraft_commands.watchlist_export(ctx, file_format)
+
+    @commands.guild_only()
+    @aircraft_watchlist.command(name='union')
+    async def aircraft_watchlist_union(self, ctx, aircraft_type: str = None):
+        """Add every known aircraft of a type (e.g. military) to your watchlist as ICAO entries."""
+        await self.aircraft_commands.watchlist_category(ctx, "union", aircraft_type)
+
+    @commands.guild_only()
+    @aircraft_watchlist.command(name='intersect')
+    async def aircraft_watchlist_intersect(self, ctx, aircraft_type: str = None):
+        """Keep only watched ICAO codes that belong to an aircraft type."""
+        await self.aircraft_commands.watchlist_category(ctx, "intersect", aircraft_type)
+
+    @commands.guild_only()
+    @aircraft_watchlist.command(name='subtract')
+    async def aircraft_watchlist_subtract(self, ctx, aircraft_type: str = None):
+        """Remove watched ICAO codes that belong to an aircraft type."""
+        await self.aircraft_commands.watchlist_category(ctx, "subtract", aircraft_type)
+
     # Geo-fence commands
     @commands.guild_only()
     @aircraft_group.group(name='geofence', invoke_without_command=True)
@@ -437,6 +569,8 @@ class Skysearch(commands.Cog, DashboardIntegration):
             color=0xfffffe,
         )
         embed.add_field(name="add", value=_("`geofence add <name> <lat> <lon> <radius_nm> [alert_on] [cooldown] [channel] [role]`"), inline=False)
+        embed.add_field(name="polygon", value=_("`geofence polygon <name> <lat,lon;lat,lon;...> [alert_on] [cooldown] [channel] [role]`"), inline=False)
+        embed.add_field(name="altitude", value=_("`geofence altitude <fence_id> [min_ft] [max_ft]` - Only match aircraft in an altitude band"), inline=False)
         embed.add_field(name="remove", value=_("`geofence remove <fence_id>`"), inline=False)
         embed.add_field(name="list", value=_("`geofence list` - List all geo-fences"), inline=False)
         await ctx.send(embed=embed)
@@ -447,6 +581,18 @@ class Skysearch(commands.Cog, DashboardIntegration):
         """Add a geo-fence. Alerts when aircraft enter/leave the area. radius_nm in nautical miles. alert_on: entry, exit, or both."""
         await self.aircraft_commands.geofence_add(ctx, name, lat, lon, radius_nm, alert_on, cooldown, channel, role)
 
+    @commands.guild_only()
+    @aircraft_geofence.command(name='polygon')
+    async def aircraft_geofence_polygon(self, ctx, name: str, points: str, alert_on: str = "both", cooldown: int = 5, channel: discord.TextChannel = None, role: discord.Role = None):
+        """Add a polygon geo-fence. points: lat,lon pairs separated by `;` (or quoted and space-separated)."""
+        await self.aircraft_commands.geofence_add_polygon(ctx, name, points, alert_on, cooldown, channel, role)
+
+    @commands.guild_only()
+    @aircraft_geofence.command(name='altitude')
+    async def aircraft_geofence_altitude(self, ctx, fence_id: str, min_ft: str = None, max_ft: str = None):
+        """Limit a geo-fence to an altitude band in feet. Use `none` for an open end; no values clears the band."""
+        await self.aircraft_commands.geofence_altitude(ctx, fence_id, min_ft, max_ft)
+
     @commands.guild_only()
     @aircraft_geofence.command(name='remove')
     async def aircraft_geofence_remove(self, ctx, fence_id: str):
@@ -762,6 +908,7 @@ class Skysearch(commands.Cog, DashboardIntegration):
         await self.admin_commands.clear_avwx_token(ctx)
 
     @tasks.loop(minutes=2)
+    @timed_cycle("check_emergency_squawks")
     async def check_emergency_squawks(self):
         """Background task to check for emergency squawks."""
         try:
@@ -770,15 +917,14 @@ class Skysearch(commands.Cog, DashboardIntegration):
             for squawk_code in emergency_squawk_codes:
                 # Use new REST API endpoint for squawk filter - must combine with base query
                 url = f"{await self.api.get_api_url()}/?all_with_pos&filter_squawk={squawk_code}"
-                response = await self.api.make_request(url)  # No ctx for background task
+                with self.perf.span("fetch", squawk=squawk_code):
+                    response = await self._fetch_background(url, max_age=180)  # No ctx for background task
                 aircraft_count = len(response.get('aircraft', [])) if response else 0
                 log.debug(f"Checked {squawk_code}: Found {aircraft_count} aircraft")
                 aircraft_list = response.get('aircraft', []) if response and 'aircraft' in response else []
                 if aircraft_list:
                     guild_runtime = []
                     for guild in self.bot.guilds:
-                        if not await self._set_guild_locales_safe(guild):
-                            continue
                         guild_config = self.config.guild(guild)
                         alert_channel_id = await guild_config.alert_channel()
                         if not alert_channel_id:
@@ -795,6 +941,7 @@ class Skysearch(commands.Cog, DashboardIntegration):
                             "last_alerts": await guild_config.last_alerts(),
                             "dirty": False,
                         })
+                    self.perf.count("guilds", len(guild_runtime))
 
                     for aircraft_info in aircraft_list:
                         # Ignore aircraft with the hex 00000000
@@ -820,6 +967,10 @@ class Skysearch(commands.Cog, DashboardIntegration):
                                     )
                                     continue
 
+                            # Locale is only needed for guilds that are about to get an alert
+                            if not await self._set_guild_locales_safe(runtime["guild"]):
+                                continue
+
                             last_alerts[alert_key] = now.timestamp()
                             cutoff = now.timestamp() - (cooldown_minutes * 60)
                             runtime["last_alerts"] = {
@@ -844,10 +995,12 @@ class Skysearch(commands.Cog, DashboardIntegration):
                             }
                             # Compose the embed and view as before
                             aircraft_data = aircraft_info
-                            image_url, photographer, photo_err = await self._run_background_io(
-                                self.helpers.get_photo_by_aircraft_data(aircraft_data)
-                            )
-                            embed = self.helpers.create_aircraft_embed(aircraft_data, image_url, photographer, photo_err)
+                            with self.perf.span("photo"):
+                                image_url, photographer, photo_err = await self._run_background_io(
+                                    self.helpers.get_photo_by_aircraft_data(aircraft_data)
+                                )
+                            with self.perf.span("render"):
+                                embed = self.helpers.create_aircraft_embed(aircraft_data, image_url, photographer, photo_err)
 
                             # Create buttons for emergency alerts
                             view = discord.ui.View()
@@ -941,18 +1094,20 @@ class Skysearch(commands.Cog, DashboardIntegration):
                                     allowed_mentions = discord.AllowedMentions(roles=[role_obj])
                                 else:
                                     allowed_mentions = discord.AllowedMentions(roles=True)
-                            sent_message = await asyncio.wait_for(
-                                self._run_background_io(
-                                    self.helpers.send_embed_with_default_thumbnail(
-                                        alert_channel,
-                                        message_data.get('embed'),
-                                        content=message_data.get('content'),
-                                        view=message_data.get('view'),
-                                        allowed_mentions=allowed_mentions,
-                                    )
-                                ),
-                                timeout=10.0,
-                            )
+                            with self.perf.span("send"):
+                                sent_message = await asyncio.wait_for(
+                                    self._run_background_io(
+                                        self.helpers.send_embed_with_default_thumbnail(
+                                            alert_channel,
+                                            message_data.get('embed'),
+                                            content=message_data.get('content'),
+                                            view=message_data.get('view'),
+                                            allowed_mentions=allowed_mentions,
+                                        )
+                                    ),
+                                    timeout=10.0,
+                                )
+                            self.perf.count("alerts")
 
                             # Let other cogs react after the message is sent
                             try:
@@ -987,7 +1142,8 @@ class Skysearch(commands.Cog, DashboardIntegration):
             # Check custom alerts against the full aircraft feed once per loop cycle
             try:
                 all_url = f"{await self.api.get_api_url()}/?all_with_pos"
-                all_response = await self.api.make_request(all_url)
+                with self.perf.span("fetch_all"):
+                    all_response = await self._fetch_background(all_url, max_age=180)
                 # Support both primary ('aircraft') and fallback ('ac') response formats
                 aircraft_list = []
                 if all_response:
@@ -996,11 +1152,9 @@ class Skysearch(commands.Cog, DashboardIntegration):
                     elif 'ac' in all_response and isinstance(all_response['ac'], list):
                         aircraft_list = all_response['ac']
                 if aircraft_list:
+                    self.perf.count("aircraft", len(aircraft_list))
                     guilds = self.bot.guilds
                     for guild in guilds:
-                        # Set locales once per guild per cycle
-                        if not await self._set_guild_locales_safe(guild):
-                            continue
                         guild_config = self.config.guild(guild)
                         alert_channel_id = await guild_config.alert_channel()
                         custom_alerts = await guild_config.custom_alerts()
@@ -1024,7 +1178,10 @@ class Skysearch(commands.Cog, DashboardIntegration):
                                             destination_channel = custom_channel
                                     if destination_channel is None:
                                         continue
+                                    if not await self._set_guild_locales_safe(guild):
+                                        continue
                                     await self._send_custom_alert(destination_channel, guild_config, aircraft_info, alert_data, alert_id)
+                                    self.perf.count("custom_alerts")
                                     # update last triggered (timezone-aware UTC)
                                     custom_alerts[alert_id]['last_triggered'] = datetime.datetime.now(datetime.timezone.utc).isoformat()
                                     custom_alerts_dirty = True
@@ -1048,10 +1205,14 @@ class Skysearch(commands.Cog, DashboardIntegration):
         return (update_time, g, a, c)
 
     @tasks.loop(minutes=5)
+    @timed_cycle("check_faa_status_changes")
     async def check_faa_status_changes(self):
         """Background task to check for FAA status changes and notify guilds with FAA alerts enabled."""
         try:
-            result = await self.airport_commands._faa_fetch_data(None)
+            with self.perf.span("fetch"):
+                result = await self.cluster.fetch(
+                    "faa_status", lambda: self.airport_commands._faa_fetch_data(None), max_age=450
+                )
             if result is None:
                 return
             ground_delays, arrival_departure_delays, closures, update_time = result
@@ -1060,12 +1221,11 @@ class Skysearch(commands.Cog, DashboardIntegration):
 
             for guild in self.bot.guilds:
                 try:
-                    if not await self._set_guild_locales_safe(guild):
-                        continue
                     guild_config = self.config.guild(guild)
                     channel_id = await guild_config.faa_alert_channel()
                     if not channel_id:
                         continue
+                    self.perf.count("guilds")
                     last = await guild_config.last_faa_status()
                     last_sig = None
                     if last and isinstance(last, dict):
@@ -1094,6 +1254,8 @@ class Skysearch(commands.Cog, DashboardIntegration):
                     channel = self.bot.get_channel(channel_id)
                     if not channel:
                         continue
+                    if not await self._set_guild_locales_safe(guild):
+                        continue
                     role_id = await guild_config.faa_alert_role()
                     role_mention = f"<@&{role_id}>" if role_id else ""
                     view = FAAStatusView(
@@ -1102,7 +1264,9 @@ class Skysearch(commands.Cog, DashboardIntegration):
                     )
                     embed = view.build_embed("all")
                     embed.set_footer(text=f"FAA status changed • Updated: {update_time} • Times in UTC")
-                    await channel.send(content=role_mention or None, embed=embed)
+                    with self.perf.span("send"):
+                        await channel.send(content=role_mention or None, embed=embed)
+                    self.perf.count("alerts")
                     await guild_config.last_faa_status.set({
                         "update_time": update_time,
                         "ground_delays": ground_delays,
@@ -1120,42 +1284,68 @@ class Skysearch(commands.Cog, DashboardIntegration):
         await self.bot.wait_until_ready()
 
     @tasks.loop(minutes=3)
+    @timed_cycle("check_geofence_alerts")
     async def check_geofence_alerts(self):
-        """Background task to check geo-fence alerts (aircraft entering/leaving areas)."""
+        """
+        Background task to check geo-fence alerts (aircraft entering/leaving areas).
+
+        Fetches all aircraft once per cycle and matches them against every guild's circle,
+        polygon and altitude-band fences locally (see utils/geofence.py).
+        """
         try:
             api_mode = await self.config.api_mode()
             key = "aircraft" if api_mode == "primary" else "ac"
+            now = datetime.datetime.now(datetime.timezone.utc)
+            all_fences = {}  # (guild_id, fence_id) -> fence, including fences on cooldown
+            due_fences = {}  # The subset off cooldown, evaluated this cycle
+            guilds = []  # (guild, guild_config, geofence_alerts, [due fence ids])
             for guild in self.bot.guilds:
-                if not await self._set_guild_locales_safe(guild):
-                    continue
                 guild_config = self.config.guild(guild)
                 geofence_alerts = await guild_config.geofence_alerts()
                 if not geofence_alerts:
                     continue
-                now = datetime.datetime.now(datetime.timezone.utc)
+                self.perf.count("guilds")
+                due = []
                 for fence_id, fence in geofence_alerts.items():
+                    if not fence.get("channel_id") or not has_geometry(fence):
+                        continue
+                    all_fences[(guild.id, fence_id)] = fence
+                    # Check cooldown
+                    last_alert = fence.get("last_alert_time")
+                    if last_alert:
+                        last_dt = datetime.datetime.fromtimestamp(last_alert, tz=datetime.timezone.utc)
+                        if (now - last_dt).total_seconds() < fence.get("cooldown", 5) * 60:
+                            continue
+                    due.append(fence_id)
+                    due_fences[(guild.id, fence_id)] = fence
+                if due:
+                    guilds.append((guild, guild_config, geofence_alerts, due))
+            if not due_fences:
+                return
+
+            url = f"{await self.api.get_api_url()}/?all_with_pos"
+            with self.perf.span("fetch"):
+                response = await self._fetch_background(url, max_age=180)
+            if not response:
+                return
+            aircraft_list = response.get(key) or []
+            self.perf.count("fences", len(due_fences))
+            with self.perf.span("match"):
+                # Index every fence so those on cooldown keep their prepared geometry
+                self.geofences.rebuild(all_fences)
+                inside = self.geofences.match(aircraft_list, keys=due_fences)
+            by_hex = None
+
+            for guild, guild_config, geofence_alerts, due in guilds:
+                changed = False
+                for fence_id in due:
                     try:
-                        lat = fence.get("lat")
-                        lon = fence.get("lon")
-                        radius_nm = fence.get("radius_nm", 50)
-                        channel_id = fence.get("channel_id")
+                        fence = geofence_alerts[fence_id]
                         alert_on = fence.get("alert_on", "both")  # entry, exit, both
-                        cooldown_min = fence.get("cooldown", 5)
-                        if not channel_id or lat is None or lon is None:
-                            continue
-                        channel = self.bot.get_channel(channel_id)
+                        channel = self.bot.get_channel(fence.get("channel_id"))
                         if not channel:
                             continue
-                        # Check cooldown
-                        last_alert = fence.get("last_alert_time")
-                        if last_alert:
-                            last_dt = datetime.datetime.fromtimestamp(last_alert, tz=datetime.timezone.utc)
-                            if (now - last_dt).total_seconds() < cooldown_min * 60:
-                                continue
-                        url = f"{await self.api.get_api_url()}/?circle={lat},{lon},{radius_nm}"
-                        response = await self.api.make_request(url)
-                        aircraft_list = response.get(key, []) if response else []
-                        current_inside = {a.get("hex", "").upper(): a for a in aircraft_list if a.get("hex") and a.get("hex") != "00000000"}
+                        current_inside = inside.get((guild.id, fence_id), {})
                         prev_inside = fence.get("aircraft_inside") or {}
                         if not isinstance(prev_inside, dict):
                             prev_inside = {k: 1 for k in prev_inside} if isinstance(prev_inside, list) else {}
@@ -1163,30 +1353,37 @@ class Skysearch(commands.Cog, DashboardIntegration):
                         # Exit: aircraft in prev, not in current
                         entries = [current_inside[icao] for icao in current_inside if icao not in prev_inside]
                         exits = [icao for icao in prev_inside if icao not in current_inside]
+                        # Record who is inside before alerting, so an aircraft whose alert could
+                        # not be built or sent is not treated as a fresh entry on every cycle
+                        new_inside = {icao: 1 for icao in current_inside}
+                        if new_inside != prev_inside:
+                            fence["aircraft_inside"] = new_inside
+                            changed = True
                         role_id = fence.get("role_id")
                         role_mention = f"<@&{role_id}>" if role_id else ""
                         sent_alert = False
+                        if (entries or exits) and not await self._set_guild_locales_safe(guild):
+                            continue
                         if entries and alert_on in ("entry", "both"):
                             for aircraft_info in entries:
                                 await self._send_geofence_alert(channel, fence, aircraft_info, "entry", role_mention)
                                 sent_alert = True
                                 break  # One alert per cycle per fence
                         if exits and alert_on in ("exit", "both") and not sent_alert:
-                            # For exit we don't have full aircraft info; fetch first exited
+                            # The exited aircraft is usually still in the feed, just outside the fence
+                            if by_hex is None:
+                                by_hex = {(a.get("hex") or "").upper(): a for a in aircraft_list}
                             icao_exit = exits[0]
-                            url_hex = f"{await self.api.get_api_url()}/?find_hex={icao_exit}"
-                            r = await self.api.make_request(url_hex)
-                            ac_list = r.get(key, []) if r else []
-                            aircraft_info = ac_list[0] if ac_list else {"hex": icao_exit, "flight": "N/A", "lat": lat, "lon": lon}
+                            aircraft_info = by_hex.get(icao_exit) or {"hex": icao_exit, "flight": "N/A", "lat": fence.get("lat"), "lon": fence.get("lon")}
                             await self._send_geofence_alert(channel, fence, aircraft_info, "exit", role_mention)
                             sent_alert = True
-                        fence["aircraft_inside"] = {icao: 1 for icao in current_inside}
                         if sent_alert:
                             fence["last_alert_time"] = now.timestamp()
-                        await guild_config.geofence_alerts.set(geofence_alerts)
-                        await asyncio.sleep(1)
+                            changed = True
                     except Exception as e:
                         log.debug(f"Geofence {fence_id} error: {e}")
+                if changed:
+                    await guild_config.geofence_alerts.set(geofence_alerts)
         except Exception as e:
             log.error(f"Error checking geofence alerts: {e}", exc_info=True)
 
@@ -1197,8 +1394,10 @@ class Skysearch(commands.Cog, DashboardIntegration):
     async def _send_geofence_alert(self, channel, fence, aircraft_info, event_type, role_mention):
         """Send a geo-fence alert (entry or exit)."""
         fence_name = fence.get("name", "Unnamed")
-        image_url, photographer, photo_err = await self._run_background_io(self.helpers.get_photo_by_aircraft_data(aircraft_info))
-        embed = self.helpers.create_aircraft_embed(aircraft_info, image_url, photographer, photo_err)
+        with self.perf.span("photo"):
+            image_url, photographer, photo_err = await self._run_background_io(self.helpers.get_photo_by_aircraft_data(aircraft_info))
+        with self.perf.span("render"):
+            embed = self.helpers.create_aircraft_embed(aircraft_info, image_url, photographer, photo_err)
         if event_type == "entry":
             embed.title = f"🟢 Geo-fence: {aircraft_info.get('desc', 'Aircraft')} entered **{fence_name}**"
             embed.color = 0x00ff00
@@ -1210,20 +1409,23 @@ class Skysearch(commands.Cog, DashboardIntegration):
         link = f"https://globe.airplanes.live/?icao={icao}"
         view.add_item(discord.ui.Button(label="View on airplanes.live", emoji="🗺️", url=link, style=discord.ButtonStyle.link))
         allowed_mentions = discord.AllowedMentions(roles=True) if role_mention else None
-        await asyncio.wait_for(
-            self._run_background_io(
-                self.helpers.send_embed_with_default_thumbnail(
-                    channel,
-                    embed,
-                    content=role_mention or None,
-                    view=view,
-                    allowed_mentions=allowed_mentions,
-                )
-            ),
-            timeout=10.0,
-        )
+        with self.perf.span("send"):
+            await asyncio.wait_for(
+                self._run_background_io(
+                    self.helpers.send_embed_with_default_thumbnail(
+                        channel,
+                        embed,
+                        content=role_mention or None,
+                        view=view,
+                        allowed_mentions=allowed_mentions,
+                    )
+                ),
+                timeout=10.0,
+            )
+        self.perf.count("alerts")
     
     @tasks.loop(minutes=3)
+    @timed_cycle("check_watched_aircraft")
     async def check_watched_aircraft(self):
         """
         Background task to check watched aircraft and notify users when they come online.
@@ -1242,29 +1444,32 @@ class Skysearch(commands.Cog, DashboardIntegration):
             # Maps user_id -> {"watchlist": {...}, "guilds": [...]}
             user_watchlists = {}
             
-            for guild in self.bot.guilds:
-                for member in guild.members:
-                    if member.bot:
-                        continue
-                    try:
-                        user_config = self.config.user(member)
-                        # Normalize watchlist (handles backward compatibility)
-                        watchlist = await self.helpers.normalize_watchlist(user_config)
+            with self.perf.span("collect"):
+                for guild in self.bot.guilds:
+                    for member in guild.members:
+                        if member.bot:
+                            continue
+                        try:
+                            user_config = self.config.user(member)
+                            # Normalize watchlist (handles backward compatibility)
+                            watchlist = await self.helpers.normalize_watchlist(user_config)
                         
-                        # Check if watchlist has any items
-                        has_items = any(watchlist.get(key) for key in watchlist.keys())
-                        if has_items:
-                            if member.id not in user_watchlists:
-                                user_watchlists[member.id] = {
-                                    "user": member,
-                                    "config": user_config,
-                                    "watchlist": watchlist,
-                                    "guilds": set()
-                                }
-                            user_watchlists[member.id]["guilds"].add(guild)
-                    except Exception as e:
-                        log.debug(f"Error getting watchlist for user {member.id}: {e}")
-                        continue
+                            # Check if watchlist has any items
+                            has_items = any(watchlist.get(key) for key in watchlist.keys())
+                            if has_items:
+                                if member.id not in user_watchlists:
+                                    user_watchlists[member.id] = {
+                                        "user": member,
+                                        "config": user_config,
+                                        # Sets, so fleet-sized watchlists stay O(1) per aircraft
+                                        "watchlist": {key: set(values) for key, values in watchlist.items()},
+                                        "guilds": set()
+                                    }
+                                user_watchlists[member.id]["guilds"].add(guild)
+                        except Exception as e:
+                            log.debug(f"Error getting watchlist for user {member.id}: {e}")
+                            continue
+            self.perf.count("users", len(user_watchlists))
             
             if not user_watchlists:
                 log.debug("No users have watchlist items")
@@ -1273,7 +1478,8 @@ class Skysearch(commands.Cog, DashboardIntegration):
             # Fetch all aircraft from the API
             try:
                 url = f"{await self.api.get_api_url()}/?all_with_pos"
-                response = await self.api.make_request(url)
+                with self.perf.span("fetch"):
+                    response = await self._fetch_background(url, max_age=180)
                 api_mode = await self.config.api_mode()
                 key = 'aircraft' if api_mode == 'primary' else 'ac'
                 all_aircraft = response.get(key) if response else []
@@ -1282,6 +1488,7 @@ class Skysearch(commands.Cog, DashboardIntegration):
                 return
             
             log.debug(f"Checking {len(all_aircraft)} aircraft against {len(user_watchlists)} users with watchlists")
+            self.perf.count("aircraft", len(all_aircraft))
             
             # Check each aircraft against each user's watchlist
             for aircraft_data in all_aircraft:
@@ -1302,6 +1509,7 @@ class Skysearch(commands.Cog, DashboardIntegration):
                                 continue
                             
                             # Aircraft matches! Process notifications
+                            self.perf.count("matches")
                             await self._process_watchlist_notification(
                                 user, user_config, aircraft_data, aircraft_icao, guilds
                             )
@@ -1408,7 +1616,8 @@ class Skysearch(commands.Cog, DashboardIntegration):
             
             # Try to send DM
             try:
-                await user.send(embed=embed, view=view)
+                with self.perf.span("send"):
+                    await user.send(embed=embed, view=view)
                 notifications[notification_key] = current_time
                 await user_config.watchlist_notifications.set(notifications)
                 aircraft_state[state_key] = state_value
@@ -1451,8 +1660,6 @@ class Skysearch(commands.Cog, DashboardIntegration):
         try:
             guilds = self.bot.guilds
             for guild in guilds:
-                if not await self._set_guild_locales_safe(guild):
-                    continue
                 guild_config = self.config.guild(guild)
                 alert_channel_id = await guild_config.alert_channel()
                 # Default alert channel may be unset; some alerts might target a custom channel.
@@ -1479,6 +1686,8 @@ class Skysearch(commands.Cog, DashboardIntegration):
                         if destination_channel is None:
                             log.warning(f"No alert channel configured for guild {guild.name} and no valid custom channel for alert {alert_id}; skipping send")
                             continue
+                        if not await self._set_guild_locales_safe(guild):
+                            continue
                         
                         # Send custom alert
                         await self._send_custom_alert(destination_channel, guild_config, aircraft_info, alert_data, alert_id)
@@ -1653,6 +1862,20 @@ class Skysearch(commands.Cog, DashboardIntegration):
         except Exception as e:
             log.error(f"Error sending custom alert {alert_id}: {e}", exc_info=True)
 
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx):
+        """Drop cached locales when Red's locale or regional format settings change."""
+        if ctx.command and ctx.command.qualified_name.startswith(LOCALE_COMMANDS):
+            # Only the `server` subcommands are scoped to one guild; anything else may be global
+            if ctx.guild is not None and ctx.command.qualified_name.endswith(" server"):
+                self.locales.invalidate(ctx.guild.id)
+            else:
+                self.locales.invalidate()
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.locales.invalidate(guild.id)
+
     @commands.Cog.listener()
     async def on_message(self, message):
         """Handle automatic ICAO lookup."""
@@ -1685,10 +1908,10 @@ class Skysearch(commands.Cog, DashboardIntegration):
         # else: guild in _auto_icao_enabled_guilds - trust cache (updated on config change)
 
         # Ensure locales for non-command listener (only if auto_icao is enabled)
-        await set_contextual_locales_from_guild(self.bot, message.guild)
+        await self.locales.apply(message.guild)
 
-        ctx = await self.bot.get_context(message)
-        await self.aircraft_commands.aircraft_by_icao(ctx, content)
+        # Debounced per channel, cached briefly and shared across channels (see utils/auto_icao.py)
+        await self.auto_icao.handle(message, content)
         
     @commands.is_owner()
     @aircraft_group.command(name="simulateemergency")
@@ -5,7 +5,16 @@ Modules:
 - api.py: Handles all external API requests (airplanes.live, etc.).
 - helpers.py: Provides helper functions for formatting, embeds, and data processing.
 - export.py: Manages exporting aircraft data to CSV, PDF, TXT, or HTML formats.
-- stats.py: handles api stats for airplanes.live requests.
+- stats.py: handles api stats for airplanes.live requests, with chart PNGs cached per stats version.
+- charts.py: Pillow renderer for the apistats charts (quickchart.io URLs are the fallback without Pillow).
+- perf.py: Timing spans, rolling histograms and optional OTLP file export for background loops.
+- paginator.py: Shared button paginator with compact snapshots, photo prefetch and per-page embed cache.
+- locales.py: Cached per-guild locale resolver applied just before background alerts are sent.
+- cluster.py: Lock-file leader election and shared upstream snapshots for multi-process bots.
+- auto_icao.py: Debounced, cached and single-flight lookups for the auto_icao message listener.
+- geo.py: Global position snapshot with vectorized radius, nearest and bounding-box queries.
+- geofence.py: Prepared circle/polygon/altitude-band fences with a grid index over their bounding boxes.
+- feeder.py: Incremental feeder JSON parser with size caps, and a short per-URL result cache.
 - xml_parser.py: Utility class for parsing XML data from APIs with safe error handling.
 
 """
\ No newline at end of file
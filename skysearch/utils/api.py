@@ -10,6 +10,8 @@ import asyncio
 from collections import defaultdict
 from typing import Dict, Any
 
+from ..api.command_profiler import record_command_phase
+
 
 class APIManager:
     """Manages API requests and HTTP client for SkySearch."""
@@ -181,6 +183,14 @@ class APIManager:
             )
         
         self._request_stats['last_request_time'] = current_time
+
+        # Timing span for `skysearch perf` (query values stripped to keep span names bounded)
+        perf = getattr(self.cog, "perf", None)
+        if perf is not None:
+            span_name = endpoint.split('=', 1)[0].lstrip('?&') or 'unknown'
+            perf.record(f"http.{span_name}", response_time, status=status_code or 0, ok=success)
+        # Counts towards the `api` phase when a command is being profiled
+        record_command_phase("api", response_time)
         
         # Hybrid saving: Save on count OR time, whichever comes first
         self._save_counter += 1
@@ -301,7 +311,7 @@ class APIManager:
                                 url = url.replace(self.primary_api_url, self.fallback_api_url)
         else:
             # If the URL is not absolute, prepend the primary API base URL
-            if not url.startswith("https"):
+            if not url.startswith(("http://", "https://")):
                 url = self.primary_api_url + url
             else:
                 url = url.replace(self.fallback_api_url, self.primary_api_url)
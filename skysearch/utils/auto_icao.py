@@ -0,0 +1,142 @@
+"""
+Automatic ICAO lookups for messages that are just a 6-character hex code.
+
+Posting the same hex repeatedly (or in several channels during a raid) used to run the
+full find_hex request and planespotters photo chain once per message. AutoIcaoLookup puts
+three layers in front of that:
+
+- per-channel debounce: the same hex in the same channel within DEBOUNCE_SECONDS is ignored,
+  and a channel never has more than MAX_PENDING_PER_CHANNEL lookups waiting;
+- a short result cache: aircraft data, photos and rendered embeds are reused for
+  REUSE_SECONDS, so a repeat in another channel costs no upstream requests;
+- single-flight: concurrent lookups for one hex share a single fetch.
+"""
+
+import asyncio
+import logging
+import time
+
+import discord
+from redbot.core.i18n import Translator, get_locale
+
+
+log = logging.getLogger("red.skysearch.auto_icao")
+
+_ = Translator("Skysearch", __file__)
+
+DEBOUNCE_SECONDS = 15
+REUSE_SECONDS = 60
+MAX_PENDING_PER_CHANNEL = 3
+MAX_CACHED_RESULTS = 256
+
+
+class _LookupResult:
+    """Aircraft found for one hex, with photo lookups and embeds rendered per locale."""
+
+    __slots__ = ("aircraft", "expires_at", "embeds")
+
+    def __init__(self, aircraft: list, expires_at: float):
+        self.aircraft = aircraft  # [(aircraft_data, image_url, photographer, photo_err)]
+        self.expires_at = expires_at
+        self.embeds = {}  # locale -> [discord.Embed]
+
+
+class AutoIcaoLookup:
+    """Debounced, cached and single-flight lookups behind the auto_icao listener."""
+
+    def __init__(self, cog):
+        self.cog = cog
+        self._recent = {}  # (channel id, hex) -> monotonic time of last lookup
+        self._pending = {}  # channel id -> lookups waiting on a fetch
+        self._results = {}  # hex -> _LookupResult
+        self._inflight = {}  # hex -> asyncio.Task
+        self.stats = {"lookups": 0, "debounced": 0, "cache_hits": 0, "shared": 0, "fetches": 0}
+
+    def _debounced(self, channel_id: int, hex_id: str, now: float) -> bool:
+        key = (channel_id, hex_id)
+        last = self._recent.get(key)
+        if last is not None and now - last < DEBOUNCE_SECONDS:
+            return True
+        if self._pending.get(channel_id, 0) >= MAX_PENDING_PER_CHANNEL:
+            return True
+        self._recent[key] = now
+        if len(self._recent) > 1024:
+            self._recent = {k: t for k, t in self._recent.items() if now - t < DEBOUNCE_SECONDS}
+        return False
+
+    async def _fetch(self, hex_id: str) -> _LookupResult:
+        self.stats["fetches"] += 1
+        commands = self.cog.aircraft_commands
+        # No ctx: one fetch may serve several channels, so errors are logged, not posted.
+        response = await commands.api.make_request(f"/?find_hex={hex_id}")
+        aircraft_list = (response.get("aircraft") or response.get("ac") or []) if response else []
+        aircraft = []
+        for aircraft_data in aircraft_list:
+            image_url, photographer, photo_err = await commands.helpers.get_photo_by_aircraft_data(aircraft_data)
+            aircraft.append((aircraft_data, image_url, photographer, photo_err))
+        return _LookupResult(aircraft, time.monotonic() + REUSE_SECONDS)
+
+    async def _resolve(self, hex_id: str) -> _LookupResult:
+        result = self._results.get(hex_id)
+        if result is not None and result.expires_at > time.monotonic():
+            self.stats["cache_hits"] += 1
+            return result
+
+        task = self._inflight.get(hex_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(hex_id))
+            self._inflight[hex_id] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(hex_id, None))
+        else:
+            self.stats["shared"] += 1
+        # Shielded so one cancelled listener doesn't cancel the fetch other channels wait on.
+        result = await asyncio.shield(task)
+
+        self._results[hex_id] = result
+        if len(self._results) > MAX_CACHED_RESULTS:
+            now = time.monotonic()
+            self._results = {h: r for h, r in self._results.items() if r.expires_at > now}
+        return result
+
+    def _embeds(self, result: _LookupResult) -> list:
+        locale = get_locale()
+        embeds = result.embeds.get(locale)
+        if embeds is None:
+            helpers = self.cog.aircraft_commands.helpers
+            embeds = [
+                helpers.create_aircraft_embed(aircraft_data, image_url, photographer, photo_err)
+                for aircraft_data, image_url, photographer, photo_err in result.aircraft
+            ]
+            result.embeds[locale] = embeds
+        return embeds
+
+    async def handle(self, message: discord.Message, hex_id: str):
+        """Look up `hex_id` for `message` unless it was just looked up in this channel."""
+        hex_id = hex_id.lower()
+        channel = message.channel
+        if self._debounced(channel.id, hex_id, time.monotonic()):
+            self.stats["debounced"] += 1
+            return
+        self.stats["lookups"] += 1
+
+        self._pending[channel.id] = self._pending.get(channel.id, 0) + 1
+        try:
+            result = await self._resolve(hex_id)
+        except Exception as e:
+            log.warning(f"Auto ICAO lookup for {hex_id} failed: {e}")
+            return
+        finally:
+            self._pending[channel.id] -= 1
+            if not self._pending[channel.id]:
+                del self._pending[channel.id]
+
+        helpers = self.cog.aircraft_commands.helpers
+        if not result.aircraft:
+            embed = discord.Embed(title=_("No results found for your query"), color=discord.Colour(0xff4545))
+            embed.add_field(name=_("Details"), value=_("No aircraft information found or the response format is incorrect."), inline=False)
+            await channel.send(embed=embed)
+            return
+        for (aircraft_data, *_photo), embed in zip(result.aircraft, self._embeds(result)):
+            # Views hold per-message state, so each send gets a fresh one
+            view = helpers.create_aircraft_view_with_watchlist(aircraft_data)
+            await helpers.send_embed_with_default_thumbnail(channel, embed, view=view)
@@ -0,0 +1,169 @@
+"""
+Local PNG rendering for the chart specs built in stats.py.
+
+Draws pie/doughnut, bar, horizontal bar and line charts with Pillow, so `skysearch apistats`
+needs no external chart service. Rendering is CPU-bound; call it from a worker thread.
+Without Pillow, HAS_PILLOW is False and callers fall back to quickchart.io URLs.
+"""
+
+import io
+import math
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    HAS_PILLOW = True
+except ImportError:
+    HAS_PILLOW = False
+
+
+SCALE = 2  # Render at 2x for sharp text on high-DPI clients (matches quickchart devicePixelRatio=2)
+TEXT_COLOR = (153, 170, 181, 255)  # Discord "greyple", readable on light and dark themes
+GRID_COLOR = (153, 170, 181, 70)
+PADDING = 12
+
+
+def _rgba(hex_color: str, alpha: int = 255) -> tuple:
+    hex_color = hex_color.lstrip("#")
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4)) + (alpha,)
+
+
+def _font(size: int):
+    try:
+        return ImageFont.load_default(size=size * SCALE)
+    except TypeError:  # Pillow < 10.1 has a single bitmap size
+        return ImageFont.load_default()
+
+
+def _text_size(draw, text: str, font) -> tuple:
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+    return right - left, bottom - top
+
+
+def _nice_max(value: float) -> float:
+    """Round an axis maximum up to 1, 2 or 5 times a power of ten."""
+    if value <= 0:
+        return 1
+    exponent = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * exponent:
+            return step * exponent
+    return 10 * exponent
+
+
+def _format_tick(value: float) -> str:
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:g}M"
+    if value >= 1_000:
+        return f"{value / 1_000:g}k"
+    return f"{value:g}"
+
+
+def _draw_legend(draw, labels, colors, width, y, font):
+    items = [(label, _text_size(draw, label, font)[0]) for label in labels]
+    box = 12 * SCALE
+    total = sum(w + box + 24 * SCALE for _, w in items)
+    x = (width - total) / 2
+    for (label, w), color in zip(items, colors):
+        draw.rectangle([x, y, x + box, y + box], fill=_rgba(color))
+        draw.text((x + box + 6 * SCALE, y - 2 * SCALE), label, fill=TEXT_COLOR, font=font)
+        x += w + box + 24 * SCALE
+
+
+def _render_pie(spec: dict, image, draw, font):
+    width, height = image.size
+    values = spec["values"]
+    total = sum(values) or 1
+    legend_h = 30 * SCALE
+    diameter = min(width, height - legend_h) - 2 * PADDING * SCALE
+    left = (width - diameter) / 2
+    top = PADDING * SCALE
+    bbox = [left, top, left + diameter, top + diameter]
+    start = -90.0
+    for value, color in zip(values, spec["colors"]):
+        sweep = 360.0 * value / total
+        if sweep > 0:
+            draw.pieslice(bbox, start, start + sweep, fill=_rgba(color), outline=(255, 255, 255, 255), width=SCALE)
+        start += sweep
+    if spec["type"] == "doughnut":
+        inset = diameter * 0.25
+        # ImageDraw writes pixels directly, so a transparent fill punches the hole
+        draw.ellipse([bbox[0] + inset, bbox[1] + inset, bbox[2] - inset, bbox[3] - inset], fill=(0, 0, 0, 0))
+    _draw_legend(draw, spec["labels"], spec["colors"], width, height - legend_h + 6 * SCALE, font)
+
+
+def _render_axes(spec: dict, image, draw, font):
+    """Bar, horizontal bar and line charts share the grid/axis layout."""
+    width, height = image.size
+    kind = spec["type"]
+    labels, values = spec["labels"], spec["values"]
+    color = _rgba(spec["colors"][0])
+    axis_max = _nice_max(max(values) if values else 0)
+    ticks = [axis_max * i / 4 for i in range(5)]
+    pad = PADDING * SCALE
+    legend_h = 26 * SCALE if kind == "line" else 0
+
+    if kind == "hbar":
+        label_w = max((_text_size(draw, str(l), font)[0] for l in labels), default=0) + pad
+        plot = [pad + label_w, pad, width - pad * 2, height - pad - 20 * SCALE]
+        for tick in ticks:
+            x = plot[0] + (plot[2] - plot[0]) * tick / axis_max
+            draw.line([x, plot[1], x, plot[3]], fill=GRID_COLOR, width=1)
+            text = _format_tick(tick)
+            tw, _ = _text_size(draw, text, font)
+            draw.text((x - tw / 2, plot[3] + 4 * SCALE), text, fill=TEXT_COLOR, font=font)
+        slot = (plot[3] - plot[1]) / max(len(values), 1)
+        for i, (label, value) in enumerate(zip(labels, values)):
+            y0 = plot[1] + slot * i + slot * 0.15
+            y1 = plot[1] + slot * (i + 1) - slot * 0.15
+            x1 = plot[0] + (plot[2] - plot[0]) * value / axis_max
+            if value > 0:
+                draw.rectangle([plot[0], y0, x1, y1], fill=color)
+            tw, th = _text_size(draw, str(label), font)
+            draw.text((plot[0] - tw - pad / 2, (y0 + y1) / 2 - th / 2), str(label), fill=TEXT_COLOR, font=font)
+        return
+
+    tick_w = max(_text_size(draw, _format_tick(t), font)[0] for t in ticks) + pad / 2
+    plot = [pad + tick_w, pad, width - pad, height - pad - 22 * SCALE - legend_h]
+    for tick in ticks:
+        y = plot[3] - (plot[3] - plot[1]) * tick / axis_max
+        draw.line([plot[0], y, plot[2], y], fill=GRID_COLOR, width=1)
+        text = _format_tick(tick)
+        tw, th = _text_size(draw, text, font)
+        draw.text((plot[0] - tw - pad / 2, y - th / 2), text, fill=TEXT_COLOR, font=font)
+
+    count = max(len(values), 1)
+    slot = (plot[2] - plot[0]) / count
+    centres = [plot[0] + slot * (i + 0.5) for i in range(count)]
+    points = [(x, plot[3] - (plot[3] - plot[1]) * v / axis_max) for x, v in zip(centres, values)]
+    if kind == "line":
+        if len(points) > 1:
+            draw.line(points, fill=color, width=2 * SCALE, joint="curve")
+        for x, y in points:
+            draw.ellipse([x - 2 * SCALE, y - 2 * SCALE, x + 2 * SCALE, y + 2 * SCALE], fill=color)
+    else:
+        for (x, y), value in zip(points, values):
+            if value > 0:
+                draw.rectangle([x - slot * 0.35, y, x + slot * 0.35, plot[3]], fill=color)
+
+    # Thin out x labels so they never overlap
+    label_w = max((_text_size(draw, str(l), font)[0] for l in labels), default=0) + pad
+    every = max(1, math.ceil(label_w / slot))
+    for i in range(0, len(labels), every):
+        tw, _ = _text_size(draw, str(labels[i]), font)
+        draw.text((centres[i] - tw / 2, plot[3] + 4 * SCALE), str(labels[i]), fill=TEXT_COLOR, font=font)
+    if legend_h:
+        _draw_legend(draw, [spec.get("label", "")], spec["colors"], width, height - legend_h + 4 * SCALE, font)
+
+
+def render_chart_png(spec: dict) -> bytes:
+    """Render one chart spec (see stats.build_chart_specs) to PNG bytes with a transparent background."""
+    image = Image.new("RGBA", (spec["width"] * SCALE, spec["height"] * SCALE), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    font = _font(11)
+    if spec["type"] in ("pie", "doughnut"):
+        _render_pie(spec, image, draw, font)
+    else:
+        _render_axes(spec, image, draw, font)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
@@ -0,0 +1,178 @@
+"""
+Shared upstream snapshots for bots running SkySearch in several processes (clusters).
+
+Each process already evaluates alerts only for `bot.guilds`, i.e. its own shards, but every
+process also polled airplanes.live and the FAA on its own. With cluster mode on, one process
+holds an exclusive lock file and becomes the leader: it fetches the global aircraft snapshot
+and FAA status and publishes each result to a file in a shared directory. The other processes
+read the published copy instead of calling the API, so upstream traffic stays the same no
+matter how many clusters are added.
+
+If the leader stops (its lock is released by the OS when the process exits) the next peer to
+fetch takes over. If a published copy is older than expected, peers fetch for themselves
+rather than alerting on stale data.
+
+Lock files need `fcntl` (Linux/macOS); on other platforms cluster mode cannot be enabled.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+log = logging.getLogger("red.skysearch.cluster")
+
+LOCK_FILENAME = "leader.lock"
+
+
+class SnapshotCoordinator:
+    """Leader election over a lock file plus file-based publishing of fetched snapshots."""
+
+    def __init__(self):
+        self.directory: Optional[Path] = None
+        self.enabled = False
+        self._lock_fp = None
+        self._served_local = 0
+        self._served_shared = 0
+        self._fallbacks = 0
+
+    @staticmethod
+    def supported() -> bool:
+        return fcntl is not None
+
+    # ------------------------------------------------------------------ leadership
+
+    def enable(self, directory: Path) -> bool:
+        """Start sharing snapshots through `directory`, which every process must resolve to the same path."""
+        if not self.supported():
+            log.warning("Cluster mode needs fcntl lock files and is not available on this platform")
+            return False
+        self._release()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.enabled = True
+        self.is_leader()
+        return True
+
+    def disable(self):
+        self.enabled = False
+        self._release()
+
+    def _release(self):
+        if self._lock_fp is not None:
+            try:
+                fcntl.flock(self._lock_fp, fcntl.LOCK_UN)
+                self._lock_fp.close()
+            except OSError:
+                pass
+            self._lock_fp = None
+            log.info("Released cluster snapshot leadership")
+
+    def is_leader(self) -> bool:
+        """True if this process holds the leader lock, trying to take it if it is free."""
+        if not self.enabled:
+            return False
+        if self._lock_fp is not None:
+            return True
+        fp = open(self.directory / LOCK_FILENAME, "a+")
+        try:
+            fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fp.close()
+            return False
+        fp.seek(0)
+        fp.truncate()
+        fp.write(str(os.getpid()))
+        fp.flush()
+        self._lock_fp = fp
+        log.info(f"Process {os.getpid()} is now the cluster snapshot leader")
+        return True
+
+    # ------------------------------------------------------------------ snapshots
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"snapshot_{hashlib.sha1(key.encode()).hexdigest()[:16]}.json"
+
+    def _write(self, key: str, data, fetched_at: float):
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump({"key": key, "fetched_at": fetched_at, "leader_pid": os.getpid(), "data": data}, fp, separators=(",", ":"))
+        os.replace(tmp, path)  # Atomic, so peers never see a partial file
+
+    def _read(self, key: str):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as fp:
+                payload = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if payload.get("key") != key:
+            return None
+        return payload
+
+    async def fetch(self, key: str, fetcher: Callable[[], Awaitable], max_age: float):
+        """
+        Return the result of `fetcher()`, shared across processes when cluster mode is on.
+
+        The leader calls `fetcher` and publishes the result under `key`. Peers use the
+        published copy when it is at most `max_age` seconds old, and otherwise call
+        `fetcher` themselves without publishing.
+        """
+        data, _fetched_at = await self.fetch_with_time(key, fetcher, max_age)
+        return data
+
+    async def fetch_with_time(self, key: str, fetcher: Callable[[], Awaitable], max_age: float) -> Tuple[Any, float]:
+        """Like `fetch`, but also return when the data was fetched (the leader's time for a peer's copy)."""
+        if not self.enabled:
+            data = await fetcher()
+            return data, time.time()
+
+        if self.is_leader():
+            data = await fetcher()
+            fetched_at = time.time()
+            self._served_local += 1
+            if data is not None:
+                try:
+                    await asyncio.to_thread(self._write, key, data, fetched_at)
+                except (OSError, TypeError) as e:
+                    log.warning(f"Could not publish cluster snapshot for {key}: {e}")
+            return data, fetched_at
+
+        payload = await asyncio.to_thread(self._read, key)
+        if payload is not None and time.time() - payload.get("fetched_at", 0) <= max_age:
+            self._served_shared += 1
+            return payload.get("data"), payload["fetched_at"]
+
+        log.debug(f"No fresh cluster snapshot for {key}; fetching directly")
+        self._fallbacks += 1
+        data = await fetcher()
+        return data, time.time()
+
+    def status(self) -> dict:
+        leader_pid = None
+        try:
+            if self.directory is not None:
+                leader_pid = int((self.directory / LOCK_FILENAME).read_text().strip() or 0) or None
+        except (OSError, ValueError):
+            pass
+        return {
+            "supported": self.supported(),
+            "enabled": self.enabled,
+            "leader": self._lock_fp is not None,
+            "pid": os.getpid(),
+            "leader_pid": leader_pid,
+            "directory": str(self.directory) if self.directory else None,
+            "fetched_locally": self._served_local,
+            "served_from_peer": self._served_shared,
+            "fallback_fetches": self._fallbacks,
+        }
@@ -0,0 +1,313 @@
+"""
+Incremental parsing of feeder status JSON for `aircraft feeder`.
+
+Feeder status documents (pasted, or fetched from an allowed URL) can be large, but the feeder
+embed and buttons only read `host`, `map_link`, and the `uuid`/rate fields of `beast_clients`
+and `mlat_clients`. FeederJSONParser is fed the document in chunks while it is read, keeps
+only those fields and skips every other value by scanning brackets and strings without
+building objects. Caps are enforced while reading:
+
+- total bytes (the caller's limit, checked on every chunk),
+- any kept value (a client object or a string) larger than MAX_VALUE_CHARS,
+- more than MAX_LIST_ELEMENTS entries in a client list, or nesting deeper than MAX_DEPTH.
+
+Only the first MAX_KEPT_CLIENTS clients of each list are kept; `<list>_count` holds the
+full number. FeederCache keeps parsed results per URL for FEEDER_CACHE_TTL seconds and
+shares one fetch between concurrent requests for the same URL.
+"""
+
+import asyncio
+import codecs
+import json
+import re
+import time
+import typing
+
+
+CHUNK_SIZE = 16_384
+MAX_VALUE_CHARS = 16_384
+MAX_LIST_ELEMENTS = 10_000
+MAX_KEPT_CLIENTS = 100
+MAX_DEPTH = 64
+FEEDER_CACHE_TTL = 30
+FEEDER_CACHE_SIZE = 64
+
+SCALAR_FIELDS = ("host", "map_link")
+CLIENT_FIELDS = {
+    "beast_clients": ("uuid", "msgs_s", "pos_s"),
+    "mlat_clients": ("user", "message_rate", "peer_count"),
+}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[,}\]\s]")
+_MORE = object()  # Sentinel: the value continues past the buffered data
+
+
+class FeederJSONParser:
+    """Chunk-fed parser that extracts the feeder embed fields from a top-level JSON object."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.result: dict = {}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+        self._list = None  # Client list whose array is being read
+        self._scan = None  # [start, index, depth, in_string] of a partly buffered value
+
+    # ------------------------------------------------------------------ input
+
+    def feed(self, chunk: bytes):
+        """Add raw response bytes."""
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_bytes:
+            raise ValueError("JSON payload is too large.")
+        try:
+            text = self._decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise ValueError("Response is not valid UTF-8 JSON.")
+        self.feed_text(text)
+
+    def feed_text(self, text: str):
+        """Add already-decoded text."""
+        self._buf += text
+        self._run(final=False)
+
+    def close(self) -> dict:
+        """Finish parsing and return the extracted fields."""
+        try:
+            self._buf += self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise ValueError("Response is not valid UTF-8 JSON.")
+        self._run(final=True)
+        if self._state != "done":
+            raise ValueError("Invalid JSON format: unexpected end of data.")
+        if self._buf[self._pos:].strip():
+            raise ValueError("Invalid JSON format: extra data after the feeder object.")
+        return self.result
+
+    # ------------------------------------------------------------------ parsing
+
+    def _run(self, final: bool):
+        while self._state != "done" and self._advance(final):
+            pass
+        self._compact()
+
+    def _compact(self):
+        """Drop text before the current position (or the start of a value still being read)."""
+        cut = self._scan[0] if self._scan is not None else self._pos
+        if cut:
+            self._buf = self._buf[cut:]
+            self._pos -= cut
+            if self._scan is not None:
+                self._scan[0] -= cut
+                self._scan[1] -= cut
+
+    def _fail(self, expected: str):
+        raise ValueError(f"Invalid JSON format: expected {expected}.")
+
+    def _advance(self, final: bool) -> bool:
+        """Consume one token or value; False when more input is needed."""
+        c = None
+        if self._scan is None:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos >= len(self._buf):
+                return False
+            c = self._buf[self._pos]
+
+        state = self._state
+        if state == "start":
+            if c != "{":
+                raise ValueError("Invalid JSON format: feeder data must be a JSON object.")
+            self._pos += 1
+            self._state = "first_key"
+        elif state in ("first_key", "key"):
+            if c == "}" and state == "first_key":
+                self._pos += 1
+                self._state = "done"
+                return True
+            if c is not None and c != '"':
+                self._fail("a key")
+            key = self._read_value(final, keep=True)
+            if key is _MORE:
+                return False
+            self._key = key
+            self._state = "colon"
+        elif state == "colon":
+            if c != ":":
+                self._fail("':'")
+            self._pos += 1
+            self._state = "value"
+        elif state == "value":
+            if c == "[" and self._key in CLIENT_FIELDS:
+                self._pos += 1
+                self._list = self._key
+                self.result[self._list] = []
+                self.result[f"{self._list}_count"] = 0
+                self._state = "first_item"
+                return True
+            keep = self._key in SCALAR_FIELDS
+            value = self._read_value(final, keep)
+            if value is _MORE:
+                return False
+            if keep and isinstance(value, str):
+                self.result[self._key] = value
+            self._state = "next"
+        elif state == "next":
+            if c == ",":
+                self._state = "key"
+            elif c == "}":
+                self._state = "done"
+            else:
+                self._fail("',' or '}'")
+            self._pos += 1
+        elif state in ("first_item", "item"):
+            if c == "]" and state == "first_item":
+                self._pos += 1
+                self._list = None
+                self._state = "next"
+                return True
+            count_key = f"{self._list}_count"
+            if self.result[count_key] >= MAX_LIST_ELEMENTS:
+                raise ValueError(f"Too many entries in {self._list} (limit {MAX_LIST_ELEMENTS}).")
+            keep = self.result[count_key] < MAX_KEPT_CLIENTS
+            value = self._read_value(final, keep)
+            if value is _MORE:
+                return False
+            self.result[count_key] += 1
+            if keep and isinstance(value, dict):
+                fields = CLIENT_FIELDS[self._list]
+                self.result[self._list].append({f: value[f] for f in fields if f in value})
+            self._state = "item_next"
+        elif state == "item_next":
+            if c == ",":
+                self._state = "item"
+            elif c == "]":
+                self._list = None
+                self._state = "next"
+            else:
+                self._fail("',' or ']'")
+            self._pos += 1
+        return True
+
+    def _read_value(self, final: bool, keep: bool):
+        """Scan one value from the buffer; decode it if `keep`, else skip it. Returns _MORE if incomplete."""
+        buf = self._buf
+        if self._scan is None:
+            self._scan = [self._pos, self._pos, 0, False]
+        start, i, depth, in_string = self._scan
+
+        if depth == 0 and not in_string and i == start and buf[start] not in '"{[':
+            # Number, true, false or null
+            m = _SCALAR_END.search(buf, start)
+            end = m.start() if m else len(buf)
+            if end - start > MAX_VALUE_CHARS:
+                raise ValueError("JSON value is too large.")
+            if m is None and not final:
+                return _MORE
+            self._scan = None
+            self._pos = end
+            return self._decode(buf[start:end])
+
+        end = None
+        while end is None:
+            if in_string:
+                m = _STRING_SPECIAL.search(buf, i)
+                if m is None:
+                    i = len(buf)
+                    break
+                if m.group() == "\\":
+                    if m.end() >= len(buf):
+                        i = m.start()  # Resume at the backslash once its escaped character arrives
+                        break
+                    i = m.end() + 1
+                    continue
+                i = m.end()
+                in_string = False
+                if depth == 0:
+                    end = i
+                continue
+            m = _STRUCTURAL.search(buf, i)
+            if m is None:
+                i = len(buf)
+                break
+            i = m.end()
+            char = m.group()
+            if char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+                if depth > MAX_DEPTH:
+                    raise ValueError("JSON is nested too deeply.")
+            else:
+                depth -= 1
+                if depth == 0:
+                    end = i
+
+        if end is None:
+            if final:
+                raise ValueError("Invalid JSON format: unexpected end of data.")
+            if keep:
+                if i - start > MAX_VALUE_CHARS:
+                    raise ValueError("JSON value is too large.")
+            else:
+                start = i  # Skipped text is never needed again
+            self._scan = [start, i, depth, in_string]
+            return _MORE
+
+        self._scan = None
+        self._pos = end
+        if not keep:
+            return None
+        if end - start > MAX_VALUE_CHARS:
+            raise ValueError("JSON value is too large.")
+        return self._decode(buf[start:end])
+
+    @staticmethod
+    def _decode(text: str):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON format: {e}")
+
+
+async def parse_feeder_text(text: str, max_chars: int) -> dict:
+    """Parse pasted feeder JSON in chunks, yielding to the event loop between them."""
+    if len(text) > max_chars:
+        raise ValueError("JSON payload is too large.")
+    parser = FeederJSONParser(max_chars)
+    for offset in range(0, len(text), CHUNK_SIZE):
+        parser.feed_text(text[offset:offset + CHUNK_SIZE])
+        await asyncio.sleep(0)
+    return parser.close()
+
+
+class FeederCache:
+    """Short-lived per-URL cache of parsed feeder data, with one fetch per URL in flight."""
+
+    def __init__(self, ttl: float = FEEDER_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}  # url -> (expires_at, result)
+        self._inflight = {}  # url -> asyncio.Task
+
+    async def get(self, url: str, fetch: typing.Callable[[], typing.Awaitable[dict]]) -> dict:
+        entry = self._entries.get(url)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[url] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(url, None))
+        result = await asyncio.shield(task)  # Errors propagate to every waiter and are not cached
+
+        self._entries[url] = (time.monotonic() + self.ttl, result)
+        while len(self._entries) > FEEDER_CACHE_SIZE:
+            self._entries.pop(next(iter(self._entries)))
+        return result
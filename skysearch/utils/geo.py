@@ -0,0 +1,208 @@
+"""
+Location queries (radius, closest, k-nearest, bounding box) over an aircraft position snapshot.
+
+The emergency and watchlist loops already download the global `all_with_pos` feed every few
+minutes. PositionSnapshot keeps the latest copy and, the first time a location command needs
+it, builds latitude/longitude columns so distances to every aircraft are computed in one
+vectorized haversine pass (NumPy when installed, plain Python otherwise). Commands only call
+the API when the snapshot is older than SNAPSHOT_MAX_AGE, and then query a `circle=` around
+the point and run the same search on that smaller result.
+
+Results carry `dst` (nautical miles) and `dir` (degrees true from the query point), the same
+fields airplanes.live adds to `circle=`/`closest=` responses.
+"""
+
+import heapq
+import math
+import time
+from typing import Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+EARTH_RADIUS_NM = 3440.065
+SNAPSHOT_MAX_AGE = 150  # Loops refresh the feed every 2-3 minutes
+API_MAX_RADIUS_NM = 250  # Largest `circle=` radius airplanes.live serves
+
+
+def haversine_nm(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in nautical miles."""
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def initial_bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Bearing in degrees true from point 1 towards point 2."""
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dl = math.radians(lon2 - lon1)
+    x = math.sin(dl) * math.cos(p2)
+    y = math.cos(p1) * math.sin(p2) - math.sin(p1) * math.cos(p2) * math.cos(dl)
+    return (math.degrees(math.atan2(x, y)) + 360) % 360
+
+
+def _position(aircraft: dict) -> Optional[tuple]:
+    try:
+        lat = float(aircraft["lat"])
+        lon = float(aircraft["lon"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if -90 <= lat <= 90 and -180 <= lon <= 180:
+        return lat, lon
+    return None
+
+
+class PositionIndex:
+    """Latitude/longitude columns over an aircraft list, for distance and box queries."""
+
+    def __init__(self, aircraft_list: list, fetched_at: float, radius_nm: Optional[float] = None):
+        self.fetched_at = fetched_at
+        self.radius_nm = radius_nm  # Radius the aircraft were fetched for, or None for the global feed
+        self.aircraft = []
+        lats, lons = [], []
+        for aircraft in aircraft_list:
+            position = _position(aircraft) if isinstance(aircraft, dict) else None
+            if position is not None:
+                self.aircraft.append(aircraft)
+                lats.append(position[0])
+                lons.append(position[1])
+        self._lats = lats
+        self._lons = lons
+        if HAS_NUMPY:
+            self._lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+            self._lon_rad = np.radians(np.asarray(lons, dtype=np.float64))
+            self._cos_lat = np.cos(self._lat_rad)
+        else:
+            self._lat_rad = [math.radians(v) for v in lats]
+            self._lon_rad = [math.radians(v) for v in lons]
+            self._cos_lat = [math.cos(v) for v in self._lat_rad]
+
+    def __len__(self):
+        return len(self.aircraft)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def _distances(self, lat: float, lon: float):
+        """Haversine distance in nm from (lat, lon) to every aircraft."""
+        p = math.radians(lat)
+        l = math.radians(lon)
+        cos_p = math.cos(p)
+        if HAS_NUMPY:
+            a = np.sin((self._lat_rad - p) / 2) ** 2 + cos_p * self._cos_lat * np.sin((self._lon_rad - l) / 2) ** 2
+            return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        result = []
+        for lat_r, lon_r, cos_lat in zip(self._lat_rad, self._lon_rad, self._cos_lat):
+            a = math.sin((lat_r - p) / 2) ** 2 + cos_p * cos_lat * math.sin((lon_r - l) / 2) ** 2
+            result.append(2 * EARTH_RADIUS_NM * math.asin(min(1.0, math.sqrt(a))))
+        return result
+
+    def _result(self, i: int, distance: float, lat: float, lon: float) -> dict:
+        """Copy of aircraft `i` annotated with distance and direction from the query point."""
+        aircraft = dict(self.aircraft[i])
+        aircraft["dst"] = round(float(distance), 1)
+        aircraft["dir"] = round(initial_bearing(lat, lon, self._lats[i], self._lons[i]))
+        return aircraft
+
+    def nearest(self, lat: float, lon: float, k: int = 1, radius_nm: Optional[float] = None) -> list:
+        """Up to `k` aircraft closest to (lat, lon), nearest first, optionally within `radius_nm`."""
+        if not self.aircraft or k <= 0:
+            return []
+        distances = self._distances(lat, lon)
+        if HAS_NUMPY:
+            candidates = np.flatnonzero(distances <= radius_nm) if radius_nm is not None else np.arange(len(distances))
+            if len(candidates) > k:
+                # argpartition finds the k smallest without sorting the whole snapshot
+                candidates = candidates[np.argpartition(distances[candidates], k - 1)[:k]]
+            order = candidates[np.argsort(distances[candidates], kind="stable")]
+            return [self._result(int(i), distances[i], lat, lon) for i in order]
+        pairs = (
+            (d, i) for i, d in enumerate(distances)
+            if radius_nm is None or d <= radius_nm
+        )
+        return [self._result(i, d, lat, lon) for d, i in heapq.nsmallest(k, pairs)]
+
+    def within(self, lat: float, lon: float, radius_nm: float) -> list:
+        """Every aircraft within `radius_nm` of (lat, lon), nearest first."""
+        return self.nearest(lat, lon, k=len(self.aircraft), radius_nm=radius_nm)
+
+    def in_bbox(self, south: float, west: float, north: float, east: float) -> list:
+        """Aircraft inside a lat/lon box, nearest to its centre first. `west > east` crosses the antimeridian."""
+        if not self.aircraft:
+            return []
+        crosses = west > east
+        if HAS_NUMPY:
+            lats = np.asarray(self._lats)
+            lons = np.asarray(self._lons)
+            in_lon = (lons >= west) | (lons <= east) if crosses else (lons >= west) & (lons <= east)
+            indices = np.flatnonzero((lats >= south) & (lats <= north) & in_lon).tolist()
+        else:
+            indices = [
+                i for i, (la, lo) in enumerate(zip(self._lats, self._lons))
+                if south <= la <= north and ((lo >= west or lo <= east) if crosses else west <= lo <= east)
+            ]
+        centre_lat, centre_lon = bbox_centre(south, west, north, east)
+        results = [
+            self._result(i, haversine_nm(centre_lat, centre_lon, self._lats[i], self._lons[i]), centre_lat, centre_lon)
+            for i in indices
+        ]
+        results.sort(key=lambda aircraft: aircraft["dst"])
+        return results
+
+
+def bbox_centre(south: float, west: float, north: float, east: float) -> tuple:
+    """Centre of a lat/lon box, handling boxes that cross the antimeridian."""
+    if west > east:
+        east += 360
+    lon = (west + east) / 2
+    if lon > 180:
+        lon -= 360
+    return (south + north) / 2, lon
+
+
+class PositionSnapshot:
+    """The most recent global `all_with_pos` feed, indexed on first use."""
+
+    def __init__(self, max_age: float = SNAPSHOT_MAX_AGE):
+        self.max_age = max_age
+        self._aircraft = None
+        self._fetched_at = 0.0
+        self._index = None
+        self.stats = {"snapshot_queries": 0, "api_queries": 0}
+
+    def update(self, response: Optional[dict], fetched_at: Optional[float] = None):
+        """Store an `all_with_pos` response (primary 'aircraft' or fallback 'ac' key) fetched at `fetched_at`."""
+        if not response:
+            return
+        aircraft_list = response.get("aircraft") or response.get("ac")
+        if not isinstance(aircraft_list, list):
+            return
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        if self._aircraft is not None and fetched_at < self._fetched_at:
+            return  # Never replace a newer snapshot with an older shared copy
+        self._aircraft = aircraft_list
+        self._fetched_at = fetched_at
+        self._index = None  # Rebuilt lazily; loops that nobody queries pay nothing
+
+    @property
+    def age(self) -> Optional[float]:
+        return time.time() - self._fetched_at if self._aircraft is not None else None
+
+    def index(self) -> Optional[PositionIndex]:
+        """The indexed snapshot if it is fresh enough to answer queries, otherwise None."""
+        age = self.age
+        if age is None or age > self.max_age:
+            return None
+        if self._index is None:
+            self._index = PositionIndex(self._aircraft, self._fetched_at)
+        return self._index
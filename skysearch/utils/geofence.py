@@ -0,0 +1,244 @@
+"""
+Local evaluation of geo-fences against the global aircraft feed.
+
+A fence is a circle (`lat`, `lon`, `radius_nm`) or a polygon (`shape: "polygon"` with
+`coords`, a flat [lat0, lon0, lat1, lon1, ...] list), and either kind may carry an altitude
+band (`min_alt`/`max_alt`, feet barometric). Rather than one `circle=` request per fence,
+check_geofence_alerts fetches `all_with_pos` once per cycle and FenceIndex matches every
+aircraft against every guild's fences:
+
+- each fence is prepared once (bounding box, polygon edges) and reused until it changes,
+- a grid over fence bounding boxes yields the few fences near each aircraft,
+- the bounding box rejects most candidates before the exact circle or point-in-polygon test.
+
+Polygon edges are straight lines in latitude/longitude, which is what people draw on a map.
+Longitudes are unwrapped around the first vertex, so fences may cross the antimeridian.
+"""
+
+import math
+import re
+from typing import Container, Dict, Hashable, Optional
+
+from .geo import EARTH_RADIUS_NM, haversine_nm
+
+
+GRID_DEGREES = 2.0
+GRID_ROWS = int(180 / GRID_DEGREES)
+GRID_COLS = int(360 / GRID_DEGREES)
+MAX_GRID_CELLS = 400  # Larger fences are checked against every aircraft instead
+MAX_POLYGON_VERTICES = 100
+
+
+def parse_polygon(text: str) -> list:
+    """Parse `lat,lon lat,lon ...` (points separated by spaces or `;`) into a flat coordinate list."""
+    points = [p for p in re.split(r"[;\s]+", text.strip()) if p]
+    coords = []
+    for point in points:
+        try:
+            lat_text, lon_text = point.split(",")
+            lat, lon = float(lat_text), float(lon_text)
+        except ValueError:
+            raise ValueError(f"Invalid point `{point}`. Use `lat,lon` pairs separated by spaces or `;`.")
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"Point `{point}` is out of range.")
+        coords.extend((lat, lon))
+    if len(coords) > 6 and coords[:2] == coords[-2:]:
+        del coords[-2:]  # Closing point repeats the first
+    if not 3 <= len(coords) // 2 <= MAX_POLYGON_VERTICES:
+        raise ValueError(f"A polygon needs 3 to {MAX_POLYGON_VERTICES} points.")
+    return coords
+
+
+def aircraft_altitude(aircraft: dict) -> Optional[float]:
+    """Barometric altitude in feet (geometric as a fallback, 0 on the ground), or None."""
+    altitude = aircraft.get("alt_baro")
+    if altitude == "ground":
+        return 0.0
+    if altitude is None:
+        altitude = aircraft.get("alt_geom")
+    try:
+        return float(altitude)
+    except (TypeError, ValueError):
+        return None
+
+
+def fence_geometry_key(fence: dict) -> tuple:
+    """Everything that affects which aircraft are inside a fence."""
+    return (
+        fence.get("shape", "circle"), fence.get("lat"), fence.get("lon"), fence.get("radius_nm"),
+        tuple(fence.get("coords") or ()), fence.get("min_alt"), fence.get("max_alt"),
+    )
+
+
+def has_geometry(fence: dict) -> bool:
+    if fence.get("shape") == "polygon":
+        return len(fence.get("coords") or ()) >= 6
+    return fence.get("lat") is not None and fence.get("lon") is not None
+
+
+class PreparedFence:
+    """A fence with its bounding box and edges computed for repeated containment tests."""
+
+    __slots__ = ("key", "south", "west", "north", "east", "min_alt", "max_alt", "_circle", "_edges")
+
+    def __init__(self, fence: dict):
+        self.key = fence_geometry_key(fence)
+        self.min_alt = fence.get("min_alt")
+        self.max_alt = fence.get("max_alt")
+        self._circle = None
+        self._edges = None
+        if fence.get("shape") == "polygon":
+            self._prepare_polygon(fence["coords"])
+        else:
+            self._prepare_circle(float(fence["lat"]), float(fence["lon"]), float(fence.get("radius_nm", 50)))
+
+    def _prepare_circle(self, lat: float, lon: float, radius_nm: float):
+        self._circle = (lat, lon, radius_nm)
+        dlat = math.degrees(radius_nm / EARTH_RADIUS_NM)
+        self.south = max(-90.0, lat - dlat)
+        self.north = min(90.0, lat + dlat)
+        ratio = math.sin(radius_nm / EARTH_RADIUS_NM) / max(math.cos(math.radians(lat)), 1e-12)
+        if self.south <= -90 or self.north >= 90 or ratio >= 1:
+            self.west, self.east = -180.0, 180.0  # Reaches a pole: every longitude
+        else:
+            dlon = math.degrees(math.asin(ratio))
+            self.west, self.east = lon - dlon, lon + dlon
+
+    def _prepare_polygon(self, coords: list):
+        lats = coords[0::2]
+        lons = [coords[1]]
+        for lon in coords[3::2]:
+            # Unwrap so consecutive vertices are never more than 180° apart
+            previous = lons[-1]
+            while lon - previous > 180:
+                lon -= 360
+            while lon - previous < -180:
+                lon += 360
+            lons.append(lon)
+        self.south, self.north = min(lats), max(lats)
+        self.west, self.east = min(lons), max(lons)
+        edges = []
+        for i in range(len(lats)):
+            lat1, lon1 = lats[i - 1], lons[i - 1]
+            lat2, lon2 = lats[i], lons[i]
+            if lat1 != lat2:  # Horizontal edges never cross the test ray
+                edges.append((lat1, lon1, lat2, (lon2 - lon1) / (lat2 - lat1)))
+        self._edges = tuple(edges)
+
+    def _unwrap(self, lon: float) -> Optional[float]:
+        """`lon` shifted by 0 or ±360° into the fence's longitude range, or None if outside it."""
+        for candidate in (lon, lon + 360, lon - 360):
+            if self.west <= candidate <= self.east:
+                return candidate
+        return None
+
+    def contains(self, lat: float, lon: float, altitude: Optional[float]) -> bool:
+        if not self.south <= lat <= self.north:
+            return False
+        lon = self._unwrap(lon)
+        if lon is None:
+            return False
+        if self.min_alt is not None or self.max_alt is not None:
+            if altitude is None:
+                return False
+            if self.min_alt is not None and altitude < self.min_alt:
+                return False
+            if self.max_alt is not None and altitude > self.max_alt:
+                return False
+        if self._circle is not None:
+            centre_lat, centre_lon, radius_nm = self._circle
+            return haversine_nm(centre_lat, centre_lon, lat, lon) <= radius_nm
+        # Even-odd ray casting towards increasing longitude
+        inside = False
+        for lat1, lon1, lat2, slope in self._edges:
+            if (lat1 > lat) != (lat2 > lat) and lon < lon1 + (lat - lat1) * slope:
+                inside = not inside
+        return inside
+
+    def cells(self) -> Optional[list]:
+        """Grid cells covered by the bounding box, or None if there are too many to list."""
+        row_min = min(int((self.south + 90) // GRID_DEGREES), GRID_ROWS - 1)
+        row_max = min(int((self.north + 90) // GRID_DEGREES), GRID_ROWS - 1)
+        col_min = int((self.west + 180) // GRID_DEGREES)
+        col_max = int((self.east + 180) // GRID_DEGREES)
+        count = (row_max - row_min + 1) * (col_max - col_min + 1)
+        if count > MAX_GRID_CELLS or col_max - col_min + 1 >= GRID_COLS:
+            return None
+        return [
+            (row, col % GRID_COLS)
+            for row in range(row_min, row_max + 1)
+            for col in range(col_min, col_max + 1)
+        ]
+
+
+def _cell(lat: float, lon: float) -> tuple:
+    row = min(int((lat + 90) // GRID_DEGREES), GRID_ROWS - 1)
+    col = int((lon + 180) // GRID_DEGREES) % GRID_COLS
+    return row, col
+
+
+class FenceIndex:
+    """Grid index over prepared fences, keyed by any hashable id (e.g. (guild_id, fence_id))."""
+
+    def __init__(self):
+        self._prepared: Dict[Hashable, PreparedFence] = {}
+        self._cells: Dict[tuple, list] = {}
+        self._everywhere: list = []
+
+    def __len__(self):
+        return len(self._prepared)
+
+    def rebuild(self, fences: Dict[Hashable, dict]):
+        """Index `fences`, reusing prepared geometry for fences that have not changed."""
+        prepared = {}
+        for key, fence in fences.items():
+            if not has_geometry(fence):
+                continue
+            existing = self._prepared.get(key)
+            if existing is not None and existing.key == fence_geometry_key(fence):
+                prepared[key] = existing
+                continue
+            try:
+                prepared[key] = PreparedFence(fence)
+            except (KeyError, TypeError, ValueError):
+                continue
+        if prepared.keys() == self._prepared.keys() and all(prepared[k] is self._prepared[k] for k in prepared):
+            return  # Nothing added, removed or reshaped: the grid is still valid
+        self._prepared = prepared
+        self._cells = {}
+        self._everywhere = []
+        for key, fence in prepared.items():
+            cells = fence.cells()
+            if cells is None:
+                self._everywhere.append((key, fence))
+                continue
+            for cell in cells:
+                self._cells.setdefault(cell, []).append((key, fence))
+
+    def match(self, aircraft_list: list, keys: Optional[Container] = None) -> Dict[Hashable, Dict[str, dict]]:
+        """{fence key: {ICAO: aircraft}} for every fence with at least one aircraft inside.
+
+        `keys` limits matching to those fences (e.g. the ones off cooldown) while the index
+        keeps the prepared geometry of all of them.
+        """
+        result: Dict[Hashable, Dict[str, dict]] = {}
+        everywhere = self._everywhere
+        cells = self._cells
+        for aircraft in aircraft_list:
+            hex_id = aircraft.get("hex")
+            if not hex_id or hex_id == "00000000":
+                continue
+            lat, lon = aircraft.get("lat"), aircraft.get("lon")
+            if lat is None or lon is None:
+                continue
+            candidates = cells.get(_cell(lat, lon))
+            if not candidates and not everywhere:
+                continue
+            altitude = aircraft_altitude(aircraft)
+            for group in (candidates or (), everywhere):
+                for key, fence in group:
+                    if keys is not None and key not in keys:
+                        continue
+                    if fence.contains(lat, lon, altitude):
+                        result.setdefault(key, {})[hex_id.upper()] = aircraft
+        return result
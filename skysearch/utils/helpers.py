@@ -2,6 +2,8 @@
 Helper utilities for SkySearch cog
 """
 
+import csv
+import io
 import json
 import aiohttp
 import discord
@@ -9,12 +11,19 @@ import logging
 from urllib.parse import quote_plus, urlparse, parse_qs, urlencode, urlunparse
 import asyncio
 
+from ..api.command_profiler import command_phase
+from .feeder import CHUNK_SIZE, FeederJSONParser, parse_feeder_text
+
 
 FEEDER_FETCH_TIMEOUT_SECONDS = 10
 FEEDER_MAX_RESPONSE_BYTES = 1_000_000
 FEEDER_ALLOWED_DOMAINS: tuple[str, ...] = (
     "airplanes.live",
 )
+PLANESPOTTERS_PHOTOS_URL = "https://api.planespotters.net/pub/photos"
+WATCHLIST_TYPES: tuple[str, ...] = ("icao", "type", "callsign", "reg", "squawk")
+WATCHLIST_MAX_ITEMS = 1000  # Per user, across all item types
+WATCHLIST_IMPORT_MAX_BYTES = 256_000
 
 
 log = logging.getLogger("red.skysearch.helpers")
@@ -25,6 +34,8 @@ class HelperUtils:
     
     def __init__(self, cog):
         self.cog = cog
+        # Overridable so the offline replay harness can point photo lookups at a stand-in.
+        self.planespotters_photos_url = PLANESPOTTERS_PHOTOS_URL
 
     def get_default_airplane_file(self):
         """Return the local default airplane image as a Discord file when available."""
@@ -38,15 +49,16 @@ class HelperUtils:
 
     async def send_embed_with_default_thumbnail(self, ctx, embed: discord.Embed, **kwargs):
         """Send an embed and attach the local default thumbnail image when needed."""
-        if "file" in kwargs or "files" in kwargs:
+        with command_phase("send"):
+            if "file" in kwargs or "files" in kwargs:
+                return await ctx.send(embed=embed, **kwargs)
+
+            thumbnail_url = embed.to_dict().get("thumbnail", {}).get("url")
+            if thumbnail_url == "attachment://defaultairplane.png":
+                icon_file = self.get_default_airplane_file()
+                if icon_file is not None:
+                    return await ctx.send(embed=embed, file=icon_file, **kwargs)
             return await ctx.send(embed=embed, **kwargs)
-
-        thumbnail_url = embed.to_dict().get("thumbnail", {}).get("url")
-        if thumbnail_url == "attachment://defaultairplane.png":
-            icon_file = self.get_default_airplane_file()
-            if icon_file is not None:
-                return await ctx.send(embed=embed, file=icon_file, **kwargs)
-        return await ctx.send(embed=embed, **kwargs)
     
     def _ensure_http_client(self):
         """Ensure HTTP client is initialized."""
@@ -128,7 +140,7 @@ class HelperUtils:
         # First try to get photo by hex ICAO directly
         if hex_id:
             try:
-                url_req = f'https://api.planespotters.net/pub/photos/hex/{hex_id}'
+                url_req = f'{self.planespotters_photos_url}/hex/{hex_id}'
                 async with self.cog._http_client.get(
                     url_req,
                     headers=await self._get_http_headers(service="planespotters"),
@@ -158,7 +170,7 @@ class HelperUtils:
         # If no photo found by hex, try by registration if provided
         if registration:
             try:
-                url_req = f'https://api.planespotters.net/pub/photos/reg/{registration}'
+                url_req = f'{self.planespotters_photos_url}/reg/{registration}'
                 async with self.cog._http_client.get(
                     url_req,
                     headers=await self._get_http_headers(service="planespotters"),
@@ -200,7 +212,7 @@ class HelperUtils:
                     if reg and reg != registration:  # Only try if we haven't already tried this registration
                         # try to get photo using the registration
                         try:
-                            url_req = f'https://api.planespotters.net/pub/photos/reg/{reg}'
+                            url_req = f'{self.planespotters_photos_url}/reg/{reg}'
                             async with self.cog._http_client.get(
                                 url_req,
                                 headers=await self._get_http_headers(service="planespotters"),
@@ -252,7 +264,8 @@ class HelperUtils:
         else:
             registration = None
             
-        return await self.get_photo_by_hex(hex_id, registration)
+        with command_phase("photo"):
+            return await self.get_photo_by_hex(hex_id, registration)
     
     def create_aircraft_embed(self, aircraft_data, image_url=None, photographer=None, photo_error: str | None = None):
         """
@@ -682,16 +695,19 @@ class HelperUtils:
 
     async def parse_json_input(self, json_input: str):
         """
-        Parse JSON input from either a URL or direct JSON text.
+        Parse feeder JSON input from either a URL or direct JSON text.
+
+        Only the fields the feeder embed and view use are extracted (see utils/feeder.py);
+        URL results are cached briefly per URL.
         
         Args:
             json_input (str): Either a URL containing JSON data OR direct JSON text
             
         Returns:
-            dict: Parsed JSON data
+            dict: Extracted feeder fields
             
         Raises:
-            ValueError: If JSON is invalid or URL fails
+            ValueError: If JSON is invalid, too large, or URL fails
             aiohttp.ClientError: If URL request fails
         """
         # Check if input looks like a URL
@@ -703,46 +719,39 @@ class HelperUtils:
                     "If you need another site, ask the bot owner to whitelist that domain."
                 )
 
-            # Fetch the JSON data from the URL
-            self._ensure_http_client()
-
-            timeout = aiohttp.ClientTimeout(total=FEEDER_FETCH_TIMEOUT_SECONDS)
-            async with self.cog._http_client.get(
-                json_input,
-                headers=await self._get_http_headers(),
-                allow_redirects=False,
-                timeout=timeout,
-            ) as response:
-                if response.status != 200:
-                    raise ValueError(f"Failed to fetch JSON data. Status: {response.status}")
-
-                # Enforce response size limits to avoid abuse.
-                content_length = response.headers.get("Content-Length")
-                if content_length:
-                    try:
-                        content_length_int = int(content_length)
-                    except ValueError:
-                        # Ignore malformed Content-Length and fall back to bounded read.
-                        content_length_int = None
-                    if content_length_int is not None and content_length_int > FEEDER_MAX_RESPONSE_BYTES:
-                        raise ValueError("JSON payload is too large.")
-
-                body = await response.content.read(FEEDER_MAX_RESPONSE_BYTES + 1)
-                if len(body) > FEEDER_MAX_RESPONSE_BYTES:
-                    raise ValueError("JSON payload is too large.")
+            return await self.cog.feeder_cache.get(json_input, lambda: self._fetch_feeder_json(json_input))
+        # Parse as direct JSON
+        return await parse_feeder_text(json_input, FEEDER_MAX_RESPONSE_BYTES)
+
+    async def _fetch_feeder_json(self, url: str) -> dict:
+        """Stream feeder JSON from an allowed URL through the incremental parser."""
+        self._ensure_http_client()
 
+        timeout = aiohttp.ClientTimeout(total=FEEDER_FETCH_TIMEOUT_SECONDS)
+        async with self.cog._http_client.get(
+            url,
+            headers=await self._get_http_headers(),
+            allow_redirects=False,
+            timeout=timeout,
+        ) as response:
+            if response.status != 200:
+                raise ValueError(f"Failed to fetch JSON data. Status: {response.status}")
+
+            # Enforce response size limits to avoid abuse.
+            content_length = response.headers.get("Content-Length")
+            if content_length:
                 try:
-                    return json.loads(body.decode("utf-8"))
-                except UnicodeDecodeError:
-                    raise ValueError("Response is not valid UTF-8 JSON.")
-                except json.JSONDecodeError as e:
-                    raise ValueError(f"Invalid JSON format from URL: {str(e)}")
-        else:
-            # Try to parse as direct JSON
-            try:
-                return json.loads(json_input)
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON format: {str(e)}")
+                    content_length_int = int(content_length)
+                except ValueError:
+                    # Ignore malformed Content-Length; the parser enforces the limit while reading.
+                    content_length_int = None
+                if content_length_int is not None and content_length_int > FEEDER_MAX_RESPONSE_BYTES:
+                    raise ValueError("JSON payload is too large.")
+
+            parser = FeederJSONParser(FEEDER_MAX_RESPONSE_BYTES)
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                parser.feed(chunk)
+            return parser.close()
 
     def create_feeder_embed(self, json_data: dict):
         """
@@ -772,7 +781,8 @@ class HelperUtils:
         # Extract beast clients information
         beast_clients = json_data.get('beast_clients', [])
         if beast_clients:
-            embed.add_field(name="Beast Clients", value=f"{len(beast_clients)} active", inline=True)
+            beast_count = json_data.get('beast_clients_count', len(beast_clients))
+            embed.add_field(name="Beast Clients", value=f"{beast_count} active", inline=True)
             
             # Show details for first few clients
             client_details = []
@@ -788,7 +798,8 @@ class HelperUtils:
         # Extract mlat clients information
         mlat_clients = json_data.get('mlat_clients', [])
         if mlat_clients:
-            embed.add_field(name="MLAT Clients", value=f"{len(mlat_clients)} active", inline=True)
+            mlat_count = json_data.get('mlat_clients_count', len(mlat_clients))
+            embed.add_field(name="MLAT Clients", value=f"{mlat_count} active", inline=True)
             
             # Show details for first few mlat clients
             mlat_details = []
@@ -1101,7 +1112,18 @@ class HelperUtils:
         icao = icao.upper().strip()
         types = []
         
-        # Check against each aircraft type set
+        for type_name, icao_set in self.get_aircraft_type_sets().items():
+            if icao in icao_set:
+                types.append(type_name)
+        
+        return types
+
+    def get_aircraft_type_sets(self) -> dict:
+        """
+        Map each aircraft type name to its ICAO set from data/icao_codes.py.
+        
+        REUSED BY: get_aircraft_types, watchlist union/intersect/subtract
+        """
         # Maps type name to cog attribute
         type_mapping = {
             'law_enforcement': self.cog.law_enforcement_icao_set,
@@ -1119,11 +1141,7 @@ class HelperUtils:
         if hasattr(self.cog, 'trainer_educational_set'):
             type_mapping['trainer_educational'] = self.cog.trainer_educational_set
         
-        for type_name, icao_set in type_mapping.items():
-            if icao in icao_set:
-                types.append(type_name)
-        
-        return types
+        return type_mapping
     
     def get_all_aircraft_type_names(self) -> list:
         """
@@ -1285,6 +1303,9 @@ class HelperUtils:
         if normalized_value in watchlist[item_type]:
             return False, f"**{value}** is already in your watchlist."
         
+        if sum(len(items) for items in watchlist.values()) >= WATCHLIST_MAX_ITEMS:
+            return False, f"Your watchlist is full ({WATCHLIST_MAX_ITEMS} items). Remove something first."
+        
         # Add to watchlist
         watchlist[item_type].append(normalized_value)
         await user_config.watchlist.set(watchlist)
@@ -1325,6 +1346,177 @@ class HelperUtils:
         
         return True, f"Removed **{value}** ({item_type}) from your watchlist."
 
+    def detect_watchlist_item_type(self, value: str) -> str:
+        """
+        Guess the watchlist item type of a value given without one.
+        
+        REUSED BY: watchlist add (single argument), watchlist import
+        """
+        value = value.upper()
+        if value.isdigit() and len(value) == 4:
+            return 'squawk'  # 4 digits = squawk code
+        if all(c in '0123456789ABCDEF' for c in value) and len(value) == 6:
+            return 'icao'  # 6 hex chars = ICAO
+        if any(c.isalpha() for c in value) and value.replace('-', '').replace(' ', '').isalnum():
+            # Has letters + optional dashes/spaces = registration or callsign
+            # Registrations are usually short, with a letter prefix
+            if len(value) <= 6 and value[0].isalpha():
+                return 'reg'
+            return 'callsign'
+        return 'icao'  # Default fallback
+
+    def normalize_watchlist_value(self, item_type: str, value) -> str | None:
+        """
+        Return `value` in the form stored in the watchlist, or None if it isn't valid for `item_type`.
+        
+        ICAO codes are stored uppercase and everything else lowercase, as in watchlist_add_item.
+        """
+        value = str(value).strip()
+        if not value:
+            return None
+        if item_type == 'icao':
+            is_valid, _error = self.validate_icao(value)
+            return value.upper() if is_valid else None
+        if item_type == 'squawk':
+            return value if value.isdigit() and len(value) == 4 else None
+        if item_type == 'type':
+            value = value.lower()
+            return value if value in self.get_all_aircraft_type_names() else None
+        return value.lower()
+
+    def parse_watchlist_import(self, data: bytes, filename: str = "") -> tuple:
+        """
+        Parse a CSV or JSON watchlist file.
+        
+        REUSED BY: watchlist import command
+        
+        JSON may be the export format ({"icao": [...], "reg": [...], ...}) or a plain list
+        of values. CSV rows are `type,value` or just `value`; values without a type are
+        auto-detected like `watchlist add <value>`. A `type,value` header row is skipped.
+        
+        Returns:
+            tuple: ({type: [normalized values, de-duplicated, in file order]}, [rejected entries])
+            
+        Raises:
+            ValueError: If the file is not valid JSON/CSV
+        """
+        text = data.decode('utf-8-sig')
+        entries = []  # (item_type or None, value)
+        if filename.lower().endswith('.json') or text.lstrip()[:1] in ('{', '['):
+            parsed = json.loads(text)
+            if isinstance(parsed, dict):
+                for item_type, values in parsed.items():
+                    if not isinstance(values, list):
+                        raise ValueError(f"Expected a list of values for '{item_type}'")
+                    entries.extend((item_type, value) for value in values)
+            elif isinstance(parsed, list):
+                entries.extend((None, value) for value in parsed)
+            else:
+                raise ValueError("Expected an object of lists or a list of values")
+        else:
+            for row in csv.reader(io.StringIO(text)):
+                cells = [cell.strip() for cell in row if cell.strip()]
+                if not cells:
+                    continue
+                if len(cells) >= 2:
+                    if cells[0].lower() in ('type', 'item_type') and cells[1].lower() == 'value':
+                        continue  # Header row
+                    entries.append((cells[0], cells[1]))
+                else:
+                    entries.append((None, cells[0]))
+
+        items = {item_type: [] for item_type in WATCHLIST_TYPES}
+        seen = {item_type: set() for item_type in WATCHLIST_TYPES}
+        rejected = []
+        for item_type, value in entries:
+            if not isinstance(value, (str, int)):
+                rejected.append(str(value))
+                continue
+            value = str(value).strip()
+            item_type = str(item_type).lower().strip() if item_type else self.detect_watchlist_item_type(value)
+            normalized = self.normalize_watchlist_value(item_type, value) if item_type in items else None
+            if normalized is None:
+                rejected.append(f"{item_type}:{value}")
+                continue
+            if normalized not in seen[item_type]:
+                seen[item_type].add(normalized)
+                items[item_type].append(normalized)
+        return items, rejected
+
+    async def watchlist_bulk_update(self, user_config, add: dict = None, keep: dict = None, remove: dict = None) -> dict:
+        """
+        Apply set operations to a watchlist with one read and one Config write.
+        
+        REUSED BY: watchlist import, union, intersect and subtract commands
+        
+        Args:
+            user_config: User config object from self.cog.config.user(user)
+            add (dict): {type: values} to add (union), in order, until WATCHLIST_MAX_ITEMS is reached
+            keep (dict): {type: values} to intersect those types with; other types are untouched
+            remove (dict): {type: values} to remove (difference)
+            
+        Returns:
+            dict: {"added", "removed", "existing", "over_cap", "total"} counts
+        """
+        watchlist = await self.normalize_watchlist(user_config)
+        current = {item_type: set(watchlist.get(item_type, [])) for item_type in WATCHLIST_TYPES}
+        removed = 0
+        for item_type, values in (remove or {}).items():
+            before = len(current[item_type])
+            current[item_type].difference_update(values)
+            removed += before - len(current[item_type])
+        for item_type, values in (keep or {}).items():
+            before = len(current[item_type])
+            current[item_type].intersection_update(values)
+            removed += before - len(current[item_type])
+
+        room = WATCHLIST_MAX_ITEMS - sum(len(values) for values in current.values())
+        added = {item_type: [] for item_type in WATCHLIST_TYPES}
+        existing = over_cap = 0
+        for item_type, values in (add or {}).items():
+            for value in values:
+                if value in current[item_type]:
+                    existing += 1
+                elif room <= 0:
+                    over_cap += 1
+                else:
+                    current[item_type].add(value)
+                    added[item_type].append(value)
+                    room -= 1
+
+        added_count = sum(len(values) for values in added.values())
+        if added_count or removed:
+            # Keep the existing order and append new items, so `watchlist list` stays stable
+            updated = {
+                item_type: [v for v in watchlist.get(item_type, []) if v in current[item_type]] + added[item_type]
+                for item_type in WATCHLIST_TYPES
+            }
+            await user_config.watchlist.set(updated)
+        return {
+            "added": added_count,
+            "removed": removed,
+            "existing": existing,
+            "over_cap": over_cap,
+            "total": sum(len(values) for values in current.values()),
+        }
+
+    def export_watchlist(self, watchlist: dict, file_format: str) -> bytes:
+        """
+        Serialize a watchlist as JSON ({type: [values]}) or CSV (`type,value` rows).
+        
+        Both formats can be read back by parse_watchlist_import.
+        """
+        if file_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(['type', 'value'])
+            for item_type in WATCHLIST_TYPES:
+                for value in watchlist.get(item_type, []):
+                    writer.writerow([item_type, value])
+            return buffer.getvalue().encode('utf-8')
+        data = {item_type: list(watchlist.get(item_type, [])) for item_type in WATCHLIST_TYPES}
+        return json.dumps(data, indent=2).encode('utf-8')
+
     async def get_all_watchlist_items(self, user_config) -> dict:
         """
         Get all watchlist items for a user (reuses normalize_watchlist).
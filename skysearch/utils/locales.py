@@ -0,0 +1,88 @@
+"""
+Per-guild locale cache for SkySearch background loops.
+
+`set_contextual_locales_from_guild` reads the guild locale and regional format from Red
+every time it is called. The background loops used to call it for every guild on every
+cycle, including guilds that never receive a SkySearch message. GuildLocaleResolver reads
+both values once per guild (in bulk on load), keeps them until Red's locale settings
+change or the entry expires, and applies them synchronously right before a message is built.
+"""
+
+import asyncio
+import logging
+import time
+
+from redbot.core.i18n import (
+    get_locale_from_guild,
+    get_regional_format_from_guild,
+    set_contextual_locale,
+    set_contextual_regional_format,
+)
+
+
+log = logging.getLogger("red.skysearch.locales")
+
+# Red has no locale-change event, so completions of these commands invalidate the cache.
+LOCALE_COMMANDS = ("set locale", "set regionalformat")
+DEFAULT_TTL = 3600  # Safety net for changes made outside those commands
+RESOLVE_TIMEOUT = 2.0
+
+
+class GuildLocaleResolver:
+    """Caches (locale, regional format) per guild and applies them to the current context."""
+
+    def __init__(self, bot, ttl: float = DEFAULT_TTL):
+        self.bot = bot
+        self.ttl = ttl
+        self._cache = {}  # guild id -> (locale, regional_format, expires_at)
+        self._hits = 0
+        self._misses = 0
+
+    async def _resolve(self, guild):
+        locale = await get_locale_from_guild(self.bot, guild)
+        regional_format = await get_regional_format_from_guild(self.bot, guild)
+        self._cache[guild.id] = (locale, regional_format, time.monotonic() + self.ttl)
+        return locale, regional_format
+
+    async def preload(self, guilds=None):
+        """Resolve locales for many guilds up front (defaults to every guild the bot is in)."""
+        guilds = list(self.bot.guilds if guilds is None else guilds)
+        loaded = 0
+        for guild in guilds:
+            try:
+                await self._resolve(guild)
+                loaded += 1
+            except Exception as e:
+                log.debug(f"Could not preload locale for guild {guild.id}: {e}")
+        log.debug(f"Preloaded locales for {loaded}/{len(guilds)} guilds")
+        return loaded
+
+    async def apply(self, guild) -> bool:
+        """Set the i18n context for `guild`, reading Red's config only on a cache miss."""
+        entry = self._cache.get(guild.id)
+        if entry is not None and entry[2] > time.monotonic():
+            self._hits += 1
+            locale, regional_format = entry[0], entry[1]
+        else:
+            self._misses += 1
+            try:
+                locale, regional_format = await asyncio.wait_for(self._resolve(guild), timeout=RESOLVE_TIMEOUT)
+            except asyncio.TimeoutError:
+                log.warning(f"Timed out resolving locale for guild {guild.id}")
+                return False
+            except Exception as e:
+                log.warning(f"Failed to resolve locale for guild {guild.id}: {e}")
+                return False
+        set_contextual_locale(locale)
+        set_contextual_regional_format(regional_format)
+        return True
+
+    def invalidate(self, guild_id=None):
+        """Forget one guild's locale, or every guild's when `guild_id` is None."""
+        if guild_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(guild_id, None)
+
+    def stats(self) -> dict:
+        return {"cached_guilds": len(self._cache), "hits": self._hits, "misses": self._misses}
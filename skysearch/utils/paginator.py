@@ -0,0 +1,208 @@
+"""
+Shared button paginator for aircraft lists (military, ladd, pia, scroll).
+
+The filtered feed is trimmed once into a compact snapshot. Rendered embeds are cached
+per page, and planespotters photos for the next and previous few pages are prefetched
+in the background through a small bounded pool. Most page turns are answered from the
+cache without waiting on an external API. Detailed pages carry the same link and Add to
+Watchlist buttons as a single aircraft result.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+
+import discord
+
+
+log = logging.getLogger("red.skysearch.paginator")
+
+# Only the fields the aircraft embeds, list pages and photo lookups read.
+SNAPSHOT_FIELDS = (
+    "hex", "flight", "r", "reg", "t", "desc", "ownOp", "year", "category",
+    "alt_baro", "alt_geom", "gs", "spd", "heading", "track", "true_heading", "baro_rate",
+    "squawk", "emergency", "lat", "lon", "seen", "seen_pos", "dst", "dir",
+)
+PREFETCH_PAGES = 2  # pages prefetched on each side of the current one
+PREFETCH_CONCURRENCY = 3
+EMBED_CACHE_SIZE = 32
+
+
+def compact_snapshot(aircraft_list: list) -> list:
+    """Copy only the fields the paginator needs out of a feed response."""
+    return [
+        {key: aircraft[key] for key in SNAPSHOT_FIELDS if key in aircraft}
+        for aircraft in aircraft_list
+        if isinstance(aircraft, dict)
+    ]
+
+
+class AircraftPaginator(discord.ui.View):
+    """Paginate a feed snapshot, one aircraft per page (with photo) or `per_page` per list page."""
+
+    def __init__(self, helpers, author, aircraft_list: list, *, title: str, per_page: int = 1, timeout: float = 120):
+        super().__init__(timeout=timeout)
+        self.helpers = helpers
+        self.author = author
+        self.snapshot = compact_snapshot(aircraft_list)
+        self.title = title
+        self.per_page = max(1, per_page)
+        self.page_count = max(1, -(-len(self.snapshot) // self.per_page))
+        self.index = 0
+        self.message = None
+        self._embed_cache = OrderedDict()
+        self._page_buttons = []  # The current aircraft's link and watchlist buttons
+        self._photo_tasks = {}
+        self._prefetch_semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        self._update_buttons()
+
+    # ------------------------------------------------------------------ rendering
+
+    @property
+    def detailed(self) -> bool:
+        return self.per_page == 1
+
+    def _page_items(self, page: int) -> list:
+        start = page * self.per_page
+        return self.snapshot[start:start + self.per_page]
+
+    async def _fetch_photo(self, aircraft: dict):
+        async with self._prefetch_semaphore:
+            try:
+                return await self.helpers.get_photo_by_aircraft_data(aircraft)
+            except Exception as e:
+                log.debug("Photo prefetch failed for %s: %s", aircraft.get("hex"), e)
+                return None, None, str(e)
+
+    def _photo_task(self, page: int) -> asyncio.Task:
+        """Photo lookup for a detailed page, shared between prefetch and page turns."""
+        task = self._photo_tasks.get(page)
+        if task is None:
+            task = asyncio.create_task(self._fetch_photo(self._page_items(page)[0]))
+            self._photo_tasks[page] = task
+        return task
+
+    def _schedule_prefetch(self):
+        """Warm photos around the current page and drop lookups that scrolled out of range."""
+        if not self.detailed:
+            return
+        for page, task in list(self._photo_tasks.items()):
+            if abs(page - self.index) > PREFETCH_PAGES * 2 and not task.done():
+                task.cancel()
+                del self._photo_tasks[page]
+        for offset in range(1, PREFETCH_PAGES + 1):
+            for page in (self.index + offset, self.index - offset):
+                if 0 <= page < self.page_count:
+                    self._photo_task(page)
+
+    def _is_ready(self, page: int) -> bool:
+        if page in self._embed_cache or not self.detailed:
+            return True
+        task = self._photo_tasks.get(page)
+        return task is not None and task.done()
+
+    def _build_list_embed(self, page: int) -> discord.Embed:
+        embed = discord.Embed(title=f"{self.title} (Page {page + 1}/{self.page_count})", color=0xfffffe)
+        embed.set_thumbnail(url="attachment://defaultairplane.png")
+        for aircraft in self._page_items(page):
+            aircraft_info = f"**Squawk:** {aircraft.get('squawk', 'N/A')}\n"
+            aircraft_info += f"**Coordinates:** Lat: {aircraft.get('lat', 'N/A')}, Lon: {aircraft.get('lon', 'N/A')}\n"
+            aircraft_info += f"**Heading:** {aircraft.get('heading', aircraft.get('track', 'N/A'))}\n"
+            aircraft_info += f"**Speed:** {aircraft.get('spd', aircraft.get('gs', 'N/A'))}\n"
+            aircraft_info += f"**ICAO:** {aircraft.get('hex', 'N/A')}"
+            if "dst" in aircraft:
+                aircraft_info += f"\n**Distance:** {aircraft['dst']} nm at {aircraft.get('dir', 'N/A')}°"
+            embed.add_field(name=aircraft.get("desc", "N/A"), value=aircraft_info, inline=False)
+        return embed
+
+    async def render(self, page: int) -> discord.Embed:
+        """Return the embed for `page`, from cache when possible."""
+        embed = self._embed_cache.get(page)
+        if embed is not None:
+            self._embed_cache.move_to_end(page)
+            return embed
+
+        if self.detailed:
+            aircraft = self._page_items(page)[0]
+            image_url, photographer, photo_err = await self._photo_task(page)
+            embed = self.helpers.create_aircraft_embed(aircraft, image_url, photographer, photo_err)
+            embed.set_author(name=f"{self.title} ({page + 1} of {self.page_count})")
+            if "dst" in aircraft:
+                embed.description = f"**Distance:** {aircraft['dst']} nm at {aircraft.get('dir', 'N/A')}°"
+        else:
+            embed = self._build_list_embed(page)
+
+        self._embed_cache[page] = embed
+        if len(self._embed_cache) > EMBED_CACHE_SIZE:
+            self._embed_cache.popitem(last=False)
+        return embed
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def start(self, ctx):
+        """Send the first page and start prefetching around it."""
+        self._schedule_prefetch()
+        embed = await self.render(self.index)
+        self.message = await self.helpers.send_embed_with_default_thumbnail(ctx, embed, view=self)
+        return self.message
+
+    def _cancel_prefetch(self):
+        for task in self._photo_tasks.values():
+            if not task.done():
+                task.cancel()
+        self._photo_tasks.clear()
+
+    async def on_timeout(self):
+        self._cancel_prefetch()
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.index <= 0
+        self.next_page.disabled = self.index >= self.page_count - 1
+        if not self.detailed or not self.snapshot:
+            return
+        for item in self._page_buttons:
+            self.remove_item(item)
+        aircraft = self._page_items(self.index)[0]
+        self._page_buttons = list(self.helpers.create_aircraft_view_with_watchlist(aircraft).children)
+        for item in self._page_buttons:
+            self.add_item(item)
+
+    async def _go_to(self, interaction: discord.Interaction, page: int):
+        self.index = max(0, min(page, self.page_count - 1))
+        self._update_buttons()
+        self._schedule_prefetch()
+        if self._is_ready(self.index):
+            embed = await self.render(self.index)
+            await interaction.response.edit_message(embed=embed, view=self)
+            return
+        # Photo still in flight: acknowledge now so the interaction doesn't expire.
+        await interaction.response.defer()
+        embed = await self.render(self.index)
+        await interaction.edit_original_response(embed=embed, view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        custom_id = (interaction.data or {}).get("custom_id")
+        if any(item.custom_id == custom_id for item in self._page_buttons if not item.url):
+            return True  # Anyone may add the shown aircraft to their watchlist, as on single results
+        return interaction.user == self.author
+
+    @discord.ui.button(emoji="⬅️", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go_to(interaction, self.index - 1)
+
+    @discord.ui.button(emoji="❌", style=discord.ButtonStyle.danger)
+    async def close(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self._cancel_prefetch()
+        self.stop()
+        await interaction.response.defer()
+        if self.message:
+            await self.message.delete()
+
+    @discord.ui.button(emoji="➡️", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._go_to(interaction, self.index + 1)
@@ -0,0 +1,310 @@
+"""
+Timing spans and rolling histograms for SkySearch background work.
+
+Every background loop runs inside a cycle span (see `timed_cycle`); phases inside it
+(fetch, match, photo, render, send) open child spans with `perf.span("fetch")`, and
+APIManager records each request as an `http.<endpoint>` span. Durations feed rolling
+histograms shown by `skysearch perf` and the dashboard.
+
+Spans can optionally be appended to a local file as OTLP/JSON lines (the format written
+by the OpenTelemetry collector's file exporter), so they can be loaded into any
+OpenTelemetry-compatible viewer without adding a dependency to the cog. Finished spans
+are buffered and written in a worker thread every few seconds or once a batch fills up,
+so exporting never blocks the event loop on file I/O.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+
+import discord
+
+
+log = logging.getLogger("red.skysearch.perf")
+
+DEFAULT_WINDOW = 512
+EXPORT_BATCH_SIZE = 256
+EXPORT_FLUSH_SECONDS = 10
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("skysearch_perf_span", default=None)
+
+
+class Span:
+    """One timed unit of work."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[dict] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes) if attributes else {}
+
+    @property
+    def duration(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e9
+
+    def set(self, key: str, value):
+        """Set an attribute (e.g. number of guilds processed)."""
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: int = 1):
+        """Increment a counter attribute."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+
+class RollingHistogram:
+    """Keeps the most recent `window` samples plus lifetime count/total/max."""
+
+    __slots__ = ("samples", "count", "total", "max", "last_attributes")
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last_attributes = {}
+
+    def add(self, seconds: float, attributes: Optional[dict] = None):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if attributes:
+            self.last_attributes = attributes
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        n = len(ordered)
+
+        def pct(p):
+            return ordered[min(n - 1, int(p * n))] if n else 0.0
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+            "max": self.max,
+            "last": self.samples[-1] if self.samples else 0.0,
+            "attributes": dict(self.last_attributes),
+        }
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class PerfRecorder:
+    """Collects spans into rolling histograms and optionally exports them."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._histograms = {}
+        self._export_path: Optional[Path] = None
+        self._export_buffer = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._write_lock = asyncio.Lock()
+        self._writes = set()
+
+    # ------------------------------------------------------------------ spans
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a block. Nested spans are named `<parent>.<name>`."""
+        parent = _current_span.get()
+        full_name = f"{parent.name}.{name}" if parent else name
+        span = Span(full_name, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def record(self, name: str, seconds: float, **attributes):
+        """Record an already-measured duration as a child of the current span."""
+        parent = _current_span.get()
+        span = Span(name, parent, attributes)
+        span.end_ns = time.time_ns()
+        span.start_ns = span.end_ns - int(seconds * 1e9)
+        self._finish(span)
+
+    def count(self, key: str, amount: int = 1):
+        """Add to a counter attribute on the current span (no-op outside a span)."""
+        span = _current_span.get()
+        if span is not None:
+            span.add(key, amount)
+
+    def _finish(self, span: Span):
+        histogram = self._histograms.get(span.name)
+        if histogram is None:
+            histogram = self._histograms[span.name] = RollingHistogram(self.window)
+        histogram.add(span.duration, span.attributes)
+        if self._export_path is not None:
+            self._export_buffer.append(span)
+            if len(self._export_buffer) >= EXPORT_BATCH_SIZE:
+                self._flush_soon(0)
+            elif self._flush_handle is None:
+                self._flush_soon(EXPORT_FLUSH_SECONDS)
+
+    # ------------------------------------------------------------------ reporting
+
+    def summaries(self) -> dict:
+        """{span name: summary} sorted by name."""
+        return {name: self._histograms[name].summary() for name in sorted(self._histograms)}
+
+    def reset(self):
+        self._histograms.clear()
+
+    # ------------------------------------------------------------------ export
+
+    @property
+    def export_path(self) -> Optional[Path]:
+        return self._export_path
+
+    def enable_export(self, path: Path):
+        self._export_path = Path(path)
+
+    def disable_export(self):
+        self.flush()
+        self._export_path = None
+
+    def _flush_soon(self, delay: float):
+        """Write the buffer in a worker thread after `delay` seconds (now if no loop is running)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = loop.call_later(delay, self._start_write)
+
+    def _start_write(self):
+        self._flush_handle = None
+        line = self._take_line()
+        if line is not None:
+            task = asyncio.create_task(self._write_async(self._export_path, line))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def _write_async(self, path: Path, line: str):
+        async with self._write_lock:  # Keep batches in order
+            await asyncio.to_thread(self._write, path, line)
+
+    def flush(self):
+        """Append buffered spans to the export file now, blocking; used on unload and when turning export off."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        line = self._take_line()
+        if line is not None:
+            self._write(self._export_path, line)
+
+    def _take_line(self) -> Optional[str]:
+        """Empty the buffer into one OTLP/JSON line (None if there is nothing to export)."""
+        if not self._export_buffer or self._export_path is None:
+            self._export_buffer.clear()
+            return None
+        spans, self._export_buffer = self._export_buffer, []
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "red.skysearch"}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "red.skysearch.perf"},
+                    "spans": [
+                        {
+                            "traceId": s.trace_id,
+                            "spanId": s.span_id,
+                            **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                            "name": s.name,
+                            "kind": 1,
+                            "startTimeUnixNano": str(s.start_ns),
+                            "endTimeUnixNano": str(s.end_ns),
+                            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                        }
+                        for s in spans
+                    ],
+                }],
+            }]
+        }
+        return json.dumps(payload, separators=(",", ":")) + "\n"
+
+    @staticmethod
+    def _write(path: Path, line: str):
+        try:
+            with open(path, "a", encoding="utf-8") as fp:
+                fp.write(line)
+        except OSError as e:
+            log.warning(f"Could not write perf spans to {path}: {e}")
+
+
+def timed_cycle(name: str):
+    """Wrap a background loop body in a root span on `self.perf`."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            perf = getattr(self, "perf", None)
+            if perf is None:
+                return await func(self, *args, **kwargs)
+            with perf.span(name):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}" if seconds >= 0.1 else f"{seconds * 1000:.1f}"
+
+
+def build_perf_embed(summaries: dict, export_path: Optional[Path] = None) -> discord.Embed:
+    """Embed with p50/p95/p99/max per span, grouped by loop."""
+    embed = discord.Embed(title="⏱️ SkySearch performance", color=0xfffffe)
+    if not summaries:
+        embed.description = "No spans recorded yet. Background loops record one cycle every few minutes."
+        return embed
+
+    groups = {}
+    for name, summary in summaries.items():
+        groups.setdefault(name.split(".", 1)[0], []).append((name, summary))
+
+    for group, rows in list(groups.items())[:24]:
+        lines = []
+        for name, s in rows[:12]:
+            label = name.split(".", 1)[1] if "." in name else "cycle"
+            lines.append(
+                f"`{label[:22]:<22}` n={s['count']} p50={_ms(s['p50'])} p95={_ms(s['p95'])} "
+                f"p99={_ms(s['p99'])} max={_ms(s['max'])} ms"
+            )
+            if label == "cycle" and s["attributes"]:
+                counters = ", ".join(f"{k}={v}" for k, v in s["attributes"].items())
+                lines.append(f"↳ last cycle: {counters}")
+        embed.add_field(name=group, value="\n".join(lines)[:1024], inline=False)
+
+    footer = f"Rolling window of {DEFAULT_WINDOW} samples per span"
+    if export_path:
+        footer += f" • exporting to {export_path.name}"
+    embed.set_footer(text=footer)
+    return embed
@@ -1,3 +1,6 @@
+import asyncio
+import hashlib
+import io
 import discord
 import json
 import urllib.parse
@@ -5,8 +8,14 @@ import datetime
 import time
 from redbot.core.i18n import Translator
 
+from .charts import render_chart_png
+
 _ = Translator("StatsUtils", __file__)
 
+# While the charted data keeps changing (every request moves the current hour's count),
+# `apistats` re-renders the charts at most this often.
+CHART_REFRESH_SECONDS = 300
+
 
 def _quickchart_url(chart_config: dict, width: int, height: int) -> str:
     config_json = json.dumps(chart_config, separators=(",", ":"))
@@ -93,33 +102,25 @@ def build_stats_embed(api_stats: dict, _=None) -> discord.Embed:
     return embed
 
 
-def build_stats_charts(api_stats: dict, _=None) -> list[discord.Embed]:
-    # Fallback function if no translator provided
-    if _ is None:
-        def _(text): return text
-    
-    chart_embeds: list[discord.Embed] = []
+def build_chart_specs(api_stats: dict) -> list[dict]:
+    """
+    Describe each stats chart (type, title, labels, values, colours, size).
+
+    Renderer-independent: `render_chart_png` draws a spec locally and
+    `build_stats_charts` turns one into a quickchart.io URL.
+    """
+    specs: list[dict] = []
 
     # Success vs Failure pie
     try:
         total_success = int(api_stats.get("successful_requests", 0))
         total_failed = int(api_stats.get("failed_requests", 0))
         if (total_success + total_failed) > 0:
-            chart = {
-                "type": "pie",
-                "data": {
-                    "labels": ["Successful", "Failed"],
-                    "datasets": [{
-                        "data": [total_success, total_failed],
-                        "backgroundColor": ["#2ecc71", "#e74c3c"],
-                    }],
-                },
-                "options": {"plugins": {"legend": {"position": "bottom"}}},
-            }
-            url = _quickchart_url(chart, 600, 300)
-            e = discord.Embed(title="Success vs Failure")
-            e.set_image(url=url)
-            chart_embeds.append(e)
+            specs.append({
+                "type": "pie", "title": "Success vs Failure", "width": 600, "height": 300,
+                "labels": ["Successful", "Failed"], "values": [total_success, total_failed],
+                "colors": ["#2ecc71", "#e74c3c"],
+            })
     except Exception:
         pass
 
@@ -128,21 +129,11 @@ def build_stats_charts(api_stats: dict, _=None) -> list[discord.Embed]:
         mode_primary = int(api_stats.get("api_mode_usage", {}).get("primary", 0))
         mode_fallback = int(api_stats.get("api_mode_usage", {}).get("fallback", 0))
         if (mode_primary + mode_fallback) > 0:
-            chart = {
-                "type": "doughnut",
-                "data": {
-                    "labels": ["Primary", "Fallback"],
-                    "datasets": [{
-                        "data": [mode_primary, mode_fallback],
-                        "backgroundColor": ["#3498db", "#9b59b6"],
-                    }],
-                },
-                "options": {"plugins": {"legend": {"position": "bottom"}}},
-            }
-            url = _quickchart_url(chart, 600, 300)
-            e = discord.Embed(title="API Mode Usage")
-            e.set_image(url=url)
-            chart_embeds.append(e)
+            specs.append({
+                "type": "doughnut", "title": "API Mode Usage", "width": 600, "height": 300,
+                "labels": ["Primary", "Fallback"], "values": [mode_primary, mode_fallback],
+                "colors": ["#3498db", "#9b59b6"],
+            })
     except Exception:
         pass
 
@@ -151,28 +142,11 @@ def build_stats_charts(api_stats: dict, _=None) -> list[discord.Embed]:
         endpoint_usage = api_stats.get("endpoint_usage", {}) or {}
         if endpoint_usage:
             top_items = sorted(endpoint_usage.items(), key=lambda x: x[1], reverse=True)[:5]
-            labels = [k for k, _ in top_items]
-            data_vals = [int(v) for _, v in top_items]
-            chart = {
-                "type": "bar",
-                "data": {
-                    "labels": labels,
-                    "datasets": [{
-                        "label": "Requests",
-                        "data": data_vals,
-                        "backgroundColor": "#f1c40f",
-                    }],
-                },
-                "options": {
-                    "indexAxis": "y",
-                    "plugins": {"legend": {"display": False}},
-                    "scales": {"x": {"beginAtZero": True}},
-                },
-            }
-            url = _quickchart_url(chart, 800, 300)
-            e = discord.Embed(title="Top Endpoints")
-            e.set_image(url=url)
-            chart_embeds.append(e)
+            specs.append({
+                "type": "hbar", "title": "Top Endpoints", "width": 800, "height": 300,
+                "labels": [k for k, _ in top_items], "values": [int(v) for _, v in top_items],
+                "colors": ["#f1c40f"], "label": "Requests",
+            })
     except Exception:
         pass
 
@@ -196,58 +170,24 @@ def build_stats_charts(api_stats: dict, _=None) -> list[discord.Embed]:
                 hours_to_show = [h for h in available_hours if h >= (current_hour - 50)]
             
             if hours_to_show:
-                labels = [datetime.datetime.fromtimestamp(h * 3600).strftime("%m/%d %H:%M") for h in hours_to_show]
-                data_vals = [int(hourly.get(h, 0)) for h in hours_to_show]
-                
-                chart = {
-                    "type": "line",
-                    "data": {
-                        "labels": labels,
-                        "datasets": [{
-                            "label": "Requests per hour",
-                            "data": data_vals,
-                            "fill": False,
-                            "borderColor": "#1abc9c",
-                            "tension": 0.3,
-                        }],
-                    },
-                    "options": {
-                        "plugins": {"legend": {"position": "bottom"}},
-                        "scales": {"y": {"beginAtZero": True}},
-                    },
-                }
-                url = _quickchart_url(chart, 800, 300)
-                e = discord.Embed(title=f"Hourly Requests (Historical: {len(hours_to_show)} hours from {datetime.datetime.fromtimestamp(hours_to_show[0] * 3600).strftime('%m/%d')} to {datetime.datetime.fromtimestamp(hours_to_show[-1] * 3600).strftime('%m/%d')})")
-                e.set_image(url=url)
-                chart_embeds.append(e)
+                start = datetime.datetime.fromtimestamp(hours_to_show[0] * 3600).strftime('%m/%d')
+                end = datetime.datetime.fromtimestamp(hours_to_show[-1] * 3600).strftime('%m/%d')
+                specs.append({
+                    "type": "line", "width": 800, "height": 300,
+                    "title": f"Hourly Requests (Historical: {len(hours_to_show)} hours from {start} to {end})",
+                    "labels": [datetime.datetime.fromtimestamp(h * 3600).strftime("%m/%d %H:%M") for h in hours_to_show],
+                    "values": [int(hourly.get(h, 0)) for h in hours_to_show],
+                    "colors": ["#1abc9c"], "label": "Requests per hour",
+                })
         else:
             # No data available, show empty chart
             current_hour = int(time.time() // 3600)
             hours = [current_hour - i for i in reversed(range(24))]
-            labels = [datetime.datetime.fromtimestamp(h * 3600).strftime("%H:%M") for h in hours]
-            data_vals = [0] * 24
-            
-            chart = {
-                "type": "line",
-                "data": {
-                    "labels": labels,
-                    "datasets": [{
-                        "label": "Requests per hour",
-                        "data": data_vals,
-                        "fill": False,
-                        "borderColor": "#1abc9c",
-                        "tension": 0.3,
-                    }],
-                },
-                "options": {
-                    "plugins": {"legend": {"position": "bottom"}},
-                    "scales": {"y": {"beginAtZero": True}},
-                },
-            }
-            url = _quickchart_url(chart, 800, 300)
-            e = discord.Embed(title="Hourly Requests (no data available)")
-            e.set_image(url=url)
-            chart_embeds.append(e)
+            specs.append({
+                "type": "line", "title": "Hourly Requests (no data available)", "width": 800, "height": 300,
+                "labels": [datetime.datetime.fromtimestamp(h * 3600).strftime("%H:%M") for h in hours],
+                "values": [0] * 24, "colors": ["#1abc9c"], "label": "Requests per hour",
+            })
     except Exception:
         pass
 
@@ -261,64 +201,115 @@ def build_stats_charts(api_stats: dict, _=None) -> list[discord.Embed]:
         available_days = sorted([int(d) for d in daily.keys() if daily.get(d, 0) > 0])
         
         if available_days:
-            # Show all available historical data
-            days_to_show = available_days
-            
-            if days_to_show:
-                labels = [datetime.datetime.fromtimestamp(d * 86400).strftime("%m/%d") for d in days_to_show]
-                data_vals = [int(daily.get(d, 0)) for d in days_to_show]
-                
-                chart = {
-                    "type": "bar",
-                    "data": {
-                        "labels": labels,
-                        "datasets": [{
-                            "label": "Total requests per day",
-                            "data": data_vals,
-                            "backgroundColor": "#2c3e50",
-                        }],
-                    },
-                    "options": {
-                        "plugins": {"legend": {"display": False}},
-                        "scales": {"y": {"beginAtZero": True}},
-                    },
-                }
-                url = _quickchart_url(chart, 800, 300)
-                e = discord.Embed(title=f"Total Requests (Historical: {len(days_to_show)} days from {datetime.datetime.fromtimestamp(days_to_show[0] * 86400).strftime('%m/%d')} to {datetime.datetime.fromtimestamp(days_to_show[-1] * 86400).strftime('%m/%d')})")
-                e.set_image(url=url)
-                chart_embeds.append(e)
+            start = datetime.datetime.fromtimestamp(available_days[0] * 86400).strftime('%m/%d')
+            end = datetime.datetime.fromtimestamp(available_days[-1] * 86400).strftime('%m/%d')
+            specs.append({
+                "type": "bar", "width": 800, "height": 300,
+                "title": f"Total Requests (Historical: {len(available_days)} days from {start} to {end})",
+                "labels": [datetime.datetime.fromtimestamp(d * 86400).strftime("%m/%d") for d in available_days],
+                "values": [int(daily.get(d, 0)) for d in available_days],
+                "colors": ["#2c3e50"], "label": "Total requests per day",
+            })
         else:
             # No data available, show empty chart
             current_day = int(time.time() // 86400)
             days = [current_day - i for i in reversed(range(30))]
-            labels = [datetime.datetime.fromtimestamp(d * 86400).strftime("%b %d") for d in days]
-            data_vals = [0] * 30
-            
-            chart = {
-                "type": "bar",
-                "data": {
-                    "labels": labels,
-                    "datasets": [{
-                        "label": "Total requests per day",
-                        "data": data_vals,
-                        "backgroundColor": "#2c3e50",
-                    }],
-                },
-                "options": {
-                    "plugins": {"legend": {"display": False}},
-                    "scales": {"y": {"beginAtZero": True}},
-                },
-            }
-            url = _quickchart_url(chart, 800, 300)
-            e = discord.Embed(title="Total Requests (no data available)")
-            e.set_image(url=url)
-            chart_embeds.append(e)
+            specs.append({
+                "type": "bar", "title": "Total Requests (no data available)", "width": 800, "height": 300,
+                "labels": [datetime.datetime.fromtimestamp(d * 86400).strftime("%b %d") for d in days],
+                "values": [0] * 30, "colors": ["#2c3e50"], "label": "Total requests per day",
+            })
     except Exception:
         pass
 
+    return specs
+
+
+def _quickchart_config(spec: dict) -> dict:
+    kind = spec["type"]
+    if kind in ("pie", "doughnut"):
+        return {
+            "type": kind,
+            "data": {"labels": spec["labels"], "datasets": [{"data": spec["values"], "backgroundColor": spec["colors"]}]},
+            "options": {"plugins": {"legend": {"position": "bottom"}}},
+        }
+    dataset = {"label": spec.get("label", ""), "data": spec["values"]}
+    if kind == "line":
+        dataset.update({"fill": False, "borderColor": spec["colors"][0], "tension": 0.3})
+        options = {"plugins": {"legend": {"position": "bottom"}}, "scales": {"y": {"beginAtZero": True}}}
+    elif kind == "hbar":
+        dataset["backgroundColor"] = spec["colors"][0]
+        options = {"indexAxis": "y", "plugins": {"legend": {"display": False}}, "scales": {"x": {"beginAtZero": True}}}
+    else:
+        dataset["backgroundColor"] = spec["colors"][0]
+        options = {"plugins": {"legend": {"display": False}}, "scales": {"y": {"beginAtZero": True}}}
+    return {"type": "line" if kind == "line" else "bar", "data": {"labels": spec["labels"], "datasets": [dataset]}, "options": options}
+
+
+def build_stats_charts(api_stats: dict, _=None) -> list[discord.Embed]:
+    """Chart embeds using quickchart.io image URLs (used when Pillow is not installed)."""
+    chart_embeds: list[discord.Embed] = []
+    for spec in build_chart_specs(api_stats):
+        e = discord.Embed(title=spec["title"])
+        e.set_image(url=_quickchart_url(_quickchart_config(spec), spec["width"], spec["height"]))
+        chart_embeds.append(e)
     return chart_embeds
 
 
+class StatsChartCache:
+    """
+    Rendered chart PNGs for `apistats`, reused while the charted data is unchanged.
+
+    The cache key is a digest of the chart specs, i.e. of the aggregates actually drawn. A
+    changed digest re-renders at most once per CHART_REFRESH_SECONDS; `invalidate()` makes
+    the next call re-render. Rendering runs in a worker thread so the event loop never
+    blocks on Pillow.
+    """
+
+    def __init__(self):
+        self._digest = None
+        self._rendered_at = 0.0
+        self._charts: list[tuple[str, str, bytes]] = []  # (title, filename, png)
+        self._lock = asyncio.Lock()
+
+    async def get(self, api_stats: dict) -> list[tuple[str, str, bytes]]:
+        specs = build_chart_specs(api_stats)
+        payload = json.dumps(specs, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        async with self._lock:
+            if digest != self._digest and (
+                self._digest is None or time.monotonic() - self._rendered_at >= CHART_REFRESH_SECONDS
+            ):
+                self._charts = await asyncio.to_thread(self._render, specs)
+                self._digest = digest
+                self._rendered_at = time.monotonic()
+            return self._charts
+
+    def invalidate(self):
+        self._digest = None
+
+    @staticmethod
+    def _render(specs: list[dict]) -> list[tuple[str, str, bytes]]:
+        charts = []
+        for index, spec in enumerate(specs):
+            try:
+                charts.append((spec["title"], f"stats_chart_{index}.png", render_chart_png(spec)))
+            except Exception:
+                continue
+        return charts
+
+
+def build_stats_chart_files(charts: list[tuple[str, str, bytes]]) -> tuple[list[discord.Embed], list[discord.File]]:
+    """Embeds plus PNG attachments for cached charts (discord.File objects are single-use)."""
+    embeds, files = [], []
+    for title, filename, png in charts:
+        e = discord.Embed(title=title)
+        e.set_image(url=f"attachment://{filename}")
+        embeds.append(e)
+        files.append(discord.File(io.BytesIO(png), filename=filename))
+    return embeds, files
+
+
 def build_stats_config_embed(save_config: dict, _=None) -> discord.Embed:
     # Fallback function if no translator provided
     if _ is None: